@@ -50,6 +50,9 @@ to every function in order to work properly.
 from __future__ import absolute_import
 import logging
 
+# Salt libs
+from salt.exceptions import SaltInvocationError
+
 # Azure libs
 HAS_LIBS = False
 try:
@@ -64,6 +67,9 @@ __virtualname__ = 'azurearm_compute'
 
 log = logging.getLogger(__name__)
 
+# Resource groups listed at a time by the *_list_all functions
+LIST_WORKERS = 8
+
 
 def __virtual__():
     if not HAS_LIBS:
@@ -77,6 +83,50 @@ def __virtual__():
     return __virtualname__
 
 
+def iter_resources(resource_type, resource_groups=None, fields=None, workers=LIST_WORKERS, **kwargs):
+    '''
+    .. versionadded:: Fluorine
+
+    Lazily yield the compute resources of a type as dictionaries, as the pages
+    of the listing arrive. Raises ``CloudError`` instead of returning an error.
+
+    :param resource_type: The operations group of the compute client to list,
+        such as ``virtual_machines``.
+
+    :param resource_groups: A list of resource groups to list, up to ``workers``
+        at a time. By default the whole subscription is listed.
+
+    :param fields: A list of the attributes to return for each resource.
+    '''
+    compconn = __utils__['azurearm.get_client']('compute', **kwargs)
+    try:
+        operations = getattr(compconn, resource_type)
+    except AttributeError:
+        raise SaltInvocationError('Unknown compute resource type {0}'.format(resource_type))
+    return __utils__['azurearm.iter_resources'](
+        operations,
+        resource_groups=resource_groups,
+        fields=fields,
+        workers=workers
+    )
+
+
+def _resources_by_name(resource_type, resource_groups, fields, workers, **kwargs):
+    result = {}
+    try:
+        if hasattr(fields, 'split'):
+            fields = fields.split(',')
+        if fields and 'name' not in fields:
+            fields = ['name'] + list(fields)
+        for resource in iter_resources(resource_type, resource_groups, fields, workers, **kwargs):
+            result[resource['name']] = resource
+    except CloudError as exc:
+        __utils__['azurearm.log_cloud_error']('compute', str(exc), **kwargs)
+        result = {'error': str(exc)}
+
+    return result
+
+
 def availability_set_create_or_update(name, resource_group, **kwargs):  # pylint: disable=invalid-name
     '''
     .. versionadded:: Fluorine
@@ -509,32 +559,29 @@ def virtual_machines_list(resource_group, **kwargs):
     return result
 
 
-def virtual_machines_list_all(**kwargs):
+def virtual_machines_list_all(resource_groups=None, fields=None, workers=LIST_WORKERS, **kwargs):
     '''
     .. versionadded:: Fluorine
 
     List all virtual machines within a subscription.
 
+    :param resource_groups: A list of resource groups to list virtual machines within,
+        up to ``workers`` at a time, instead of listing the whole subscription.
+
+    :param fields: A list of the attributes to return for each of the virtual machines.
+        Only these attributes are converted. By default all of them are returned.
+
+    :param workers: The number of resource groups to list at a time.
+
     CLI Example:
 
     .. code-block:: bash
 
         salt-call azurearm_compute.virtual_machines_list_all
+        salt-call azurearm_compute.virtual_machines_list_all resource_groups='[testgroup, othergroup]' fields='[name, id]'
 
     '''
-    result = {}
-    compconn = __utils__['azurearm.get_client']('compute', **kwargs)
-    try:
-        vms = __utils__['azurearm.paged_object_to_list'](
-            compconn.virtual_machines.list_all()
-        )
-        for vm in vms:  # pylint: disable=invalid-name
-            result[vm['name']] = vm
-    except CloudError as exc:
-        __utils__['azurearm.log_cloud_error']('compute', str(exc), **kwargs)
-        result = {'error': str(exc)}
-
-    return result
+    return _resources_by_name('virtual_machines', resource_groups, fields, workers, **kwargs)
 
 
 def virtual_machines_list_available_sizes(name, resource_group, **kwargs):  # pylint: disable=invalid-name
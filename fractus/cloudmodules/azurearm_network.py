@@ -71,6 +71,9 @@ __virtualname__ = 'azurearm_network'
 
 log = logging.getLogger(__name__)
 
+# Resource groups listed at a time by the *_list_all functions
+LIST_WORKERS = 8
+
 
 def __virtual__():
     if not HAS_LIBS:
@@ -84,6 +87,50 @@ def __virtual__():
     return __virtualname__
 
 
+def iter_resources(resource_type, resource_groups=None, fields=None, workers=LIST_WORKERS, **kwargs):
+    '''
+    .. versionadded:: Fluorine
+
+    Lazily yield the network resources of a type as dictionaries, as the pages
+    of the listing arrive. Raises ``CloudError`` instead of returning an error.
+
+    :param resource_type: The operations group of the network client to list,
+        such as ``network_interfaces``.
+
+    :param resource_groups: A list of resource groups to list, up to ``workers``
+        at a time. By default the whole subscription is listed.
+
+    :param fields: A list of the attributes to return for each resource.
+    '''
+    netconn = __utils__['azurearm.get_client']('network', **kwargs)
+    try:
+        operations = getattr(netconn, resource_type)
+    except AttributeError:
+        raise SaltInvocationError('Unknown network resource type {0}'.format(resource_type))
+    return __utils__['azurearm.iter_resources'](
+        operations,
+        resource_groups=resource_groups,
+        fields=fields,
+        workers=workers
+    )
+
+
+def _resources_by_name(resource_type, resource_groups, fields, workers, **kwargs):
+    result = {}
+    try:
+        if hasattr(fields, 'split'):
+            fields = fields.split(',')
+        if fields and 'name' not in fields:
+            fields = ['name'] + list(fields)
+        for resource in iter_resources(resource_type, resource_groups, fields, workers, **kwargs):
+            result[resource['name']] = resource
+    except CloudError as exc:
+        __utils__['azurearm.log_cloud_error']('network', str(exc), **kwargs)
+        result = {'error': str(exc)}
+
+    return result
+
+
 def check_dns_name_availability(name, region, **kwargs):
     '''
     .. versionadded:: Fluorine
@@ -637,32 +684,29 @@ def network_security_groups_list(resource_group, **kwargs):
     return result
 
 
-def network_security_groups_list_all(**kwargs):  # pylint: disable=invalid-name
+def network_security_groups_list_all(resource_groups=None, fields=None, workers=LIST_WORKERS, **kwargs):  # pylint: disable=invalid-name
     '''
     .. versionadded:: Fluorine
 
     List all network security groups within a subscription.
 
+    :param resource_groups: A list of resource groups to list network security groups within,
+        up to ``workers`` at a time, instead of listing the whole subscription.
+
+    :param fields: A list of the attributes to return for each of the network security groups.
+        Only these attributes are converted. By default all of them are returned.
+
+    :param workers: The number of resource groups to list at a time.
+
     CLI Example:
 
     .. code-block:: bash
 
         salt-call azurearm_network.network_security_groups_list_all
+        salt-call azurearm_network.network_security_groups_list_all resource_groups='[testgroup, othergroup]' fields='[name, id]'
 
     '''
-    result = {}
-    netconn = __utils__['azurearm.get_client']('network', **kwargs)
-    try:
-        secgroups = __utils__['azurearm.paged_object_to_list'](
-            netconn.network_security_groups.list_all()
-        )
-        for secgroup in secgroups:
-            result[secgroup['name']] = secgroup
-    except CloudError as exc:
-        __utils__['azurearm.log_cloud_error']('network', str(exc), **kwargs)
-        result = {'error': str(exc)}
-
-    return result
+    return _resources_by_name('network_security_groups', resource_groups, fields, workers, **kwargs)
 
 
 def subnets_list(virtual_network, resource_group, **kwargs):
@@ -853,31 +897,29 @@ def subnet_delete(name, virtual_network, resource_group, **kwargs):
     return result
 
 
-def virtual_networks_list_all(**kwargs):
+def virtual_networks_list_all(resource_groups=None, fields=None, workers=LIST_WORKERS, **kwargs):
     '''
     .. versionadded:: Fluorine
 
     List all virtual networks within a subscription.
 
+    :param resource_groups: A list of resource groups to list virtual networks within,
+        up to ``workers`` at a time, instead of listing the whole subscription.
+
+    :param fields: A list of the attributes to return for each of the virtual networks.
+        Only these attributes are converted. By default all of them are returned.
+
+    :param workers: The number of resource groups to list at a time.
+
     CLI Example:
 
     .. code-block:: bash
 
         salt-call azurearm_network.virtual_networks_list_all
+        salt-call azurearm_network.virtual_networks_list_all resource_groups='[testgroup, othergroup]' fields='[name, id]'
 
     '''
-    result = {}
-    netconn = __utils__['azurearm.get_client']('network', **kwargs)
-    try:
-        vnets = __utils__['azurearm.paged_object_to_list'](netconn.virtual_networks.list_all())
-
-        for vnet in vnets:
-            result[vnet['name']] = vnet
-    except CloudError as exc:
-        __utils__['azurearm.log_cloud_error']('network', str(exc), **kwargs)
-        result = {'error': str(exc)}
-
-    return result
+    return _resources_by_name('virtual_networks', resource_groups, fields, workers, **kwargs)
 
 
 def virtual_networks_list(resource_group, **kwargs):
@@ -1059,31 +1101,29 @@ def virtual_network_get(name, resource_group, **kwargs):
     return result
 
 
-def load_balancers_list_all(**kwargs):
+def load_balancers_list_all(resource_groups=None, fields=None, workers=LIST_WORKERS, **kwargs):
     '''
     .. versionadded:: Fluorine
 
     List all load balancers within a subscription.
 
+    :param resource_groups: A list of resource groups to list load balancers within,
+        up to ``workers`` at a time, instead of listing the whole subscription.
+
+    :param fields: A list of the attributes to return for each of the load balancers.
+        Only these attributes are converted. By default all of them are returned.
+
+    :param workers: The number of resource groups to list at a time.
+
     CLI Example:
 
     .. code-block:: bash
 
         salt-call azurearm_network.load_balancers_list_all
+        salt-call azurearm_network.load_balancers_list_all resource_groups='[testgroup, othergroup]' fields='[name, id]'
 
     '''
-    result = {}
-    netconn = __utils__['azurearm.get_client']('network', **kwargs)
-    try:
-        load_balancers = __utils__['azurearm.paged_object_to_list'](netconn.load_balancers.list_all())
-
-        for load_balancer in load_balancers:
-            result[load_balancer['name']] = load_balancer
-    except CloudError as exc:
-        __utils__['azurearm.log_cloud_error']('network', str(exc), **kwargs)
-        result = {'error': str(exc)}
-
-    return result
+    return _resources_by_name('load_balancers', resource_groups, fields, workers, **kwargs)
 
 
 def load_balancers_list(resource_group, **kwargs):
@@ -1573,31 +1613,29 @@ def network_interface_create_or_update(name, ip_configurations, subnet, virtual_
     return result
 
 
-def network_interfaces_list_all(**kwargs):
+def network_interfaces_list_all(resource_groups=None, fields=None, workers=LIST_WORKERS, **kwargs):
     '''
     .. versionadded:: Fluorine
 
     List all network interfaces within a subscription.
 
+    :param resource_groups: A list of resource groups to list network interfaces within,
+        up to ``workers`` at a time, instead of listing the whole subscription.
+
+    :param fields: A list of the attributes to return for each of the network interfaces.
+        Only these attributes are converted. By default all of them are returned.
+
+    :param workers: The number of resource groups to list at a time.
+
     CLI Example:
 
     .. code-block:: bash
 
         salt-call azurearm_network.network_interfaces_list_all
+        salt-call azurearm_network.network_interfaces_list_all resource_groups='[testgroup, othergroup]' fields='[name, id]'
 
     '''
-    result = {}
-    netconn = __utils__['azurearm.get_client']('network', **kwargs)
-    try:
-        nics = __utils__['azurearm.paged_object_to_list'](netconn.network_interfaces.list_all())
-
-        for nic in nics:
-            result[nic['name']] = nic
-    except CloudError as exc:
-        __utils__['azurearm.log_cloud_error']('network', str(exc), **kwargs)
-        result = {'error': str(exc)}
-
-    return result
+    return _resources_by_name('network_interfaces', resource_groups, fields, workers, **kwargs)
 
 
 def network_interfaces_list(resource_group, **kwargs):
@@ -1956,31 +1994,29 @@ def public_ip_address_create_or_update(name, resource_group, **kwargs):
     return result
 
 
-def public_ip_addresses_list_all(**kwargs):
+def public_ip_addresses_list_all(resource_groups=None, fields=None, workers=LIST_WORKERS, **kwargs):
     '''
     .. versionadded:: Fluorine
 
     List all public IP addresses within a subscription.
 
+    :param resource_groups: A list of resource groups to list public IP addresses within,
+        up to ``workers`` at a time, instead of listing the whole subscription.
+
+    :param fields: A list of the attributes to return for each of the public IP addresses.
+        Only these attributes are converted. By default all of them are returned.
+
+    :param workers: The number of resource groups to list at a time.
+
     CLI Example:
 
     .. code-block:: bash
 
         salt-call azurearm_network.public_ip_addresses_list_all
+        salt-call azurearm_network.public_ip_addresses_list_all resource_groups='[testgroup, othergroup]' fields='[name, id]'
 
     '''
-    result = {}
-    netconn = __utils__['azurearm.get_client']('network', **kwargs)
-    try:
-        pub_ips = __utils__['azurearm.paged_object_to_list'](netconn.public_ip_addresses.list_all())
-
-        for ip in pub_ips:
-            result[ip['name']] = ip
-    except CloudError as exc:
-        __utils__['azurearm.log_cloud_error']('network', str(exc), **kwargs)
-        result = {'error': str(exc)}
-
-    return result
+    return _resources_by_name('public_ip_addresses', resource_groups, fields, workers, **kwargs)
 
 
 def public_ip_addresses_list(resource_group, **kwargs):
@@ -2365,31 +2401,29 @@ def route_filters_list(resource_group, **kwargs):
     return result
 
 
-def route_filters_list_all(**kwargs):
+def route_filters_list_all(resource_groups=None, fields=None, workers=LIST_WORKERS, **kwargs):
     '''
     .. versionadded:: Fluorine
 
     List all route filters within a subscription.
 
+    :param resource_groups: A list of resource groups to list route filters within,
+        up to ``workers`` at a time, instead of listing the whole subscription.
+
+    :param fields: A list of the attributes to return for each of the route filters.
+        Only these attributes are converted. By default all of them are returned.
+
+    :param workers: The number of resource groups to list at a time.
+
     CLI Example:
 
     .. code-block:: bash
 
         salt-call azurearm_network.route_filters_list_all
+        salt-call azurearm_network.route_filters_list_all resource_groups='[testgroup, othergroup]' fields='[name, id]'
 
     '''
-    result = {}
-    netconn = __utils__['azurearm.get_client']('network', **kwargs)
-    try:
-        filters = __utils__['azurearm.paged_object_to_list'](netconn.route_filters.list())
-
-        for route_filter in filters:
-            result[route_filter['name']] = route_filter
-    except CloudError as exc:
-        __utils__['azurearm.log_cloud_error']('network', str(exc), **kwargs)
-        result = {'error': str(exc)}
-
-    return result
+    return _resources_by_name('route_filters', resource_groups, fields, workers, **kwargs)
 
 
 def route_delete(name, route_table, resource_group, **kwargs):
@@ -2724,28 +2758,26 @@ def route_tables_list(resource_group, **kwargs):
     return result
 
 
-def route_tables_list_all(**kwargs):
+def route_tables_list_all(resource_groups=None, fields=None, workers=LIST_WORKERS, **kwargs):
     '''
     .. versionadded:: Fluorine
 
     List all route tables within a subscription.
 
+    :param resource_groups: A list of resource groups to list route tables within,
+        up to ``workers`` at a time, instead of listing the whole subscription.
+
+    :param fields: A list of the attributes to return for each of the route tables.
+        Only these attributes are converted. By default all of them are returned.
+
+    :param workers: The number of resource groups to list at a time.
+
     CLI Example:
 
     .. code-block:: bash
 
         salt-call azurearm_network.route_tables_list_all
+        salt-call azurearm_network.route_tables_list_all resource_groups='[testgroup, othergroup]' fields='[name, id]'
 
     '''
-    result = {}
-    netconn = __utils__['azurearm.get_client']('network', **kwargs)
-    try:
-        tables = __utils__['azurearm.paged_object_to_list'](netconn.route_tables.list_all())
-
-        for table in tables:
-            result[table['name']] = table
-    except CloudError as exc:
-        __utils__['azurearm.log_cloud_error']('network', str(exc), **kwargs)
-        result = {'error': str(exc)}
-
-    return result
+    return _resources_by_name('route_tables', resource_groups, fields, workers, **kwargs)
@@ -78,26 +78,27 @@ def __virtual__():
     return __virtualname__
 
 
-def resource_groups_list(**kwargs):
+def resource_groups_list(fields=None, **kwargs):
     '''
     .. versionadded:: Fluorine
 
     List all resource groups within a subscription.
 
+    :param fields: A list of the attributes to return for each resource group.
+        Only these attributes are converted. By default all of them are returned.
+
     CLI Example:
 
     .. code-block:: bash
 
         salt-call azurearm_resource.resource_groups_list
+        salt-call azurearm_resource.resource_groups_list fields='[name, location]'
 
     '''
     result = {}
     resconn = __utils__['azurearm.get_client']('resource', **kwargs)
     try:
-        groups = __utils__['azurearm.paged_object_to_list'](resconn.resource_groups.list())
-
-        for group in groups:
-            result[group['name']] = group
+        result = __utils__['azurearm.paged_object_to_dict'](resconn.resource_groups.list(), fields=fields)
     except CloudError as exc:
         __utils__['azurearm.log_cloud_error']('resource', str(exc), **kwargs)
         result = {'error': str(exc)}
@@ -40,6 +40,14 @@ Execution module for Amazon Elasticache using boto3
             key: askdjghsdfjkghWupUjasdflkdfklgjsdfjajkghs
             region: us-east-1
 
+    The waits of the create, modify and delete functions can be deferred to
+    the end of the run, where all the deferred waits are settled at once by
+    :py:func:`wait_for_deferred`, with the option:
+
+    .. code-block:: yaml
+
+        boto3_elasticache.defer_wait: True
+
 :depends: boto3
 '''
 
@@ -49,12 +57,12 @@ Execution module for Amazon Elasticache using boto3
 # Import Python libs
 from __future__ import absolute_import, print_function, unicode_literals
 import logging
-import time
 
 # Import Salt libs
 from salt.exceptions import SaltInvocationError, CommandExecutionError
 import salt.utils.compat
 import salt.utils.versions
+from salt.ext import six
 
 
 log = logging.getLogger(__name__)
@@ -71,6 +79,11 @@ except ImportError:
     HAS_BOTO3 = False
 
 
+# Bounds of the interval between polls of the resources being waited for.
+WAIT_MIN_INTERVAL = 5
+WAIT_MAX_INTERVAL = 60
+
+
 def __virtual__():
     '''
     Only load if boto libraries exist and if boto libraries are greater than
@@ -118,6 +131,65 @@ def _describe_resource(name=None, name_param=None, res_type=None, info_node=None
         return None
 
 
+def _resource_waiter(name_param, res_type, status_param, region=None, key=None,
+                     keyid=None, profile=None):
+    '''
+    Return the waiter shared by the waits for the ``res_type`` resources of a
+    region, which lists all of them with one paged describe per poll.
+    '''
+    describe = globals()['describe_'+res_type+'s']
+
+    def _statuses(names):
+        items = describe(region=region, key=key, keyid=keyid, profile=profile)
+        if items is None:
+            raise CommandExecutionError('Unable to describe {0}s'.format(res_type))
+        return dict((item[name_param], item.get(status_param)) for item in items)
+
+    cxkey = __utils__['boto.profile_key']('elasticache', region, key, keyid, profile)
+    return __utils__['boto_waiter.get_waiter'](
+        __context__, ('boto3_elasticache', res_type, cxkey), _statuses, batch=None,
+        min_interval=WAIT_MIN_INTERVAL, max_interval=WAIT_MAX_INTERVAL)
+
+
+def _wait_for_resources(names, name_param, res_type, status_param, status, timeout,
+                        region=None, key=None, keyid=None, profile=None):
+    if isinstance(names, six.string_types):
+        names = [names]
+    waiter = _resource_waiter(name_param, res_type, status_param,
+                              region, key, keyid, profile)
+    waits = [waiter.add(name, until=status, timeout=timeout) for name in names]
+    __utils__['boto_waiter.wait_all'](waits)
+    return {'ready': [wait.key for wait in waits if wait.result],
+            'not_ready': dict((wait.key, wait.status) for wait in waits if not wait.result)}
+
+
+def _defer(wait_for):
+    '''
+    Defer ``wait_for`` to the end of the run if the ``boto3_elasticache.defer_wait``
+    option is set, returning whether it was deferred.
+    '''
+    if not __opts__.get('boto3_elasticache.defer_wait', False):
+        return False
+    __utils__['boto_waiter.defer'](__context__, 'boto3_elasticache', wait_for)
+    return True
+
+
+def wait_for_deferred(timeout=None):
+    '''
+    Wait for the resources whose status the create, modify and delete
+    functions deferred waiting for. Returns the names of those which are
+    ``ready``, and of those which ``failed`` or are still ``pending`` after
+    ``timeout`` seconds.
+
+    Example:
+
+    .. code-block:: bash
+
+        salt myminion boto3_elasticache.wait_for_deferred timeout=1800
+    '''
+    return __utils__['boto_waiter.wait_deferred'](__context__, 'boto3_elasticache', timeout)
+
+
 def _delete_resource(name, name_param, desc, res_type, wait=0, status_param=None,
                      status_gone='deleted', region=None, key=None, keyid=None, profile=None,
                      **args):
@@ -144,7 +216,8 @@ def _delete_resource(name, name_param, desc, res_type, wait=0, status_param=None
         f = getattr(conn, func)
         if wait:
             func = 'describe_'+res_type+'s'
-            s = globals()[func]
+            waiter = _resource_waiter(name_param, res_type, status_param,
+                                      region, key, keyid, profile)
     except (AttributeError, KeyError) as e:
         raise SaltInvocationError("No function '{0}()' found: {1}".format(func, e.message))
     try:
@@ -153,20 +226,15 @@ def _delete_resource(name, name_param, desc, res_type, wait=0, status_param=None
         if not wait:
             log.info('%s %s deletion requested.', desc.title(), name)
             return True
+        wait_for = waiter.add(name, until=(None, status_gone), timeout=wait)
+        if _defer(wait_for):
+            log.info('%s %s deletion requested.', desc.title(), name)
+            return True
         log.info('Waiting up to %s seconds for %s %s to be deleted.', wait, desc, name)
-        orig_wait = wait
-        while wait > 0:
-            r = s(name=name, conn=conn)
-            if not r or not len(r) or r[0].get(status_param) == status_gone:
-                log.info('%s %s deleted.', desc.title(), name)
-                return True
-            sleep = wait if wait % 60 == wait else 60
-            log.info('Sleeping %s seconds for %s %s to be deleted.',
-                     sleep, desc, name)
-            time.sleep(sleep)
-            wait -= sleep
-        log.error('%s %s not deleted after %s seconds!', desc.title(), name, orig_wait)
-
+        if wait_for.wait():
+            log.info('%s %s deleted.', desc.title(), name)
+            return True
+        log.error('%s %s not deleted after %s seconds!', desc.title(), name, wait)
         return False
     except botocore.exceptions.ClientError as e:
         log.error('Failed to delete %s %s: %s', desc, name, e)
@@ -196,7 +264,8 @@ def _create_resource(name, name_param=None, desc=None, res_type=None, wait=0, st
         f = getattr(conn, func)
         if wait:
             func = 'describe_'+res_type+'s'
-            s = globals()[func]
+            waiter = _resource_waiter(name_param, res_type, status_param,
+                                      region, key, keyid, profile)
     except (AttributeError, KeyError) as e:
         raise SaltInvocationError("No function '{0}()' found: {1}".format(func, e.message))
     try:
@@ -204,21 +273,17 @@ def _create_resource(name, name_param=None, desc=None, res_type=None, wait=0, st
         if not wait:
             log.info('%s %s created.', desc.title(), name)
             return True
+        wait_for = waiter.add(name, until=status_good, timeout=wait)
+        if _defer(wait_for):
+            log.info('%s %s created.', desc.title(), name)
+            return True
         log.info('Waiting up to %s seconds for %s %s to be become available.',
                  wait, desc, name)
-        orig_wait = wait
-        while wait > 0:
-            r = s(name=name, conn=conn)
-            if r and r[0].get(status_param) == status_good:
-                log.info('%s %s created and available.', desc.title(), name)
-                return True
-            sleep = wait if wait % 60 == wait else 60
-            log.info('Sleeping %s seconds for %s %s to become available.',
-                     sleep, desc, name)
-            time.sleep(sleep)
-            wait -= sleep
+        if wait_for.wait():
+            log.info('%s %s created and available.', desc.title(), name)
+            return True
         log.error('%s %s not available after %s seconds!',
-                  desc.title(), name, orig_wait)
+                  desc.title(), name, wait)
         return False
     except botocore.exceptions.ClientError as e:
         msg = 'Failed to create {0} {1}: {2}'.format(desc, name, e)
@@ -249,7 +314,8 @@ def _modify_resource(name, name_param=None, desc=None, res_type=None, wait=0, st
         f = getattr(conn, func)
         if wait:
             func = 'describe_'+res_type+'s'
-            s = globals()[func]
+            waiter = _resource_waiter(name_param, res_type, status_param,
+                                      region, key, keyid, profile)
     except (AttributeError, KeyError) as e:
         raise SaltInvocationError("No function '{0}()' found: {1}".format(func, e.message))
     try:
@@ -257,21 +323,17 @@ def _modify_resource(name, name_param=None, desc=None, res_type=None, wait=0, st
         if not wait:
             log.info('%s %s modification requested.', desc.title(), name)
             return True
+        wait_for = waiter.add(name, until=status_good, timeout=wait)
+        if _defer(wait_for):
+            log.info('%s %s modification requested.', desc.title(), name)
+            return True
         log.info('Waiting up to %s seconds for %s %s to be become available.',
                  wait, desc, name)
-        orig_wait = wait
-        while wait > 0:
-            r = s(name=name, conn=conn)
-            if r and r[0].get(status_param) == status_good:
-                log.info('%s %s modified and available.', desc.title(), name)
-                return True
-            sleep = wait if wait % 60 == wait else 60
-            log.info('Sleeping %s seconds for %s %s to become available.',
-                     sleep, desc, name)
-            time.sleep(sleep)
-            wait -= sleep
+        if wait_for.wait():
+            log.info('%s %s modified and available.', desc.title(), name)
+            return True
         log.error('%s %s not available after %s seconds!',
-                  desc.title(), name, orig_wait)
+                  desc.title(), name, wait)
         return False
     except botocore.exceptions.ClientError as e:
         msg = 'Failed to modify {0} {1}: {2}'.format(desc, name, e)
@@ -309,6 +371,24 @@ def cache_cluster_exists(name, conn=None, region=None, key=None, keyid=None, pro
     return bool(describe_cache_clusters(name=name, conn=conn, region=region, key=key, keyid=keyid, profile=profile))
 
 
+def wait_for_cache_clusters(names, status='available', timeout=600, region=None, key=None,
+                            keyid=None, profile=None):
+    '''
+    Wait until many cache clusters reach ``status``, polling all of them with
+    one describe call. Pass ``status=None`` to wait for their deletion.
+
+    Returns ``{'ready': [...], 'not_ready': {name: status}}``.
+
+    Example:
+
+    .. code-block:: bash
+
+        salt myminion boto3_elasticache.wait_for_cache_clusters '[myelasticache1, myelasticache2]'
+    '''
+    return _wait_for_resources(names, 'CacheClusterId', 'cache_cluster', 'CacheClusterStatus',
+                               status, timeout, region, key, keyid, profile)
+
+
 def create_cache_cluster(name, wait=600, security_groups=None,
                          region=None, key=None, keyid=None, profile=None, **args):
     '''
@@ -420,6 +500,24 @@ def replication_group_exists(name, region=None, key=None, keyid=None, profile=No
                 profile=profile))
 
 
+def wait_for_replication_groups(names, status='available', timeout=600, region=None, key=None,
+                                keyid=None, profile=None):
+    '''
+    Wait until many replication groups reach ``status``, polling all of them
+    with one describe call. Pass ``status=None`` to wait for their deletion.
+
+    Returns ``{'ready': [...], 'not_ready': {name: status}}``.
+
+    Example:
+
+    .. code-block:: bash
+
+        salt myminion boto3_elasticache.wait_for_replication_groups '[myreplgroup1, myreplgroup2]'
+    '''
+    return _wait_for_resources(names, 'ReplicationGroupId', 'replication_group', 'Status',
+                               status, timeout, region, key, keyid, profile)
+
+
 def create_replication_group(name, wait=600, security_groups=None, region=None, key=None, keyid=None,
                              profile=None, **args):
     '''
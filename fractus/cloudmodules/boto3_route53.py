@@ -50,13 +50,14 @@ Execution module for Amazon Route53 written against Boto 3
 
 # Import Python libs
 from __future__ import absolute_import, print_function, unicode_literals
+import copy
 import logging
-import time
 
 # Import Salt libs
 import salt.utils.compat
 import salt.utils.versions
 from salt.exceptions import SaltInvocationError
+from salt.ext import six
 log = logging.getLogger(__name__)  # pylint: disable=W1699
 
 # Import third party libs
@@ -88,16 +89,12 @@ def __init__(opts):
 def _collect_results(func, item, args, marker='Marker', nextmarker='NextMarker'):
     ret = []
     Marker = args.get(marker, '')
-    tries = 10
+    backoff = __utils__['boto_retry.backoff']('route53', tries=10)
     while Marker is not None:
         try:
             r = func(**args)
         except ClientError as e:
-            if tries and e.response.get('Error', {}).get('Code') == 'Throttling':
-                # Rate limited - retry
-                log.debug('Throttled by AWS API.')
-                time.sleep(3)
-                tries -= 1
+            if backoff.retry(e):
                 continue
             log.error('Could not collect results from %s(): %s', func, e)
             return []
@@ -109,22 +106,67 @@ def _collect_results(func, item, args, marker='Marker', nextmarker='NextMarker')
     return ret
 
 
+# Seconds the hosted zones and the records of a zone are cached for, once
+# listed.
+ZONE_CACHE_TTL = 600
+
+
+def _change_waiter():
+    return __utils__['route53.get_waiter'](__context__)
+
+
+def _change_queue():
+    return __utils__['route53.get_queue'](__context__)
+
+
+def _zone_cache():
+    return __utils__['boto_cache.get_cache'](
+        __context__, 'boto3_route53',
+        ttl=__opts__.get('boto3_route53.zone_cache_ttl', ZONE_CACHE_TTL))
+
+
+def _zone_id(Id):
+    return Id.split('/')[-1]
+
+
+def _conn_key(region=None, key=None, keyid=None, profile=None):
+    return __utils__['boto.profile_key']('route53', region, key, keyid, profile)
+
+
+def _zones_by_name(region=None, key=None, keyid=None, profile=None):
+    '''
+    Return the hosted zones of the account indexed by domain name, listed
+    once and cached for the run.
+    '''
+    def _fetch():
+        conn = _get_conn(region=region, key=key, keyid=keyid, profile=profile)
+        zones = {}
+        for z in _collect_results(conn.list_hosted_zones, 'HostedZones', {}):
+            zones.setdefault(z['Name'], []).append(z)
+        return zones
+    return _zone_cache().get(('zones', _conn_key(region, key, keyid, profile)), _fetch)
+
+
+def _invalidate_zone(Id=None, region=None, key=None, keyid=None, profile=None):
+    _zone_cache().invalidate('zones')
+    if Id:
+        _zone_cache().invalidate('hosted_zone', _zone_id(Id))
+
+
+def _get_status(conn):
+    def _status(change_id):
+        change = __utils__['boto_retry.call']('route53', conn.get_change, Id=change_id)
+        return change['ChangeInfo']['Status']
+    return _status
+
+
 def _wait_for_sync(change, conn, tries=10, sleep=20):
-    for retry in range(1, tries+1):
-        log.info('Getting route53 status (attempt %s)', retry)
-        status = 'wait'
-        try:
-            status = conn.get_change(Id=change)['ChangeInfo']['Status']
-        except ClientError as e:
-            if e.response.get('Error', {}).get('Code') == 'Throttling':
-                log.debug('Throttled by AWS API.')
-            else:
-                raise e
-        if status == 'INSYNC':
-            return True
-        time.sleep(sleep)
-    log.error('Timed out waiting for Route53 INSYNC status.')
-    return False
+    waiter = _change_waiter()
+    waiter.add(change, _get_status(conn))
+    if waiter.wait([change], timeout=tries * sleep):
+        log.error('Timed out waiting for Route53 INSYNC status.')
+        return False
+    return True
 
 
 def find_hosted_zone(Id=None, Name=None, PrivateZone=None,
@@ -184,7 +226,7 @@ def find_hosted_zone(Id=None, Name=None, PrivateZone=None,
 
 def get_hosted_zone(Id, region=None, key=None, keyid=None, profile=None):
     '''
-    Return detailed info about the given zone.
+    Return detailed info about the given zone. The result is cached for the run.
 
     Id
         The unique Zone Identifier for the Hosted Zone.
@@ -208,9 +250,15 @@ def get_hosted_zone(Id, region=None, key=None, keyid=None, profile=None):
         salt myminion boto3_route53.get_hosted_zone Z1234567690 \
                 profile='{"region": "us-east-1", "keyid": "A12345678AB", "key": "xblahblahblah"}'
     '''
-    conn = _get_conn(region=region, key=key, keyid=keyid, profile=profile)
-    args = {'Id': Id}
-    return _collect_results(conn.get_hosted_zone, None, args)
+    def _fetch():
+        conn = _get_conn(region=region, key=key, keyid=keyid, profile=profile)
+        return _collect_results(conn.get_hosted_zone, None, {'Id': Id})
+    cache_key = ('hosted_zone', _zone_id(Id), _conn_key(region, key, keyid, profile))
+    ret = _zone_cache().get(cache_key, _fetch)
+    if not ret:
+        # Don't remember failed lookups
+        _zone_cache().invalidate(*cache_key)
+    return copy.deepcopy(ret)
 
 
 def get_hosted_zones_by_domain(Name, region=None, key=None, keyid=None, profile=None):
@@ -219,6 +267,9 @@ def get_hosted_zones_by_domain(Name, region=None, key=None, keyid=None, profile=
     Note that this can return multiple Route53 zones, since a domain name can be used in
     both public and private zones.
 
+    The hosted zones of the account are listed once per run and indexed by domain name, so
+    lookups don't list every zone again.
+
     Name
         The domain name associated with the Hosted Zone(s).
 
@@ -241,9 +292,7 @@ def get_hosted_zones_by_domain(Name, region=None, key=None, keyid=None, profile=
         salt myminion boto3_route53.get_hosted_zones_by_domain salt.org. \
                 profile='{"region": "us-east-1", "keyid": "A12345678AB", "key": "xblahblahblah"}'
     '''
-    conn = _get_conn(region=region, key=key, keyid=keyid, profile=profile)
-    zones = [z for z in _collect_results(conn.list_hosted_zones, 'HostedZones', {})
-            if z['Name'] == Name]
+    zones = _zones_by_name(region=region, key=key, keyid=keyid, profile=profile).get(Name, [])
     ret = []
     for z in zones:
         ret += get_hosted_zone(Id=z['Id'], region=region, key=key, keyid=keyid, profile=profile)
@@ -390,19 +439,17 @@ def create_hosted_zone(Name, VPCId=None, VPCName=None, VPCRegion=None, CallerRef
         if any((VPCId, VPCName, VPCRegion)):
             log.info('Options VPCId, VPCName, and VPCRegion are ignored when creating '
                      'non-private zones.')
-    tries = 10
-    while tries:
+    backoff = __utils__['boto_retry.backoff']('route53', tries=10)
+    while True:
         try:
             r = conn.create_hosted_zone(**args)
             r.pop('ResponseMetadata', None)
+            _invalidate_zone()
             if _wait_for_sync(r['ChangeInfo']['Id'], conn):
                 return [r]
             return []
         except ClientError as e:
-            if tries and e.response.get('Error', {}).get('Code') == 'Throttling':
-                log.debug('Throttled by AWS API.')
-                time.sleep(3)
-                tries -= 1
+            if backoff.retry(e):
                 continue
             log.error('Failed to create hosted zone %s: %s', Name, e)
             return []
@@ -442,20 +489,19 @@ def update_hosted_zone_comment(Id=None, Name=None, Comment=None, PrivateZone=Non
             log.error("Couldn't resolve domain name %s to a hosted zone ID.", Name)
             return []
         Id = zone[0]['HostedZone']['Id']
-    tries = 10
-    while tries:
+    backoff = __utils__['boto_retry.backoff']('route53', tries=10)
+    while True:
         try:
             r = conn.update_hosted_zone_comment(Id=Id, Comment=Comment)
             r.pop('ResponseMetadata', None)
+            _invalidate_zone(Id)
             return [r]
         except ClientError as e:
-            if tries and e.response.get('Error', {}).get('Code') == 'Throttling':
-                log.debug('Throttled by AWS API.')
-                time.sleep(3)
-                tries -= 1
+            if backoff.retry(e):
                 continue
             log.error('Failed to update comment on hosted zone %s: %s',
                       Name or Id, e)
+            break
     return []
 
 
@@ -544,23 +590,22 @@ def associate_vpc_with_hosted_zone(HostedZoneId=None, Name=None, VPCId=None,
     args.update({'Comment': Comment}) if Comment is not None else None
 
     conn = _get_conn(region=region, key=key, keyid=keyid, profile=profile)
-    tries = 10
-    while tries:
+    backoff = __utils__['boto_retry.backoff']('route53', tries=10)
+    while True:
         try:
             r = conn.associate_vpc_with_hosted_zone(**args)
+            _invalidate_zone(HostedZoneId)
             return _wait_for_sync(r['ChangeInfo']['Id'], conn)
         except ClientError as e:
             if e.response.get('Error', {}).get('Code') == 'ConflictingDomainExists':
                 log.debug('VPC Association already exists.')
                 # return True since the current state is the desired one
                 return True
-            if tries and e.response.get('Error', {}).get('Code') == 'Throttling':
-                log.debug('Throttled by AWS API.')
-                time.sleep(3)
-                tries -= 1
+            if backoff.retry(e):
                 continue
             log.error('Failed to associate VPC %s with hosted zone %s: %s',
                       VPCName or VPCId, Name or HostedZoneId, e)
+            break
     return False
 
 
@@ -639,23 +684,22 @@ def disassociate_vpc_from_hosted_zone(HostedZoneId=None, Name=None, VPCId=None,
     args.update({'Comment': Comment}) if Comment is not None else None
 
     conn = _get_conn(region=region, key=key, keyid=keyid, profile=profile)
-    tries = 10
-    while tries:
+    backoff = __utils__['boto_retry.backoff']('route53', tries=10)
+    while True:
         try:
             r = conn.disassociate_vpc_from_hosted_zone(**args)
+            _invalidate_zone(HostedZoneId)
             return _wait_for_sync(r['ChangeInfo']['Id'], conn)
         except ClientError as e:
             if e.response.get('Error', {}).get('Code') == 'VPCAssociationNotFound':
                 log.debug('No VPC Association exists.')
                 # return True since the current state is the desired one
                 return True
-            if tries and e.response.get('Error', {}).get('Code') == 'Throttling':
-                log.debug('Throttled by AWS API.')
-                time.sleep(3)
-                tries -= 1
+            if backoff.retry(e):
                 continue
             log.error('Failed to associate VPC %s with hosted zone %s: %s',
                       VPCName or VPCId, Name or HostedZoneId, e)
+            break
     return False
 
 
@@ -691,6 +735,8 @@ def delete_hosted_zone(Id, region=None, key=None, keyid=None, profile=None):
     conn = _get_conn(region=region, key=key, keyid=keyid, profile=profile)
     try:
         r = conn.delete_hosted_zone(Id=Id)
+        _invalidate_zone(Id)
+        _zone_cache().invalidate('zone', _zone_id(Id))
         return _wait_for_sync(r['ChangeInfo']['Id'], conn)
     except ClientError as e:
         log.error('Failed to delete hosted zone %s: %s', Id, e)
@@ -718,27 +764,14 @@ def delete_hosted_zone_by_domain(Name, PrivateZone=None, region=None, key=None,
     return delete_hosted_zone(Id=Id, region=region, key=key, keyid=keyid, profile=profile)
 
 
-def get_resource_records(HostedZoneId=None, Name=None, StartRecordName=None,
-                         StartRecordType=None, PrivateZone=None,
-                         region=None, key=None, keyid=None, profile=None):
+def iter_resource_records(HostedZoneId=None, Name=None, StartRecordName=None,
+                          StartRecordType=None, PrivateZone=None,
+                          region=None, key=None, keyid=None, profile=None):
     '''
-    Get all resource records from a given zone matching the provided StartRecordName (if given) or all
-    records in the zone (if not), optionally filtered by a specific StartRecordType.  This will return
-    any and all RRs matching, regardless of their special AWS flavors (weighted, geolocation, alias,
-    etc.) so your code should be prepared for potentially large numbers of records back from this
-    function - for example, if you've created a complex geolocation mapping with lots of entries all
-    over the world providing the same server name to many different regional clients.
-
-    If you want EXACTLY ONE record to operate on, you'll need to implement any logic required to
-    pick the specific RR you care about from those returned.
-
-    Note that if you pass in Name without providing a value for PrivateZone (either True or
-    False), CommandExecutionError can be raised in the case of both public and private zones
-    matching the domain. XXX FIXME DOCU
-
-    CLI example::
-
-        salt myminion boto3_route53.get_records test.example.org example.org A
+    Lazily iterate over the resource records of a zone, fetching one page of
+    records at a time. Takes the same arguments as :py:func:`get_resource_records`,
+    and stops requesting pages as soon as the caller stops iterating or the
+    requested StartRecordName / StartRecordType have been passed.
     '''
     if not _exactly_one((HostedZoneId, Name)):
         raise SaltInvocationError('Exactly one of either HostedZoneId or Name must '
@@ -750,18 +783,16 @@ def get_resource_records(HostedZoneId=None, Name=None, StartRecordName=None,
         zone = find_hosted_zone(**args)
         if not zone:
             log.error("Couldn't resolve domain name %s to a hosted zone ID.", Name)
-            return []
+            return
         HostedZoneId = zone[0]['HostedZone']['Id']
 
     conn = _get_conn(region=region, key=key, keyid=keyid, profile=profile)
-    ret = []
     next_rr_name = StartRecordName
     next_rr_type = StartRecordType
     next_rr_id = None
     done = False
-    while True:
-        if done:
-            return ret
+    backoff = __utils__['boto_retry.backoff']('route53', tries=100)
+    while not done:
         args = {'HostedZoneId': HostedZoneId}
         args.update({'StartRecordName': next_rr_name}) if next_rr_name else None
         # Grrr, can't specify type unless name is set...  We'll do this via filtering later instead
@@ -769,6 +800,7 @@ def get_resource_records(HostedZoneId=None, Name=None, StartRecordName=None,
         args.update({'StartRecordIdentifier': next_rr_id}) if next_rr_id else None
         try:
             r = conn.list_resource_record_sets(**args)
+            backoff.success()
             rrs = r['ResourceRecordSets']
             next_rr_name = r.get('NextRecordName')
             next_rr_type = r.get('NextRecordType')
@@ -784,18 +816,52 @@ def get_resource_records(HostedZoneId=None, Name=None, StartRecordName=None,
                     else:
                         # We're filtering by type alone, and there might be more later, so...
                         continue
-                ret += [rr]
+                yield rr
             if not next_rr_name:
                 done = True
         except ClientError as e:
-            # Try forever on a simple thing like this...
-            if e.response.get('Error', {}).get('Code') == 'Throttling':
-                log.debug('Throttled by AWS API.')
-                time.sleep(3)
+            # Try (almost) forever on a simple thing like this...
+            if backoff.retry(e):
                 continue
             raise e
 
 
+def get_resource_records(HostedZoneId=None, Name=None, StartRecordName=None,
+                         StartRecordType=None, PrivateZone=None,
+                         region=None, key=None, keyid=None, profile=None):
+    '''
+    Get all resource records from a given zone matching the provided StartRecordName (if given) or all
+    records in the zone (if not), optionally filtered by a specific StartRecordType.  This will return
+    any and all RRs matching, regardless of their special AWS flavors (weighted, geolocation, alias,
+    etc.) so your code should be prepared for potentially large numbers of records back from this
+    function - for example, if you've created a complex geolocation mapping with lots of entries all
+    over the world providing the same server name to many different regional clients.
+
+    If you want EXACTLY ONE record to operate on, you'll need to implement any logic required to
+    pick the specific RR you care about from those returned.
+
+    Note that if you pass in Name without providing a value for PrivateZone (either True or
+    False), CommandExecutionError can be raised in the case of both public and private zones
+    matching the domain. XXX FIXME DOCU
+
+    CLI example::
+
+        salt myminion boto3_route53.get_records test.example.org example.org A
+
+    Once the records of the zone have been loaded by :py:func:`get_zone_records`, lookups by
+    HostedZoneId are answered from that model of the zone.
+    '''
+    if HostedZoneId and not Name:
+        zone = _zone_cache().peek(('zone',) + _zone_key(HostedZoneId, region, key, keyid, profile))
+        if zone is not None and zone.loaded:
+            return zone.lookup(StartRecordName, StartRecordType)
+    return list(iter_resource_records(HostedZoneId=HostedZoneId, Name=Name,
+                                      StartRecordName=StartRecordName,
+                                      StartRecordType=StartRecordType,
+                                      PrivateZone=PrivateZone, region=region,
+                                      key=key, keyid=keyid, profile=profile))
+
+
 def change_resource_record_sets(HostedZoneId=None, Name=None,
                                 PrivateZone=None, ChangeBatch=None,
                                 region=None, key=None, keyid=None, profile=None):
@@ -881,18 +947,169 @@ def change_resource_record_sets(HostedZoneId=None, Name=None,
 
     args = {'HostedZoneId': HostedZoneId, 'ChangeBatch': ChangeBatch}
     conn = _get_conn(region=region, key=key, keyid=keyid, profile=profile)
-    tries = 20  # A bit more headroom
-    while tries:
+    backoff = __utils__['boto_retry.backoff']('route53', tries=20)  # A bit more headroom
+    while True:
         try:
             r = conn.change_resource_record_sets(**args)
+            _apply_to_zone(HostedZoneId, ChangeBatch.get('Changes', []),
+                           region, key, keyid, profile)
             return _wait_for_sync(r['ChangeInfo']['Id'], conn, 30)  # And a little extra time here
         except ClientError as e:
-            if tries and e.response.get('Error', {}).get('Code') == 'Throttling':
-                log.debug('Throttled by AWS API.')
-                time.sleep(3)
-                tries -= 1
+            if backoff.retry(e):
                 continue
             log.error('Failed to apply requested changes to the hosted zone %s: %s',
                     (Name or HostedZoneId), six.text_type(e))
             raise e
     return False
+
+
+def _zone_key(HostedZoneId, region=None, key=None, keyid=None, profile=None):
+    return (_zone_id(HostedZoneId), _conn_key(region, key, keyid, profile))
+
+
+def _get_zone(HostedZoneId, region=None, key=None, keyid=None, profile=None):
+    '''
+    Return the model of the records of a zone, cached for the run.
+    '''
+    def _list_records(name, rtype):
+        return iter_resource_records(HostedZoneId=HostedZoneId, StartRecordName=name,
+                                     StartRecordType=rtype, region=region, key=key,
+                                     keyid=keyid, profile=profile)
+    return _zone_cache().get(('zone',) + _zone_key(HostedZoneId, region, key, keyid, profile),
+                             lambda: __utils__['route53.zone_records'](_list_records))
+
+
+def _apply_to_zone(HostedZoneId, changes, region=None, key=None, keyid=None, profile=None):
+    zone = _zone_cache().peek(('zone',) + _zone_key(HostedZoneId, region, key, keyid, profile))
+    if zone is not None:
+        for change in changes:
+            zone.apply(change)
+
+
+def get_zone_records(HostedZoneId, Name, Type, SetIdentifier=None,
+                     region=None, key=None, keyid=None, profile=None):
+    '''
+    Return the resource record sets of a zone with the given Name and Type,
+    like :py:func:`get_resource_records` with StartRecordName and
+    StartRecordType. The records of the zone are listed once into a model
+    indexed by name, type and set identifier, which is cached for the run
+    and kept up to date with the changes made through this module, so that
+    many record states cost a single paged listing. Changes queued with
+    :py:func:`queue_change` are applied on top of them.
+
+    CLI example::
+
+        salt myminion boto3_route53.get_zone_records Z1234567890 test.example.org. A
+    '''
+    zone_key = _zone_key(HostedZoneId, region, key, keyid, profile)
+    records = _get_zone(HostedZoneId, region, key, keyid, profile).lookup(Name, Type)
+    for (_name, _type, _id), change in six.iteritems(_change_queue().changes(zone_key)):
+        if (_name, _type) != (Name, Type):
+            continue
+        records = [rrset for rrset in records if rrset.get('SetIdentifier') != _id]
+        if change['Action'] != 'DELETE':
+            records.append(dict(change['ResourceRecordSet']))
+    if SetIdentifier:
+        records = [rrset for rrset in records if rrset.get('SetIdentifier') == SetIdentifier]
+    return records
+
+
+def refresh_zone_records(HostedZoneId, Name=None, Type=None,
+                         region=None, key=None, keyid=None, profile=None):
+    '''
+    Refresh the cached model of a zone loaded by :py:func:`get_zone_records`,
+    after records were changed outside of this module. Only the record sets
+    with the given Name, and Type if given, are listed again. Without a Name
+    the model is dropped, to be listed again on the next lookup.
+
+    CLI example::
+
+        salt myminion boto3_route53.refresh_zone_records Z1234567890 test.example.org.
+    '''
+    if not Name:
+        _zone_cache().invalidate('zone', _zone_id(HostedZoneId))
+        return True
+    zone = _zone_cache().peek(('zone',) + _zone_key(HostedZoneId, region, key, keyid, profile))
+    if zone is not None:
+        zone.refresh(Name, Type)
+    return True
+
+
+def queue_change(HostedZoneId, Change, region=None, key=None, keyid=None, profile=None):
+    '''
+    Queue a record change, to be submitted by :py:func:`flush_changes`
+    together with the other changes to the same zone. A later change to the
+    same record set replaces the queued one.
+
+    CLI example::
+
+        salt myminion boto3_route53.queue_change Z1234567890 \\
+                Change="{'Action': 'UPSERT', 'ResourceRecordSet': $foo}"
+    '''
+    conn_args = {'region': region, 'key': key, 'keyid': keyid, 'profile': profile}
+    _change_queue().add(_zone_key(HostedZoneId, region, key, keyid, profile), Change, conn_args)
+    return True
+
+
+def _change_name(change):
+    return '{0} {1}'.format(*__utils__['route53.change_key'](change)[:2])
+
+
+def _submit_changes(conn, HostedZoneId, changes):
+    '''
+    Submit a batch of changes, returning the ids of the submitted changes and
+    the failed changes with their errors. A rejected batch is split in two and retried, to find
+    the changes Route53 refuses and apply all of the others.
+    '''
+    backoff = __utils__['boto_retry.backoff']('route53', tries=20)
+    while True:
+        try:
+            r = conn.change_resource_record_sets(HostedZoneId=HostedZoneId,
+                                                 ChangeBatch={'Changes': changes})
+            backoff.success()
+            return [r['ChangeInfo']['Id']], []
+        except ClientError as e:
+            if backoff.retry(e):
+                continue
+            if len(changes) == 1:
+                log.error('Failed to apply %s to the hosted zone %s: %s',
+                          _change_name(changes[0]), HostedZoneId, e)
+                return [], [(changes[0], e)]
+            log.warning('Batch of %s changes to the hosted zone %s failed, splitting it: %s',
+                        len(changes), HostedZoneId, e)
+            half = len(changes) // 2
+            ids, failed = _submit_changes(conn, HostedZoneId, changes[:half])
+            _ids, _failed = _submit_changes(conn, HostedZoneId, changes[half:])
+            return ids + _ids, failed + _failed
+
+
+def flush_changes(wait=True, timeout=600):
+    '''
+    Submit every change queued with :py:func:`queue_change`, as few
+    ChangeBatch requests per hosted zone as the Route53 limits allow, and
+    wait for them to be in sync unless ``wait`` is False. Returns the record
+    sets which were changed, those which failed and the ids of the changes
+    still pending after ``timeout`` seconds.
+
+    CLI example::
+
+        salt myminion boto3_route53.flush_changes
+    '''
+    ret = {'applied': [], 'failed': [], 'pending': []}
+    change_ids = []
+    for zone_key, conn_args, changes in _change_queue().pop_all():
+        HostedZoneId = zone_key[0]
+        conn = _get_conn(**conn_args)
+        for batch in __utils__['route53.change_batches'](changes):
+            ids, failed = _submit_changes(conn, HostedZoneId, batch)
+            for change_id in ids:
+                _change_waiter().add(change_id, _get_status(conn))
+            change_ids.extend(ids)
+            failed_changes = [change for change, _ in failed]
+            ret['failed'].extend('{0}: {1}'.format(_change_name(change), e) for change, e in failed)
+            applied = [change for change in batch if change not in failed_changes]
+            ret['applied'].extend(_change_name(change) for change in applied)
+            _apply_to_zone(HostedZoneId, applied, **conn_args)
+    if wait and change_ids:
+        ret['pending'] = _change_waiter().wait(change_ids, timeout=timeout)
+    return ret
@@ -82,6 +82,7 @@ Connection module for Amazon APIGateway
 from __future__ import absolute_import, print_function, unicode_literals
 import logging
 import datetime
+import threading
 
 # Import Salt libs
 from salt.ext import six
@@ -168,6 +169,44 @@ def _multi_call(function, contentkey, *args, **kwargs):
     return ret.get(contentkey)
 
 
+# Seconds the resource tree of a rest api is cached for. Set the
+# boto_apigateway.resource_cache_ttl option to 0 to disable the cache.
+RESOURCE_CACHE_TTL = 300
+
+# Guards the cached resource trees, which are shared by the threads of a run.
+_TREE_LOCK = threading.Lock()
+
+
+def _resource_cache():
+    return __utils__['boto_cache.get_cache'](
+        __context__, 'boto_apigateway',
+        ttl=__opts__.get('boto_apigateway.resource_cache_ttl', RESOURCE_CACHE_TTL))
+
+
+def _resource_tree(restApiId, region=None, key=None, keyid=None, profile=None):
+    '''
+    Return the resources of a rest api by path. They are fetched with a
+    single paged call and cached for the run, and the functions creating or
+    deleting resources update the cached tree in place, holding ``_TREE_LOCK``.
+    '''
+    def _fetch():
+        conn = _get_conn(region=region, key=key, keyid=keyid, profile=profile)
+        return dict((resource['path'], _copy_resource(resource))
+                    for resource in _multi_call(conn.get_resources, 'items', restApiId=restApiId))
+    cxkey = __utils__['boto.profile_key']('apigateway', region, key, keyid, profile)
+    return _resource_cache().get(('resources', restApiId, cxkey), _fetch)
+
+
+def _copy_resource(resource):
+    '''
+    Copy a cached resource, so that callers don't share its resourceMethods.
+    '''
+    resource = dict(resource)
+    if resource.get('resourceMethods'):
+        resource['resourceMethods'] = dict(resource['resourceMethods'])
+    return resource
+
+
 def _find_apis_by_name(name, description=None,
                        region=None, key=None, keyid=None, profile=None):
     '''
@@ -278,6 +317,7 @@ def delete_api(name, description=None, region=None, key=None, keyid=None, profil
             conn = _get_conn(**conn_params)
             for api in apis:
                 conn.delete_rest_api(restApiId=api['id'])
+                _resource_cache().invalidate('resources', api['id'])
             return {'deleted': True, 'count': len(apis)}
         else:
             return {'deleted': False}
@@ -289,6 +329,9 @@ def describe_api_resources(restApiId, region=None, key=None, keyid=None, profile
     '''
     Given rest api id, return all resources for this api.
 
+    The resources of an api are fetched once and cached for the run, see the
+    ``boto_apigateway.resource_cache_ttl`` option.
+
     CLI Example:
 
     .. code-block:: bash
@@ -297,9 +340,10 @@ def describe_api_resources(restApiId, region=None, key=None, keyid=None, profile
 
     '''
     try:
-        conn = _get_conn(region=region, key=key, keyid=keyid, profile=profile)
-        resources = sorted(_multi_call(conn.get_resources, 'items', restApiId=restApiId),
-                           key=lambda k: k['path'])
+        tree = _resource_tree(restApiId, region=region, key=key, keyid=keyid, profile=profile)
+        with _TREE_LOCK:
+            resources = sorted((_copy_resource(resource) for resource in tree.values()),
+                               key=lambda k: k['path'])
 
         return {'resources': resources}
     except ClientError as e:
@@ -319,14 +363,13 @@ def describe_api_resource(restApiId, path,
         salt myminion boto_apigateway.describe_api_resource myapi_id resource_path
 
     '''
-    r = describe_api_resources(restApiId, region=region, key=key, keyid=keyid, profile=profile)
-    resources = r.get('resources')
-    if resources is None:
-        return r
-    for resource in resources:
-        if resource['path'] == path:
-            return {'resource': resource}
-    return {'resource': None}
+    try:
+        tree = _resource_tree(restApiId, region=region, key=key, keyid=keyid, profile=profile)
+    except ClientError as e:
+        return {'error': __utils__['boto3.get_error'](e)}
+    with _TREE_LOCK:
+        resource = tree.get(path)
+        return {'resource': _copy_resource(resource) if resource else None}
 
 
 def create_api_resources(restApiId, path,
@@ -347,17 +390,22 @@ def create_api_resources(restApiId, path,
     current_path = ''
     try:
         conn = _get_conn(region=region, key=key, keyid=keyid, profile=profile)
+        tree = _resource_tree(restApiId, region=region, key=key, keyid=keyid, profile=profile)
         for path_part in path_parts:
             if current_path == '/':
                 current_path = '{0}{1}'.format(current_path, path_part)
             else:
                 current_path = '{0}/{1}'.format(current_path, path_part)
-            r = describe_api_resource(restApiId, current_path,
-                                      region=region, key=key, keyid=keyid, profile=profile)
-            resource = r.get('resource')
+            with _TREE_LOCK:
+                resource = tree.get(current_path)
             if not resource:
-                resource = conn.create_resource(restApiId=restApiId, parentId=created[-1]['id'], pathPart=path_part)
-            created.append(resource)
+                resource = dict(conn.create_resource(restApiId=restApiId, parentId=created[-1]['id'],
+                                                     pathPart=path_part))
+                resource.pop('ResponseMetadata', None)
+                with _TREE_LOCK:
+                    tree[resource.get('path', current_path)] = resource
+            with _TREE_LOCK:
+                created.append(_copy_resource(resource))
 
         if created:
             return {'created': True, 'restApiId': restApiId, 'resources': created}
@@ -385,10 +433,15 @@ def delete_api_resources(restApiId, path,
         return {'deleted': False, 'error': 'use delete_api to remove the root resource'}
     try:
         conn = _get_conn(region=region, key=key, keyid=keyid, profile=profile)
-        r = describe_api_resource(restApiId, path, region=region, key=key, keyid=keyid, profile=profile)
-        resource = r.get('resource')
+        tree = _resource_tree(restApiId, region=region, key=key, keyid=keyid, profile=profile)
+        with _TREE_LOCK:
+            resource = tree.get(path)
         if resource:
             conn.delete_resource(restApiId=restApiId, resourceId=resource['id'])
+            # Deleting a resource deletes everything below it
+            with _TREE_LOCK:
+                for _path in [_path for _path in tree if _path == path or _path.startswith(path + '/')]:
+                    tree.pop(_path, None)
             return {'deleted': True}
         else:
             return {'deleted': False, 'error': 'no resource found by {0}'.format(path)}
@@ -917,6 +970,24 @@ def flush_api_stage_cache(restApiId, stageName, region=None, key=None, keyid=Non
         return {'flushed': False, 'error': __utils__['boto3.get_error'](e)}
 
 
+def _set_resource_method(restApiId, resourcePath, httpMethod, present,
+                         region=None, key=None, keyid=None, profile=None):
+    '''
+    Keep the resourceMethods of a cached resource up to date.
+    '''
+    tree = _resource_tree(restApiId, region=region, key=key, keyid=keyid, profile=profile)
+    with _TREE_LOCK:
+        resource = tree.get(resourcePath)
+        if resource is None:
+            return
+        if present:
+            if resource.get('resourceMethods') is None:
+                resource['resourceMethods'] = {}
+            resource['resourceMethods'].setdefault(httpMethod, {})
+        elif resource.get('resourceMethods'):
+            resource['resourceMethods'].pop(httpMethod, None)
+
+
 def create_api_method(restApiId, resourcePath, httpMethod, authorizationType,
                       apiKeyRequired=False, requestParameters=None, requestModels=None,
                       region=None, key=None, keyid=None, profile=None):
@@ -942,6 +1013,7 @@ def create_api_method(restApiId, resourcePath, httpMethod, authorizationType,
             method = conn.put_method(restApiId=restApiId, resourceId=resource['id'], httpMethod=httpMethod,
                                      authorizationType=str(authorizationType), apiKeyRequired=apiKeyRequired,  # future lint: disable=blacklisted-function
                                      requestParameters=requestParameters, requestModels=requestModels)
+            _set_resource_method(restApiId, resourcePath, httpMethod, True, region, key, keyid, profile)
             return {'created': True, 'method': method}
         return {'created': False, 'error': 'Failed to create method'}
 
@@ -989,6 +1061,7 @@ def delete_api_method(restApiId, resourcePath, httpMethod, region=None, key=None
         if resource:
             conn = _get_conn(region=region, key=key, keyid=keyid, profile=profile)
             conn.delete_method(restApiId=restApiId, resourceId=resource['id'], httpMethod=httpMethod)
+            _set_resource_method(restApiId, resourcePath, httpMethod, False, region, key, keyid, profile)
             return {'deleted': True}
         return {'deleted': False, 'error': 'get API method failed: no such resource'}
     except ClientError as e:
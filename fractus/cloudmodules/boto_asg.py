@@ -47,10 +47,11 @@ Connection module for Amazon Autoscale Groups
 
 # Import Python libs
 from __future__ import absolute_import, print_function, unicode_literals
+import copy
 import datetime
 import logging
 import sys
-import time
+import threading
 import email.mime.multipart
 
 log = logging.getLogger(__name__)
@@ -100,6 +101,187 @@ def __init__(opts):
             get_conn_funcname='_get_conn_autoscaling_boto3')
 
 
+# Seconds the autoscale groups of a region, with their scaling policies and
+# scheduled actions, are cached for once described in bulk. Set the
+# boto_asg.describe_cache_ttl option to 0 to disable the cache.
+DESCRIBE_CACHE_TTL = 60
+
+# Marks an autoscale group changed since the bulk describe, so that its next
+# lookup describes it again.
+_STALE = object()
+
+# Guards the cached group configurations, which are shared by the threads of
+# a run.
+_CACHE_LOCK = threading.Lock()
+
+
+def _describe_cache():
+    return __utils__['boto_cache.get_cache'](
+        __context__, 'boto_asg',
+        ttl=__opts__.get('boto_asg.describe_cache_ttl', DESCRIBE_CACHE_TTL))
+
+
+def _cxkey(region=None, key=None, keyid=None, profile=None):
+    return __utils__['boto.profile_key']('asg', region, key, keyid, profile)
+
+
+def _paged(describe, **kwargs):
+    next_token = None
+    while True:
+        page = describe(next_token=next_token, **kwargs)
+        for item in page:
+            yield item
+        next_token = getattr(page, 'next_token', None)
+        if not next_token:
+            return
+
+
+def _group_config(asg):
+    ret = odict.OrderedDict()
+    attrs = ['name', 'availability_zones', 'default_cooldown',
+            'desired_capacity', 'health_check_period',
+            'health_check_type', 'launch_config_name', 'load_balancers',
+            'max_size', 'min_size', 'placement_group',
+            'vpc_zone_identifier', 'tags', 'termination_policies',
+            'suspended_processes']
+    for attr in attrs:
+        # Tags are objects, so we need to turn them into dicts.
+        if attr == 'tags':
+            _tags = []
+            for tag in asg.tags:
+                _tag = odict.OrderedDict()
+                _tag['key'] = tag.key
+                _tag['value'] = tag.value
+                _tag['propagate_at_launch'] = tag.propagate_at_launch
+                _tags.append(_tag)
+            ret['tags'] = _tags
+        # Boto accepts a string or list as input for vpc_zone_identifier,
+        # but always returns a comma separated list. We require lists in
+        # states.
+        elif attr == 'vpc_zone_identifier':
+            ret[attr] = getattr(asg, attr).split(',')
+        # convert SuspendedProcess objects to names
+        elif attr == 'suspended_processes':
+            suspended_processes = getattr(asg, attr)
+            ret[attr] = sorted([x.process_name for x in suspended_processes])
+        else:
+            ret[attr] = getattr(asg, attr)
+    ret['scaling_policies'] = []
+    ret['scheduled_actions'] = {}
+    return ret
+
+
+def _add_policy(config, policy):
+    config['scaling_policies'].append(
+        dict([
+            ("name", policy.name),
+            ("adjustment_type", policy.adjustment_type),
+            ("scaling_adjustment", policy.scaling_adjustment),
+            ("min_adjustment_step", policy.min_adjustment_step),
+            ("cooldown", policy.cooldown)
+        ])
+    )
+
+
+def _add_scheduled_action(config, action):
+    end_time = None
+    if action.end_time:
+        end_time = action.end_time.isoformat()
+    config['scheduled_actions'][action.name] = dict([
+      ("min_size", action.min_size),
+      ("max_size", action.max_size),
+      # AWS bug
+      ("desired_capacity", int(action.desired_capacity)),
+      ("start_time", action.start_time.isoformat()),
+      ("end_time", end_time),
+      ("recurrence", action.recurrence)
+    ])
+
+
+def _describe_group(conn, name):
+    asg = conn.get_all_groups(names=[name])
+    if not asg:
+        return None
+    config = _group_config(asg[0])
+    for policy in conn.get_all_policies(as_group=name):
+        _add_policy(config, policy)
+    for action in conn.get_all_scheduled_actions(as_group=name):
+        _add_scheduled_action(config, action)
+    return config
+
+
+def _describe_all(conn):
+    # Three paged listings describe every group of the region, instead of
+    # three calls per group.
+    configs = dict((asg.name, _group_config(asg)) for asg in _paged(conn.get_all_groups))
+    for policy in _paged(conn.get_all_policies):
+        if policy.as_name in configs:
+            _add_policy(configs[policy.as_name], policy)
+    for action in _paged(conn.get_all_scheduled_actions):
+        if action.as_group in configs:
+            _add_scheduled_action(configs[action.as_group], action)
+    return configs
+
+
+def _refresh(conn, configs, name):
+    config = _describe_group(conn, name)
+    with _CACHE_LOCK:
+        if config is None:
+            configs.pop(name, None)
+        else:
+            configs[name] = config
+    return config
+
+
+def _group_configs(conn, names=None, region=None, key=None, keyid=None, profile=None):
+    '''
+    Return the normalized configurations of the autoscale groups of a
+    region by name, of those of ``names`` only when given. The
+    configurations are shared with the cache and must not be changed.
+
+    Every group of the region is described with paged bulk calls, which
+    serve the lookups of the whole run. Groups changed by this module since
+    are described again on their own, for those of ``names`` only when
+    given. Raises BotoServerError like the boto describe calls.
+    '''
+    cache = _describe_cache()
+    if not cache.ttl:
+        return _describe_all(conn)
+    configs = cache.get(('group', _cxkey(region, key, keyid, profile)),
+                        lambda: _describe_all(conn))
+    with _CACHE_LOCK:
+        if names is None:
+            names = list(configs)
+        stale = [name for name in names if configs.get(name) is _STALE]
+    for name in stale:
+        _refresh(conn, configs, name)
+    # Other threads change the cache, so a copy is returned
+    with _CACHE_LOCK:
+        return dict((name, configs[name]) for name in names
+                    if configs.get(name, _STALE) is not _STALE)
+
+
+def _get_group_config(conn, name, region=None, key=None, keyid=None, profile=None):
+    '''
+    Return the normalized configuration of an autoscale group, or None if it
+    does not exist, see _group_configs.
+    '''
+    if not _describe_cache().ttl:
+        return _describe_group(conn, name)
+    return _group_configs(conn, [name], region, key, keyid, profile).get(name)
+
+
+def _invalidate(name, region=None, key=None, keyid=None, profile=None):
+    '''
+    Mark an autoscale group as changed, so that its next lookup describes it
+    again.
+    '''
+    configs = _describe_cache().peek(('group', _cxkey(region, key, keyid, profile)))
+    if configs is not None:
+        with _CACHE_LOCK:
+            configs[name] = _STALE
+
+
 def exists(name, region=None, key=None, keyid=None, profile=None):
     '''
     Check to see if an autoscale group exists.
@@ -109,21 +291,17 @@ def exists(name, region=None, key=None, keyid=None, profile=None):
         salt myminion boto_asg.exists myasg region=us-east-1
     '''
     conn = _get_conn(region=region, key=key, keyid=keyid, profile=profile)
-    retries = 30
+    backoff = __utils__['boto_retry.backoff']('autoscaling', tries=30)
     while True:
         try:
-            _conn = conn.get_all_groups(names=[name])
-            if _conn:
+            if _get_group_config(conn, name, region, key, keyid, profile) is not None:
                 return True
             else:
                 msg = 'The autoscale group does not exist in region {0}'.format(region)
                 log.debug(msg)
                 return False
         except boto.exception.BotoServerError as e:
-            if retries and e.code == 'Throttling':
-                log.debug('Throttled by AWS API, retrying in 5 seconds...')
-                time.sleep(5)
-                retries -= 1
+            if backoff.retry(e):
                 continue
             log.error(e)
             return False
@@ -138,78 +316,41 @@ def get_config(name, region=None, key=None, keyid=None, profile=None):
         salt myminion boto_asg.get_config myasg region=us-east-1
     '''
     conn = _get_conn(region=region, key=key, keyid=keyid, profile=profile)
-    retries = 30
+    backoff = __utils__['boto_retry.backoff']('autoscaling', tries=30)
     while True:
         try:
-            asg = conn.get_all_groups(names=[name])
-            if asg:
-                asg = asg[0]
-            else:
-                return {}
-            ret = odict.OrderedDict()
-            attrs = ['name', 'availability_zones', 'default_cooldown',
-                    'desired_capacity', 'health_check_period',
-                    'health_check_type', 'launch_config_name', 'load_balancers',
-                    'max_size', 'min_size', 'placement_group',
-                    'vpc_zone_identifier', 'tags', 'termination_policies',
-                    'suspended_processes']
-            for attr in attrs:
-                # Tags are objects, so we need to turn them into dicts.
-                if attr == 'tags':
-                    _tags = []
-                    for tag in asg.tags:
-                        _tag = odict.OrderedDict()
-                        _tag['key'] = tag.key
-                        _tag['value'] = tag.value
-                        _tag['propagate_at_launch'] = tag.propagate_at_launch
-                        _tags.append(_tag)
-                    ret['tags'] = _tags
-                # Boto accepts a string or list as input for vpc_zone_identifier,
-                # but always returns a comma separated list. We require lists in
-                # states.
-                elif attr == 'vpc_zone_identifier':
-                    ret[attr] = getattr(asg, attr).split(',')
-                # convert SuspendedProcess objects to names
-                elif attr == 'suspended_processes':
-                    suspended_processes = getattr(asg, attr)
-                    ret[attr] = sorted([x.process_name for x in suspended_processes])
-                else:
-                    ret[attr] = getattr(asg, attr)
-            # scaling policies
-            policies = conn.get_all_policies(as_group=name)
-            ret["scaling_policies"] = []
-            for policy in policies:
-                ret["scaling_policies"].append(
-                    dict([
-                        ("name", policy.name),
-                        ("adjustment_type", policy.adjustment_type),
-                        ("scaling_adjustment", policy.scaling_adjustment),
-                        ("min_adjustment_step", policy.min_adjustment_step),
-                        ("cooldown", policy.cooldown)
-                    ])
-                )
-            # scheduled actions
-            actions = conn.get_all_scheduled_actions(as_group=name)
-            ret['scheduled_actions'] = {}
-            for action in actions:
-                end_time = None
-                if action.end_time:
-                    end_time = action.end_time.isoformat()
-                ret['scheduled_actions'][action.name] = dict([
-                  ("min_size", action.min_size),
-                  ("max_size", action.max_size),
-                  # AWS bug
-                  ("desired_capacity", int(action.desired_capacity)),
-                  ("start_time", action.start_time.isoformat()),
-                  ("end_time", end_time),
-                  ("recurrence", action.recurrence)
-                ])
-            return ret
+            config = _get_group_config(conn, name, region, key, keyid, profile)
+            return copy.deepcopy(config) if config is not None else {}
         except boto.exception.BotoServerError as e:
-            if retries and e.code == 'Throttling':
-                log.debug('Throttled by AWS API, retrying in 5 seconds...')
-                time.sleep(5)
-                retries -= 1
+            if backoff.retry(e):
+                continue
+            log.error(e)
+            return {}
+
+
+def get_configs(names=None, region=None, key=None, keyid=None, profile=None):
+    '''
+    Get the configuration of many autoscale groups, all of the region by
+    default, as a dict of group names to what get_config returns. Groups
+    which do not exist are left out.
+
+    CLI example::
+
+        salt myminion boto_asg.get_configs '["myasg", "myasg2"]' region=us-east-1
+    '''
+    if isinstance(names, six.string_types):
+        names = salt.utils.json.loads(names)
+    if names is not None:
+        names = set(names)
+    conn = _get_conn(region=region, key=key, keyid=keyid, profile=profile)
+    backoff = __utils__['boto_retry.backoff']('autoscaling', tries=30)
+    while True:
+        try:
+            configs = _group_configs(conn, names, region, key, keyid, profile)
+            return dict((name, copy.deepcopy(config)) for name, config in six.iteritems(configs)
+                        if names is None or name in names)
+        except boto.exception.BotoServerError as e:
+            if backoff.retry(e):
                 continue
             log.error(e)
             return {}
@@ -244,7 +385,7 @@ def create(name, launch_config_name, availability_zones, min_size, max_size,
     if tags:
         for tag in tags:
             try:
-                key = tag.get('key')
+                tag_key = tag.get('key')
             except KeyError:
                 log.error('Tag missing key.')
                 return False
@@ -254,7 +395,7 @@ def create(name, launch_config_name, availability_zones, min_size, max_size,
                 log.error('Tag missing value.')
                 return False
             propagate_at_launch = tag.get('propagate_at_launch', False)
-            _tag = autoscale.Tag(key=key, value=value, resource_id=name,
+            _tag = autoscale.Tag(key=tag_key, value=value, resource_id=name,
                                  propagate_at_launch=propagate_at_launch)
             _tags.append(_tag)
     if isinstance(termination_policies, six.string_types):
@@ -263,7 +404,7 @@ def create(name, launch_config_name, availability_zones, min_size, max_size,
         suspended_processes = salt.utils.json.loads(suspended_processes)
     if isinstance(scheduled_actions, six.string_types):
         scheduled_actions = salt.utils.json.loads(scheduled_actions)
-    retries = 30
+    backoff = __utils__['boto_retry.backoff']('autoscaling', tries=30)
     while True:
         try:
             _asg = autoscale.AutoScalingGroup(
@@ -286,14 +427,14 @@ def create(name, launch_config_name, availability_zones, min_size, max_size,
             # create notifications
             if notification_arn and notification_types:
                 conn.put_notification_configuration(_asg, notification_arn, notification_types)
+            _invalidate(name, region, key, keyid, profile)
             log.info('Created ASG %s', name)
             return True
         except boto.exception.BotoServerError as e:
-            if retries and e.code == 'Throttling':
-                log.debug('Throttled by AWS API, retrying in 5 seconds...')
-                time.sleep(5)
-                retries -= 1
+            if backoff.retry(e):
                 continue
+            # The group may have been created before the error
+            _invalidate(name, region, key, keyid, profile)
             log.error(e)
             msg = 'Failed to create ASG %s', name
             log.error(msg)
@@ -351,7 +492,7 @@ def update(name, launch_config_name, availability_zones, min_size, max_size,
         tags = __utils__['boto3.ordered'](tags)
         for tag in tags:
             try:
-                key = tag.get('key')
+                tag_key = tag.get('key')
             except KeyError:
                 log.error('Tag missing key.')
                 return False, "Tag {0} missing key".format(tag)
@@ -361,7 +502,7 @@ def update(name, launch_config_name, availability_zones, min_size, max_size,
                 log.error('Tag missing value.')
                 return False, "Tag {0} missing value".format(tag)
             propagate_at_launch = tag.get('propagate_at_launch', False)
-            _tag = {'key': key,
+            _tag = {'key': tag_key,
                     'value': value,
                     'resource_id': name,
                     'propagate_at_launch': propagate_at_launch}
@@ -370,7 +511,7 @@ def update(name, launch_config_name, availability_zones, min_size, max_size,
             desired_tags.append(_tag)
     delete_tags = [t for t in current_tags if t not in desired_tags]
 
-    retries = 30
+    backoff = __utils__['boto_retry.backoff']('autoscaling', tries=30)
     while True:
         try:
             _asg = autoscale.AutoScalingGroup(
@@ -416,13 +557,13 @@ def update(name, launch_config_name, availability_zones, min_size, max_size,
                     scheduled_action.name, autoscale_group=name
                 )
             _create_scheduled_actions(conn, name, scheduled_actions)
+            _invalidate(name, region, key, keyid, profile)
             return True, ''
         except boto.exception.BotoServerError as e:
-            if retries and e.code == 'Throttling':
-                log.debug('Throttled by AWS API, retrying in 5 seconds...')
-                time.sleep(5)
-                retries -= 1
+            if backoff.retry(e):
                 continue
+            # The group may have been changed in part before the error
+            _invalidate(name, region, key, keyid, profile)
             log.error(e)
             msg = 'Failed to update ASG {0}'.format(name)
             log.error(msg)
@@ -476,18 +617,16 @@ def delete(name, force=False, region=None, key=None, keyid=None, profile=None):
         salt myminion boto_asg.delete myasg region=us-east-1
     '''
     conn = _get_conn(region=region, key=key, keyid=keyid, profile=profile)
-    retries = 30
+    backoff = __utils__['boto_retry.backoff']('autoscaling', tries=30)
     while True:
         try:
             conn.delete_auto_scaling_group(name, force)
+            _invalidate(name, region, key, keyid, profile)
             msg = 'Deleted autoscale group {0}.'.format(name)
             log.info(msg)
             return True
         except boto.exception.BotoServerError as e:
-            if retries and e.code == 'Throttling':
-                log.debug('Throttled by AWS API, retrying in 5 seconds...')
-                time.sleep(5)
-                retries -= 1
+            if backoff.retry(e):
                 continue
             log.error(e)
             msg = 'Failed to delete autoscale group {0}'.format(name)
@@ -536,7 +675,7 @@ def launch_configuration_exists(name, region=None, key=None, keyid=None,
         salt myminion boto_asg.launch_configuration_exists mylc
     '''
     conn = _get_conn(region=region, key=key, keyid=keyid, profile=profile)
-    retries = 30
+    backoff = __utils__['boto_retry.backoff']('autoscaling', tries=30)
     while True:
         try:
             lc = conn.get_all_launch_configurations(names=[name])
@@ -547,10 +686,7 @@ def launch_configuration_exists(name, region=None, key=None, keyid=None,
                 log.debug(msg)
                 return False
         except boto.exception.BotoServerError as e:
-            if retries and e.code == 'Throttling':
-                log.debug('Throttled by AWS API, retrying in 5 seconds...')
-                time.sleep(5)
-                retries -= 1
+            if backoff.retry(e):
                 continue
             log.error(e)
             return False
@@ -566,15 +702,12 @@ def get_all_launch_configurations(region=None, key=None, keyid=None,
         salt myminion boto_asg.get_all_launch_configurations
     '''
     conn = _get_conn(region=region, key=key, keyid=keyid, profile=profile)
-    retries = 30
+    backoff = __utils__['boto_retry.backoff']('autoscaling', tries=30)
     while True:
         try:
             return conn.get_all_launch_configurations()
         except boto.exception.BotoServerError as e:
-            if retries and e.code == 'Throttling':
-                log.debug('Throttled by AWS API, retrying in 5 seconds...')
-                time.sleep(5)
-                retries -= 1
+            if backoff.retry(e):
                 continue
             log.error(e)
             return []
@@ -603,7 +736,7 @@ def describe_launch_configuration(name, region=None, key=None, keyid=None,
         salt myminion boto_asg.describe_launch_configuration mylc
     '''
     conn = _get_conn(region=region, key=key, keyid=keyid, profile=profile)
-    retries = 30
+    backoff = __utils__['boto_retry.backoff']('autoscaling', tries=30)
     while True:
         try:
             lc = conn.get_all_launch_configurations(names=[name])
@@ -614,10 +747,7 @@ def describe_launch_configuration(name, region=None, key=None, keyid=None,
                 log.debug(msg)
                 return None
         except boto.exception.BotoServerError as e:
-            if retries and e.code == 'Throttling':
-                log.debug('Throttled by AWS API, retrying in 5 seconds...')
-                time.sleep(5)
-                retries -= 1
+            if backoff.retry(e):
                 continue
             log.error(e)
             return None
@@ -681,17 +811,14 @@ def create_launch_configuration(name, image_id, key_name=None,
         associate_public_ip_address=associate_public_ip_address,
         volume_type=volume_type, delete_on_termination=delete_on_termination,
         iops=iops, use_block_device_types=use_block_device_types)
-    retries = 30
+    backoff = __utils__['boto_retry.backoff']('autoscaling', tries=30)
     while True:
         try:
             conn.create_launch_configuration(lc)
             log.info('Created LC %s', name)
             return True
         except boto.exception.BotoServerError as e:
-            if retries and e.code == 'Throttling':
-                log.debug('Throttled by AWS API, retrying in 5 seconds...')
-                time.sleep(5)
-                retries -= 1
+            if backoff.retry(e):
                 continue
             log.error(e)
             msg = 'Failed to create LC {0}'.format(name)
@@ -709,17 +836,14 @@ def delete_launch_configuration(name, region=None, key=None, keyid=None,
         salt myminion boto_asg.delete_launch_configuration mylc
     '''
     conn = _get_conn(region=region, key=key, keyid=keyid, profile=profile)
-    retries = 30
+    backoff = __utils__['boto_retry.backoff']('autoscaling', tries=30)
     while True:
         try:
             conn.delete_launch_configuration(name)
             log.info('Deleted LC %s', name)
             return True
         except boto.exception.BotoServerError as e:
-            if retries and e.code == 'Throttling':
-                log.debug('Throttled by AWS API, retrying in 5 seconds...')
-                time.sleep(5)
-                retries -= 1
+            if backoff.retry(e):
                 continue
             log.error(e)
             msg = 'Failed to delete LC {0}'.format(name)
@@ -739,9 +863,8 @@ def get_scaling_policy_arn(as_group, scaling_policy_name, region=None,
         salt '*' boto_asg.get_scaling_policy_arn mygroup mypolicy
     '''
     conn = _get_conn(region=region, key=key, keyid=keyid, profile=profile)
-    retries = 30
-    while retries > 0:
-        retries -= 1
+    backoff = __utils__['boto_retry.backoff']('autoscaling', tries=30)
+    while True:
         try:
             policies = conn.get_all_policies(as_group=as_group)
             for policy in policies:
@@ -750,13 +873,12 @@ def get_scaling_policy_arn(as_group, scaling_policy_name, region=None,
             log.error('Could not convert: %s', as_group)
             return None
         except boto.exception.BotoServerError as e:
+            if backoff.retry(e):
+                continue
             if e.error_code != 'Throttling':
                 raise
-            log.debug('Throttled by API, will retry in 5 seconds')
-            time.sleep(5)
-
-    log.error('Maximum number of retries exceeded')
-    return None
+            log.error('Maximum number of retries exceeded')
+            return None
 
 
 def get_all_groups(region=None, key=None, keyid=None, profile=None):
@@ -774,7 +896,7 @@ def get_all_groups(region=None, key=None, keyid=None, profile=None):
 
     '''
     conn = _get_conn(region=region, key=key, keyid=keyid, profile=profile)
-    retries = 30
+    backoff = __utils__['boto_retry.backoff']('autoscaling', tries=30)
     while True:
         try:
             next_token = ''
@@ -785,10 +907,7 @@ def get_all_groups(region=None, key=None, keyid=None, profile=None):
                 next_token = ret.next_token
             return asgs
         except boto.exception.BotoServerError as e:
-            if retries and e.code == 'Throttling':
-                log.debug('Throttled by AWS API, retrying in 5 seconds...')
-                time.sleep(5)
-                retries -= 1
+            if backoff.retry(e):
                 continue
             log.error(e)
             return []
@@ -824,16 +943,13 @@ def get_instances(name, lifecycle_state="InService", health_status="Healthy",
     '''
     conn = _get_conn(region=region, key=key, keyid=keyid, profile=profile)
     ec2_conn = _get_ec2_conn(region=region, key=key, keyid=keyid, profile=profile)
-    retries = 30
+    backoff = __utils__['boto_retry.backoff']('autoscaling', tries=30)
     while True:
         try:
             asgs = conn.get_all_groups(names=[name])
             break
         except boto.exception.BotoServerError as e:
-            if retries and e.code == 'Throttling':
-                log.debug('Throttled by AWS API, retrying in 5 seconds...')
-                time.sleep(5)
-                retries -= 1
+            if backoff.retry(e):
                 continue
             log.error(e)
             return False
@@ -866,6 +982,91 @@ def _convert_attribute(instance, attribute):
     return getattr(instance, attribute).encode("ascii")
 
 
+# Names per DescribeAutoScalingGroups call, and instance ids per
+# DescribeInstances call, of get_instances_bulk.
+GROUP_NAMES_CHUNK = 50
+INSTANCE_IDS_CHUNK = 1000
+
+
+def _chunks(items, size):
+    for idx in range(0, len(items), size):
+        yield items[idx:idx + size]
+
+
+def _list_groups(conn, names):
+    return list(_paged(conn.get_all_groups, names=names))
+
+
+def get_instances_bulk(names=None, lifecycle_state="InService", health_status="Healthy",
+                       attributes=('id', 'private_ip_address', 'placement', 'tags'),
+                       region=None, key=None, keyid=None, profile=None):
+    '''
+    Return attributes of the instances of many autoscale groups, all of the
+    region by default.
+
+    Groups are described in paged calls of up to GROUP_NAMES_CHUNK names and
+    instances in calls of up to INSTANCE_IDS_CHUNK ids. The result is
+    columnar: a dict with an ``asg`` list of group names and a list per
+    attribute, all in the same order, one item per instance. Tags are
+    returned as dicts, other attributes as boto returns them.
+
+    Returns False if the groups or instances can't be described.
+
+    CLI example::
+
+        salt-call boto_asg.get_instances_bulk '["asg1", "asg2"]' attributes='["id", "private_ip_address"]'
+    '''
+    if isinstance(names, six.string_types):
+        names = salt.utils.json.loads(names)
+    if isinstance(attributes, six.string_types):
+        attributes = salt.utils.json.loads(attributes)
+    conn = _get_conn(region=region, key=key, keyid=keyid, profile=profile)
+    ec2_conn = _get_ec2_conn(region=region, key=key, keyid=keyid, profile=profile)
+    chunks = [None] if names is None else _chunks(sorted(set(names)), GROUP_NAMES_CHUNK)
+    asgs = []
+    try:
+        for chunk in chunks:
+            asgs.extend(__utils__['boto_retry.call']('autoscaling', _list_groups, conn, chunk))
+    except boto.exception.BotoServerError as e:
+        log.error(e)
+        return False
+
+    group_of = {}
+    instance_ids = []
+    # match lifecycle_state and health_status
+    for asg in sorted(asgs, key=lambda asg: asg.name):
+        for i in asg.instances:
+            if lifecycle_state is not None and i.lifecycle_state != lifecycle_state:
+                continue
+            if health_status is not None and i.health_status != health_status:
+                continue
+            if i.instance_id not in group_of:
+                # Keep the instances in the order the groups list them
+                instance_ids.append(i.instance_id)
+            group_of[i.instance_id] = asg.name
+
+    ret = dict((attr, []) for attr in attributes)
+    ret['asg'] = []
+    try:
+        for chunk in _chunks(instance_ids, INSTANCE_IDS_CHUNK):
+            instances = __utils__['boto_retry.call'](
+                'ec2', ec2_conn.get_only_instances, instance_ids=chunk)
+            # Instances terminated since the groups were described are left out
+            by_id = dict((instance.id, instance) for instance in instances)
+            for instance_id in chunk:
+                instance = by_id.get(instance_id)
+                if instance is None:
+                    continue
+                ret['asg'].append(group_of[instance_id])
+                for attr in attributes:
+                    value = getattr(instance, attr, None)
+                    ret[attr].append(dict(value) if attr == 'tags' and value is not None else value)
+    except boto.exception.BotoServerError as e:
+        log.error(e)
+        return False
+    return ret
+
+
 def enter_standby(name, instance_ids, should_decrement_desired_capacity=False,
                   region=None, key=None, keyid=None, profile=None):
     '''
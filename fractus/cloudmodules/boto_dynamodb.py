@@ -39,6 +39,14 @@ Connection module for Amazon DynamoDB
             key: askdjghsdfjkghWupUjasdflkdfklgjsdfjajkghs
             region: us-east-1
 
+    The wait of delete for tables to disappear can be deferred to the end of
+    the run, where all the deferred waits are settled at once by
+    :py:func:`wait_for_deferred`:
+
+    .. code-block:: yaml
+
+        boto_dynamodb.defer_wait: True
+
 :depends: boto
 '''
 # keep lint from choking on _get_conn and _cache_id
@@ -47,14 +55,12 @@ Connection module for Amazon DynamoDB
 # Import Python libs
 from __future__ import absolute_import, print_function, unicode_literals
 import logging
-import time
 
 logger = logging.getLogger(__name__)
 logging.getLogger('boto').setLevel(logging.INFO)
 
 # Import third party libs
 from salt.ext import six
-from salt.ext.six.moves import range  # pylint: disable=import-error,redefined-builtin
 from salt.exceptions import SaltInvocationError
 import salt.utils.versions
 
@@ -82,6 +88,52 @@ def __virtual__():
     return has_boto_reqs
 
 
+# Seconds create_table and delete wait for tables to appear and disappear,
+# and the bounds of the interval between polls of the tables.
+PROPAGATION_TIMEOUT = 30
+WAIT_MIN_INTERVAL = 1
+WAIT_MAX_INTERVAL = 5
+
+
+def _table_waiter(region=None, key=None, keyid=None, profile=None):
+    '''
+    Return the waiter shared by the waits for the tables of a region.
+    DynamoDB can't describe tables in bulk, so every poll describes the
+    pending tables one by one, all from the same background thread.
+    '''
+    def describe(names):
+        conn = _get_conn(region=region, key=key, keyid=keyid, profile=profile)
+        statuses = {}
+        for name in names:
+            try:
+                statuses[name] = conn.describe_table(name)['Table']['TableStatus']
+            except JSONResponseError as e:
+                if e.error_code != 'ResourceNotFoundException':
+                    raise
+        return statuses
+
+    cxkey = __utils__['boto.profile_key']('dynamodb2', region, key, keyid, profile)
+    return __utils__['boto_waiter.get_waiter'](
+        __context__, ('boto_dynamodb', cxkey), describe,
+        min_interval=WAIT_MIN_INTERVAL, max_interval=WAIT_MAX_INTERVAL)
+
+
+def wait_for_deferred(timeout=None):
+    '''
+    Wait for the tables whose deletion delete deferred waiting for, see the
+    ``boto_dynamodb.defer_wait`` option. Returns the names of the tables
+    which are ``ready`` (gone), and of those which ``failed`` or are still
+    ``pending`` after ``timeout`` seconds.
+
+    CLI Example:
+
+    .. code-block:: bash
+
+        salt myminion boto_dynamodb.wait_for_deferred timeout=60
+    '''
+    return __utils__['boto_waiter.wait_deferred'](__context__, 'boto_dynamodb', timeout)
+
+
 def create_table(table_name, region=None, key=None, keyid=None, profile=None,
                  read_capacity_units=None, write_capacity_units=None,
                  hash_key=None, hash_key_data_type=None, range_key=None,
@@ -144,21 +196,11 @@ def create_table(table_name, region=None, key=None, keyid=None, profile=None,
         connection=conn
     )
 
-    # Table creation can take several seconds to propagate.
-    # We will check MAX_ATTEMPTS times.
-    MAX_ATTEMPTS = 30
-    for i in range(MAX_ATTEMPTS):
-        if exists(
-            table_name,
-            region,
-            key,
-            keyid,
-            profile
-        ):
-            return True
-        else:
-            time.sleep(1)   # sleep for one second and try again
-    return False
+    # Table creation can take several seconds to propagate. The table is
+    # used right after it is created, so this wait is never deferred.
+    wait = _table_waiter(region, key, keyid, profile).add(
+        table_name, until=('CREATING', 'UPDATING', 'ACTIVE'), timeout=PROPAGATION_TIMEOUT)
+    return wait.wait()
 
 
 def exists(table_name, region=None, key=None, keyid=None, profile=None):
@@ -198,14 +240,12 @@ def delete(table_name, region=None, key=None, keyid=None, profile=None):
     table.delete()
 
     # Table deletion can take several seconds to propagate.
-    # We will retry MAX_ATTEMPTS times.
-    MAX_ATTEMPTS = 30
-    for i in range(MAX_ATTEMPTS):
-        if not exists(table_name, region, key, keyid, profile):
-            return True
-        else:
-            time.sleep(1)   # sleep for one second and try again
-    return False
+    wait = _table_waiter(region, key, keyid, profile).add(
+        table_name, until=None, timeout=PROPAGATION_TIMEOUT)
+    if __opts__.get('boto_dynamodb.defer_wait', False):
+        __utils__['boto_waiter.defer'](__context__, 'boto_dynamodb', wait)
+        return True
+    return wait.wait()
 
 
 def update(table_name, throughput=None, global_indexes=None,
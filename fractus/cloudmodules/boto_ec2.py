@@ -659,9 +659,9 @@ def find_images(ami_name=None, executable_by=None, owners=None, image_ids=None,
         salt myminion boto_ec2.find_images tags='{"mytag": "value"}'
 
     '''
-    retries = 30
+    backoff = __utils__['boto_retry.backoff']('ec2', tries=30)
     conn = _get_conn(region=region, key=key, keyid=keyid, profile=profile)
-    while retries:
+    while True:
         try:
             filter_parameters = {'filters': {}}
             if image_ids:
@@ -685,14 +685,10 @@ def find_images(ami_name=None, executable_by=None, owners=None, image_ids=None,
             else:
                 return False
         except boto.exception.BotoServerError as exc:
-            if exc.error_code == 'Throttling':
-                log.debug("Throttled by AWS API, will retry in 5 seconds...")
-                time.sleep(5)
-                retries -= 1
+            if backoff.retry(exc):
                 continue
             log.error('Failed to convert AMI name `%s` to an AMI ID: %s', ami_name, exc)
             return False
-    return False
 
 
 def terminate(instance_id=None, name=None, region=None,
@@ -39,6 +39,15 @@ Connection module for Amazon Elasticache
             key: askdjghsdfjkghWupUjasdflkdfklgjsdfjajkghs
             region: us-east-1
 
+    The waits of create, create_replication_group and delete can be deferred
+    to the end of the run, by passing ``wait=defer`` or setting the option
+    below, where all the deferred waits are settled at once by
+    :py:func:`wait_for_deferred`:
+
+    .. code-block:: yaml
+
+        boto_elasticache.defer_wait: True
+
 :depends: boto
 '''
 # keep lint from choking on _get_conn and _cache_id
@@ -48,7 +57,6 @@ from __future__ import absolute_import, print_function, unicode_literals
 
 # Import Python libs
 import logging
-import time
 
 # Import Salt libs
 from salt.ext import six
@@ -84,6 +92,66 @@ def __virtual__():
     return has_boto_reqs
 
 
+# How long create and delete wait, and the bounds of the interval between
+# polls of the clusters and replication groups being waited for.
+WAIT_TIMEOUT = 1800
+WAIT_MIN_INTERVAL = 3
+WAIT_MAX_INTERVAL = 30
+
+# Describe call, response name, result list, id and status of the resources
+# which can be waited for.
+_WAITABLE = {
+    'cache_cluster': ('describe_cache_clusters', 'DescribeCacheClusters', 'CacheClusters',
+                      'CacheClusterId', 'CacheClusterStatus'),
+    'replication_group': ('describe_replication_groups', 'DescribeReplicationGroups',
+                          'ReplicationGroups', 'ReplicationGroupId', 'Status'),
+}
+
+
+def _waiter(kind, region=None, key=None, keyid=None, profile=None):
+    '''
+    Return the waiter shared by the waits for the ``kind`` resources of a
+    region, which lists all of them with one paged describe per poll.
+    '''
+    func, response, items, id_key, status_key = _WAITABLE[kind]
+
+    def describe(names):
+        conn = _get_conn(region=region, key=key, keyid=keyid, profile=profile)
+        statuses = {}
+        marker = None
+        while True:
+            page = getattr(conn, func)(marker=marker)
+            page = page[response + 'Response'][response + 'Result']
+            for item in page[items]:
+                statuses[item[id_key]] = item[status_key]
+            marker = page.get('Marker')
+            if not marker:
+                return statuses
+
+    cxkey = __utils__['boto.profile_key']('elasticache', region, key, keyid, profile)
+    return __utils__['boto_waiter.get_waiter'](
+        __context__, ('boto_elasticache', kind, cxkey), describe, batch=None,
+        min_interval=WAIT_MIN_INTERVAL, max_interval=WAIT_MAX_INTERVAL)
+
+
+def _defer_wait(wait):
+    return wait == 'defer' or (wait and __opts__.get('boto_elasticache.defer_wait', False))
+
+
+def wait_for_deferred(timeout=None):
+    '''
+    Wait for the cache clusters and replication groups whose status create,
+    create_replication_group and delete deferred waiting for. Returns the
+    names of those which are ``ready``, and of those which ``failed`` or are
+    still ``pending`` after ``timeout`` seconds.
+
+    CLI example::
+
+        salt myminion boto_elasticache.wait_for_deferred timeout=1800
+    '''
+    return __utils__['boto_waiter.wait_deferred'](__context__, 'boto_elasticache', timeout)
+
+
 def exists(name, region=None, key=None, keyid=None, profile=None):
     '''
     Check to see if a cache cluster exists.
@@ -140,13 +208,15 @@ def create_replication_group(name, primary_cluster_id, replication_group_descrip
         if not wait:
             log.info('Created cache cluster %s.', name)
             return True
-        while True:
-            time.sleep(3)
-            config = describe_replication_group(name, region, key, keyid, profile)
-            if not config:
-                return True
-            if config['status'] == 'available':
-                return True
+        waiting = _waiter('replication_group', region, key, keyid, profile).add(
+            name, until='available', timeout=WAIT_TIMEOUT)
+        if _defer_wait(wait):
+            __utils__['boto_waiter.defer'](__context__, 'boto_elasticache', waiting)
+            return True
+        if waiting.wait():
+            return True
+        log.error('Replication group %s not available after %s seconds.', name, WAIT_TIMEOUT)
+        return False
     except boto.exception.BotoServerError as e:
         msg = 'Failed to create replication group {0}.'.format(name)
         log.error(msg)
@@ -566,14 +636,17 @@ def create(name, num_cache_nodes=None, engine=None, cache_node_type=None,
         if not wait:
             log.info('Created cache cluster %s.', name)
             return True
-        while True:
-            time.sleep(3)
-            config = get_config(name, region, key, keyid, profile)
-            if not config:
-                return True
-            if config['cache_cluster_status'] == 'available':
-                return True
-        log.info('Created cache cluster %s.', name)
+        waiting = _waiter('cache_cluster', region, key, keyid, profile).add(
+            name, until='available', timeout=WAIT_TIMEOUT)
+        if _defer_wait(wait):
+            __utils__['boto_waiter.defer'](__context__, 'boto_elasticache', waiting)
+            log.info('Created cache cluster %s.', name)
+            return True
+        if waiting.wait():
+            log.info('Created cache cluster %s.', name)
+            return True
+        log.error('Cache cluster %s not available after %s seconds.', name, WAIT_TIMEOUT)
+        return False
     except boto.exception.BotoServerError as e:
         msg = 'Failed to create cache cluster {0}.'.format(name)
         log.error(msg)
@@ -596,15 +669,17 @@ def delete(name, wait=False, region=None, key=None, keyid=None, profile=None):
         if not wait:
             log.info('Deleted cache cluster %s.', name)
             return True
-        while True:
-            config = get_config(name, region, key, keyid, profile)
-            if not config:
-                return True
-            if config['cache_cluster_status'] == 'deleting':
-                return True
-            time.sleep(2)
-        log.info('Deleted cache cluster %s.', name)
-        return True
+        waiting = _waiter('cache_cluster', region, key, keyid, profile).add(
+            name, until=('deleting', None), timeout=WAIT_TIMEOUT)
+        if _defer_wait(wait):
+            __utils__['boto_waiter.defer'](__context__, 'boto_elasticache', waiting)
+            log.info('Deleted cache cluster %s.', name)
+            return True
+        if waiting.wait():
+            log.info('Deleted cache cluster %s.', name)
+            return True
+        log.error('Cache cluster %s not deleted after %s seconds.', name, WAIT_TIMEOUT)
+        return False
     except boto.exception.BotoServerError as e:
         msg = 'Failed to delete cache cluster {0}.'.format(name)
         log.error(msg)
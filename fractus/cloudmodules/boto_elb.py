@@ -39,6 +39,14 @@ Connection module for Amazon ELB
             key: askdjghsdfjkghWupUjasdflkdfklgjsdfjajkghs
             region: us-east-1
 
+    Runs which look up many load balancers can describe every load balancer
+    of a region once and answer the lookups from memory, by setting the
+    number of seconds they are cached for:
+
+    .. code-block:: yaml
+
+        boto_elb.describe_cache_ttl: 60
+
 :depends: boto >= 2.33.0
 '''
 # keep lint from choking on _get_conn and _cache_id
@@ -47,8 +55,11 @@ Connection module for Amazon ELB
 from __future__ import absolute_import, print_function, unicode_literals
 
 # Import Python libs
+import copy
 import logging
+import threading
 import time
+from multiprocessing.pool import ThreadPool
 
 log = logging.getLogger(__name__)
 
@@ -87,6 +98,100 @@ def __virtual__():
     return has_boto_reqs
 
 
+# Seconds the load balancers of a region are cached for once described in
+# bulk. Disabled unless the boto_elb.describe_cache_ttl option is set.
+DESCRIBE_CACHE_TTL = 0
+
+# Marks a load balancer changed since the bulk describe, so that its next
+# lookup describes it again.
+_STALE = object()
+
+# Guards the cached load balancers, which are shared by the threads of a run.
+_CACHE_LOCK = threading.Lock()
+
+
+def _describe_cache():
+    return __utils__['boto_cache.get_cache'](
+        __context__, 'boto_elb',
+        ttl=__opts__.get('boto_elb.describe_cache_ttl', DESCRIBE_CACHE_TTL))
+
+
+def _cxkey(region=None, key=None, keyid=None, profile=None):
+    return __utils__['boto.profile_key']('elb', region, key, keyid, profile)
+
+
+def _describe_all(conn):
+    elbs = {}
+    marker = None
+    while True:
+        page = conn.get_all_load_balancers(marker=marker)
+        for lb in page:
+            elbs[lb.name] = lb
+        marker = getattr(page, 'next_marker', None)
+        if not marker:
+            return elbs
+
+
+def _get_load_balancer(conn, name, region=None, key=None, keyid=None, profile=None):
+    '''
+    Return the boto LoadBalancer of an ELB, or None if it does not exist.
+
+    Every ELB of the region is described with a single call, which serves
+    the lookups of the whole run. ELBs changed by this module since are
+    described again on their own. Raises BotoServerError like
+    get_all_load_balancers.
+    '''
+    cache = _describe_cache()
+    if not cache.ttl:
+        lbs = conn.get_all_load_balancers(load_balancer_names=[name])
+        return lbs[0] if lbs else None
+    elbs = cache.get(('load_balancer', _cxkey(region, key, keyid, profile)),
+                     lambda: _describe_all(conn))
+    lb = elbs.get(name)
+    if lb is _STALE:
+        try:
+            lbs = conn.get_all_load_balancers(load_balancer_names=[name])
+        except boto.exception.BotoServerError as error:
+            if getattr(error, 'error_code', None) != 'LoadBalancerNotFound':
+                raise
+            lbs = []
+        lb = lbs[0] if lbs else None
+        with _CACHE_LOCK:
+            if lb is None:
+                elbs.pop(name, None)
+            else:
+                elbs[name] = lb
+    return lb
+
+
+def _cached(kind, name, fetch, region=None, key=None, keyid=None, profile=None):
+    '''
+    Return the cached ``kind`` description of an ELB, such as its tags or
+    attributes, calling ``fetch()`` on first use. Failed lookups, for which
+    ``fetch()`` returns None, aren't cached.
+    '''
+    cache = _describe_cache()
+    cache_key = (kind, _cxkey(region, key, keyid, profile), name)
+    value = cache.get(cache_key, fetch)
+    if value is None:
+        cache.invalidate(*cache_key)
+    return value
+
+
+def _invalidate(name, region=None, key=None, keyid=None, profile=None):
+    '''
+    Mark an ELB as changed, so that its next lookup describes it again.
+    '''
+    cache = _describe_cache()
+    cxkey = _cxkey(region, key, keyid, profile)
+    elbs = cache.peek(('load_balancer', cxkey))
+    if elbs is not None:
+        with _CACHE_LOCK:
+            elbs[name] = _STALE
+    cache.invalidate('tags', cxkey, name)
+    cache.invalidate('attributes', cxkey, name)
+
+
 def exists(name, region=None, key=None, keyid=None, profile=None):
     '''
     Check to see if an ELB exists.
@@ -100,7 +205,7 @@ def exists(name, region=None, key=None, keyid=None, profile=None):
     conn = _get_conn(region=region, key=key, keyid=keyid, profile=profile)
 
     try:
-        elb = conn.get_all_load_balancers(load_balancer_names=[name])
+        elb = _get_load_balancer(conn, name, region, key, keyid, profile)
         if elb:
             return True
         else:
@@ -156,14 +261,16 @@ def get_elb_config(name, region=None, key=None, keyid=None, profile=None):
         salt myminion boto_elb.exists myelb region=us-east-1
     '''
     conn = _get_conn(region=region, key=key, keyid=keyid, profile=profile)
-    retries = 30
+    backoff = __utils__['boto_retry.backoff']('elb', tries=30)
 
-    while retries:
+    while True:
         try:
-            lb = conn.get_all_load_balancers(load_balancer_names=[name])
-            lb = lb[0]
+            lb = _get_load_balancer(conn, name, region, key, keyid, profile)
+            if lb is None:
+                log.error('Error fetching config for ELB %s: not found', name)
+                return {}
             ret = {}
-            ret['availability_zones'] = lb.availability_zones
+            ret['availability_zones'] = list(lb.availability_zones)
             listeners = []
             for _listener in lb.listeners:
                 listener_dict = {}
@@ -171,7 +278,7 @@ def get_elb_config(name, region=None, key=None, keyid=None, profile=None):
                 listener_dict['elb_protocol'] = _listener.protocol
                 listener_dict['instance_port'] = _listener.instance_port
                 listener_dict['instance_protocol'] = _listener.instance_protocol
-                listener_dict['policies'] = _listener.policy_names
+                listener_dict['policies'] = list(_listener.policy_names)
                 if _listener.ssl_certificate_id:
                     listener_dict['certificate'] = _listener.ssl_certificate_id
                 listeners.append(listener_dict)
@@ -183,11 +290,13 @@ def get_elb_config(name, region=None, key=None, keyid=None, profile=None):
                 bs_dict['policies'] = [p.policy_name for p in _backend.policies]
                 backends.append(bs_dict)
             ret['backends'] = backends
-            ret['subnets'] = lb.subnets
-            ret['security_groups'] = lb.security_groups
+            ret['subnets'] = list(lb.subnets)
+            ret['security_groups'] = list(lb.security_groups)
             ret['scheme'] = lb.scheme
             ret['dns_name'] = lb.dns_name
-            ret['tags'] = _get_all_tags(conn, name)
+            tags = _cached('tags', name, lambda: dict(_get_all_tags(conn, name) or {}),
+                           region, key, keyid, profile)
+            ret['tags'] = dict(tags) if tags else None
             lb_policy_lists = [
                 lb.policies.app_cookie_stickiness_policies,
                 lb.policies.lb_cookie_stickiness_policies,
@@ -199,15 +308,11 @@ def get_elb_config(name, region=None, key=None, keyid=None, profile=None):
             ret['policies'] = policies
             return ret
         except boto.exception.BotoServerError as error:
-            if error.error_code == 'Throttling':
-                log.debug('Throttled by AWS API, will retry in 5 seconds.')
-                time.sleep(5)
-                retries -= 1
+            if backoff.retry(error):
                 continue
             log.error('Error fetching config for ELB %s: %s', name, error.message)
             log.error(error)
             return {}
-    return {}
 
 
 def listener_dict_to_tuple(listener):
@@ -274,6 +379,8 @@ def create(name, availability_zones, listeners, subnets=None,
                   name, error.error_code, error.message,
                   exc_info_on_loglevel=logging.DEBUG)
         return False
+    finally:
+        _invalidate(name, region, key, keyid, profile)
 
 
 def delete(name, region=None, key=None, keyid=None, profile=None):
@@ -298,6 +405,8 @@ def delete(name, region=None, key=None, keyid=None, profile=None):
         log.error('Failed to delete ELB %s', name,
                   exc_info_on_loglevel=logging.DEBUG)
         return False
+    finally:
+        _invalidate(name, region, key, keyid, profile)
 
 
 def create_listeners(name, listeners, region=None, key=None, keyid=None,
@@ -327,6 +436,8 @@ def create_listeners(name, listeners, region=None, key=None, keyid=None,
         log.error('Failed to create ELB listeners on %s: %s', name, error,
                   exc_info_on_loglevel=logging.DEBUG)
         return False
+    finally:
+        _invalidate(name, region, key, keyid, profile)
 
 
 def delete_listeners(name, ports, region=None, key=None, keyid=None,
@@ -352,6 +463,8 @@ def delete_listeners(name, ports, region=None, key=None, keyid=None,
         log.error('Failed to delete ELB listeners on %s: %s', name, error,
                   exc_info_on_loglevel=logging.DEBUG)
         return False
+    finally:
+        _invalidate(name, region, key, keyid, profile)
 
 
 def apply_security_groups(name, security_groups, region=None, key=None,
@@ -378,6 +491,8 @@ def apply_security_groups(name, security_groups, region=None, key=None,
         log.error('Failed to appply security_groups on ELB %s: %s',
                   name, e.message)
         return False
+    finally:
+        _invalidate(name, region, key, keyid, profile)
 
 
 def enable_availability_zones(name, availability_zones, region=None, key=None,
@@ -402,6 +517,8 @@ def enable_availability_zones(name, availability_zones, region=None, key=None,
     except boto.exception.BotoServerError as error:
         log.error('Failed to enable availability_zones on ELB %s: %s', name, error)
         return False
+    finally:
+        _invalidate(name, region, key, keyid, profile)
 
 
 def disable_availability_zones(name, availability_zones, region=None, key=None,
@@ -427,6 +544,8 @@ def disable_availability_zones(name, availability_zones, region=None, key=None,
         log.error('Failed to disable availability_zones on ELB %s: %s',
                   name, error, exc_info_on_loglevel=logging.DEBUG)
         return False
+    finally:
+        _invalidate(name, region, key, keyid, profile)
 
 
 def attach_subnets(name, subnets, region=None, key=None, keyid=None,
@@ -452,6 +571,8 @@ def attach_subnets(name, subnets, region=None, key=None, keyid=None,
         log.error('Failed to attach ELB %s on subnets: %s', name, error,
                   exc_info_on_loglevel=logging.DEBUG)
         return False
+    finally:
+        _invalidate(name, region, key, keyid, profile)
 
 
 def detach_subnets(name, subnets, region=None, key=None, keyid=None,
@@ -477,6 +598,8 @@ def detach_subnets(name, subnets, region=None, key=None, keyid=None,
         log.error('Failed to detach ELB %s from subnets: %s', name, error,
                   exc_info_on_loglevel=logging.DEBUG)
         return False
+    finally:
+        _invalidate(name, region, key, keyid, profile)
 
 
 def get_attributes(name, region=None, key=None, keyid=None, profile=None):
@@ -490,38 +613,37 @@ def get_attributes(name, region=None, key=None, keyid=None, profile=None):
         salt myminion boto_elb.get_attributes myelb
     '''
     conn = _get_conn(region=region, key=key, keyid=keyid, profile=profile)
-    retries = 30
-
-    while retries:
-        try:
-            lbattrs = conn.get_all_lb_attributes(name)
-            ret = odict.OrderedDict()
-            ret['access_log'] = odict.OrderedDict()
-            ret['cross_zone_load_balancing'] = odict.OrderedDict()
-            ret['connection_draining'] = odict.OrderedDict()
-            ret['connecting_settings'] = odict.OrderedDict()
-            al = lbattrs.access_log
-            czlb = lbattrs.cross_zone_load_balancing
-            cd = lbattrs.connection_draining
-            cs = lbattrs.connecting_settings
-            ret['access_log']['enabled'] = al.enabled
-            ret['access_log']['s3_bucket_name'] = al.s3_bucket_name
-            ret['access_log']['s3_bucket_prefix'] = al.s3_bucket_prefix
-            ret['access_log']['emit_interval'] = al.emit_interval
-            ret['cross_zone_load_balancing']['enabled'] = czlb.enabled
-            ret['connection_draining']['enabled'] = cd.enabled
-            ret['connection_draining']['timeout'] = cd.timeout
-            ret['connecting_settings']['idle_timeout'] = cs.idle_timeout
-            return ret
-        except boto.exception.BotoServerError as e:
-            if e.error_code == 'Throttling':
-                log.debug("Throttled by AWS API, will retry in 5 seconds...")
-                time.sleep(5)
-                retries -= 1
-                continue
-            log.error('ELB %s does not exist: %s', name, e.message)
-            return {}
-    return {}
+    backoff = __utils__['boto_retry.backoff']('elb', tries=30)
+
+    def _fetch():
+        while True:
+            try:
+                lbattrs = conn.get_all_lb_attributes(name)
+                ret = odict.OrderedDict()
+                ret['access_log'] = odict.OrderedDict()
+                ret['cross_zone_load_balancing'] = odict.OrderedDict()
+                ret['connection_draining'] = odict.OrderedDict()
+                ret['connecting_settings'] = odict.OrderedDict()
+                al = lbattrs.access_log
+                czlb = lbattrs.cross_zone_load_balancing
+                cd = lbattrs.connection_draining
+                cs = lbattrs.connecting_settings
+                ret['access_log']['enabled'] = al.enabled
+                ret['access_log']['s3_bucket_name'] = al.s3_bucket_name
+                ret['access_log']['s3_bucket_prefix'] = al.s3_bucket_prefix
+                ret['access_log']['emit_interval'] = al.emit_interval
+                ret['cross_zone_load_balancing']['enabled'] = czlb.enabled
+                ret['connection_draining']['enabled'] = cd.enabled
+                ret['connection_draining']['timeout'] = cd.timeout
+                ret['connecting_settings']['idle_timeout'] = cs.idle_timeout
+                return ret
+            except boto.exception.BotoServerError as e:
+                if backoff.retry(e):
+                    continue
+                log.error('ELB %s does not exist: %s', name, e.message)
+                return None
+
+    return copy.deepcopy(_cached('attributes', name, _fetch, region, key, keyid, profile) or {})
 
 
 def set_attributes(name, attributes, region=None, key=None, keyid=None,
@@ -575,6 +697,13 @@ def set_attributes(name, attributes, region=None, key=None, keyid=None,
     if not al and not czlb and not cd and not cs:
         log.error('No supported attributes for ELB.')
         return False
+
+    def _modify(attribute, value):
+        try:
+            return conn.modify_lb_attribute(name, attribute, value)
+        finally:
+            _invalidate(name, region, key, keyid, profile)
+
     if al:
         _al = AccessLogAttribute()
         _al.enabled = al.get('enabled', False)
@@ -585,7 +714,7 @@ def set_attributes(name, attributes, region=None, key=None, keyid=None,
         _al.s3_bucket_name = al.get('s3_bucket_name', None)
         _al.s3_bucket_prefix = al.get('s3_bucket_prefix', None)
         _al.emit_interval = al.get('emit_interval', None)
-        added_attr = conn.modify_lb_attribute(name, 'accessLog', _al)
+        added_attr = _modify('accessLog', _al)
         if added_attr:
             log.info('Added access_log attribute to %s elb.', name)
         else:
@@ -594,8 +723,7 @@ def set_attributes(name, attributes, region=None, key=None, keyid=None,
     if czlb:
         _czlb = CrossZoneLoadBalancingAttribute()
         _czlb.enabled = czlb['enabled']
-        added_attr = conn.modify_lb_attribute(name, 'crossZoneLoadBalancing',
-                                              _czlb.enabled)
+        added_attr = _modify('crossZoneLoadBalancing', _czlb.enabled)
         if added_attr:
             log.info('Added cross_zone_load_balancing attribute to %s elb.', name)
         else:
@@ -605,7 +733,7 @@ def set_attributes(name, attributes, region=None, key=None, keyid=None,
         _cd = ConnectionDrainingAttribute()
         _cd.enabled = cd['enabled']
         _cd.timeout = cd.get('timeout', 300)
-        added_attr = conn.modify_lb_attribute(name, 'connectionDraining', _cd)
+        added_attr = _modify('connectionDraining', _cd)
         if added_attr:
             log.info('Added connection_draining attribute to %s elb.', name)
         else:
@@ -614,7 +742,7 @@ def set_attributes(name, attributes, region=None, key=None, keyid=None,
     if cs:
         _cs = ConnectionSettingAttribute()
         _cs.idle_timeout = cs.get('idle_timeout', 60)
-        added_attr = conn.modify_lb_attribute(name, 'connectingSettings', _cs)
+        added_attr = _modify('connectingSettings', _cs)
         if added_attr:
             log.info('Added connecting_settings attribute to %s elb.', name)
         else:
@@ -634,12 +762,14 @@ def get_health_check(name, region=None, key=None, keyid=None, profile=None):
         salt myminion boto_elb.get_health_check myelb
     '''
     conn = _get_conn(region=region, key=key, keyid=keyid, profile=profile)
-    retries = 30
+    backoff = __utils__['boto_retry.backoff']('elb', tries=30)
 
     while True:
         try:
-            lb = conn.get_all_load_balancers(load_balancer_names=[name])
-            lb = lb[0]
+            lb = _get_load_balancer(conn, name, region, key, keyid, profile)
+            if lb is None:
+                log.error('ELB %s not found.', name)
+                return {}
             ret = odict.OrderedDict()
             hc = lb.health_check
             ret['interval'] = hc.interval
@@ -649,10 +779,7 @@ def get_health_check(name, region=None, key=None, keyid=None, profile=None):
             ret['unhealthy_threshold'] = hc.unhealthy_threshold
             return ret
         except boto.exception.BotoServerError as e:
-            if retries and e.code == 'Throttling':
-                log.debug('Throttled by AWS API, will retry in 5 seconds.')
-                time.sleep(5)
-                retries -= 1
+            if backoff.retry(e):
                 continue
             log.error('ELB %s not found.', name,
                       exc_info_on_logleve=logging.DEBUG)
@@ -671,19 +798,17 @@ def set_health_check(name, health_check, region=None, key=None, keyid=None,
         salt myminion boto_elb.set_health_check myelb '{"target": "HTTP:80/"}'
     '''
     conn = _get_conn(region=region, key=key, keyid=keyid, profile=profile)
-    retries = 30
+    backoff = __utils__['boto_retry.backoff']('elb', tries=30)
 
     hc = HealthCheck(**health_check)
     while True:
         try:
             conn.configure_health_check(name, hc)
+            _invalidate(name, region, key, keyid, profile)
             log.info('Configured health check on ELB %s', name)
             return True
         except boto.exception.BotoServerError as error:
-            if retries and e.code == 'Throttling':
-                log.debug('Throttled by AWS API, will retry in 5 seconds.')
-                time.sleep(5)
-                retries -= 1
+            if backoff.retry(error):
                 continue
             log.exception('Failed to configure health check on ELB %s', name)
             return False
@@ -844,6 +969,183 @@ def get_instance_health(name, region=None, key=None, keyid=None, profile=None, i
         return []
 
 
+# ELBs reconciled or polled at a time by set_instances_bulk and
+# wait_for_healthy.
+BULK_WORKERS = 8
+
+# Seconds wait_for_healthy waits for instances to come InService, and the
+# bounds of the interval between its polls, which doubles after every poll.
+HEALTHY_TIMEOUT = 300
+HEALTH_POLL_MIN = 2
+HEALTH_POLL_MAX = 30
+
+
+def _instance_ids(instances):
+    if isinstance(instances, six.string_types):
+        return [instances]
+    return list(instances or [])
+
+
+def _reconcile_instances(name, instances, test, region, key, keyid, profile):
+    conn = _get_conn(region=region, key=key, keyid=keyid, profile=profile)
+    desired = set(_instance_ids(instances))
+    try:
+        current = set(i.instance_id for i in
+                      __utils__['boto_retry.call']('elb', conn.describe_instance_health, name))
+    except boto.exception.BotoServerError as error:
+        return {'error': __utils__['boto.get_error'](error)}
+    add = sorted(desired - current)
+    remove = sorted(current - desired)
+    ret = {'added': add, 'removed': remove}
+    if test or not (add or remove):
+        return ret
+    if remove and deregister_instances(name, remove, region, key, keyid, profile) is False:
+        ret['error'] = {'message': 'Failed to deregister {0}'.format(remove)}
+    if add and register_instances(name, add, region, key, keyid, profile) is False:
+        ret['error'] = {'message': 'Failed to register {0}'.format(add)}
+    return ret
+
+
+def set_instances_bulk(elbs, test=False, wait_for_healthy=False, timeout=HEALTHY_TIMEOUT,
+                       workers=BULK_WORKERS, region=None, key=None, keyid=None, profile=None):
+    '''
+    Set the instances of many ELBs to exactly the lists given, reconciling up
+    to ``workers`` ELBs at a time.
+
+    elbs
+        A dict of ELB names to the list of instance ids each should have.
+
+    wait_for_healthy
+        Wait until all the instances are InService, see :py:func:`wait_for_healthy`.
+
+    Returns ``{'result': {'changed': {elb: {'added': [...], 'removed': [...]}},
+    'unchanged': [...], 'failed': {elb: error}}}``, plus ``'unhealthy'``,
+    the instances which weren't InService in time by ELB, when waiting.
+
+    CLI example:
+
+    .. code-block:: bash
+
+        salt myminion boto_elb.set_instances_bulk '{"elb1": ["i-1", "i-2"], "elb2": ["i-3"]}' wait_for_healthy=True
+    '''
+    if isinstance(elbs, six.string_types):
+        elbs = salt.utils.json.loads(elbs)
+    result = {'changed': {}, 'unchanged': [], 'failed': {}}
+    if not elbs:
+        return {'result': result}
+
+    def _reconcile(item):
+        name, instances = item
+        return name, _reconcile_instances(name, instances, test, region, key, keyid, profile)
+
+    pool = ThreadPool(max(min(int(workers), len(elbs)), 1))
+    try:
+        reconciled = pool.map(_reconcile, sorted(six.iteritems(elbs)))
+    finally:
+        pool.close()
+        pool.join()
+
+    for name, ret in reconciled:
+        if 'error' in ret:
+            result['failed'][name] = ret['error']
+        elif ret['added'] or ret['removed']:
+            result['changed'][name] = ret
+        else:
+            result['unchanged'].append(name)
+
+    if wait_for_healthy and not test:
+        healthy = _wait_for_healthy(
+            dict((name, instances) for name, instances in six.iteritems(elbs)
+                 if name not in result['failed'] and instances),
+            timeout=timeout, workers=workers, region=region, key=key, keyid=keyid, profile=profile)
+        result['unhealthy'] = healthy['pending']
+    return {'result': result}
+
+
+def wait_for_healthy(elbs, timeout=HEALTHY_TIMEOUT, workers=BULK_WORKERS, region=None,
+                     key=None, keyid=None, profile=None):
+    '''
+    Wait until the instances of many ELBs are InService.
+
+    The health of every ELB which still has instances out of service is
+    polled at once, up to ``workers`` ELBs at a time. The interval between
+    polls starts at HEALTH_POLL_MIN seconds and doubles up to HEALTH_POLL_MAX.
+    Returns as soon as every instance is InService, or after ``timeout``
+    seconds.
+
+    elbs
+        A list of ELB names, to wait for all their instances, or a dict of
+        ELB names to the list of instance ids to wait for.
+
+    Returns ``{'healthy': bool, 'pending': {elb: [instance ids]}}`` where
+    ``pending`` holds the instances which aren't InService yet. ELBs whose
+    instance health could not be described before the timeout are pending
+    with an empty list.
+
+    CLI example:
+
+    .. code-block:: bash
+
+        salt myminion boto_elb.wait_for_healthy '["elb1", "elb2"]' timeout=600
+    '''
+    if isinstance(elbs, six.string_types):
+        elbs = salt.utils.json.loads(elbs)
+    if not isinstance(elbs, dict):
+        elbs = dict((name, None) for name in elbs)
+    return _wait_for_healthy(elbs, timeout, workers, region, key, keyid, profile)
+
+
+def _sleep(seconds):
+    # The poll loop sleeps through here, apart from the sleeps of its pool
+    time.sleep(seconds)
+
+
+def _wait_for_healthy(elbs, timeout, workers, region, key, keyid, profile):
+    # set_instances_bulk's wait_for_healthy argument shadows the public function
+    pending = dict((name, _instance_ids(instances) or None) for name, instances in six.iteritems(elbs))
+    if not pending:
+        return {'healthy': True, 'pending': {}}
+
+    def _poll(item):
+        name, instances = item
+        # boto connections are pooled per thread
+        conn = _get_conn(region=region, key=key, keyid=keyid, profile=profile)
+        try:
+            states = __utils__['boto_retry.call']('elb', conn.describe_instance_health, name, instances)
+        except boto.exception.BotoServerError as error:
+            # Instances which are still being registered are reported as
+            # invalid, so the ELB stays pending until the next poll
+            log.debug('Unable to get the instance health of ELB %s: %s', name, error)
+            return name, None
+        return name, [state.instance_id for state in states if state.state != 'InService']
+
+    deadline = time.time() + float(timeout)
+    interval = HEALTH_POLL_MIN
+    pool = ThreadPool(max(min(int(workers), len(pending)), 1))
+    try:
+        while pending:
+            for name, out_of_service in pool.map(_poll, sorted(six.iteritems(pending))):
+                if out_of_service is None:
+                    continue
+                if out_of_service:
+                    # Only poll the instances which aren't in service yet
+                    pending[name] = out_of_service
+                else:
+                    del pending[name]
+            if not pending or time.time() + interval > deadline:
+                break
+            log.debug('Waiting %s seconds for instances of %s to be InService',
+                      interval, ', '.join(sorted(pending)))
+            _sleep(interval)
+            interval = min(interval * 2, HEALTH_POLL_MAX)
+    finally:
+        pool.close()
+        pool.join()
+    # ELBs whose health was never known are pending with no instance ids
+    return {'healthy': not pending,
+            'pending': dict((name, instances or []) for name, instances in six.iteritems(pending))}
+
+
 def create_policy(name, policy_name, policy_type, policy, region=None,
                   key=None, keyid=None, profile=None):
     '''
@@ -874,6 +1176,8 @@ def create_policy(name, policy_name, policy_type, policy, region=None,
                   policy_name, name, e.message,
                   exc_info_on_loglevel=logging.DEBUG)
         return False
+    finally:
+        _invalidate(name, region, key, keyid, profile)
 
 
 def delete_policy(name, policy_name, region=None, key=None, keyid=None,
@@ -902,6 +1206,8 @@ def delete_policy(name, policy_name, region=None, key=None, keyid=None,
                   policy_name, name, e.message,
                   exc_info_on_loglevel=logging.DEBUG)
         return False
+    finally:
+        _invalidate(name, region, key, keyid, profile)
 
 
 def set_listener_policy(name, port, policies=None, region=None, key=None,
@@ -931,6 +1237,8 @@ def set_listener_policy(name, port, policies=None, region=None, key=None,
                  policies, name, port, e.message,
                  exc_info_on_loglevel=logging.DEBUG)
         return False
+    finally:
+        _invalidate(name, region, key, keyid, profile)
     return True
 
 
@@ -958,6 +1266,8 @@ def set_backend_policy(name, port, policies=None, region=None, key=None,
                  policies, name, port, e.message,
                  exc_info_on_loglevel=logging.DEBUG)
         return False
+    finally:
+        _invalidate(name, region, key, keyid, profile)
     return True
 
 
@@ -983,6 +1293,7 @@ def set_tags(name, tags, region=None, key=None, keyid=None, profile=None):
     if exists(name, region, key, keyid, profile):
         conn = _get_conn(region=region, key=key, keyid=keyid, profile=profile)
         ret = _add_tags(conn, name, tags)
+        _invalidate(name, region, key, keyid, profile)
         return ret
     else:
         return False
@@ -1007,6 +1318,7 @@ def delete_tags(name, tags, region=None, key=None, keyid=None, profile=None):
     if exists(name, region, key, keyid, profile):
         conn = _get_conn(region=region, key=key, keyid=keyid, profile=profile)
         ret = _remove_tags(conn, name, tags)
+        _invalidate(name, region, key, keyid, profile)
         return ret
     else:
         return False
@@ -40,7 +40,6 @@ Connection module for Amazon IAM
 # Import Python libs
 from __future__ import absolute_import, print_function, unicode_literals
 import logging
-import time
 
 # Import salt libs
 from salt.ext import six
@@ -621,6 +620,21 @@ def get_group_policy(group_name, policy_name, region=None, key=None,
         return False
 
 
+def iter_all_groups(path_prefix='/', page_size=None, region=None, key=None,
+                    keyid=None, profile=None):
+    '''
+    Lazily iterate over IAM groups, starting at the optional path, fetching
+    one page at a time.
+    '''
+    conn = _get_conn(region=region, key=key, keyid=keyid, profile=profile)
+    if not conn:
+        return
+    for item in __utils__['boto.paged_items'](conn.get_all_groups,
+                                              'list_groups_response.list_groups_result.groups',
+                                              path_prefix=path_prefix, page_size=page_size):
+        yield item
+
+
 def get_all_groups(path_prefix='/', region=None, key=None, keyid=None,
                  profile=None):
     '''
@@ -635,18 +649,23 @@ def get_all_groups(path_prefix='/', region=None, key=None, keyid=None,
     conn = _get_conn(region=region, key=key, keyid=keyid, profile=profile)
     if not conn:
         return None
-    _groups = conn.get_all_groups(path_prefix=path_prefix)
-    groups = _groups.list_groups_response.list_groups_result.groups
-    marker = getattr(
-        _groups.list_groups_response.list_groups_result, 'marker', None
-    )
-    while marker:
-        _groups = conn.get_all_groups(path_prefix=path_prefix, marker=marker)
-        groups = groups + _groups.list_groups_response.list_groups_result.groups
-        marker = getattr(
-            _groups.list_groups_response.list_groups_result, 'marker', None
-        )
-    return groups
+    return list(iter_all_groups(path_prefix, region=region, key=key, keyid=keyid,
+                                profile=profile))
+
+
+def iter_all_instance_profiles(path_prefix='/', page_size=None, region=None, key=None,
+                               keyid=None, profile=None):
+    '''
+    Lazily iterate over IAM instance profiles, starting at the optional path,
+    fetching one page at a time.
+    '''
+    conn = _get_conn(region=region, key=key, keyid=keyid, profile=profile)
+    if not conn:
+        return
+    for item in __utils__['boto.paged_items'](conn.list_instance_profiles,
+                                              'list_instance_profiles_response.list_instance_profiles_result.instance_profiles',
+                                              path_prefix=path_prefix, page_size=page_size):
+        yield item
 
 
 def get_all_instance_profiles(path_prefix='/', region=None, key=None,
@@ -660,17 +679,8 @@ def get_all_instance_profiles(path_prefix='/', region=None, key=None,
 
         salt-call boto_iam.get_all_instance_profiles
     '''
-    conn = _get_conn(region=region, key=key, keyid=keyid, profile=profile)
-    marker = False
-    profiles = []
-    while marker is not None:
-        marker = marker if marker else None
-        p = conn.list_instance_profiles(path_prefix=path_prefix,
-                                                   marker=marker)
-        res = p.list_instance_profiles_response.list_instance_profiles_result
-        profiles += res.instance_profiles
-        marker = getattr(res, 'marker', None)
-    return profiles
+    return list(iter_all_instance_profiles(path_prefix, region=region, key=key, keyid=keyid,
+                                           profile=profile))
 
 
 def list_instance_profiles(path_prefix='/', region=None, key=None,
@@ -1313,6 +1323,21 @@ def get_account_id(region=None, key=None, keyid=None, profile=None):
     return __context__[cache_key]
 
 
+def iter_all_roles(path_prefix=None, page_size=None, region=None, key=None,
+                   keyid=None, profile=None):
+    '''
+    Lazily iterate over IAM roles, starting at the optional path, fetching
+    one page at a time.
+    '''
+    conn = _get_conn(region=region, key=key, keyid=keyid, profile=profile)
+    if not conn:
+        return
+    for item in __utils__['boto.paged_items'](conn.list_roles,
+                                              'list_roles_response.list_roles_result.roles',
+                                              path_prefix=path_prefix, page_size=page_size):
+        yield item
+
+
 def get_all_roles(path_prefix=None, region=None, key=None, keyid=None,
                  profile=None):
     '''
@@ -1327,18 +1352,23 @@ def get_all_roles(path_prefix=None, region=None, key=None, keyid=None,
     conn = _get_conn(region=region, key=key, keyid=keyid, profile=profile)
     if not conn:
         return None
-    _roles = conn.list_roles(path_prefix=path_prefix)
-    roles = _roles.list_roles_response.list_roles_result.roles
-    marker = getattr(
-        _roles.list_roles_response.list_roles_result, 'marker', None
-    )
-    while marker:
-        _roles = conn.list_roles(path_prefix=path_prefix, marker=marker)
-        roles = roles + _roles.list_roles_response.list_roles_result.roles
-        marker = getattr(
-            _roles.list_roles_response.list_roles_result, 'marker', None
-        )
-    return roles
+    return list(iter_all_roles(path_prefix, region=region, key=key, keyid=keyid,
+                               profile=profile))
+
+
+def iter_all_users(path_prefix='/', page_size=None, region=None, key=None,
+                   keyid=None, profile=None):
+    '''
+    Lazily iterate over IAM users, starting at the optional path, fetching
+    one page at a time.
+    '''
+    conn = _get_conn(region=region, key=key, keyid=keyid, profile=profile)
+    if not conn:
+        return
+    for item in __utils__['boto.paged_items'](conn.get_all_users,
+                                              'list_users_response.list_users_result.users',
+                                              path_prefix=path_prefix, page_size=page_size):
+        yield item
 
 
 def get_all_users(path_prefix='/', region=None, key=None, keyid=None,
@@ -1355,18 +1385,8 @@ def get_all_users(path_prefix='/', region=None, key=None, keyid=None,
     conn = _get_conn(region=region, key=key, keyid=keyid, profile=profile)
     if not conn:
         return None
-    _users = conn.get_all_users(path_prefix=path_prefix)
-    users = _users.list_users_response.list_users_result.users
-    marker = getattr(
-        _users.list_users_response.list_users_result, 'marker', None
-    )
-    while marker:
-        _users = conn.get_all_users(path_prefix=path_prefix, marker=marker)
-        users = users + _users.list_users_response.list_users_result.users
-        marker = getattr(
-            _users.list_users_response.list_users_result, 'marker', None
-        )
-    return users
+    return list(iter_all_users(path_prefix, region=region, key=key, keyid=keyid,
+                               profile=profile))
 
 
 def get_all_user_policies(user_name, marker=None, max_items=None, region=None, key=None, keyid=None, profile=None):
@@ -2084,7 +2104,7 @@ def list_entities_for_policy(policy_name, path_prefix=None, entity_filter=None,
         salt myminion boto_iam.list_entities_for_policy mypolicy
     '''
     conn = _get_conn(region=region, key=key, keyid=keyid, profile=profile)
-    retries = 30
+    backoff = __utils__['boto_retry.backoff']('iam', tries=30)
 
     params = {}
     for arg in ('path_prefix', 'entity_filter'):
@@ -2092,7 +2112,7 @@ def list_entities_for_policy(policy_name, path_prefix=None, entity_filter=None,
             params[arg] = locals()[arg]
 
     policy_arn = _get_policy_arn(policy_name, region, key, keyid, profile)
-    while retries:
+    while True:
         try:
             allret = {
               'policy_groups': [],
@@ -2104,14 +2124,10 @@ def list_entities_for_policy(policy_name, path_prefix=None, entity_filter=None,
                     v.extend(ret.get('list_entities_for_policy_response', {}).get('list_entities_for_policy_result', {}).get(k))
             return allret
         except boto.exception.BotoServerError as e:
-            if e.error_code == 'Throttling':
-                log.debug("Throttled by AWS API, will retry in 5 seconds...")
-                time.sleep(5)
-                retries -= 1
+            if backoff.retry(e):
                 continue
             log.error('Failed to list entities for IAM policy %s: %s', policy_name, e.message)
             return {}
-    return {}
 
 
 def list_attached_user_policies(user_name, path_prefix=None, entity_filter=None,
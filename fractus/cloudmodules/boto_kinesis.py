@@ -48,12 +48,9 @@ Connection module for Amazon Kinesis
 # Import Python libs
 from __future__ import absolute_import, print_function, unicode_literals
 import logging
-import time
-import random
 import sys
 
 # Import Salt libs
-from salt.ext.six.moves import range  # pylint: disable=import-error,redefined-builtin
 import salt.utils.versions
 
 # Import third party libs
@@ -72,6 +69,16 @@ log = logging.getLogger(__name__)
 __virtualname__ = 'boto_kinesis'
 
 
+# How long get_stream_when_active waits, and the bounds of the interval
+# between polls of the streams being waited for.
+WAIT_TIMEOUT = 900
+WAIT_MIN_INTERVAL = 1
+WAIT_MAX_INTERVAL = 10
+
+# Status of streams which couldn't be described.
+_DESCRIBE_FAILED = 'DESCRIBE_FAILED'
+
+
 def __virtual__():
     '''
     Only load if boto3 libraries exist.
@@ -121,10 +128,37 @@ def _get_full_stream(stream_name, region=None, key=None, keyid=None, profile=Non
     return r
 
 
-def get_stream_when_active(stream_name, region=None, key=None, keyid=None, profile=None):
+def _stream_waiter(region=None, key=None, keyid=None, profile=None):
+    '''
+    Return the waiter shared by the waits for the streams of a region. Kinesis
+    can't describe streams in bulk, so every poll describes the pending
+    streams one by one, all from the same background thread.
+    '''
+    def describe(names):
+        conn = _get_conn(region=region, key=key, keyid=keyid, profile=profile)
+        statuses = {}
+        for name in names:
+            # Only get the basic stream, so we don't pull the full list of
+            # shards repeatedly (in case of very large stream)
+            r = _execute_with_retries(conn, 'describe_stream', StreamName=name, Limit=1)
+            if 'error' not in r:
+                statuses[name] = r['result']['StreamDescription']['StreamStatus']
+            elif not (isinstance(r['error'], dict) and
+                      r['error'].get('Code') == 'ResourceNotFoundException'):
+                statuses[name] = _DESCRIBE_FAILED
+        return statuses
+
+    cxkey = __utils__['boto.profile_key']('kinesis', region, key, keyid, profile)
+    return __utils__['boto_waiter.get_waiter'](
+        __context__, ('boto_kinesis', cxkey), describe,
+        min_interval=WAIT_MIN_INTERVAL, max_interval=WAIT_MAX_INTERVAL)
+
+
+def get_stream_when_active(stream_name, region=None, key=None, keyid=None, profile=None,
+                           timeout=WAIT_TIMEOUT):
     '''
     Get complete stream info from AWS, returning only when the stream is in the ACTIVE state.
-    Continues to retry when stream is updating or creating.
+    Continues to retry when stream is updating or creating, for up to ``timeout`` seconds.
     If the stream is deleted during retries, the loop will catch the error and break.
 
     CLI example::
@@ -133,18 +167,16 @@ def get_stream_when_active(stream_name, region=None, key=None, keyid=None, profi
     '''
     conn = _get_conn(region=region, key=key, keyid=keyid, profile=profile)
 
-    stream_status = None
-    # only get basic stream until it's active,
-    # so we don't pull the full list of shards repeatedly (in case of very large stream)
-    attempt = 0
-    max_retry_delay = 10
-    while stream_status != "ACTIVE":
-        time.sleep(_jittered_backoff(attempt, max_retry_delay))
-        attempt += 1
-        stream_response = _get_basic_stream(stream_name, conn)
-        if 'error' in stream_response:
-            return stream_response
-        stream_status = stream_response['result']["StreamDescription"]["StreamStatus"]
+    _stream_waiter(region, key, keyid, profile).add(
+        stream_name, until='ACTIVE', failed=(None, _DESCRIBE_FAILED), timeout=timeout).wait()
+    stream_response = _get_basic_stream(stream_name, conn)
+    if 'error' in stream_response:
+        return stream_response
+    if stream_response['result']["StreamDescription"]["StreamStatus"] != "ACTIVE":
+        stream_response['error'] = 'Stream {0} is not ACTIVE after {1} seconds'.format(
+            stream_name, timeout)
+        log.error(stream_response['error'])
+        return stream_response
 
     # now it's active, get the full stream if necessary
     if stream_response['result']["StreamDescription"]["HasMoreShards"]:
@@ -517,38 +549,26 @@ def _execute_with_retries(conn, function, **kwargs):
     '''
     r = {}
     max_attempts = 18
-    max_retry_delay = 10
-    for attempt in range(max_attempts):
-        log.info("attempt: %s function: %s", attempt, function)
+    # could be rate limited by AWS or another command is blocking,
+    # retry with exponential backoff
+    backoff = __utils__['boto_retry.backoff']('kinesis', tries=max_attempts - 1, base=1, cap=10,
+                                              codes=('LimitExceededException', 'ResourceInUseException'))
+    fn = getattr(conn, function)
+    while True:
+        log.info("attempt: %s function: %s", backoff.attempt, function)
         try:
-            fn = getattr(conn, function)
             r['result'] = fn(**kwargs)
             return r
         except botocore.exceptions.ClientError as e:
-            error_code = e.response['Error']['Code']
-            if "LimitExceededException" in error_code or "ResourceInUseException" in error_code:
-                # could be rate limited by AWS or another command is blocking,
-                # retry with exponential backoff
-                log.debug("Retrying due to AWS exception", exc_info=True)
-                time.sleep(_jittered_backoff(attempt, max_retry_delay))
-            else:
-                # ResourceNotFoundException or InvalidArgumentException
-                r['error'] = e.response['Error']
+            if backoff.retry(e):
+                log.debug("Retried due to AWS exception", exc_info=True)
+                continue
+            if backoff.retryable(e):
+                r['error'] = "Tried to execute function {0} {1} times, but was unable".format(function, max_attempts)
                 log.error(r['error'])
-                r['result'] = None
                 return r
-
-    r['error'] = "Tried to execute function {0} {1} times, but was unable".format(function, max_attempts)
-    log.error(r['error'])
-    return r
-
-
-def _jittered_backoff(attempt, max_retry_delay):
-    '''
-    Basic exponential backoff
-
-    CLI example::
-
-        salt myminion boto_kinesis._jittered_backoff current_attempt_number max_delay_in_seconds
-    '''
-    return min(random.random() * (2 ** attempt), max_retry_delay)
+            # ResourceNotFoundException or InvalidArgumentException
+            r['error'] = e.response['Error']
+            log.error(r['error'])
+            r['result'] = None
+            return r
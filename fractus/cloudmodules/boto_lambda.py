@@ -45,6 +45,17 @@ The dependencies listed above can be installed via package or pip.
             key: askdjghsdfjkghWupUjasdflkdfklgjsdfjajkghs
             region: us-east-1
 
+    Large deployment packages can be staged in an S3 bucket of the same
+    region, instead of being sent in the request body. Packages of at least
+    ``boto_lambda.s3_staging_threshold`` bytes (10MB by default) are then
+    uploaded in parts under ``<prefix><function name>/<sha256>.zip``, and
+    packages which are already staged are not uploaded again:
+
+    .. code-block:: yaml
+
+        boto_lambda.s3_staging_bucket: my-lambda-artifacts
+        boto_lambda.s3_staging_prefix: fractus-lambda/
+
 .. versionchanged:: 2015.8.0
     All methods now return a dictionary. Create and delete methods return:
 
@@ -81,18 +92,21 @@ The dependencies listed above can be installed via package or pip.
 
 # Import Python libs
 from __future__ import absolute_import, print_function, unicode_literals
+import base64
+import binascii
 import logging
-import time
-import random
+import os
+from multiprocessing.pool import ThreadPool
 
 # Import Salt libs
 from salt.ext import six
 import salt.utils.compat
+import salt.utils.data
 import salt.utils.files
 import salt.utils.json
+import salt.utils.stringutils
 import salt.utils.versions
-from salt.exceptions import SaltInvocationError
-from salt.ext.six.moves import range  # pylint: disable=import-error
+from salt.exceptions import CommandExecutionError, SaltInvocationError
 
 log = logging.getLogger(__name__)
 
@@ -104,7 +118,7 @@ try:
     import boto
     import boto3
     # pylint: enable=unused-import
-    from botocore.exceptions import ClientError
+    from botocore.exceptions import BotoCoreError, ClientError
     from botocore import __version__ as found_botocore_version
     logging.getLogger('boto').setLevel(logging.CRITICAL)
     logging.getLogger('boto3').setLevel(logging.CRITICAL)
@@ -193,6 +207,89 @@ def _filedata(infile):
         return f.read()
 
 
+# Deployment packages of at least this many bytes are staged in the
+# boto_lambda.s3_staging_bucket, when it is set, and uploaded in parts
+# instead of being sent in the request body.
+S3_STAGING_THRESHOLD = 10 * 1024 ** 2
+S3_STAGING_PREFIX = 'fractus-lambda/'
+
+
+def code_sha256(ZipFile):
+    '''
+    Return the base64 encoded SHA256 of a deployment package, as reported in
+    the CodeSha256 of a function. The file is read in chunks, and the result
+    is cached by path, size and mtime until the file changes.
+
+    CLI Example:
+
+    .. code-block:: bash
+
+        salt myminion boto_lambda.code_sha256 my_function.zip
+
+    '''
+    digest = __utils__['s3.file_digests'](ZipFile, 'sha256')['hash']
+    return salt.utils.stringutils.to_unicode(base64.b64encode(binascii.unhexlify(digest)))
+
+
+def _stage_code(FunctionName, ZipFile, bucket, region=None, key=None, keyid=None, profile=None):
+    '''
+    Upload a deployment package to the staging bucket, under a key named
+    after its content, and return the key. Packages already staged are not
+    uploaded again.
+    '''
+    digest = __utils__['s3.file_digests'](ZipFile, 'sha256')['hash']
+    s3_key = '{0}{1}/{2}.zip'.format(__opts__.get('boto_lambda.s3_staging_prefix', S3_STAGING_PREFIX),
+                                     FunctionName, digest)
+    name = '{0}/{1}'.format(bucket, s3_key)
+    conn_args = {'region': region, 'key': key, 'keyid': keyid, 'profile': profile}
+    if __salt__['boto_s3.get_object_metadata'](name, **conn_args).get('result'):
+        log.debug('Deployment package %s already staged as %s', ZipFile, name)
+        return s3_key
+    log.info('Staging deployment package %s as %s', ZipFile, name)
+    r = __salt__['boto_s3.upload_file'](ZipFile, name, **conn_args)
+    if 'error' in r:
+        raise CommandExecutionError('Failed to stage {0} as {1}: {2}'.format(
+            ZipFile, name, r['error']['message']))
+    return s3_key
+
+
+def _code_args(FunctionName, ZipFile=None, S3Bucket=None, S3Key=None, S3ObjectVersion=None,
+               region=None, key=None, keyid=None, profile=None):
+    '''
+    Return the Code arguments for a deployment package, staging large
+    ZipFiles in S3.
+    '''
+    if ZipFile:
+        if S3Bucket or S3Key or S3ObjectVersion:
+            raise SaltInvocationError('Either ZipFile must be specified, or '
+                                      'S3Bucket and S3Key must be provided.')
+        bucket = __opts__.get('boto_lambda.s3_staging_bucket')
+        threshold = int(__opts__.get('boto_lambda.s3_staging_threshold', S3_STAGING_THRESHOLD))
+        if not bucket or os.path.getsize(ZipFile) < threshold:
+            return {'ZipFile': _filedata(ZipFile)}
+        S3Bucket = bucket
+        S3Key = _stage_code(FunctionName, ZipFile, bucket,
+                            region=region, key=key, keyid=keyid, profile=profile)
+    elif not S3Bucket or not S3Key:
+        raise SaltInvocationError('Either ZipFile must be specified, or '
+                                  'S3Bucket and S3Key must be provided.')
+    code = {
+        'S3Bucket': S3Bucket,
+        'S3Key': S3Key,
+    }
+    if S3ObjectVersion:
+        code['S3ObjectVersion'] = S3ObjectVersion
+    return code
+
+
+def _role_backoff(wait_for_role, role_retries):
+    '''
+    Backoff for calls which fail until a newly created IAM role has propagated
+    '''
+    return __utils__['boto_retry.backoff']('lambda', tries=role_retries - 1 if wait_for_role else 0,
+                                           base=2, cap=30, codes=('InvalidParameterValueException',))
+
+
 def _resolve_vpcconfig(conf, region=None, key=None, keyid=None, profile=None):
     if isinstance(conf, six.string_types):
         conf = salt.utils.json.loads(conf)
@@ -244,47 +341,25 @@ def create_function(FunctionName, Runtime, Role, Handler, ZipFile=None,
                              keyid=keyid, profile=profile)
     try:
         conn = _get_conn(region=region, key=key, keyid=keyid, profile=profile)
-        if ZipFile:
-            if S3Bucket or S3Key or S3ObjectVersion:
-                raise SaltInvocationError('Either ZipFile must be specified, or '
-                                          'S3Bucket and S3Key must be provided.')
-            code = {
-                'ZipFile': _filedata(ZipFile),
-            }
-        else:
-            if not S3Bucket or not S3Key:
-                raise SaltInvocationError('Either ZipFile must be specified, or '
-                                          'S3Bucket and S3Key must be provided.')
-            code = {
-                'S3Bucket': S3Bucket,
-                'S3Key': S3Key,
-            }
-            if S3ObjectVersion:
-                code['S3ObjectVersion'] = S3ObjectVersion
+        code = _code_args(FunctionName, ZipFile, S3Bucket, S3Key, S3ObjectVersion,
+                          region=region, key=key, keyid=keyid, profile=profile)
         kwargs = {}
         if VpcConfig is not None:
             kwargs['VpcConfig'] = _resolve_vpcconfig(VpcConfig, region=region, key=key, keyid=keyid, profile=profile)
         if Environment is not None:
             kwargs['Environment'] = Environment
-        if WaitForRole:
-            retrycount = RoleRetries
-        else:
-            retrycount = 1
-        for retry in range(retrycount, 0, -1):
+        backoff = _role_backoff(WaitForRole, RoleRetries)
+        while True:
             try:
                 func = conn.create_function(FunctionName=FunctionName, Runtime=Runtime, Role=role_arn, Handler=Handler,
                                             Code=code, Description=Description, Timeout=Timeout, MemorySize=MemorySize,
                                             Publish=Publish, **kwargs)
             except ClientError as e:
-                if retry > 1 and e.response.get('Error', {}).get('Code') == 'InvalidParameterValueException':
+                if backoff.retry(e):
                     log.info(
                         'Function not created but IAM role may not have propagated, will retry')
-                    # exponential backoff
-                    time.sleep((2 ** (RoleRetries - retry)) +
-                               (random.randint(0, 1000) / 1000))
                     continue
-                else:
-                    raise
+                raise
             else:
                 break
         if func:
@@ -296,6 +371,8 @@ def create_function(FunctionName, Runtime, Role, Handler, ZipFile=None,
             return {'created': False}
     except ClientError as e:
         return {'created': False, 'error': __utils__['boto3.get_error'](e)}
+    except CommandExecutionError as e:
+        return {'created': False, 'error': {'message': six.text_type(e)}}
 
 
 def delete_function(FunctionName, Qualifier=None, region=None, key=None, keyid=None, profile=None):
@@ -401,23 +478,16 @@ def update_function_config(FunctionName, Role=None, Handler=None,
     if VpcConfig:
         args['VpcConfig'] = _resolve_vpcconfig(VpcConfig, region=region, key=key, keyid=keyid, profile=profile)
     try:
-        if WaitForRole:
-            retrycount = RoleRetries
-        else:
-            retrycount = 1
-        for retry in range(retrycount, 0, -1):
+        backoff = _role_backoff(WaitForRole, RoleRetries)
+        while True:
             try:
                 r = conn.update_function_configuration(**args)
             except ClientError as e:
-                if retry > 1 and e.response.get('Error', {}).get('Code') == 'InvalidParameterValueException':
+                if backoff.retry(e):
                     log.info(
                         'Function not updated but IAM role may not have propagated, will retry')
-                    # exponential backoff
-                    time.sleep((2 ** (RoleRetries - retry)) +
-                               (random.randint(0, 1000) / 1000))
                     continue
-                else:
-                    raise
+                raise
             else:
                 break
         if r:
@@ -451,25 +521,10 @@ def update_function_code(FunctionName, ZipFile=None, S3Bucket=None, S3Key=None,
 
     conn = _get_conn(region=region, key=key, keyid=keyid, profile=profile)
     try:
-        if ZipFile:
-            if S3Bucket or S3Key or S3ObjectVersion:
-                raise SaltInvocationError('Either ZipFile must be specified, or '
-                                          'S3Bucket and S3Key must be provided.')
-            r = conn.update_function_code(FunctionName=FunctionName,
-                                          ZipFile=_filedata(ZipFile),
-                                          Publish=Publish)
-        else:
-            if not S3Bucket or not S3Key:
-                raise SaltInvocationError('Either ZipFile must be specified, or '
-                                          'S3Bucket and S3Key must be provided.')
-            args = {
-                'S3Bucket': S3Bucket,
-                'S3Key': S3Key,
-            }
-            if S3ObjectVersion:
-                args['S3ObjectVersion'] = S3ObjectVersion
-            r = conn.update_function_code(FunctionName=FunctionName,
-                                          Publish=Publish, **args)
+        args = _code_args(FunctionName, ZipFile, S3Bucket, S3Key, S3ObjectVersion,
+                          region=region, key=key, keyid=keyid, profile=profile)
+        r = conn.update_function_code(FunctionName=FunctionName,
+                                      Publish=Publish, **args)
         if r:
             keys = ('FunctionName', 'Runtime', 'Role', 'Handler', 'CodeSha256',
                     'CodeSize', 'Description', 'Timeout', 'MemorySize',
@@ -480,6 +535,8 @@ def update_function_code(FunctionName, ZipFile=None, S3Bucket=None, S3Key=None,
             return {'updated': False}
     except ClientError as e:
         return {'updated': False, 'error': __utils__['boto3.get_error'](e)}
+    except CommandExecutionError as e:
+        return {'updated': False, 'error': {'message': six.text_type(e)}}
 
 
 def add_permission(FunctionName, StatementId, Action, Principal, SourceArn=None,
@@ -619,6 +676,217 @@ def list_functions(region=None, key=None, keyid=None, profile=None):
     return ret
 
 
+# Number of functions deploy_functions works on at a time
+DEPLOY_WORKERS = 8
+
+
+def _config_changes(func, spec, role_arn, conn_args):
+    '''
+    Return the configuration settings of a function spec which differ from
+    the listed function. Settings missing from the spec are left alone.
+    '''
+    changes = {}
+    if role_arn and func.get('Role') != role_arn:
+        changes['Role'] = role_arn
+    for option in ('Handler', 'Description', 'Timeout', 'MemorySize', 'Environment'):
+        if option in spec and func.get(option) != spec[option]:
+            changes[option] = spec[option]
+    if 'VpcConfig' in spec:
+        vpc_config = _resolve_vpcconfig(spec['VpcConfig'], **conn_args) or \
+            {'SubnetIds': [], 'SecurityGroupIds': []}
+        current = dict(func.get('VpcConfig') or {})
+        current.pop('VpcId', None)
+        if __utils__['boto3.ordered'](current or None) != __utils__['boto3.ordered'](vpc_config):
+            changes['VpcConfig'] = vpc_config
+    return changes
+
+
+def _s3_code_sha256(spec, conn_args):
+    '''
+    Return the base64 encoded SHA256 S3 keeps for a deployment package, or
+    None if the object was not uploaded with a SHA256 checksum. Checksums of
+    multipart uploads are not the SHA256 of the whole object and are ignored.
+    '''
+    args = {'Bucket': spec['S3Bucket'], 'Key': spec['S3Key'], 'ChecksumMode': 'ENABLED'}
+    if spec.get('S3ObjectVersion'):
+        args['VersionId'] = spec['S3ObjectVersion']
+    conn = __utils__['boto3.get_connection']('s3', **conn_args)
+    try:
+        checksum = conn.head_object(**args).get('ChecksumSHA256')
+    except (ClientError, BotoCoreError) as e:
+        # botocore releases without checksum support reject ChecksumMode
+        # with a ParamValidationError
+        log.debug('Unable to get the checksum of s3://%s/%s: %s', spec['S3Bucket'], spec['S3Key'], e)
+        return None
+    if not checksum or '-' in checksum:
+        return None
+    return checksum
+
+
+def _code_changed(func, spec, conn_args):
+    '''
+    Check if the deployment package of a spec differs from the code of the
+    deployed function. ZipFiles are compared by size and CodeSha256. Code in
+    S3 is compared with the CodeSha256 given in the spec, or else with the
+    SHA256 checksum of the S3 object (at S3ObjectVersion), and is updated,
+    which is idempotent, when neither is available.
+    '''
+    if spec.get('ZipFile'):
+        if os.path.getsize(spec['ZipFile']) != func.get('CodeSize'):
+            return True
+        return code_sha256(spec['ZipFile']) != func.get('CodeSha256')
+    if not spec.get('S3Key'):
+        return False
+    sha256 = spec.get('CodeSha256') or _s3_code_sha256(spec, conn_args)
+    if sha256 is None:
+        return True
+    return sha256 != func.get('CodeSha256')
+
+
+def _sync_permissions(FunctionName, Permissions, conn_args):
+    current = get_permissions(FunctionName, **conn_args)
+    if 'error' in current:
+        return current
+    diffs = salt.utils.data.compare_dicts(current.get('permissions') or {}, Permissions or {})
+    for sid, diff in six.iteritems(diffs):
+        if diff.get('old', '') != '':
+            r = remove_permission(FunctionName=FunctionName, StatementId=sid, **conn_args)
+            if not r.get('updated'):
+                return r
+        if diff.get('new', '') != '':
+            r = add_permission(FunctionName=FunctionName, StatementId=sid,
+                               **dict(conn_args, **diff['new']))
+            if not r.get('updated'):
+                return r
+    return {'updated': bool(diffs)}
+
+
+def _deploy_function(spec, func, role_arn, test, conn_args):
+    '''
+    Create or update a single function, returning ``(name, status, details)``.
+    '''
+    name = spec['FunctionName']
+    code = dict((k, spec.get(k)) for k in ('ZipFile', 'S3Bucket', 'S3Key', 'S3ObjectVersion'))
+    role_args = {'WaitForRole': True, 'RoleRetries': spec.get('RoleRetries', 5)}
+    try:
+        if func is None:
+            if not (spec.get('Runtime') and role_arn and spec.get('Handler')):
+                raise SaltInvocationError('Runtime, Role and Handler are required to create '
+                                          'function {0}.'.format(name))
+            if test:
+                return name, 'created', None
+            r = create_function(name, spec.get('Runtime'), role_arn, spec.get('Handler'),
+                                Description=spec.get('Description', ''),
+                                Timeout=spec.get('Timeout', 3),
+                                MemorySize=spec.get('MemorySize', 128),
+                                Publish=spec.get('Publish', False),
+                                VpcConfig=spec.get('VpcConfig'),
+                                Environment=spec.get('Environment'),
+                                **dict(conn_args, **dict(code, **role_args)))
+            if not r.get('created'):
+                return name, 'failed', r.get('error', {'message': 'Function was not created'})
+            status, details = 'created', None
+        else:
+            details = []
+            config = _config_changes(func, spec, role_arn, conn_args)
+            if config:
+                details.append('config')
+                if not test:
+                    r = update_function_config(name, **dict(conn_args, **dict(config, **role_args)))
+                    if not r.get('updated'):
+                        return name, 'failed', r.get('error', {'message': 'Function config was not updated'})
+            if _code_changed(func, spec, conn_args):
+                details.append('code')
+                if not test:
+                    r = update_function_code(name, Publish=spec.get('Publish', False),
+                                             **dict(conn_args, **code))
+                    if not r.get('updated'):
+                        return name, 'failed', r.get('error', {'message': 'Function code was not updated'})
+            status = 'updated' if details else 'unchanged'
+        if 'Permissions' in spec and not (test and func is None):
+            if test:
+                current = get_permissions(name, **conn_args).get('permissions') or {}
+                r = {'updated': bool(salt.utils.data.compare_dicts(current, spec['Permissions'] or {}))}
+            else:
+                r = _sync_permissions(name, spec['Permissions'], conn_args)
+            if 'error' in r:
+                return name, 'failed', r['error']
+            if r['updated'] and status != 'created':
+                status = 'updated'
+                details.append('permissions')
+        return name, status, details
+    except (SaltInvocationError, CommandExecutionError, ClientError, IOError, OSError) as e:
+        log.error('Failed to deploy function %s: %s', name, e)
+        if isinstance(e, ClientError):
+            return name, 'failed', __utils__['boto3.get_error'](e)
+        return name, 'failed', {'message': six.text_type(e)}
+
+
+def deploy_functions(functions, workers=DEPLOY_WORKERS, test=False,
+                     region=None, key=None, keyid=None, profile=None):
+    '''
+    Create or update many functions at once. ``functions`` is a list of
+    dictionaries taking the arguments of :py:func:`create_function`, and
+    optionally ``Permissions`` by statement id as returned by
+    :py:func:`get_permissions`.
+
+    The functions are compared with a single listing of every function of
+    the account, and up to ``workers`` functions have their configuration,
+    code and permissions updated at a time. Settings missing from a spec are
+    left alone on existing functions. Code in S3 is only updated when the
+    ``CodeSha256`` of the spec, or the SHA256 checksum of the S3 object,
+    differs from the function's, or when neither is known. A failure only
+    stops the function it happened to. Pass ``test=True`` to only report what
+    would change.
+
+    Returns {'result': {'created': [name, ...], 'updated': {name: ['config',
+    'code', 'permissions']}, 'unchanged': [name, ...], 'failed': {name:
+    error}}}.
+
+    CLI Example:
+
+    .. code-block:: bash
+
+        salt myminion boto_lambda.deploy_functions \
+            '[{"FunctionName": "myfunction", "Runtime": "python2.7", "Role": "myrole",
+               "Handler": "file.method", "ZipFile": "/srv/myfunction.zip"}]' workers=16
+
+    '''
+    if isinstance(functions, six.string_types):
+        functions = salt.utils.json.loads(functions)
+    if not all(spec.get('FunctionName') for spec in functions):
+        raise SaltInvocationError('Every function must have a FunctionName.')
+    conn_args = {'region': region, 'key': key, 'keyid': keyid, 'profile': profile}
+    try:
+        current = dict((func['FunctionName'], func) for func in list_functions(**conn_args))
+    except ClientError as e:
+        return {'error': __utils__['boto3.get_error'](e)}
+
+    # Resolve every role once instead of looking up the account per function
+    role_arns = {}
+    for role in set(spec['Role'] for spec in functions if spec.get('Role')):
+        role_arns[role] = _get_role_arn(role, **conn_args)
+
+    def _deploy(spec):
+        return _deploy_function(spec, current.get(spec['FunctionName']),
+                                role_arns.get(spec.get('Role')), test, conn_args)
+
+    ret = {'created': [], 'updated': {}, 'unchanged': [], 'failed': {}}
+    pool = ThreadPool(max(int(workers), 1))
+    try:
+        for name, status, details in pool.imap(_deploy, functions):
+            if status == 'failed':
+                ret['failed'][name] = details
+            elif status == 'updated':
+                ret['updated'][name] = details
+            else:
+                ret[status].append(name)
+    finally:
+        pool.close()
+        pool.join()
+    return {'result': ret}
+
+
 def list_function_versions(FunctionName,
                            region=None, key=None, keyid=None, profile=None):
     '''
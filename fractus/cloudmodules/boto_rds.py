@@ -39,6 +39,14 @@ Connection module for Amazon RDS
             key: askdjghsdfjkghWupUjasdflkdfklgjsdfjajkghs
             region: us-east-1
 
+    The waits of create and delete for the status of DB instances can be
+    deferred to the end of the run, where all the deferred waits are settled
+    at once by :py:func:`wait_for_deferred`:
+
+    .. code-block:: yaml
+
+        boto_rds.defer_wait: True
+
 :depends: boto3
 '''
 # keep lint from choking on _get_conn and _cache_id
@@ -50,10 +58,10 @@ Connection module for Amazon RDS
 # Import Python libs
 from __future__ import absolute_import, print_function, unicode_literals
 import logging
-import time
 
 # Import Salt libs
 import salt.utils.compat
+import salt.utils.json
 import salt.utils.odict as odict
 import salt.utils.versions
 from salt.exceptions import SaltInvocationError
@@ -122,6 +130,17 @@ boto3_param_map = {
 }
 
 
+# Seconds create waits for wait_status, and the bounds of the interval
+# between polls of the DB instances being waited for.
+WAIT_TIMEOUT = 3600
+WAIT_MIN_INTERVAL = 10
+WAIT_MAX_INTERVAL = 60
+
+# Statuses DB instances don't recover from by themselves.
+FAILED_STATI = ('failed', 'incompatible-network', 'incompatible-parameters',
+                'incompatible-restore', 'storage-full', 'deleting')
+
+
 def __virtual__():
     '''
     Only load if boto libraries exist and if boto libraries are greater than
@@ -296,24 +315,20 @@ def create(name, allocated_storage, db_instance_class, engine,
             return {'created': True, 'message':
                     'RDS instance {0} created.'.format(name)}
 
-        while True:
-            jmespath = 'DBInstances[*].DBInstanceStatus'
-            status = describe_db_instances(name=name, jmespath=jmespath,
-                                           region=region, key=key, keyid=keyid,
-                                           profile=profile)
-            if len(status):
-                stat = status[0]
-            else:
-                # Whoops, something is horribly wrong...
-                return {'created': False,
-                        'error': "RDS instance {0} should have been created but"
-                                 " now I can't find it.".format(name)}
-            if stat == wait_status:
-                return {'created': True,
-                        'message': 'RDS instance {0} created (current status '
-                        '{1})'.format(name, stat)}
-            time.sleep(10)
-            log.info('Instance status after 10 seconds is: %s', stat)
+        wait = _db_waiter(region, key, keyid, profile).add(
+            name, until=wait_status, failed=FAILED_STATI, timeout=WAIT_TIMEOUT)
+        if _defer_wait():
+            __utils__['boto_waiter.defer'](__context__, 'boto_rds', wait)
+            return {'created': True,
+                    'message': 'RDS instance {0} created, waiting for status {1} '
+                    'at the end of the run.'.format(name, wait_status)}
+        if wait.wait():
+            return {'created': True,
+                    'message': 'RDS instance {0} created (current status '
+                    '{1})'.format(name, wait.status)}
+        return {'created': False,
+                'error': 'RDS instance {0} should have been created but is {1} '
+                         'instead of {2}.'.format(name, wait.status or 'missing', wait_status)}
 
     except ClientError as e:
         return {'error': __utils__['boto3.get_error'](e)}
@@ -572,6 +587,67 @@ def describe(name, tags=None, region=None, key=None, keyid=None,
         return {'rds': None}
 
 
+def _db_waiter(region=None, key=None, keyid=None, profile=None):
+    '''
+    Return the waiter shared by the waits for the DB instances of a region,
+    which describes up to 100 pending instances per call.
+    '''
+    def describe(names):
+        conn = _get_conn(region=region, key=key, keyid=keyid, profile=profile)
+        pages = conn.get_paginator('describe_db_instances').paginate(
+            Filters=[{'Name': 'db-instance-id', 'Values': names}])
+        return dict((db['DBInstanceIdentifier'], db['DBInstanceStatus'])
+                    for page in pages for db in page['DBInstances'])
+
+    cxkey = __utils__['boto.profile_key']('rds', region, key, keyid, profile)
+    return __utils__['boto_waiter.get_waiter'](
+        __context__, ('boto_rds', cxkey), describe,
+        min_interval=WAIT_MIN_INTERVAL, max_interval=WAIT_MAX_INTERVAL)
+
+
+def wait_for_status(names, status='available', timeout=WAIT_TIMEOUT, region=None,
+                    key=None, keyid=None, profile=None):
+    '''
+    Wait until many RDS instances reach ``status``, polling all of them at
+    once. Pass ``status=None`` to wait for their deletion.
+
+    Returns ``{'ready': [...], 'not_ready': {name: status}}``.
+
+    CLI example::
+
+        salt myminion boto_rds.wait_for_status '["myrds1", "myrds2"]' timeout=1800
+    '''
+    if isinstance(names, six.string_types):
+        names = salt.utils.json.loads(names)
+    conn = _get_conn(region=region, key=key, keyid=keyid, profile=profile)
+    if not conn:
+        return {'results': bool(conn)}
+    waiter = _db_waiter(region, key, keyid, profile)
+    waits = [waiter.add(name, until=status, failed=FAILED_STATI if status else (),
+                        timeout=timeout) for name in names]
+    __utils__['boto_waiter.wait_all'](waits)
+    return {'ready': [wait.key for wait in waits if wait.result],
+            'not_ready': dict((wait.key, wait.status) for wait in waits if not wait.result)}
+
+
+def _defer_wait():
+    return __opts__.get('boto_rds.defer_wait', False)
+
+
+def wait_for_deferred(timeout=None):
+    '''
+    Wait for the DB instances whose status create and delete deferred waiting
+    for, see the ``boto_rds.defer_wait`` option. Returns the names of the
+    instances which are ``ready``, and of those which ``failed`` or are still
+    ``pending`` after ``timeout`` seconds.
+
+    CLI example::
+
+        salt myminion boto_rds.wait_for_deferred timeout=1800
+    '''
+    return __utils__['boto_waiter.wait_deferred'](__context__, 'boto_rds', timeout)
+
+
 def describe_db_instances(name=None, filters=None, jmespath='DBInstances',
                           region=None, key=None, keyid=None, profile=None):
     '''
@@ -657,6 +733,9 @@ def delete(name, skip_final_snapshot=None, final_db_snapshot_identifier=None,
     '''
     Delete an RDS instance.
 
+    Pass ``wait_for_deletion=defer``, or set the ``boto_rds.defer_wait``
+    option, to wait for the deletion at the end of the run instead.
+
     CLI example::
 
         salt myminion boto_rds.delete myrds skip_final_snapshot=True \
@@ -688,22 +767,21 @@ def delete(name, skip_final_snapshot=None, final_db_snapshot_identifier=None,
             return {'deleted': bool(res), 'message':
                     'Deleted RDS instance {0}.'.format(name)}
 
-        start_time = time.time()
-        while True:
-            res = __salt__['boto_rds.exists'](name=name, tags=tags, region=region,
-                                               key=key, keyid=keyid,
-                                               profile=profile)
-            if not res.get('exists'):
-                return {'deleted': bool(res), 'message':
-                        'Deleted RDS instance {0} completely.'.format(name)}
-
-            if time.time() - start_time > timeout:
-                raise SaltInvocationError('RDS instance {0} has not been '
-                                          'deleted completely after {1} '
-                                          'seconds'.format(name, timeout))
-            log.info('Waiting up to %s seconds for RDS instance %s to be '
-                     'deleted.', timeout, name)
-            time.sleep(10)
+        wait = _db_waiter(region, key, keyid, profile).add(
+            name, until=None, timeout=timeout)
+        if wait_for_deletion == 'defer' or _defer_wait():
+            __utils__['boto_waiter.defer'](__context__, 'boto_rds', wait)
+            return {'deleted': bool(res), 'message':
+                    'Deleted RDS instance {0}, waiting for it to be gone at the '
+                    'end of the run.'.format(name)}
+        log.info('Waiting up to %s seconds for RDS instance %s to be '
+                 'deleted.', timeout, name)
+        if not wait.wait():
+            raise SaltInvocationError('RDS instance {0} has not been '
+                                      'deleted completely after {1} '
+                                      'seconds'.format(name, timeout))
+        return {'deleted': True, 'message':
+                'Deleted RDS instance {0} completely.'.format(name)}
     except ClientError as e:
         return {'error': __utils__['boto3.get_error'](e)}
 
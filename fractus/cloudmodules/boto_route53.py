@@ -49,7 +49,6 @@ from __future__ import absolute_import, print_function, unicode_literals
 
 # Import Python libs
 import logging
-import time
 
 # Import salt libs
 import salt.utils.compat
@@ -145,8 +144,8 @@ def describe_hosted_zones(zone_id=None, domain_name=None, region=None,
     if zone_id and domain_name:
         raise SaltInvocationError('At most one of zone_id or domain_name may '
                                   'be provided')
-    retries = 10
-    while retries:
+    backoff = __utils__['boto_retry.backoff']('route53', tries=10, retry_all=True)
+    while True:
         try:
             if zone_id:
                 zone_id = zone_id.replace('/hostedzone/',
@@ -166,14 +165,7 @@ def describe_hosted_zones(zone_id=None, domain_name=None, region=None,
                     marker = r['ListHostedZonesResponse'].get('NextMarker', '')
             return ret if ret else []
         except DNSServerError as e:
-            if retries:
-                if 'Throttling' == e.code:
-                    log.debug('Throttled by AWS API.')
-                elif 'PriorRequestNotComplete' == e.code:
-                    log.debug('The request was rejected by AWS API.\
-                              Route 53 was still processing a prior request')
-                time.sleep(3)
-                retries -= 1
+            if backoff.retry(e):
                 continue
             log.error('Could not list zones: %s', e.message)
             return []
@@ -265,19 +257,13 @@ def zone_exists(zone, region=None, key=None, keyid=None, profile=None,
         if rate_limit_retries is not None:
             error_retries = rate_limit_retries
 
-    while error_retries > 0:
+    backoff = __utils__['boto_retry.backoff']('route53', tries=error_retries, retry_all=retry_on_errors)
+    while True:
         try:
             return bool(conn.get_zone(zone))
 
         except DNSServerError as e:
-            if retry_on_errors:
-                if 'Throttling' == e.code:
-                    log.debug('Throttled by AWS API.')
-                elif 'PriorRequestNotComplete' == e.code:
-                    log.debug('The request was rejected by AWS API.\
-                              Route 53 was still processing a prior request')
-                time.sleep(3)
-                error_retries -= 1
+            if backoff.retry(e):
                 continue
             raise e
 
@@ -421,19 +407,13 @@ def create_healthcheck(ip_addr=None, fqdn=None, region=None, key=None, keyid=Non
 
     conn = _get_conn(region=region, key=key, keyid=keyid, profile=profile)
 
-    while error_retries > 0:
+    backoff = __utils__['boto_retry.backoff']('route53', tries=error_retries, retry_all=retry_on_errors)
+    while True:
         try:
             return {'result': conn.create_health_check(hc_)}
         except DNSServerError as exc:
             log.debug(exc)
-            if retry_on_errors:
-                if 'Throttling' == exc.code:
-                    log.debug('Throttled by AWS API.')
-                elif 'PriorRequestNotComplete' == exc.code:
-                    log.debug('The request was rejected by AWS API.\
-                              Route 53 was still processing a prior request')
-                time.sleep(3)
-                error_retries -= 1
+            if backoff.retry(exc):
                 continue
             return {'error': __utils__['boto.get_error'](exc)}
     return False
@@ -499,7 +479,8 @@ def get_record(name, zone, record_type, fetch_all=False, region=None, key=None,
         if rate_limit_retries is not None:
             error_retries = rate_limit_retries
 
-    while error_retries > 0:
+    backoff = __utils__['boto_retry.backoff']('route53', tries=error_retries, retry_all=retry_on_errors)
+    while True:
         try:
             if split_dns:
                 _zone = _get_split_zone(zone, conn, private_zone)
@@ -519,14 +500,7 @@ def get_record(name, zone, record_type, fetch_all=False, region=None, key=None,
             break  # the while True
 
         except DNSServerError as e:
-            if retry_on_errors:
-                if 'Throttling' == e.code:
-                    log.debug('Throttled by AWS API.')
-                elif 'PriorRequestNotComplete' == e.code:
-                    log.debug('The request was rejected by AWS API.\
-                              Route 53 was still processing a prior request')
-                time.sleep(3)
-                error_retries -= 1
+            if backoff.retry(e):
                 continue
             raise e
 
@@ -580,7 +554,8 @@ def add_record(name, value, zone, record_type, identifier=None, ttl=None,
         if rate_limit_retries is not None:
             error_retries = rate_limit_retries
 
-    while error_retries > 0:
+    backoff = __utils__['boto_retry.backoff']('route53', tries=error_retries, retry_all=retry_on_errors)
+    while True:
         try:
             if split_dns:
                 _zone = _get_split_zone(zone, conn, private_zone)
@@ -594,35 +569,21 @@ def add_record(name, value, zone, record_type, identifier=None, ttl=None,
             break
 
         except DNSServerError as e:
-            if retry_on_errors:
-                if 'Throttling' == e.code:
-                    log.debug('Throttled by AWS API.')
-                elif 'PriorRequestNotComplete' == e.code:
-                    log.debug('The request was rejected by AWS API.\
-                              Route 53 was still processing a prior request')
-                time.sleep(3)
-                error_retries -= 1
+            if backoff.retry(e):
                 continue
             raise e
 
     _value = _munge_value(value, _type)
-    while error_retries > 0:
+    while True:
         try:
             # add_record requires a ttl value, annoyingly.
             if ttl is None:
                 ttl = 60
             status = _zone.add_record(_type, name, _value, ttl, identifier)
-            return _wait_for_sync(status.id, conn, wait_for_sync)
+            return _wait_for_sync(status.id, wait_for_sync, region, key, keyid, profile)
 
         except DNSServerError as e:
-            if retry_on_errors:
-                if 'Throttling' == e.code:
-                    log.debug('Throttled by AWS API.')
-                elif 'PriorRequestNotComplete' == e.code:
-                    log.debug('The request was rejected by AWS API.\
-                              Route 53 was still processing a prior request')
-                time.sleep(3)
-                error_retries -= 1
+            if backoff.retry(e):
                 continue
             raise e
 
@@ -668,23 +629,17 @@ def update_record(name, value, zone, record_type, identifier=None, ttl=None,
             error_retries = rate_limit_retries
 
     _value = _munge_value(value, _type)
-    while error_retries > 0:
+    backoff = __utils__['boto_retry.backoff']('route53', tries=error_retries, retry_all=retry_on_errors)
+    while True:
         try:
             old_record = _zone.find_records(name, _type, identifier=identifier)
             if not old_record:
                 return False
             status = _zone.update_record(old_record, _value, ttl, identifier)
-            return _wait_for_sync(status.id, conn, wait_for_sync)
+            return _wait_for_sync(status.id, wait_for_sync, region, key, keyid, profile)
 
         except DNSServerError as e:
-            if retry_on_errors:
-                if 'Throttling' == e.code:
-                    log.debug('Throttled by AWS API.')
-                elif 'PriorRequestNotComplete' == e.code:
-                    log.debug('The request was rejected by AWS API.\
-                              Route 53 was still processing a prior request')
-                time.sleep(3)
-                error_retries -= 1
+            if backoff.retry(e):
                 continue
             raise e
 
@@ -729,29 +684,23 @@ def delete_record(name, zone, record_type, identifier=None, all_records=False,
         if rate_limit_retries is not None:
             error_retries = rate_limit_retries
 
-    while error_retries > 0:
+    backoff = __utils__['boto_retry.backoff']('route53', tries=error_retries, retry_all=retry_on_errors)
+    while True:
         try:
             old_record = _zone.find_records(name, _type, all=all_records, identifier=identifier)
             if not old_record:
                 return False
             status = _zone.delete_record(old_record)
-            return _wait_for_sync(status.id, conn, wait_for_sync)
+            return _wait_for_sync(status.id, wait_for_sync, region, key, keyid, profile)
 
         except DNSServerError as e:
-            if retry_on_errors:
-                if 'Throttling' == e.code:
-                    log.debug('Throttled by AWS API.')
-                elif 'PriorRequestNotComplete' == e.code:
-                    log.debug('The request was rejected by AWS API.\
-                              Route 53 was still processing a prior request')
-                time.sleep(3)
-                error_retries -= 1
+            if backoff.retry(e):
                 continue
             raise e
 
 
 def _try_func(conn, func, **args):
-    tries = 30
+    backoff = __utils__['boto_retry.backoff']('route53', tries=30)
     while True:
         try:
             return getattr(conn, func)(**args)
@@ -761,38 +710,56 @@ def _try_func(conn, func, **args):
                       func, conn)
             return None
         except DNSServerError as e:
-            if tries and e.code == 'Throttling':
-                log.debug('Throttled by AWS API.  Will retry in 5 seconds')
-                time.sleep(5)
-                tries -= 1
+            if backoff.retry(e):
                 continue
             log.error('Failed calling %s(): %s', func, e)
             return None
 
 
-def _wait_for_sync(status, conn, wait=True):
-    ### Wait should be a bool or an integer
+def _change_waiter():
+    return __utils__['route53.get_waiter'](__context__)
+
+
+def _wait_for_sync(status, wait=True, region=None, key=None, keyid=None, profile=None):
+    ### Wait should be a bool, an integer or 'defer'
+    def _get_status(change_id):
+        # Deferred changes are polled from other threads, and boto
+        # connections are pooled per thread
+        conn = _get_conn(region=region, key=key, keyid=keyid, profile=profile)
+        change = __utils__['boto_retry.call']('route53', conn.get_change, change_id)
+        return change.GetChangeResponse.ChangeInfo.Status
+
+    if wait is True and __opts__.get('boto_route53.defer_sync', False):
+        wait = 'defer'
+    if wait == 'defer':
+        # Confirmed later by wait_for_changes, all deferred changes at once
+        _change_waiter().add(status, _get_status)
+        log.debug('Deferred waiting for Route53 change %s', status)
+        return True
     if wait is True:
         wait = 600
     if not wait:
         return True
-    orig_wait = wait
-    log.info('Waiting up to %s seconds for Route53 changes to synchronize', orig_wait)
-    while wait > 0:
-        change = conn.get_change(status)
-        current = change.GetChangeResponse.ChangeInfo.Status
-        if current == 'INSYNC':
-            return True
-        sleep = wait if wait % 60 == wait else 60
-        log.info(
-            'Sleeping %s seconds waiting for changes to synch (current status %s)',
-            sleep, current
-        )
-        time.sleep(sleep)
-        wait -= sleep
-        continue
-    log.error('Route53 changes not synced after %s seconds.', orig_wait)
-    return False
+    waiter = _change_waiter()
+    waiter.add(status, _get_status)
+    return not waiter.wait([status], timeout=wait)
+
+
+def wait_for_changes(timeout=600):
+    '''
+    Wait for every Route53 change applied with ``wait_for_sync=defer`` to be
+    in sync, polling them together. Returns the ids of the changes which
+    were confirmed and of those still pending after ``timeout`` seconds.
+
+    CLI example::
+
+        salt myminion boto_route53.wait_for_changes timeout=300
+    '''
+    waiter = _change_waiter()
+    changes = waiter.pending()
+    pending = waiter.wait(changes, timeout=timeout)
+    return {'synced': [change for change in changes if change not in pending],
+            'pending': pending}
 
 
 def create_hosted_zone(domain_name, caller_ref=None, comment='', private_zone=False, vpc_id=None,
@@ -908,7 +875,7 @@ def create_hosted_zone(domain_name, caller_ref=None, comment='', private_zone=Fa
     r = r.get('CreateHostedZoneResponse', {})
     # Pop it since it'll be irrelevant by the time we return
     status = r.pop('ChangeInfo', {}).get('Id', '').replace('/change/', '')
-    synced = _wait_for_sync(status, conn, wait=600)
+    synced = _wait_for_sync(status, 600, region, key, keyid, profile)
     if not synced:
         log.error('Hosted zone %s not synced after 600 seconds.', domain_name)
         return None
@@ -53,6 +53,8 @@ Connection module for Amazon S3 using boto3
 # Import Python libs
 from __future__ import absolute_import, print_function, unicode_literals
 import logging
+import os
+from multiprocessing.pool import ThreadPool
 
 # Import Salt libs
 import salt.utils.versions
@@ -64,6 +66,7 @@ try:
     # pylint: disable=unused-import
     import boto3
     # pylint: enable=unused-import
+    import boto3.s3.transfer
     import botocore
     logging.getLogger('boto3').setLevel(logging.CRITICAL)
     HAS_BOTO = True
@@ -71,6 +74,20 @@ except ImportError:
     HAS_BOTO = False
 # pylint: enable=import-error
 
+# Keys of transfer_config which are passed on to boto3's TransferConfig
+TRANSFER_CONFIG_KEYS = frozenset([
+    'multipart_threshold',
+    'multipart_chunksize',
+    'max_concurrency',
+    'num_download_attempts',
+    'max_io_queue',
+    'io_chunksize',
+    'use_threads',
+])
+SYNC_WORKERS = 8
+# Keys per DeleteObjects call, the most S3 accepts
+DELETE_BATCH = 1000
+
 
 def __virtual__():
     '''
@@ -132,10 +149,45 @@ def get_object_metadata(
     return {'result': metadata}
 
 
+def _transfer_settings(transfer_config=None):
+    '''
+    Merge ``transfer_config`` over the ``boto_s3.transfer_config`` option.
+    '''
+    settings = dict(__salt__['config.get']('boto_s3.transfer_config', {}) or {})
+    settings.update(transfer_config or {})
+    unknown = set(settings) - TRANSFER_CONFIG_KEYS
+    if unknown:
+        log.warning('Ignoring unknown transfer_config keys %s', sorted(unknown))
+    return dict((k, v) for k, v in settings.items() if k in TRANSFER_CONFIG_KEYS)
+
+
+def file_digests(
+    source,
+    hash_type=None,
+    transfer_config=None,
+):
+    '''
+    Get the content hash of a local file and the ETag S3 will report for it
+    once uploaded with the given transfer settings. Results are cached until
+    the file changes.
+
+    CLI Example:
+
+    .. code-block:: bash
+
+        salt myminion boto_s3.file_digests /path/to/local/file
+    '''
+    settings = _transfer_settings(transfer_config)
+    multipart = dict((k, settings[k]) for k in ('multipart_threshold', 'multipart_chunksize')
+                     if k in settings)
+    return __utils__['s3.file_digests'](source, hash_type or __opts__['hash_type'], **multipart)
+
+
 def upload_file(
     source,
     name,
     extra_args=None,
+    transfer_config=None,
     region=None,
     key=None,
     keyid=None,
@@ -144,6 +196,12 @@ def upload_file(
     '''
     Upload a local file as an S3 object.
 
+    transfer_config
+        A dictionary of ``boto3.s3.transfer.TransferConfig`` settings, like
+        ``multipart_threshold``, ``multipart_chunksize`` and
+        ``max_concurrency``, merged over the ``boto_s3.transfer_config``
+        option.
+
     CLI Example:
 
     .. code-block:: bash
@@ -159,11 +217,133 @@ def upload_file(
     bucket, _, s3_key = name.partition('/')
 
     conn = _get_conn(region=region, key=key, keyid=keyid, profile=profile)
+    config = boto3.s3.transfer.TransferConfig(**_transfer_settings(transfer_config))
 
     try:
-        conn.upload_file(source, bucket, s3_key, ExtraArgs=extra_args)
+        conn.upload_file(source, bucket, s3_key, ExtraArgs=extra_args, Config=config)
     except boto3.exceptions.S3UploadFailedError as e:
         return {'error': __utils__['boto3.get_error'](e)}
 
     log.info('S3 object uploaded to %s', name)
     return {'result': True}
+
+
+def sync_directory(
+    source,
+    name,
+    extra_args=None,
+    transfer_config=None,
+    workers=SYNC_WORKERS,
+    delete=False,
+    test=False,
+    region=None,
+    key=None,
+    keyid=None,
+    profile=None,
+):
+    '''
+    Upload every file below a local directory to an S3 bucket and prefix,
+    skipping files whose content already matches the ETag of the S3 object.
+    The prefix is listed once instead of fetching the metadata of every
+    object, and up to ``workers`` files are hashed and uploaded at a time.
+
+    Only the content is compared, ``extra_args`` are applied to the files
+    which get uploaded. Pass ``delete=True`` to also delete the objects below
+    the prefix which have no local file, and ``test=True`` to only report
+    what would change.
+
+    Returns {'result': {'uploaded': [key, ...], 'unchanged': [key, ...],
+    'deleted': [key, ...], 'failed': {key: error}}}.
+
+    CLI Example:
+
+    .. code-block:: bash
+
+        salt myminion boto_s3.sync_directory \\
+                         /path/to/local/dir \\
+                         my_bucket/path/to/prefix \\
+                         workers=16
+    '''
+    bucket, _, prefix = name.partition('/')
+    prefix = prefix.strip('/')
+    if not os.path.isdir(source):
+        return {'error': '{0} is not a directory'.format(source)}
+
+    conn = _get_conn(region=region, key=key, keyid=keyid, profile=profile)
+    args = {'Bucket': bucket}
+    args.update({'Prefix': prefix + '/'}) if prefix else None
+    try:
+        remote = dict(
+            (obj['Key'], obj) for obj in __utils__['boto3.paged_items'](
+                conn.list_objects_v2, 'Contents',
+                marker_flag='NextContinuationToken',
+                marker_arg='ContinuationToken',
+                **args)
+        )
+    except botocore.exceptions.ClientError as e:
+        return {'error': __utils__['boto3.get_error'](e)}
+
+    files = []
+    for root, dirs, filenames in os.walk(source):
+        dirs.sort()
+        for filename in sorted(filenames):
+            path = os.path.join(root, filename)
+            rel = os.path.relpath(path, source).replace(os.sep, '/')
+            files.append((path, '/'.join((prefix, rel)) if prefix else rel))
+
+    settings = _transfer_settings(transfer_config)
+    config = boto3.s3.transfer.TransferConfig(**settings)
+    multipart = dict((k, settings[k]) for k in ('multipart_threshold', 'multipart_chunksize')
+                     if k in settings)
+
+    def _sync(item):
+        path, s3_key = item
+        try:
+            obj = remote.get(s3_key)
+            if obj is not None and obj.get('Size') == os.path.getsize(path):
+                digests = __utils__['s3.file_digests'](path, __opts__['hash_type'], **multipart)
+                if __utils__['s3.etag_matches'](obj.get('ETag'), digests['etag']):
+                    return s3_key, 'unchanged', None
+            if not test:
+                conn.upload_file(path, bucket, s3_key, ExtraArgs=extra_args, Config=config)
+                log.info('S3 object uploaded to %s/%s', bucket, s3_key)
+            return s3_key, 'uploaded', None
+        except boto3.exceptions.S3UploadFailedError as e:
+            return s3_key, 'failed', __utils__['boto3.get_error'](e)
+        except (IOError, OSError) as e:
+            return s3_key, 'failed', {'message': '{0}'.format(e)}
+
+    ret = {'uploaded': [], 'unchanged': [], 'deleted': [], 'failed': {}}
+    pool = ThreadPool(max(int(workers), 1))
+    try:
+        for s3_key, status, error in pool.imap(_sync, files):
+            if status == 'failed':
+                ret['failed'][s3_key] = error
+            else:
+                ret[status].append(s3_key)
+    finally:
+        pool.close()
+        pool.join()
+
+    if delete:
+        local = set(s3_key for _, s3_key in files)
+        stale = sorted(s3_key for s3_key in remote if s3_key not in local)
+        for idx in range(0, len(stale), DELETE_BATCH):
+            batch = stale[idx:idx + DELETE_BATCH]
+            if test:
+                ret['deleted'].extend(batch)
+                continue
+            try:
+                r = conn.delete_objects(Bucket=bucket, Delete={
+                    'Objects': [{'Key': s3_key} for s3_key in batch],
+                    'Quiet': True,
+                })
+            except botocore.exceptions.ClientError as e:
+                ret['failed'].update((s3_key, __utils__['boto3.get_error'](e)) for s3_key in batch)
+                continue
+            errors = dict((err['Key'], {'message': err.get('Message'), 'code': err.get('Code')})
+                          for err in r.get('Errors', []))
+            ret['failed'].update(errors)
+            ret['deleted'].extend(s3_key for s3_key in batch if s3_key not in errors)
+            log.info('Deleted %s S3 objects from %s', len(batch) - len(errors), name)
+    return {'result': ret}
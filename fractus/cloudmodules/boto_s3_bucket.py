@@ -54,10 +54,12 @@ The dependencies listed above can be installed via package or pip.
 # Import Python libs
 from __future__ import absolute_import, print_function, unicode_literals
 import logging
+import threading
+import time
+from multiprocessing.pool import ThreadPool
 
 # Import Salt libs
 from salt.ext import six
-from salt.ext.six.moves import range  # pylint: disable=import-error
 import salt.utils.compat
 import salt.utils.json
 import salt.utils.versions
@@ -80,6 +82,14 @@ except ImportError:
     HAS_BOTO = False
 # pylint: enable=import-error
 
+# DeleteObjects accepts at most 1000 keys per call.
+DELETE_BATCH_SIZE = 1000
+DELETE_WORKERS = 8
+# Per key DeleteObjects errors which are retried.
+RETRYABLE_DELETE_ERRORS = ('InternalError', 'ServiceUnavailable', 'SlowDown', 'RequestTimeout')
+# Log progress every this many batches.
+PROGRESS_BATCHES = 50
+
 
 def __virtual__():
     '''
@@ -204,11 +214,117 @@ def delete(Bucket, MFA=None, RequestPayer=None, Force=False,
         return {'deleted': False, 'error': __utils__['boto3.get_error'](e)}
 
 
+def _batches(objects, size):
+    batch = []
+    for obj in objects:
+        batch.append(obj)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _delete_batch(conn, args, objs):
+    '''
+    Delete a single batch of keys. The whole call is retried when it is
+    throttled, and only the keys which failed with a transient error are sent
+    again. Returns the errors of the keys which could not be deleted.
+    '''
+    backoff = __utils__['boto_retry.backoff']('s3', codes=RETRYABLE_DELETE_ERRORS)
+    failed = []
+    while objs:
+        try:
+            ret = conn.delete_objects(Delete={'Objects': objs, 'Quiet': True}, **args)
+        except ClientError as e:
+            if backoff.retry(e):
+                continue
+            raise
+        backoff.success()
+        errors = ret.get('Errors', [])
+        retry = [err for err in errors if err.get('Code') in RETRYABLE_DELETE_ERRORS]
+        failed += [err for err in errors if err.get('Code') not in RETRYABLE_DELETE_ERRORS]
+        if not retry:
+            break
+        if not backoff.retry_code(retry[0]['Code']):
+            failed += retry
+            break
+        keys = set((err['Key'], err.get('VersionId')) for err in retry)
+        objs = [obj for obj in objs if (obj['Key'], obj.get('VersionId')) in keys]
+    return failed
+
+
+def _delete_pipeline(conn, Bucket, objects, MFA=None, RequestPayer=None,
+                     Workers=DELETE_WORKERS, BatchSize=DELETE_BATCH_SIZE):
+    '''
+    Delete the keys produced by the ``objects`` iterable in batches of
+    ``BatchSize`` on a pool of ``Workers`` threads, while ``objects`` is still
+    being consumed. At most two batches per worker are held in memory.
+
+    Returns a dict with the ``count`` of deleted keys, the ``failed`` key
+    errors and the ``error`` which stopped the pipeline, if any.
+    '''
+    args = {'Bucket': Bucket}
+    args.update({'MFA': MFA}) if MFA else None
+    args.update({'RequestPayer': RequestPayer}) if RequestPayer else None
+    BatchSize = min(int(BatchSize), DELETE_BATCH_SIZE)
+    Workers = max(int(Workers), 1)
+    result = {'count': 0, 'failed': [], 'error': None}
+    lock = threading.Lock()
+    slots = threading.BoundedSemaphore(Workers * 2)
+    started = time.time()
+    batches = [0]
+
+    def _run(batch):
+        try:
+            failed = _delete_batch(conn, args, batch)
+            with lock:
+                result['count'] += len(batch) - len(failed)
+                result['failed'] += failed
+                batches[0] += 1
+                if batches[0] % PROGRESS_BATCHES == 0:
+                    log.info('Deleted %s objects from %s (%.0f objects/s)', result['count'],
+                             Bucket, result['count'] / max(time.time() - started, 0.001))
+        except Exception as e:  # pylint: disable=broad-except
+            with lock:
+                result['error'] = result['error'] or e
+        finally:
+            slots.release()
+
+    pool = ThreadPool(Workers)
+    try:
+        for batch in _batches(objects, BatchSize):
+            slots.acquire()
+            if result['error'] is not None:
+                break
+            pool.apply_async(_run, (batch,))
+    finally:
+        pool.close()
+        pool.join()
+
+    log.info('Deleted %s objects from %s in %.1f seconds, %s failed', result['count'],
+             Bucket, time.time() - started, len(result['failed']))
+    if result['error'] is not None and not isinstance(result['error'], ClientError):
+        raise result['error']
+    return result
+
+
+def _delete_result(result):
+    if result['error'] is not None:
+        return {'deleted': False, 'error': __utils__['boto3.get_error'](result['error'])}
+    if result['failed']:
+        return {'deleted': False, 'failed': result['failed']}
+    return {'deleted': True}
+
+
 def delete_objects(Bucket, Delete, MFA=None, RequestPayer=None,
-                   region=None, key=None, keyid=None, profile=None):
+                   Workers=DELETE_WORKERS, region=None, key=None, keyid=None,
+                   profile=None):
     '''
     Delete objects in a given S3 bucket.
 
+    The keys are deleted in batches of 1000, ``Workers`` batches at a time.
+
     Returns {deleted: true} if all objects were deleted
     and {deleted: false, failed: [key, ...]} otherwise
 
@@ -227,26 +343,9 @@ def delete_objects(Bucket, Delete, MFA=None, RequestPayer=None,
     if 'Objects' not in Delete:
         raise SaltInvocationError("Malformed Delete request.")
 
-    failed = []
-    objs = Delete['Objects']
-    for i in range(0, len(objs), 1000):
-        chunk = objs[i:i+1000]
-        subset = {'Objects': chunk, 'Quiet': True}
-        try:
-            args = {'Bucket': Bucket}
-            args.update({'MFA': MFA}) if MFA else None
-            args.update({'RequestPayer': RequestPayer}) if RequestPayer else None
-            args.update({'Delete': subset})
-            conn = _get_conn(region=region, key=key, keyid=keyid, profile=profile)
-            ret = conn.delete_objects(**args)
-            failed += ret.get('Errors', [])
-        except ClientError as e:
-            return {'deleted': False, 'error': __utils__['boto3.get_error'](e)}
-
-    if len(failed):
-        return {'deleted': False, 'failed': failed}
-    else:
-        return {'deleted': True}
+    conn = _get_conn(region=region, key=key, keyid=keyid, profile=profile)
+    return _delete_result(_delete_pipeline(conn, Bucket, Delete['Objects'], MFA=MFA,
+                                           RequestPayer=RequestPayer, Workers=Workers))
 
 
 def describe(Bucket,
@@ -315,11 +414,15 @@ def describe(Bucket,
         return {'error': __utils__['boto3.get_error'](e)}
 
 
-def empty(Bucket, MFA=None, RequestPayer=None, region=None, key=None,
-          keyid=None, profile=None):
+def empty(Bucket, MFA=None, RequestPayer=None, Workers=DELETE_WORKERS,
+          region=None, key=None, keyid=None, profile=None):
     '''
     Delete all objects in a given S3 bucket.
 
+    Object versions are deleted while the bucket is still being listed, using
+    ``Workers`` concurrent ``DeleteObjects`` calls, so buckets of any size can
+    be emptied in constant memory.
+
     Returns {deleted: true} if all objects were deleted
     and {deleted: false, failed: [key, ...]} otherwise
 
@@ -327,22 +430,19 @@ def empty(Bucket, MFA=None, RequestPayer=None, region=None, key=None,
 
     .. code-block:: bash
 
-        salt myminion boto_s3_bucket.empty mybucket
+        salt myminion boto_s3_bucket.empty mybucket Workers=16
 
     '''
 
-    stuff = list_object_versions(Bucket, region=region, key=key, keyid=keyid,
-                                 profile=profile)
-    Delete = {}
-    Delete['Objects'] = [{'Key': v['Key'], 'VersionId': v['VersionId']} for v in stuff.get('Versions', [])]
-    Delete['Objects'] += [{'Key': v['Key'], 'VersionId': v['VersionId']} for v in stuff.get('DeleteMarkers', [])]
-    if len(Delete['Objects']):
-        ret = delete_objects(Bucket, Delete, MFA=MFA, RequestPayer=RequestPayer,
-                             region=region, key=key, keyid=keyid, profile=profile)
-        failed = ret.get('failed', [])
-        if len(failed):
-            return {'deleted': False, 'failed': ret[failed]}
-    return {'deleted': True}
+    try:
+        conn = _get_conn(region=region, key=key, keyid=keyid, profile=profile)
+        objects = ({'Key': v['Key'], 'VersionId': v['VersionId']}
+                   for v in iter_object_versions(Bucket, region=region, key=key,
+                                                 keyid=keyid, profile=profile))
+        return _delete_result(_delete_pipeline(conn, Bucket, objects, MFA=MFA,
+                                               RequestPayer=RequestPayer, Workers=Workers))
+    except ClientError as e:
+        return {'deleted': False, 'error': __utils__['boto3.get_error'](e)}
 
 
 def list(region=None, key=None, keyid=None, profile=None):
@@ -373,6 +473,35 @@ def list(region=None, key=None, keyid=None, profile=None):
         return {'error': __utils__['boto3.get_error'](e)}
 
 
+def iter_object_versions(Bucket, Delimiter=None, EncodingType=None, Prefix=None,
+                         PageSize=None, region=None, key=None, keyid=None, profile=None):
+    '''
+    Lazily iterate over the object versions and delete markers in a given S3
+    bucket, fetching one page at a time. Each item is tagged with
+    ``IsDeleteMarker``. Stopping the iteration early stops the listing, and
+    errors are raised as ``ClientError``.
+
+    PageSize
+        Number of keys to request per page (``MaxKeys``).
+    '''
+
+    args = {'Bucket': Bucket}
+    args.update({'Delimiter': Delimiter}) if Delimiter else None
+    args.update({'EncodingType': EncodingType}) if Delimiter else None
+    args.update({'Prefix': Prefix}) if Prefix else None
+    conn = _get_conn(region=region, key=key, keyid=keyid, profile=profile)
+    for ret in __utils__['boto3.paged_call'](conn.list_object_versions,
+                                             marker_flag=('NextKeyMarker', 'NextVersionIdMarker'),
+                                             marker_arg=('KeyMarker', 'VersionIdMarker'),
+                                             page_size=PageSize, page_size_arg='MaxKeys', **args):
+        for version in ret.get('Versions', []):
+            version.setdefault('IsDeleteMarker', False)
+            yield version
+        for marker in ret.get('DeleteMarkers', []):
+            marker['IsDeleteMarker'] = True
+            yield marker
+
+
 def list_object_versions(Bucket, Delimiter=None, EncodingType=None, Prefix=None,
                  region=None, key=None, keyid=None, profile=None):
     '''
@@ -391,25 +520,43 @@ def list_object_versions(Bucket, Delimiter=None, EncodingType=None, Prefix=None,
     try:
         Versions = []
         DeleteMarkers = []
-        args = {'Bucket': Bucket}
-        args.update({'Delimiter': Delimiter}) if Delimiter else None
-        args.update({'EncodingType': EncodingType}) if Delimiter else None
-        args.update({'Prefix': Prefix}) if Prefix else None
-        conn = _get_conn(region=region, key=key, keyid=keyid, profile=profile)
-        IsTruncated = True
-        while IsTruncated:
-            ret = conn.list_object_versions(**args)
-            IsTruncated = ret.get('IsTruncated', False)
-            if IsTruncated in ('True', 'true', True):
-                args['KeyMarker'] = ret['NextKeyMarker']
-                args['VersionIdMarker'] = ret['NextVersionIdMarker']
-            Versions += ret.get('Versions', [])
-            DeleteMarkers += ret.get('DeleteMarkers', [])
+        for version in iter_object_versions(Bucket, Delimiter=Delimiter, EncodingType=EncodingType,
+                                            Prefix=Prefix, region=region, key=key, keyid=keyid,
+                                            profile=profile):
+            if version.pop('IsDeleteMarker'):
+                DeleteMarkers.append(version)
+            else:
+                Versions.append(version)
         return {'Versions': Versions, 'DeleteMarkers': DeleteMarkers}
     except ClientError as e:
         return {'error': __utils__['boto3.get_error'](e)}
 
 
+def iter_objects(Bucket, Delimiter=None, EncodingType=None, Prefix=None,
+                 FetchOwner=False, StartAfter=None, PageSize=None, region=None,
+                 key=None, keyid=None, profile=None):
+    '''
+    Lazily iterate over the objects in a given S3 bucket, fetching one page at
+    a time. Stopping the iteration early stops the listing, and errors are
+    raised as ``ClientError``.
+
+    PageSize
+        Number of keys to request per page (``MaxKeys``).
+    '''
+
+    args = {'Bucket': Bucket, 'FetchOwner': FetchOwner}
+    args.update({'Delimiter': Delimiter}) if Delimiter else None
+    args.update({'EncodingType': EncodingType}) if Delimiter else None
+    args.update({'Prefix': Prefix}) if Prefix else None
+    args.update({'StartAfter': StartAfter}) if StartAfter else None
+    conn = _get_conn(region=region, key=key, keyid=keyid, profile=profile)
+    for obj in __utils__['boto3.paged_items'](conn.list_objects_v2, 'Contents',
+                                              marker_flag='NextContinuationToken',
+                                              marker_arg='ContinuationToken',
+                                              page_size=PageSize, page_size_arg='MaxKeys', **args):
+        yield obj
+
+
 def list_objects(Bucket, Delimiter=None, EncodingType=None, Prefix=None,
                  FetchOwner=False, StartAfter=None, region=None, key=None,
                  keyid=None, profile=None):
@@ -427,20 +574,9 @@ def list_objects(Bucket, Delimiter=None, EncodingType=None, Prefix=None,
     '''
 
     try:
-        Contents = []
-        args = {'Bucket': Bucket, 'FetchOwner': FetchOwner}
-        args.update({'Delimiter': Delimiter}) if Delimiter else None
-        args.update({'EncodingType': EncodingType}) if Delimiter else None
-        args.update({'Prefix': Prefix}) if Prefix else None
-        args.update({'StartAfter': StartAfter}) if StartAfter else None
-        conn = _get_conn(region=region, key=key, keyid=keyid, profile=profile)
-        IsTruncated = True
-        while IsTruncated:
-            ret = conn.list_objects_v2(**args)
-            IsTruncated = ret.get('IsTruncated', False)
-            if IsTruncated in ('True', 'true', True):
-                args['ContinuationToken'] = ret['NextContinuationToken']
-            Contents += ret.get('Contents', [])
+        Contents = [obj for obj in iter_objects(Bucket, Delimiter=Delimiter, EncodingType=EncodingType,
+                                                Prefix=Prefix, FetchOwner=FetchOwner, StartAfter=StartAfter,
+                                                region=region, key=key, keyid=keyid, profile=profile)]
         return {'Contents': Contents}
     except ClientError as e:
         return {'error': __utils__['boto3.get_error'](e)}
@@ -39,6 +39,14 @@ Connection module for Amazon Security Groups
             key: askdjghsdfjkghWupUjasdflkdfklgjsdfjajkghs
             region: us-east-1
 
+    Runs which look up many security groups can describe every group of a
+    region once and answer the lookups from memory, by setting the number of
+    seconds the groups are cached for:
+
+    .. code-block:: yaml
+
+        boto_secgroup.describe_cache_ttl: 60
+
 :depends: boto
 '''
 # keep lint from choking on _get_conn and _cache_id
@@ -88,6 +96,36 @@ def __virtual__():
     return has_boto_reqs
 
 
+# Seconds all security groups of a region are cached for, once described.
+# Disabled unless the boto_secgroup.describe_cache_ttl option is set.
+DESCRIBE_CACHE_TTL = 0
+
+
+def _describe_cache():
+    return __utils__['boto_cache.get_cache'](
+        __context__, 'boto_secgroup',
+        ttl=__opts__.get('boto_secgroup.describe_cache_ttl', DESCRIBE_CACHE_TTL))
+
+
+def _cached_groups(conn, region=None, key=None, keyid=None, profile=None):
+    '''
+    Return an index of every security group in the region, by id, name and
+    vpc_id, described with a single call and shared by the lookups of the
+    run. Returns None unless the describe cache is enabled.
+    '''
+    cache = _describe_cache()
+    if not cache.ttl:
+        return None
+    cxkey = __utils__['boto.profile_key']('ec2', region, key, keyid, profile)
+    return cache.get(('security_group', cxkey),
+                     lambda: __utils__['boto_cache.index'](conn.get_all_security_groups(),
+                                                           name_attr='name'))
+
+
+def _invalidate():
+    _describe_cache().invalidate('security_group')
+
+
 def exists(name=None, region=None, key=None, keyid=None, profile=None,
            vpc_id=None, vpc_name=None, group_id=None):
     '''
@@ -157,6 +195,11 @@ def _get_group(conn=None, name=None, vpc_id=None, vpc_name=None, group_id=None,
         except boto.exception.BotoServerError as e:
             log.debug(e)
             return None
+    if conn is None:
+        conn = _get_conn(region=region, key=key, keyid=keyid, profile=profile)
+    index = _cached_groups(conn, region=region, key=key, keyid=keyid, profile=profile)
+    if index is not None:
+        return _find_group(index, name=name, vpc_id=vpc_id, group_id=group_id)
     if name:
         if vpc_id is None:
             log.debug('getting group for %s', name)
@@ -200,6 +243,30 @@ def _get_group(conn=None, name=None, vpc_id=None, vpc_name=None, group_id=None,
         return None
 
 
+def _find_group(index, name=None, vpc_id=None, group_id=None):
+    '''
+    Same lookup as :py:func:`_get_group`, answered from the index of cached
+    security groups.
+    '''
+    if name:
+        if vpc_id is None:
+            groups = index.find(name=name)
+            for group in groups:
+                if group.vpc_id is None:
+                    return group
+            if len(groups) > 1:
+                raise CommandExecutionError('Security group belongs to more VPCs, specify the VPC ID!')
+            return groups[0] if groups else None
+        elif vpc_id:
+            groups = index.find(name=name, vpc_id=vpc_id)
+            return groups[0] if len(groups) == 1 else None
+        return None
+    elif group_id:
+        groups = index.find(resource_id=group_id)
+        return groups[0] if len(groups) == 1 else None
+    return None
+
+
 def _parse_rules(sg, rules):
     _rules = []
     for rule in rules:
@@ -394,6 +461,7 @@ def create(name, description, vpc_id=None, vpc_name=None, region=None, key=None,
             return False
 
     created = conn.create_security_group(name, description, vpc_id)
+    _invalidate()
     if created:
         log.info('Created security group %s.', name)
         return True
@@ -419,6 +487,7 @@ def delete(name=None, group_id=None, region=None, key=None, keyid=None,
                        profile=profile)
     if group:
         deleted = conn.delete_security_group(group_id=group.id)
+        _invalidate()
         if deleted:
             log.info('Deleted security group %s with id %s.', group.name, group.id)
             return True
@@ -463,6 +532,7 @@ def authorize(name=None, source_group_name=None,
                     ip_protocol=ip_protocol, from_port=from_port, to_port=to_port,
                     cidr_ip=cidr_ip, group_id=group.id,
                     src_group_id=source_group_group_id)
+            _invalidate()
             if added:
                 log.info('Added rule to security group %s with id %s',
                          group.name, group.id)
@@ -518,6 +588,7 @@ def revoke(name=None, source_group_name=None,
                     ip_protocol=ip_protocol, from_port=from_port, to_port=to_port,
                     cidr_ip=cidr_ip, group_id=group.id,
                     src_group_id=source_group_group_id)
+            _invalidate()
 
             if revoked:
                 log.info('Removed rule from security group %s with id %s.',
@@ -539,6 +610,152 @@ def revoke(name=None, source_group_name=None,
         return False
 
 
+# Rules sent in a single authorize or revoke call by authorize_rules and
+# revoke_rules.
+RULES_PER_CALL = 100
+
+_RULE_ACTIONS = {
+    ('authorize', False): 'AuthorizeSecurityGroupIngress',
+    ('authorize', True): 'AuthorizeSecurityGroupEgress',
+    ('revoke', False): 'RevokeSecurityGroupIngress',
+    ('revoke', True): 'RevokeSecurityGroupEgress',
+}
+
+
+def _permission_params(group_id, rules):
+    '''
+    Build the query parameters of an authorize or revoke call for ``rules``.
+    Rules with the same protocol and port range are sent as a single IP
+    permission listing all of their sources.
+    '''
+    permissions = odict.OrderedDict()
+    for rule in rules:
+        ports = (six.text_type(rule.get('ip_protocol')), rule.get('from_port'), rule.get('to_port'))
+        permission = permissions.setdefault(ports, {'cidrs': [], 'groups': []})
+        cidr_ip = rule.get('cidr_ip')
+        if cidr_ip:
+            if isinstance(cidr_ip, six.string_types):
+                cidr_ip = [cidr_ip]
+            permission['cidrs'].extend(cidr_ip)
+        else:
+            permission['groups'].append(rule)
+
+    params = {'GroupId': group_id}
+    for num, ((ip_protocol, from_port, to_port), permission) in enumerate(six.iteritems(permissions), 1):
+        prefix = 'IpPermissions.{0}.'.format(num)
+        params[prefix + 'IpProtocol'] = ip_protocol
+        if from_port is not None:
+            params[prefix + 'FromPort'] = six.text_type(from_port)
+        if to_port is not None:
+            params[prefix + 'ToPort'] = six.text_type(to_port)
+        for cnum, cidr_ip in enumerate(permission['cidrs'], 1):
+            params['{0}IpRanges.{1}.CidrIp'.format(prefix, cnum)] = cidr_ip
+        for gnum, rule in enumerate(permission['groups'], 1):
+            gprefix = '{0}Groups.{1}.'.format(prefix, gnum)
+            if rule.get('source_group_group_id'):
+                params[gprefix + 'GroupId'] = rule['source_group_group_id']
+            elif rule.get('source_group_name'):
+                params[gprefix + 'GroupName'] = rule['source_group_name']
+            if rule.get('source_group_owner_id'):
+                params[gprefix + 'UserId'] = rule['source_group_owner_id']
+    return params
+
+
+def _resolve_source_groups(conn, rules, vpc_id=None, region=None, key=None,
+                           keyid=None, profile=None):
+    '''
+    Return ``rules`` with the names of source groups of the account replaced
+    by group ids, which EC2 requires for groups of non-default VPCs. Source
+    groups are looked up in the VPC of the group the rules belong to.
+    '''
+    group_ids = {}
+    resolved = []
+    for rule in rules:
+        source_name = rule.get('source_group_name')
+        if source_name and not rule.get('source_group_group_id') and not rule.get('source_group_owner_id'):
+            if source_name not in group_ids:
+                source = _get_group(conn, name=source_name, vpc_id=vpc_id, region=region,
+                                    key=key, keyid=keyid, profile=profile)
+                group_ids[source_name] = source.id if source else None
+            if group_ids[source_name]:
+                rule = dict((k, v) for k, v in six.iteritems(rule) if k != 'source_group_name')
+                rule['source_group_group_id'] = group_ids[source_name]
+        resolved.append(rule)
+    return resolved
+
+
+def _change_rules(action, rules, name=None, group_id=None, region=None, key=None,
+                  keyid=None, profile=None, vpc_id=None, vpc_name=None, egress=False):
+    conn = _get_conn(region=region, key=key, keyid=keyid, profile=profile)
+    group = _get_group(conn, name=name, vpc_id=vpc_id, vpc_name=vpc_name,
+                       group_id=group_id, region=region, key=key, keyid=keyid,
+                       profile=profile)
+    if not group:
+        log.error('Failed to %s rules of security group.', action)
+        return False
+    rules = _resolve_source_groups(conn, rules, vpc_id=group.vpc_id, region=region,
+                                   key=key, keyid=keyid, profile=profile)
+    single = authorize if action == 'authorize' else revoke
+    ok = True
+    for start in range(0, len(rules), RULES_PER_CALL):
+        batch = rules[start:start + RULES_PER_CALL]
+        try:
+            changed = conn.get_status(_RULE_ACTIONS[(action, bool(egress))],
+                                      _permission_params(group.id, batch), verb='POST')
+        except boto.exception.EC2ResponseError as e:
+            # The whole call fails if any rule of the batch does, fall back
+            # to changing the rules one by one to apply the others.
+            log.debug('Batched %s of %s rules on security group %s failed, '
+                      'retrying them one by one: %s', action, len(batch), group.id, e)
+            changed = False
+        _invalidate()
+        if changed:
+            log.info('%s %s rules on security group %s with id %s',
+                     'Added' if action == 'authorize' else 'Removed',
+                     len(batch), group.name, group.id)
+            continue
+        for rule in batch:
+            rule = dict((k, v) for k, v in six.iteritems(rule)
+                        if k in ('ip_protocol', 'from_port', 'to_port', 'cidr_ip',
+                                 'source_group_name', 'source_group_owner_id',
+                                 'source_group_group_id'))
+            if not single(group_id=group.id, region=region, key=key, keyid=keyid,
+                          profile=profile, egress=egress, **rule):
+                ok = False
+    return ok
+
+
+def authorize_rules(rules, name=None, group_id=None, region=None, key=None,
+                    keyid=None, profile=None, vpc_id=None, vpc_name=None, egress=False):
+    '''
+    Add a list of rules to an existing security group, with as few API calls
+    as possible. Each rule is a dict of the arguments of :py:func:`authorize`.
+
+    CLI example::
+
+        salt myminion boto_secgroup.authorize_rules '[{ip_protocol: tcp, from_port: 80, to_port: 80, cidr_ip: 10.0.0.0/8}]' mysecgroup
+    '''
+    return _change_rules('authorize', rules, name=name, group_id=group_id, region=region,
+                         key=key, keyid=keyid, profile=profile, vpc_id=vpc_id,
+                         vpc_name=vpc_name, egress=egress)
+
+
+def revoke_rules(rules, name=None, group_id=None, region=None, key=None,
+                 keyid=None, profile=None, vpc_id=None, vpc_name=None, egress=False):
+    '''
+    Remove a list of rules from an existing security group, with as few API
+    calls as possible. Each rule is a dict of the arguments of
+    :py:func:`revoke`.
+
+    CLI example::
+
+        salt myminion boto_secgroup.revoke_rules '[{ip_protocol: tcp, from_port: 80, to_port: 80, cidr_ip: 10.0.0.0/8}]' mysecgroup
+    '''
+    return _change_rules('revoke', rules, name=name, group_id=group_id, region=region,
+                         key=key, keyid=keyid, profile=profile, vpc_id=vpc_id,
+                         vpc_name=vpc_name, egress=egress)
+
+
 def _find_vpcs(vpc_id=None, vpc_name=None, cidr=None, tags=None,
                region=None, key=None, keyid=None, profile=None):
     '''
@@ -635,6 +852,7 @@ def set_tags(tags,
     if secgrp:
         if isinstance(tags, dict):
             secgrp.add_tags(tags)
+            _invalidate()
         else:
             msg = 'Tags must be a dict of tagname:tagvalue'
             raise SaltInvocationError(msg)
@@ -701,6 +919,7 @@ def delete_tags(tags,
             for tag in tags:
                 tags_to_remove[tag] = None
             secgrp.remove_tags(tags_to_remove)
+            _invalidate()
         else:
             msg = 'Tags must be a list of tagnames to remove from the security group'
             raise SaltInvocationError(msg)
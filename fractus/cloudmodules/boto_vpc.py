@@ -44,6 +44,15 @@ Connection module for Amazon VPC
             key: askdjghsdfjkghWupUjasdflkdfklgjsdfjajkghs
             region: us-east-1
 
+    Runs which look up many VPC resources can describe every resource of a
+    type once and answer the lookups from memory, by setting the number of
+    seconds the resources are cached for. Lookups by names, tags or CIDRs
+    using ``*`` or ``?`` wildcards still use filtered describe calls.
+
+    .. code-block:: yaml
+
+        boto_vpc.describe_cache_ttl: 60
+
 .. versionchanged:: 2015.8.0
     All methods now return a dictionary. Create and delete methods return:
 
@@ -200,6 +209,72 @@ def __init__(opts):
                   exactly_one_funcname=None)
 
 
+# Seconds the resources described by this module are cached for. The describe
+# cache is disabled unless the boto_vpc.describe_cache_ttl option is set.
+DESCRIBE_CACHE_TTL = 0
+
+
+def _describe_cache():
+    return __utils__['boto_cache.get_cache'](
+        __context__, 'boto_vpc',
+        ttl=__opts__.get('boto_vpc.describe_cache_ttl', DESCRIBE_CACHE_TTL))
+
+
+def _get_all_func(resource):
+    f = 'get_all_{0}'.format(resource)
+    if not f.endswith('s'):
+        f = f + 's'
+    return f
+
+
+def _has_wildcards(*values):
+    '''
+    Check if any of the given filter values, or of the items of the given
+    lists and dicts, uses the ``*`` or ``?`` wildcards of EC2 filters.
+    '''
+    for value in values:
+        if isinstance(value, dict):
+            value = list(value.values())
+        if isinstance(value, (list, tuple)):
+            if _has_wildcards(*value):
+                return True
+        elif isinstance(value, six.string_types) and ('*' in value or '?' in value):
+            return True
+    return False
+
+
+def _cached_resources(resource, region=None, key=None, keyid=None, profile=None,
+                      filter_values=()):
+    '''
+    Return an index of every resource of the given type in the region. All
+    of them are described with a single call, which is shared by the lookups
+    of the whole run until the TTL expires or a function of this module
+    changes resources of that type. Returns None if the cache is disabled, or
+    if any of ``filter_values`` uses wildcards, which only the filters of the
+    describe calls understand.
+    '''
+    cache = _describe_cache()
+    if not cache.ttl or _has_wildcards(*filter_values):
+        return None
+    cxkey = __utils__['boto.profile_key']('vpc', region, key, keyid, profile)
+
+    def _describe():
+        conn = _get_conn(region=region, key=key, keyid=keyid, profile=profile)
+        return __utils__['boto_cache.index'](getattr(conn, _get_all_func(resource))())
+    return cache.get((resource, cxkey), _describe)
+
+
+def _invalidate(*resources):
+    '''
+    Drop the cached describes of the given resource types, or of all of them.
+    '''
+    cache = _describe_cache()
+    if not resources:
+        cache.invalidate()
+    for resource in resources:
+        cache.invalidate(resource)
+
+
 def check_vpc(vpc_id=None, vpc_name=None, region=None, key=None,
               keyid=None, profile=None):
     '''
@@ -230,6 +305,12 @@ def check_vpc(vpc_id=None, vpc_name=None, region=None, key=None,
     return vpc_id
 
 
+# Cached resource type changed by the create and delete calls of a resource
+_INVALIDATES = {
+    'route': 'route_table',
+}
+
+
 def _create_resource(resource, name=None, tags=None, region=None, key=None,
                      keyid=None, profile=None, **kwargs):
     '''
@@ -255,11 +336,17 @@ def _create_resource(resource, name=None, tags=None, region=None, key=None,
 
         if r:
             if isinstance(r, bool):
+                _invalidate(_INVALIDATES.get(resource, resource))
                 return {'created': True}
             else:
                 log.info('A %s with id %s was created', resource, r.id)
-                _maybe_set_name_tag(name, r)
-                _maybe_set_tags(tags, r)
+                try:
+                    _maybe_set_name_tag(name, r)
+                    _maybe_set_tags(tags, r)
+                finally:
+                    # Invalidated once tagged, so that lookups by name
+                    # describe the resource with its tags
+                    _invalidate(_INVALIDATES.get(resource, resource))
 
                 if name:
                     _cache_id(name,
@@ -307,6 +394,7 @@ def _delete_resource(resource, name=None, resource_id=None, region=None,
                         '{0} {1} does not exist.'.format(resource, name)}}
 
         if delete_resource(resource_id, **kwargs):
+            _invalidate(_INVALIDATES.get(resource, resource))
             _cache_id(name, sub_resource=resource,
                       resource_id=resource_id,
                       invalidate=True,
@@ -335,25 +423,26 @@ def _get_resource(resource, name=None, resource_id=None, region=None,
         raise SaltInvocationError('One (but not both) of name or id must be '
                                   'provided.')
 
-    conn = _get_conn(region=region, key=key, keyid=keyid, profile=profile)
-
-    f = 'get_all_{0}'.format(resource)
-    if not f.endswith('s'):
-        f = f + 's'
-    get_resources = getattr(conn, f)
-    filter_parameters = {}
+    index = _cached_resources(resource, region=region, key=key, keyid=keyid,
+                              profile=profile, filter_values=(name,))
+    if index is not None:
+        r = index.find(resource_id=resource_id, name=name)
+    else:
+        conn = _get_conn(region=region, key=key, keyid=keyid, profile=profile)
+        get_resources = getattr(conn, _get_all_func(resource))
+        filter_parameters = {}
 
-    if name:
-        filter_parameters['filters'] = {'tag:Name': name}
-    if resource_id:
-        filter_parameters['{0}_ids'.format(resource)] = resource_id
+        if name:
+            filter_parameters['filters'] = {'tag:Name': name}
+        if resource_id:
+            filter_parameters['{0}_ids'.format(resource)] = resource_id
 
-    try:
-        r = get_resources(**filter_parameters)
-    except BotoServerError as e:
-        if e.code.endswith('.NotFound'):
-            return None
-        raise
+        try:
+            r = get_resources(**filter_parameters)
+        except BotoServerError as e:
+            if e.code.endswith('.NotFound'):
+                return None
+            raise
 
     if r:
         if len(r) == 1:
@@ -386,12 +475,13 @@ def _find_resources(resource, name=None, resource_id=None, tags=None,
         raise SaltInvocationError('At least one of the following must be '
                                   'provided: id, name, or tags.')
 
-    conn = _get_conn(region=region, key=key, keyid=keyid, profile=profile)
+    index = _cached_resources(resource, region=region, key=key, keyid=keyid,
+                              profile=profile, filter_values=(name, tags))
+    if index is not None:
+        return index.find(resource_id=resource_id, name=name, tags=tags)
 
-    f = 'get_all_{0}'.format(resource)
-    if not f.endswith('s'):
-        f = f + 's'
-    get_resources = getattr(conn, f)
+    conn = _get_conn(region=region, key=key, keyid=keyid, profile=profile)
+    get_resources = getattr(conn, _get_all_func(resource))
 
     filter_parameters = {}
     if name:
@@ -494,6 +584,13 @@ def _find_vpcs(vpc_id=None, vpc_name=None, cidr=None, tags=None,
         raise SaltInvocationError('At least one of the following must be '
                                   'provided: vpc_id, vpc_name, cidr or tags.')
 
+    index = _cached_resources('vpc', region=region, key=key, keyid=keyid,
+                              profile=profile, filter_values=(vpc_name, tags, cidr))
+    if index is not None:
+        vpcs = index.find(resource_id=vpc_id, name=vpc_name, tags=tags,
+                          cidr_block=cidr)
+        return [vpc.id for vpc in vpcs]
+
     conn = _get_conn(region=region, key=key, keyid=keyid, profile=profile)
     filter_parameters = {'filters': {}}
 
@@ -632,6 +729,7 @@ def create(cidr_block, instance_tenancy=None, vpc_name=None,
             _maybe_set_tags(tags, vpc)
             _maybe_set_dns(conn, vpc.id, enable_dns_support, enable_dns_hostnames)
             _maybe_name_route_table(conn, vpc.id, vpc_name)
+            _invalidate('vpc', 'route_table', 'network_acl')
             if vpc_name:
                 _cache_id(vpc_name, vpc.id,
                           region=region, key=key,
@@ -680,6 +778,7 @@ def delete(vpc_id=None, name=None, vpc_name=None, tags=None,
 
         if conn.delete_vpc(vpc_id):
             log.info('VPC %s was deleted.', vpc_id)
+            _invalidate()
             if vpc_name:
                 _cache_id(vpc_name, resource_id=vpc_id,
                           invalidate=True,
@@ -732,7 +831,12 @@ def describe(vpc_id=None, vpc_name=None, region=None, key=None,
     filter_parameters = {'vpc_ids': vpc_id}
 
     try:
-        vpcs = conn.get_all_vpcs(**filter_parameters)
+        index = _cached_resources('vpc', region=region, key=key, keyid=keyid,
+                                  profile=profile)
+        if index is not None:
+            vpcs = index.find(resource_id=vpc_id)
+        else:
+            vpcs = conn.get_all_vpcs(**filter_parameters)
     except BotoServerError as err:
         return {'error': __utils__['boto.get_error'](err)}
 
@@ -791,7 +895,13 @@ def describe_vpcs(vpc_id=None, name=None, cidr=None, tags=None,
             for tag_name, tag_value in six.iteritems(tags):
                 filter_parameters['filters']['tag:{0}'.format(tag_name)] = tag_value
 
-        vpcs = conn.get_all_vpcs(**filter_parameters)
+        index = _cached_resources('vpc', region=region, key=key, keyid=keyid,
+                                  profile=profile, filter_values=(name, tags, cidr))
+        if index is not None:
+            vpcs = index.find(resource_id=vpc_id, name=name, tags=tags,
+                              cidr_block=cidr)
+        else:
+            vpcs = conn.get_all_vpcs(**filter_parameters)
 
         if vpcs:
             ret = []
@@ -879,6 +989,7 @@ def create_subnet(vpc_id=None, cidr_block=None, vpc_name=None,
     if auto_assign_public_ipv4:
         conn3 = _get_conn3(region=region, key=key, keyid=keyid, profile=profile)
         conn3.modify_subnet_attribute(MapPublicIpOnLaunch={'Value': True}, SubnetId=subnet_object_dict['id'])
+        _invalidate('subnet')
     return subnet_object_dict
 
 
@@ -953,7 +1064,14 @@ def subnet_exists(subnet_id=None, name=None, subnet_name=None, cidr=None,
         filter_parameters['filters']['availability_zone'] = zones
 
     try:
-        subnets = conn.get_all_subnets(**filter_parameters)
+        index = _cached_resources('subnet', region=region, key=key, keyid=keyid,
+                                  profile=profile,
+                                  filter_values=(subnet_name, tags, cidr, zones))
+        if index is not None:
+            subnets = index.find(resource_id=subnet_id, name=subnet_name, tags=tags,
+                                 cidr_block=cidr, availability_zone=zones)
+        else:
+            subnets = conn.get_all_subnets(**filter_parameters)
     except BotoServerError as err:
         boto_err = __utils__['boto.get_error'](err)
         if boto_err.get('aws', {}).get('code') == 'InvalidSubnetID.NotFound':
@@ -1098,7 +1216,13 @@ def describe_subnets(subnet_ids=None, subnet_names=None, vpc_id=None, cidr=None,
         if subnet_names:
             filter_parameters['filters']['tag:Name'] = subnet_names
 
-        subnets = conn.get_all_subnets(subnet_ids=subnet_ids, **filter_parameters)
+        index = _cached_resources('subnet', region=region, key=key, keyid=keyid,
+                                  profile=profile, filter_values=(subnet_names, cidr))
+        if index is not None:
+            subnets = index.find(resource_id=subnet_ids, name=subnet_names,
+                                 vpc_id=vpc_id, cidr_block=cidr)
+        else:
+            subnets = conn.get_all_subnets(subnet_ids=subnet_ids, **filter_parameters)
         log.debug('The filters criteria %s matched the following subnets: %s',
                   filter_parameters, subnets)
 
@@ -1109,10 +1233,12 @@ def describe_subnets(subnet_ids=None, subnet_names=None, vpc_id=None, cidr=None,
         keys = ('id', 'cidr_block', 'availability_zone', 'tags', 'vpc_id')
         for item in subnets:
             subnet = {}
-            for key in keys:
-                if hasattr(item, key):
-                    subnet[key] = getattr(item, key)
-            explicit_route_table_assoc = _get_subnet_explicit_route_table(subnet['id'], subnet['vpc_id'], conn=conn)
+            for attr in keys:
+                if hasattr(item, attr):
+                    subnet[attr] = getattr(item, attr)
+            explicit_route_table_assoc = _get_subnet_explicit_route_table(subnet['id'], subnet['vpc_id'], conn=conn,
+                                                                          region=region, key=key, keyid=keyid,
+                                                                          profile=profile)
             if explicit_route_table_assoc:
                 subnet['explicit_route_table_association_id'] = explicit_route_table_assoc
             subnets_list.append(subnet)
@@ -1155,6 +1281,7 @@ def create_internet_gateway(internet_gateway_name=None, vpc_id=None,
         if r.get('created') and vpc_id:
             conn = _get_conn(region=region, key=key, keyid=keyid, profile=profile)
             conn.attach_internet_gateway(r['id'], vpc_id)
+            _invalidate('internet_gateway')
             log.info(
                 'Attached internet gateway %s to VPC %s',
                 r['id'], vpc_name or vpc_id
@@ -1210,6 +1337,7 @@ def delete_internet_gateway(internet_gateway_id=None,
                                  profile=profile)
                 conn.detach_internet_gateway(internet_gateway_id,
                                              igw.attachments[0].vpc_id)
+                _invalidate('internet_gateway')
         return _delete_resource('internet_gateway',
                                 resource_id=internet_gateway_id,
                                 region=region, key=key, keyid=keyid,
@@ -1570,6 +1698,7 @@ def create_dhcp_options(domain_name=None, domain_name_servers=None, ntp_servers=
         if r.get('created') and vpc_id:
             conn = _get_conn(region=region, key=key, keyid=keyid, profile=profile)
             conn.associate_dhcp_options(r['id'], vpc_id)
+            _invalidate('vpc')
             log.info(
                 'Associated options %s to VPC %s',
                 r['id'], vpc_name or vpc_id
@@ -1662,6 +1791,7 @@ def associate_dhcp_options_to_vpc(dhcp_options_id, vpc_id=None, vpc_name=None,
 
         conn = _get_conn(region=region, key=key, keyid=keyid, profile=profile)
         if conn.associate_dhcp_options(dhcp_options_id, vpc_id):
+            _invalidate('vpc')
             log.info('DHCP options with id %s were associated with VPC %s',
                      dhcp_options_id, vpc_id)
             return {'associated': True}
@@ -1753,6 +1883,7 @@ def create_network_acl(vpc_id=None, vpc_name=None, network_acl_name=None,
         try:
             conn = _get_conn(region=region, key=key, keyid=keyid, profile=profile)
             association_id = conn.associate_network_acl(r['id'], subnet_id)
+            _invalidate('network_acl')
         except BotoServerError as e:
             return {'created': False, 'error': __utils__['boto.get_error'](e)}
         r['association_id'] = association_id
@@ -1785,6 +1916,7 @@ def delete_network_acl(network_acl_id=None, network_acl_name=None, disassociate=
             try:
                 conn = _get_conn(region=region, key=key, keyid=keyid, profile=profile)
                 conn.disassociate_network_acl(subnet_id)
+                _invalidate('network_acl')
             except BotoServerError:
                 pass
 
@@ -1859,6 +1991,7 @@ def associate_network_acl_to_subnet(network_acl_id=None, subnet_id=None,
     try:
         conn = _get_conn(region=region, key=key, keyid=keyid, profile=profile)
         association_id = conn.associate_network_acl(network_acl_id, subnet_id)
+        _invalidate('network_acl')
         if association_id:
             log.info('Network ACL with id %s was associated with subnet %s',
                      network_acl_id, subnet_id)
@@ -1906,6 +2039,7 @@ def disassociate_network_acl(subnet_id=None, vpc_id=None, subnet_name=None, vpc_
 
         conn = _get_conn(region=region, key=key, keyid=keyid, profile=profile)
         association_id = conn.disassociate_network_acl(subnet_id, vpc_id=vpc_id)
+        _invalidate('network_acl')
         return {'disassociated': True, 'association_id': association_id}
     except BotoServerError as e:
         return {'disassociated': False, 'error': __utils__['boto.get_error'](e)}
@@ -1955,6 +2089,7 @@ def _create_network_acl_entry(network_acl_id=None, rule_number=None, protocol=No
                     cidr_block, egress=egress, icmp_code=icmp_code,
                     icmp_type=icmp_type, port_range_from=port_range_from,
                     port_range_to=port_range_to)
+        _invalidate('network_acl')
         if created:
             log.info('Network ACL entry was %s', rkey)
         else:
@@ -2038,6 +2173,7 @@ def delete_network_acl_entry(network_acl_id=None, rule_number=None, egress=None,
     try:
         conn = _get_conn(region=region, key=key, keyid=keyid, profile=profile)
         deleted = conn.delete_network_acl_entry(network_acl_id, rule_number, egress=egress)
+        _invalidate('network_acl')
         if deleted:
             log.info('Network ACL entry was deleted')
         else:
@@ -2152,7 +2288,13 @@ def route_exists(destination_cidr_block, route_table_name=None, route_table_id=N
             for tag_name, tag_value in six.iteritems(tags):
                 filter_parameters['filters']['tag:{0}'.format(tag_name)] = tag_value
 
-        route_tables = conn.get_all_route_tables(**filter_parameters)
+        index = _cached_resources('route_table', region=region, key=key, keyid=keyid,
+                                  profile=profile, filter_values=(route_table_name, tags))
+        if index is not None:
+            route_tables = index.find(resource_id=route_table_id, name=route_table_name,
+                                      tags=tags)
+        else:
+            route_tables = conn.get_all_route_tables(**filter_parameters)
 
         if len(route_tables) != 1:
             raise SaltInvocationError('Found more than one route table.')
@@ -2228,6 +2370,7 @@ def associate_route_table(route_table_id=None, subnet_id=None,
     try:
         conn = _get_conn(region=region, key=key, keyid=keyid, profile=profile)
         association_id = conn.associate_route_table(route_table_id, subnet_id)
+        _invalidate('route_table')
         log.info('Route table %s was associated with subnet %s',
                  route_table_id, subnet_id)
         return {'association_id': association_id}
@@ -2253,6 +2396,7 @@ def disassociate_route_table(association_id, region=None, key=None, keyid=None,
     try:
         conn = _get_conn(region=region, key=key, keyid=keyid, profile=profile)
         if conn.disassociate_route_table(association_id):
+            _invalidate('route_table')
             log.info('Route table with association id %s has been disassociated.', association_id)
             return {'disassociated': True}
         else:
@@ -2277,6 +2421,7 @@ def replace_route_table_association(association_id, route_table_id, region=None,
     try:
         conn = _get_conn(region=region, key=key, keyid=keyid, profile=profile)
         association_id = conn.replace_route_table_association_with_assoc(association_id, route_table_id)
+        _invalidate('route_table')
         log.info('Route table %s was reassociated with association id %s',
                  route_table_id, association_id)
         return {'replaced': True, 'association_id': association_id}
@@ -2376,6 +2521,7 @@ def create_route(route_table_id=None, destination_cidr_block=None,
         ret = conn3.create_route(RouteTableId=route_table_id,
                        DestinationCidrBlock=destination_cidr_block,
                        NatGatewayId=nat_gateway_id)
+        _invalidate('route_table')
         return {'created': True, 'id': ret.get('NatGatewayId')}
     except BotoServerError as e:
         return {'created': False, 'error': __utils__['boto.get_error'](e)}
@@ -2455,6 +2601,7 @@ def replace_route(route_table_id=None, destination_cidr_block=None,
         if conn.replace_route(route_table_id, destination_cidr_block,
                               gateway_id=gateway_id, instance_id=instance_id,
                               interface_id=interface_id, vpc_peering_connection_id=vpc_peering_connection_id):
+            _invalidate('route_table')
             log.info(
                 'Route with cidr block %s on route table %s was replaced',
                 route_table_id, destination_cidr_block
@@ -2699,14 +2846,18 @@ def _get_subnet_explicit_route_table(subnet_id, vpc_id, conn=None, region=None,
 
     .. versionadded:: 2016.11.0
     '''
-    if not conn:
-        conn = _get_conn(region=region, key=key, keyid=keyid, profile=profile)
-    if conn:
-        vpc_route_tables = conn.get_all_route_tables(filters={'vpc_id': vpc_id})
-        for vpc_route_table in vpc_route_tables:
-            for rt_association in vpc_route_table.associations:
-                if rt_association.subnet_id == subnet_id and not rt_association.main:
-                    return rt_association.id
+    index = _cached_resources('route_table', region=region, key=key, keyid=keyid,
+                              profile=profile)
+    if index is not None:
+        vpc_route_tables = index.find(vpc_id=vpc_id)
+    else:
+        if not conn:
+            conn = _get_conn(region=region, key=key, keyid=keyid, profile=profile)
+        vpc_route_tables = conn.get_all_route_tables(filters={'vpc_id': vpc_id}) if conn else []
+    for vpc_route_table in vpc_route_tables:
+        for rt_association in vpc_route_table.associations:
+            if rt_association.subnet_id == subnet_id and not rt_association.main:
+                return rt_association.id
     return None
 
 
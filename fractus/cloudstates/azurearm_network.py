@@ -109,6 +109,109 @@ def __virtual__():
     return __virtualname__ if 'azurearm_network.check_ip_address_availability' in __salt__ else False
 
 
+# Child resources returned within their parent resource, by the attribute
+# holding them and their resource type in IDs
+_CHILD_RESOURCES = {
+    'networkSecurityGroups': ('security_rules', 'securityRules'),
+    'routeTables': ('routes', 'routes'),
+    'virtualNetworks': ('subnets', 'subnets'),
+}
+
+
+def _snapshot():
+    '''
+    Return the network resources fetched during this run, by resource ID.
+    '''
+    return __context__.setdefault('azurearm_network.snapshot', {})
+
+
+def _resource_key(connection_auth, resource_group, *path):
+    '''
+    Return the ID of a network resource, lowercased as Azure IDs are case
+    insensitive. ``path`` holds the resource types and names, such as
+    ``('networkSecurityGroups', 'nsg1', 'securityRules', 'rule1')``.
+    '''
+    subscription = connection_auth.get('subscription_id') or connection_auth.get('profile', '')
+    return '/'.join(
+        ['/subscriptions', str(subscription), 'resourceGroups', resource_group,
+         'providers', 'Microsoft.Network'] + list(path)
+    ).lower()
+
+
+def _remember(connection_auth, resource_group, path, resource):
+    snapshot = _snapshot()
+    key = _resource_key(connection_auth, resource_group, *path)
+    snapshot[key] = {'object': resource, 'normalized': {}}
+    if len(path) == 2 and path[0] in _CHILD_RESOURCES:
+        attr, child_type = _CHILD_RESOURCES[path[0]]
+        for child in resource.get(attr, []):
+            if child.get('name'):
+                child_key = _resource_key(connection_auth, resource_group, *(path + (child_type, child['name'])))
+                snapshot[child_key] = {'object': child, 'normalized': {}}
+
+
+def _forget(connection_auth, resource_group, *path):
+    '''
+    Drop a resource and its children from the snapshot, and its parent if the
+    resource is a child resource.
+    '''
+    snapshot = _snapshot()
+    key = _resource_key(connection_auth, resource_group, *path)
+    for cached in [cached for cached in snapshot if cached == key or cached.startswith(key + '/')]:
+        del snapshot[cached]
+    if len(path) == 4:
+        snapshot.pop(_resource_key(connection_auth, resource_group, *path[:2]), None)
+
+
+def _get_resource(getter, connection_auth, resource_group, *path):
+    '''
+    Return a network resource from the snapshot, falling back to the
+    ``getter`` execution module function. Child resources are found in their
+    parent if it was fetched before, so that child states don't get each
+    resource again.
+    '''
+    path = tuple(path)
+    entry = _snapshot().get(_resource_key(connection_auth, resource_group, *path))
+    if entry is not None:
+        return entry['object']
+
+    if len(path) == 4:
+        parent = _snapshot().get(_resource_key(connection_auth, resource_group, *path[:2]))
+        if parent is not None:
+            attr = _CHILD_RESOURCES[path[0]][0]
+            for child in parent['object'].get(attr, []):
+                if child.get('name') == path[3]:
+                    _remember(connection_auth, resource_group, path, child)
+                    return child
+
+    # Execution module getters take the names from the child up, then the group
+    args = list(path[1::2])[::-1] + [resource_group]
+    resource = __salt__[getter](*args, azurearm_log_level='info', **connection_auth)
+    if 'error' not in resource:
+        _remember(connection_auth, resource_group, path, resource)
+    return resource
+
+
+def _compare_list_of_dicts(connection_auth, resource_group, path, resource, attr, new, convert_id_to_name=None):
+    '''
+    Compare the ``attr`` list of a resource with ``new`` like
+    azurearm.compare_list_of_dicts does. The normalized form of the remote
+    list is computed once per resource in the snapshot, and unchanged lists
+    skip the full comparison.
+    '''
+    old = resource.get(attr, [])
+    entry = _snapshot().get(_resource_key(connection_auth, resource_group, *path))
+    if entry is not None and entry['object'] is resource:
+        cache_key = (attr, tuple(convert_id_to_name or []))
+        if cache_key not in entry['normalized']:
+            entry['normalized'][cache_key] = __utils__['azurearm.normalize_list_of_dicts'](
+                old, convert_id_to_name
+            )
+        if __utils__['azurearm.list_of_dicts_unchanged'](entry['normalized'][cache_key], new, convert_id_to_name):
+            return {}
+    return __utils__['azurearm.compare_list_of_dicts'](old, new, convert_id_to_name)
+
+
 def virtual_network_present(name, address_prefixes, resource_group, dns_servers=None,
                             tags=None, connection_auth=None, **kwargs):
     '''
@@ -166,11 +269,11 @@ def virtual_network_present(name, address_prefixes, resource_group, dns_servers=
         ret['comment'] = 'Connection information must be specified via connection_auth dictionary!'
         return ret
 
-    vnet = __salt__['azurearm_network.virtual_network_get'](
-        name,
+    vnet = _get_resource(
+        'azurearm_network.virtual_network_get',
+        connection_auth,
         resource_group,
-        azurearm_log_level='info',
-        **connection_auth
+        'virtualNetworks', name
     )
 
     if 'error' not in vnet:
@@ -248,8 +351,10 @@ def virtual_network_present(name, address_prefixes, resource_group, dns_servers=
         tags=tags,
         **vnet_kwargs
     )
+    _forget(connection_auth, resource_group, 'virtualNetworks', name)
 
     if 'error' not in vnet:
+        _remember(connection_auth, resource_group, ('virtualNetworks', name), vnet)
         ret['result'] = True
         ret['comment'] = 'Virtual network {0} has been created.'.format(name)
         return ret
@@ -285,11 +390,11 @@ def virtual_network_absent(name, resource_group, connection_auth=None):
         ret['comment'] = 'Connection information must be specified via connection_auth dictionary!'
         return ret
 
-    vnet = __salt__['azurearm_network.virtual_network_get'](
-        name,
+    vnet = _get_resource(
+        'azurearm_network.virtual_network_get',
+        connection_auth,
         resource_group,
-        azurearm_log_level='info',
-        **connection_auth
+        'virtualNetworks', name
     )
 
     if 'error' in vnet:
@@ -307,6 +412,7 @@ def virtual_network_absent(name, resource_group, connection_auth=None):
         return ret
 
     deleted = __salt__['azurearm_network.virtual_network_delete'](name, resource_group, **connection_auth)
+    _forget(connection_auth, resource_group, 'virtualNetworks', name)
 
     if deleted:
         ret['result'] = True
@@ -380,12 +486,11 @@ def subnet_present(name, address_prefix, virtual_network, resource_group,
         ret['comment'] = 'Connection information must be specified via connection_auth dictionary!'
         return ret
 
-    snet = __salt__['azurearm_network.subnet_get'](
-        name,
-        virtual_network,
+    snet = _get_resource(
+        'azurearm_network.subnet_get',
+        connection_auth,
         resource_group,
-        azurearm_log_level='info',
-        **connection_auth
+        'virtualNetworks', virtual_network, 'subnets', name
     )
 
     if 'error' not in snet:
@@ -453,6 +558,7 @@ def subnet_present(name, address_prefix, virtual_network, resource_group,
         route_table=route_table,
         **snet_kwargs
     )
+    _forget(connection_auth, resource_group, 'virtualNetworks', virtual_network, 'subnets', name)
 
     if 'error' not in snet:
         ret['result'] = True
@@ -493,12 +599,11 @@ def subnet_absent(name, virtual_network, resource_group, connection_auth=None):
         ret['comment'] = 'Connection information must be specified via connection_auth dictionary!'
         return ret
 
-    snet = __salt__['azurearm_network.subnet_get'](
-        name,
-        virtual_network,
+    snet = _get_resource(
+        'azurearm_network.subnet_get',
+        connection_auth,
         resource_group,
-        azurearm_log_level='info',
-        **connection_auth
+        'virtualNetworks', virtual_network, 'subnets', name
     )
 
     if 'error' in snet:
@@ -516,6 +621,7 @@ def subnet_absent(name, virtual_network, resource_group, connection_auth=None):
         return ret
 
     deleted = __salt__['azurearm_network.subnet_delete'](name, virtual_network, resource_group, **connection_auth)
+    _forget(connection_auth, resource_group, 'virtualNetworks', virtual_network, 'subnets', name)
 
     if deleted:
         ret['result'] = True
@@ -603,11 +709,11 @@ def network_security_group_present(name, resource_group, tags=None, security_rul
         ret['comment'] = 'Connection information must be specified via connection_auth dictionary!'
         return ret
 
-    nsg = __salt__['azurearm_network.network_security_group_get'](
-        name,
+    nsg = _get_resource(
+        'azurearm_network.network_security_group_get',
+        connection_auth,
         resource_group,
-        azurearm_log_level='info',
-        **connection_auth
+        'networkSecurityGroups', name
     )
 
     if 'error' not in nsg:
@@ -616,7 +722,14 @@ def network_security_group_present(name, resource_group, tags=None, security_rul
             ret['changes']['tags'] = tag_changes
 
         if security_rules:
-            comp_ret = __utils__['azurearm.compare_list_of_dicts'](nsg.get('security_rules', []), security_rules)
+            comp_ret = _compare_list_of_dicts(
+                connection_auth,
+                resource_group,
+                ('networkSecurityGroups', name),
+                nsg,
+                'security_rules',
+                security_rules
+            )
 
             if comp_ret.get('comment'):
                 ret['comment'] = '"security_rules" {0}'.format(comp_ret['comment'])
@@ -661,8 +774,10 @@ def network_security_group_present(name, resource_group, tags=None, security_rul
         security_rules=security_rules,
         **nsg_kwargs
     )
+    _forget(connection_auth, resource_group, 'networkSecurityGroups', name)
 
     if 'error' not in nsg:
+        _remember(connection_auth, resource_group, ('networkSecurityGroups', name), nsg)
         ret['result'] = True
         ret['comment'] = 'Network security group {0} has been created.'.format(name)
         return ret
@@ -698,11 +813,11 @@ def network_security_group_absent(name, resource_group, connection_auth=None):
         ret['comment'] = 'Connection information must be specified via connection_auth dictionary!'
         return ret
 
-    nsg = __salt__['azurearm_network.network_security_group_get'](
-        name,
+    nsg = _get_resource(
+        'azurearm_network.network_security_group_get',
+        connection_auth,
         resource_group,
-        azurearm_log_level='info',
-        **connection_auth
+        'networkSecurityGroups', name
     )
 
     if 'error' in nsg:
@@ -720,6 +835,7 @@ def network_security_group_absent(name, resource_group, connection_auth=None):
         return ret
 
     deleted = __salt__['azurearm_network.network_security_group_delete'](name, resource_group, **connection_auth)
+    _forget(connection_auth, resource_group, 'networkSecurityGroups', name)
 
     if deleted:
         ret['result'] = True
@@ -862,12 +978,11 @@ def security_rule_present(name, access, direction, priority, protocol, security_
             # pylint: disable=exec-used
             exec('{0} = None'.format(params[1]))
 
-    rule = __salt__['azurearm_network.security_rule_get'](
-        name,
-        security_group,
+    rule = _get_resource(
+        'azurearm_network.security_rule_get',
+        connection_auth,
         resource_group,
-        azurearm_log_level='info',
-        **connection_auth
+        'networkSecurityGroups', security_group, 'securityRules', name
     )
 
     if 'error' not in rule:
@@ -1042,6 +1157,7 @@ def security_rule_present(name, access, direction, priority, protocol, security_
         source_port_ranges=source_port_ranges,
         **rule_kwargs
     )
+    _forget(connection_auth, resource_group, 'networkSecurityGroups', security_group, 'securityRules', name)
 
     if 'error' not in rule:
         ret['result'] = True
@@ -1082,12 +1198,11 @@ def security_rule_absent(name, security_group, resource_group, connection_auth=N
         ret['comment'] = 'Connection information must be specified via connection_auth dictionary!'
         return ret
 
-    rule = __salt__['azurearm_network.security_rule_get'](
-        name,
-        security_group,
+    rule = _get_resource(
+        'azurearm_network.security_rule_get',
+        connection_auth,
         resource_group,
-        azurearm_log_level='info',
-        **connection_auth
+        'networkSecurityGroups', security_group, 'securityRules', name
     )
 
     if 'error' in rule:
@@ -1105,6 +1220,7 @@ def security_rule_absent(name, security_group, resource_group, connection_auth=N
         return ret
 
     deleted = __salt__['azurearm_network.security_rule_delete'](name, security_group, resource_group, **connection_auth)
+    _forget(connection_auth, resource_group, 'networkSecurityGroups', security_group, 'securityRules', name)
 
     if deleted:
         ret['result'] = True
@@ -1300,11 +1416,11 @@ def load_balancer_present(name, resource_group, sku=None, frontend_ip_configurat
     if sku:
         sku = {'name': sku.capitalize()}
 
-    load_bal = __salt__['azurearm_network.load_balancer_get'](
-        name,
+    load_bal = _get_resource(
+        'azurearm_network.load_balancer_get',
+        connection_auth,
         resource_group,
-        azurearm_log_level='info',
-        **connection_auth
+        'loadBalancers', name
     )
 
     if 'error' not in load_bal:
@@ -1321,8 +1437,12 @@ def load_balancer_present(name, resource_group, sku=None, frontend_ip_configurat
 
         # frontend_ip_configurations changes
         if frontend_ip_configurations:
-            comp_ret = __utils__['azurearm.compare_list_of_dicts'](
-                load_bal.get('frontend_ip_configurations', []),
+            comp_ret = _compare_list_of_dicts(
+                connection_auth,
+                resource_group,
+                ('loadBalancers', name),
+                load_bal,
+                'frontend_ip_configurations',
                 frontend_ip_configurations,
                 ['public_ip_address', 'subnet']
             )
@@ -1336,8 +1456,12 @@ def load_balancer_present(name, resource_group, sku=None, frontend_ip_configurat
 
         # backend_address_pools changes
         if backend_address_pools:
-            comp_ret = __utils__['azurearm.compare_list_of_dicts'](
-                load_bal.get('backend_address_pools', []),
+            comp_ret = _compare_list_of_dicts(
+                connection_auth,
+                resource_group,
+                ('loadBalancers', name),
+                load_bal,
+                'backend_address_pools',
                 backend_address_pools
             )
 
@@ -1350,7 +1474,14 @@ def load_balancer_present(name, resource_group, sku=None, frontend_ip_configurat
 
         # probes changes
         if probes:
-            comp_ret = __utils__['azurearm.compare_list_of_dicts'](load_bal.get('probes', []), probes)
+            comp_ret = _compare_list_of_dicts(
+                connection_auth,
+                resource_group,
+                ('loadBalancers', name),
+                load_bal,
+                'probes',
+                probes
+            )
 
             if comp_ret.get('comment'):
                 ret['comment'] = '"probes" {0}'.format(comp_ret['comment'])
@@ -1361,8 +1492,12 @@ def load_balancer_present(name, resource_group, sku=None, frontend_ip_configurat
 
         # load_balancing_rules changes
         if load_balancing_rules:
-            comp_ret = __utils__['azurearm.compare_list_of_dicts'](
-                load_bal.get('load_balancing_rules', []),
+            comp_ret = _compare_list_of_dicts(
+                connection_auth,
+                resource_group,
+                ('loadBalancers', name),
+                load_bal,
+                'load_balancing_rules',
                 load_balancing_rules,
                 ['frontend_ip_configuration', 'backend_address_pool', 'probe']
             )
@@ -1376,8 +1511,12 @@ def load_balancer_present(name, resource_group, sku=None, frontend_ip_configurat
 
         # inbound_nat_rules changes
         if inbound_nat_rules:
-            comp_ret = __utils__['azurearm.compare_list_of_dicts'](
-                load_bal.get('inbound_nat_rules', []),
+            comp_ret = _compare_list_of_dicts(
+                connection_auth,
+                resource_group,
+                ('loadBalancers', name),
+                load_bal,
+                'inbound_nat_rules',
                 inbound_nat_rules,
                 ['frontend_ip_configuration']
             )
@@ -1391,8 +1530,12 @@ def load_balancer_present(name, resource_group, sku=None, frontend_ip_configurat
 
         # inbound_nat_pools changes
         if inbound_nat_pools:
-            comp_ret = __utils__['azurearm.compare_list_of_dicts'](
-                load_bal.get('inbound_nat_pools', []),
+            comp_ret = _compare_list_of_dicts(
+                connection_auth,
+                resource_group,
+                ('loadBalancers', name),
+                load_bal,
+                'inbound_nat_pools',
                 inbound_nat_pools,
                 ['frontend_ip_configuration']
             )
@@ -1406,8 +1549,12 @@ def load_balancer_present(name, resource_group, sku=None, frontend_ip_configurat
 
         # outbound_nat_rules changes
         if outbound_nat_rules:
-            comp_ret = __utils__['azurearm.compare_list_of_dicts'](
-                load_bal.get('outbound_nat_rules', []),
+            comp_ret = _compare_list_of_dicts(
+                connection_auth,
+                resource_group,
+                ('loadBalancers', name),
+                load_bal,
+                'outbound_nat_rules',
                 outbound_nat_rules,
                 ['frontend_ip_configuration']
             )
@@ -1468,8 +1615,10 @@ def load_balancer_present(name, resource_group, sku=None, frontend_ip_configurat
         outbound_nat_rules=outbound_nat_rules,
         **lb_kwargs
     )
+    _forget(connection_auth, resource_group, 'loadBalancers', name)
 
     if 'error' not in load_bal:
+        _remember(connection_auth, resource_group, ('loadBalancers', name), load_bal)
         ret['result'] = True
         ret['comment'] = 'Load balancer {0} has been created.'.format(name)
         return ret
@@ -1505,11 +1654,11 @@ def load_balancer_absent(name, resource_group, connection_auth=None):
         ret['comment'] = 'Connection information must be specified via connection_auth dictionary!'
         return ret
 
-    load_bal = __salt__['azurearm_network.load_balancer_get'](
-        name,
+    load_bal = _get_resource(
+        'azurearm_network.load_balancer_get',
+        connection_auth,
         resource_group,
-        azurearm_log_level='info',
-        **connection_auth
+        'loadBalancers', name
     )
 
     if 'error' in load_bal:
@@ -1527,6 +1676,7 @@ def load_balancer_absent(name, resource_group, connection_auth=None):
         return ret
 
     deleted = __salt__['azurearm_network.load_balancer_delete'](name, resource_group, **connection_auth)
+    _forget(connection_auth, resource_group, 'loadBalancers', name)
 
     if deleted:
         ret['result'] = True
@@ -2172,11 +2322,11 @@ def route_table_present(name, resource_group, tags=None, routes=None, disable_bg
         ret['comment'] = 'Connection information must be specified via connection_auth dictionary!'
         return ret
 
-    rt_tbl = __salt__['azurearm_network.route_table_get'](
-        name,
+    rt_tbl = _get_resource(
+        'azurearm_network.route_table_get',
+        connection_auth,
         resource_group,
-        azurearm_log_level='info',
-        **connection_auth
+        'routeTables', name
     )
 
     if 'error' not in rt_tbl:
@@ -2195,7 +2345,14 @@ def route_table_present(name, resource_group, tags=None, routes=None, disable_bg
 
         # routes changes
         if routes:
-            comp_ret = __utils__['azurearm.compare_list_of_dicts'](rt_tbl.get('routes', []), routes)
+            comp_ret = _compare_list_of_dicts(
+                connection_auth,
+                resource_group,
+                ('routeTables', name),
+                rt_tbl,
+                'routes',
+                routes
+            )
 
             if comp_ret.get('comment'):
                 ret['comment'] = '"routes" {0}'.format(comp_ret['comment'])
@@ -2241,8 +2398,10 @@ def route_table_present(name, resource_group, tags=None, routes=None, disable_bg
         tags=tags,
         **rt_tbl_kwargs
     )
+    _forget(connection_auth, resource_group, 'routeTables', name)
 
     if 'error' not in rt_tbl:
+        _remember(connection_auth, resource_group, ('routeTables', name), rt_tbl)
         ret['result'] = True
         ret['comment'] = 'Route table {0} has been created.'.format(name)
         return ret
@@ -2278,11 +2437,11 @@ def route_table_absent(name, resource_group, connection_auth=None):
         ret['comment'] = 'Connection information must be specified via connection_auth dictionary!'
         return ret
 
-    rt_tbl = __salt__['azurearm_network.route_table_get'](
-        name,
+    rt_tbl = _get_resource(
+        'azurearm_network.route_table_get',
+        connection_auth,
         resource_group,
-        azurearm_log_level='info',
-        **connection_auth
+        'routeTables', name
     )
 
     if 'error' in rt_tbl:
@@ -2300,6 +2459,7 @@ def route_table_absent(name, resource_group, connection_auth=None):
         return ret
 
     deleted = __salt__['azurearm_network.route_table_delete'](name, resource_group, **connection_auth)
+    _forget(connection_auth, resource_group, 'routeTables', name)
 
     if deleted:
         ret['result'] = True
@@ -2372,12 +2532,11 @@ def route_present(name, address_prefix, next_hop_type, route_table, resource_gro
         ret['comment'] = 'Connection information must be specified via connection_auth dictionary!'
         return ret
 
-    route = __salt__['azurearm_network.route_get'](
-        name,
-        route_table,
+    route = _get_resource(
+        'azurearm_network.route_get',
+        connection_auth,
         resource_group,
-        azurearm_log_level='info',
-        **connection_auth
+        'routeTables', route_table, 'routes', name
     )
 
     if 'error' not in route:
@@ -2437,6 +2596,7 @@ def route_present(name, address_prefix, next_hop_type, route_table, resource_gro
         next_hop_ip_address=next_hop_ip_address,
         **route_kwargs
     )
+    _forget(connection_auth, resource_group, 'routeTables', route_table, 'routes', name)
 
     if 'error' not in route:
         ret['result'] = True
@@ -2477,12 +2637,11 @@ def route_absent(name, route_table, resource_group, connection_auth=None):
         ret['comment'] = 'Connection information must be specified via connection_auth dictionary!'
         return ret
 
-    route = __salt__['azurearm_network.route_get'](
-        name,
-        route_table,
+    route = _get_resource(
+        'azurearm_network.route_get',
+        connection_auth,
         resource_group,
-        azurearm_log_level='info',
-        **connection_auth
+        'routeTables', route_table, 'routes', name
     )
 
     if 'error' in route:
@@ -2500,6 +2659,7 @@ def route_absent(name, route_table, resource_group, connection_auth=None):
         return ret
 
     deleted = __salt__['azurearm_network.route_delete'](name, route_table, resource_group, **connection_auth)
+    _forget(connection_auth, resource_group, 'routeTables', route_table, 'routes', name)
 
     if deleted:
         ret['result'] = True
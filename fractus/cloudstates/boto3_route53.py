@@ -59,6 +59,23 @@ passed in as a dict, or as a string to pull from pillars or minion config:
         - keyid: GKTADJGHEIQSXMKKRBJ08H
         - key: askdjghsdfjkghWupUjasdflkdfklgjsdfjajkghs
 
+Runs managing many records can batch their changes. With the
+``boto3_route53.batch_changes`` option set, record states compare against a
+single listing of each zone and queue their changes, which are submitted
+together as a few ``ChangeBatch`` requests per zone by a ``changes_applied``
+state or at the end of the run:
+
+.. code-block:: yaml
+
+    boto3_route53.batch_changes: True
+
+.. code-block:: yaml
+
+    records applied:
+      boto3_route53.changes_applied:
+        - require:
+          - boto3_route53: test.example.com.
+
 '''
 # keep lint from choking
 #pylint: disable=W0106
@@ -137,6 +154,28 @@ def _from_aws_encoding(string):  # XXX TODO
     pass
 
 
+def _batch_changes():
+    return __opts__.get('boto3_route53.batch_changes', False)
+
+
+def _get_records(HostedZoneId, Name, Type, region, key, keyid, profile):
+    if _batch_changes():
+        return __salt__['boto3_route53.get_zone_records'](HostedZoneId, Name, Type,
+                region=region, key=key, keyid=keyid, profile=profile)
+    return __salt__['boto3_route53.get_resource_records'](HostedZoneId=HostedZoneId,
+            StartRecordName=Name, StartRecordType=Type, region=region, key=key, keyid=keyid,
+            profile=profile)
+
+
+def _apply_change(HostedZoneId, Change, region, key, keyid, profile):
+    if _batch_changes():
+        return __salt__['boto3_route53.queue_change'](HostedZoneId=HostedZoneId, Change=Change,
+                region=region, key=key, keyid=keyid, profile=profile)
+    return __salt__['boto3_route53.change_resource_record_sets'](HostedZoneId=HostedZoneId,
+            ChangeBatch={'Changes': [Change]}, region=region, key=key, keyid=keyid,
+            profile=profile)
+
+
 def hosted_zone_present(name, Name=None, PrivateZone=False,
                         CallerReference=None, Comment=None, VPCs=None,
                         region=None, key=None, keyid=None, profile=None):
@@ -650,9 +689,7 @@ def rr_present(name, HostedZoneId=None, DomainName=None, PrivateZone=False, Name
                 fixed_rrs += [rr]
         ResourceRecords = [{'Value': rr} for rr in sorted(fixed_rrs)]
 
-    recordsets = __salt__['boto3_route53.get_resource_records'](HostedZoneId=HostedZoneId,
-            StartRecordName=Name, StartRecordType=Type, region=region, key=key, keyid=keyid,
-            profile=profile)
+    recordsets = _get_records(HostedZoneId, Name, Type, region, key, keyid, profile)
 
     if SetIdentifier and recordsets:
         log.debug('Filter recordsets %s by SetIdentifier %s.', recordsets, SetIdentifier)
@@ -707,19 +744,15 @@ def rr_present(name, HostedZoneId=None, DomainName=None, PrivateZone=False, Name
             else:
                 log.debug('Not updating ResourceRecordSet with local value: %s', locals().get(u))
 
-        ChangeBatch = {
-            'Changes': [
-                {
-                    'Action': 'UPSERT',
-                    'ResourceRecordSet': ResourceRecordSet,
-                }
-            ]
+        Change = {
+            'Action': 'UPSERT',
+            'ResourceRecordSet': ResourceRecordSet,
         }
 
-        if __salt__['boto3_route53.change_resource_record_sets'](HostedZoneId=HostedZoneId,
-                ChangeBatch=ChangeBatch, region=region, key=key, keyid=keyid, profile=profile):
-            ret['comment'] = 'Route 53 resource record {} with type {} {}.'.format(Name,
-                    Type, 'created' if create else 'updated')
+        if _apply_change(HostedZoneId, Change, region, key, keyid, profile):
+            ret['comment'] = 'Route 53 resource record {} with type {} {}{}.'.format(Name,
+                    Type, 'queued to be ' if _batch_changes() else '',
+                    'created' if create else 'updated')
             log.info(ret['comment'])
             if create:
                 ret['changes']['old'] = None
@@ -797,9 +830,7 @@ def rr_absent(name, HostedZoneId=None, DomainName=None, PrivateZone=False,
     zone = zone[0]
     HostedZoneId = zone['HostedZone']['Id']
 
-    recordsets = __salt__['boto3_route53.get_resource_records'](HostedZoneId=HostedZoneId,
-            StartRecordName=Name, StartRecordType=Type, region=region, key=key, keyid=keyid,
-            profile=profile)
+    recordsets = _get_records(HostedZoneId, Name, Type, region, key, keyid, profile)
     if SetIdentifier and recordsets:
         log.debug('Filter recordsets %s by SetIdentifier %s.', recordsets, SetIdentifier)
         recordsets = [r for r in recordsets if r.get('SetIdentifier') == SetIdentifier]
@@ -820,18 +851,14 @@ def rr_absent(name, HostedZoneId=None, DomainName=None, PrivateZone=False,
         ret['result'] = None
         return ret
 
-    ChangeBatch = {
-        'Changes': [
-            {
-                'Action': 'DELETE',
-                'ResourceRecordSet': ResourceRecordSet,
-            }
-        ]
+    Change = {
+        'Action': 'DELETE',
+        'ResourceRecordSet': ResourceRecordSet,
     }
 
-    if __salt__['boto3_route53.change_resource_record_sets'](HostedZoneId=HostedZoneId,
-            ChangeBatch=ChangeBatch, region=region, key=key, keyid=keyid, profile=profile):
-        ret['comment'] = 'Route 53 resource record {} with type {} deleted.'.format(Name, Type)
+    if _apply_change(HostedZoneId, Change, region, key, keyid, profile):
+        ret['comment'] = 'Route 53 resource record {} with type {} {}deleted.'.format(Name, Type,
+                'queued to be ' if _batch_changes() else '')
         log.info(ret['comment'])
         ret['changes']['old'] = ResourceRecordSet
         ret['changes']['new'] = None
@@ -842,3 +869,37 @@ def rr_absent(name, HostedZoneId=None, DomainName=None, PrivateZone=False,
         ret['result'] = False
 
     return ret
+
+
+def changes_applied(name, wait=True, timeout=600):
+    '''
+    Submit the record changes queued so far by record states run with the
+    ``boto3_route53.batch_changes`` option, as a few ChangeBatch requests per
+    hosted zone.
+
+    name
+        The name of the state definition.
+
+    wait
+        Wait for the changes to be INSYNC.
+
+    timeout
+        Seconds to wait for the changes.
+    '''
+    ret = {'name': name, 'result': True, 'comment': '', 'changes': {}}
+    if __opts__['test']:
+        ret['comment'] = 'Queued Route 53 changes would be applied.'
+        return ret
+    res = __salt__['boto3_route53.flush_changes'](wait=wait, timeout=timeout)
+    if res['applied']:
+        ret['changes']['applied'] = res['applied']
+    if res['failed']:
+        ret['result'] = False
+        ret['comment'] = 'Failed to apply Route 53 changes: {}.'.format('; '.join(res['failed']))
+    elif res['pending']:
+        ret['result'] = False
+        ret['comment'] = 'Route 53 changes {} not synced after {} seconds.'.format(
+                ', '.join(res['pending']), timeout)
+    else:
+        ret['comment'] = '{} queued Route 53 changes applied.'.format(len(res['applied']))
+    return ret
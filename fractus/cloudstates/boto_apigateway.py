@@ -57,6 +57,7 @@ import hashlib
 import logging
 import os
 import re
+from multiprocessing.pool import ThreadPool
 
 # Import Salt Libs
 import salt.utils.files
@@ -68,6 +69,10 @@ from salt.ext import six
 
 log = logging.getLogger(__name__)
 
+# Number of models or methods created at a time while deploying a swagger
+# file, unless set with the boto_apigateway.deploy_workers option.
+DEPLOY_WORKERS = 4
+
 
 def __virtual__():
     '''
@@ -714,6 +719,7 @@ class _Swagger(object):
         self._deploymentId = ''
         self._error_response_template = error_response_template
         self._response_template = response_template
+        self._model_deps = {}
 
         if swagger_file_path is not None:
             if os.path.exists(swagger_file_path) and os.path.isfile(swagger_file_path):
@@ -888,12 +894,9 @@ class _Swagger(object):
         '''
         generator to return the tuple of model and its schema to create on aws.
         '''
-        model_dict = self._build_all_dependencies()
-        while True:
-            model = self._get_model_without_dependencies(model_dict)
-            if not model:
-                break
-            yield (model, self._models().get(model))
+        for level in self._model_levels():
+            for model in level:
+                yield (model, self._models().get(model))
 
     @property
     def paths(self):
@@ -1289,6 +1292,7 @@ class _Swagger(object):
     def _build_dependent_model_list(self, obj_schema):
         '''
         Helper function to build the list of models the given object schema is referencing.
+        The dependencies of every referenced model are only resolved once.
         '''
         dep_models_list = []
 
@@ -1300,8 +1304,7 @@ class _Swagger(object):
             ref = obj_schema.get('$ref')
             if ref:
                 ref_obj_model = ref.split("/")[-1]
-                ref_obj_schema = self._models().get(ref_obj_model)
-                dep_models_list.extend(self._build_dependent_model_list(ref_obj_schema))
+                dep_models_list.extend(self._model_dependencies(ref_obj_model))
                 dep_models_list.extend([ref_obj_model])
             else:
                 # need to walk each property object
@@ -1311,40 +1314,98 @@ class _Swagger(object):
                         dep_models_list.extend(self._build_dependent_model_list(prop_obj_schema))
         return list(set(dep_models_list))
 
+    def _model_dependencies(self, model):
+        '''
+        Helper function returning the memoized list of models the given model depends on.
+        Models which are not defined, or which depend on themselves, are left in the list
+        so that they are reported when ordering the models.
+        '''
+        if model not in self._model_deps:
+            schema = self._models().get(model)
+            if schema is None:
+                return []
+            # Guard against reference cycles while the dependencies are resolved
+            self._model_deps[model] = [model]
+            self._model_deps[model] = self._build_dependent_model_list(schema)
+        return self._model_deps[model]
+
     def _build_all_dependencies(self):
         '''
         Helper function to build a map of model to their list of model reference dependencies
         '''
         ret = {}
-        for model, schema in six.iteritems(self._models()):
-            dep_list = self._build_dependent_model_list(schema)
-            ret[model] = dep_list
+        for model in self._models():
+            ret[model] = list(self._model_dependencies(model))
         return ret
 
-    def _get_model_without_dependencies(self, models_dict):
+    def _model_levels(self):
         '''
-        Helper function to find the next model that should be created
+        Helper function to sort the models topologically. Returns a list of levels, where the
+        models of a level only depend on models of the previous levels, so the models of a level
+        can be created in any order.
         '''
-        next_model = None
-        if not models_dict:
-            return next_model
-
-        for model, dependencies in six.iteritems(models_dict):
-            if dependencies == []:
-                next_model = model
-                break
-
-        if next_model is None:
+        models_dict = self._build_all_dependencies()
+        dependents = {}
+        pending = {}
+        for model, dep_list in six.iteritems(models_dict):
+            pending[model] = len(dep_list)
+            for dep in dep_list:
+                dependents.setdefault(dep, []).append(model)
+
+        levels = []
+        level = sorted(model for model, count in six.iteritems(pending) if count == 0)
+        while level:
+            levels.append(level)
+            next_level = []
+            for model in level:
+                for dependent in dependents.get(model, []):
+                    pending[dependent] -= 1
+                    if pending[dependent] == 0:
+                        next_level.append(dependent)
+            level = sorted(next_level)
+
+        unresolved = dict((model, models_dict[model]) for model, count in six.iteritems(pending) if count)
+        if unresolved:
             raise ValueError('incomplete model definitions, models in dependency '
-                             'list not defined: {0}'.format(models_dict))
+                             'list not defined or circular: {0}'.format(unresolved))
+        return levels
 
-        # remove the model from other depednencies before returning
-        models_dict.pop(next_model)
-        for model, dep_list in six.iteritems(models_dict):
-            if next_model in dep_list:
-                dep_list.remove(next_model)
+    def _run_concurrently(self, ret, func, args_list):
+        '''
+        Helper method to run func(ret, *args) for every args tuple on a thread pool, each with a
+        return structure of its own, which are then merged into ret in order. The changes of all
+        runs are merged, and the first run which aborted sets the result and comment of ret.
+        '''
+        def _run(args):
+            return func({'result': True, 'comment': '', 'changes': {}}, *args)
 
-        return next_model
+        workers = max(int(__opts__.get('boto_apigateway.deploy_workers', DEPLOY_WORKERS)), 1)
+        if workers == 1 or len(args_list) < 2:
+            results = []
+            for args in args_list:
+                results.append(_run(args))
+                if results[-1].get('abort'):
+                    break
+        else:
+            pool = ThreadPool(min(workers, len(args_list)))
+            try:
+                results = pool.map(_run, args_list)
+            finally:
+                pool.close()
+                pool.join()
+
+        aborted = None
+        for result in results:
+            if result['changes'].get('new'):
+                ret['changes'].setdefault('new', []).extend(result['changes']['new'])
+            if aborted is None and result.get('abort'):
+                aborted = result
+        if aborted is not None:
+            ret['result'] = aborted['result']
+            ret['abort'] = True
+            if aborted.get('comment'):
+                ret['comment'] = aborted['comment']
+        return ret
 
     def deploy_models(self, ret):
         '''
@@ -1354,53 +1415,72 @@ class _Swagger(object):
             a dictionary for returning status to Saltstack
         '''
 
-        for model, schema in self.models():
-            # add in a few attributes into the model schema that AWS expects
-            # _schema = schema.copy()
-            _schema = self._update_schema_to_aws_notation(schema)
-            _schema.update({'$schema': _Swagger.JSON_SCHEMA_DRAFT_4,
-                            'title': '{0} Schema'.format(model)})
-
-            # check to see if model already exists, aws has 2 default models [Empty, Error]
-            # which may need upate with data from swagger file
-            model_exists_response = __salt__['boto_apigateway.api_model_exists'](restApiId=self.restApiId,
-                                                                                 modelName=model,
-                                                                                 **self._common_aws_args)
-
-            if model_exists_response.get('exists'):
-                update_model_schema_response = (
-                    __salt__['boto_apigateway.update_api_model_schema'](restApiId=self.restApiId,
-                                                                        modelName=model,
-                                                                        schema=_dict_to_json_pretty(_schema),
-                                                                        **self._common_aws_args))
-                if not update_model_schema_response.get('updated'):
-                    ret['result'] = False
-                    ret['abort'] = True
-                    if 'error' in update_model_schema_response:
-                        ret['comment'] = ('Failed to update existing model {0} with schema {1}, '
-                                          'error: {2}'.format(model, _dict_to_json_pretty(schema),
-                                                              update_model_schema_response['error']['message']))
-                    return ret
+        for level in self._model_levels():
+            ret = self._run_concurrently(ret, self._deploy_model,
+                                         [(model, self._models().get(model)) for model in level])
+            if ret.get('abort'):
+                return ret
+        return ret
 
-                ret = _log_changes(ret, 'deploy_models', update_model_schema_response)
-            else:
-                create_model_response = (
-                    __salt__['boto_apigateway.create_api_model'](restApiId=self.restApiId, modelName=model,
-                                                                 modelDescription=model,
-                                                                 schema=_dict_to_json_pretty(_schema),
-                                                                 contentType='application/json',
-                                                                 **self._common_aws_args))
-
-                if not create_model_response.get('created'):
-                    ret['result'] = False
-                    ret['abort'] = True
-                    if 'error' in create_model_response:
-                        ret['comment'] = ('Failed to create model {0}, schema {1}, '
-                                          'error: {2}'.format(model, _dict_to_json_pretty(schema),
-                                                              create_model_response['error']['message']))
-                    return ret
+    def _deploy_model(self, ret, model, schema):
+        '''
+        Method to create or update a single model on AWS Apigateway
+
+        ret
+            a dictionary for returning status to Saltstack
+
+        model
+            the name of the model
+
+        schema
+            the schema of the model in the swagger file
+        '''
+        # add in a few attributes into the model schema that AWS expects
+        # _schema = schema.copy()
+        _schema = self._update_schema_to_aws_notation(schema)
+        _schema.update({'$schema': _Swagger.JSON_SCHEMA_DRAFT_4,
+                        'title': '{0} Schema'.format(model)})
+
+        # check to see if model already exists, aws has 2 default models [Empty, Error]
+        # which may need upate with data from swagger file
+        model_exists_response = __salt__['boto_apigateway.api_model_exists'](restApiId=self.restApiId,
+                                                                             modelName=model,
+                                                                             **self._common_aws_args)
+
+        if model_exists_response.get('exists'):
+            update_model_schema_response = (
+                __salt__['boto_apigateway.update_api_model_schema'](restApiId=self.restApiId,
+                                                                    modelName=model,
+                                                                    schema=_dict_to_json_pretty(_schema),
+                                                                    **self._common_aws_args))
+            if not update_model_schema_response.get('updated'):
+                ret['result'] = False
+                ret['abort'] = True
+                if 'error' in update_model_schema_response:
+                    ret['comment'] = ('Failed to update existing model {0} with schema {1}, '
+                                      'error: {2}'.format(model, _dict_to_json_pretty(schema),
+                                                          update_model_schema_response['error']['message']))
+                return ret
+
+            ret = _log_changes(ret, 'deploy_models', update_model_schema_response)
+        else:
+            create_model_response = (
+                __salt__['boto_apigateway.create_api_model'](restApiId=self.restApiId, modelName=model,
+                                                             modelDescription=model,
+                                                             schema=_dict_to_json_pretty(_schema),
+                                                             contentType='application/json',
+                                                             **self._common_aws_args))
+
+            if not create_model_response.get('created'):
+                ret['result'] = False
+                ret['abort'] = True
+                if 'error' in create_model_response:
+                    ret['comment'] = ('Failed to create model {0}, schema {1}, '
+                                      'error: {2}'.format(model, _dict_to_json_pretty(schema),
+                                                          create_model_response['error']['message']))
+                return ret
 
-                ret = _log_changes(ret, 'deploy_models', create_model_response)
+            ret = _log_changes(ret, 'deploy_models', create_model_response)
 
         return ret
 
@@ -1659,6 +1739,9 @@ class _Swagger(object):
             'NONE' or 'AWS_IAM'
         '''
 
+        # Resources are created one at a time, since paths may share parents which still need
+        # to be created. The methods of all the resources are independent of each other.
+        methods = []
         for path, pathData in self.paths:
             resource = __salt__['boto_apigateway.create_api_resources'](restApiId=self.restApiId,
                                                                         path=path,
@@ -1669,9 +1752,9 @@ class _Swagger(object):
             ret = _log_changes(ret, 'deploy_resources', resource)
             for method, method_data in six.iteritems(pathData):
                 if method in _Swagger.SWAGGER_OPERATION_NAMES:
-                    ret = self._deploy_method(ret, path, method, method_data, api_key_required,
-                                              lambda_integration_role, lambda_region, authorization_type)
-        return ret
+                    methods.append((path, method, method_data, api_key_required,
+                                    lambda_integration_role, lambda_region, authorization_type))
+        return self._run_concurrently(ret, self._deploy_method, methods)
 
 
 def usage_plan_present(name, plan_name, description=None, throttle=None, quota=None, region=None, key=None, keyid=None,
@@ -486,7 +486,7 @@ def present(name, listeners, availability_zones=None, subnets=None,
 
 
 def register_instances(name, instances, region=None, key=None, keyid=None,
-                       profile=None):
+                       profile=None, wait_for_healthy=False, timeout=300):
     '''
     Add EC2 instance(s) to an Elastic Load Balancer. Removing an instance from
     the ``instances`` list does not remove it from the ELB.
@@ -500,6 +500,10 @@ def register_instances(name, instances, region=None, key=None, keyid=None,
         to the ELB. EC2 instances already associated with this ELB will not be
         removed if they are not in the ``instances`` list.
 
+    wait_for_healthy
+        Wait until the registered instances are InService. The state fails
+        if they aren't after ``timeout`` seconds.
+
     .. versionadded:: 2015.8.0
 
     .. code-block:: yaml
@@ -543,6 +547,14 @@ def register_instances(name, instances, region=None, key=None, keyid=None,
         new = set().union(nodes, instances)
         ret.update({'comment': msg, 'changes': {'old': '\n'.join(nodes),
                                                 'new': '\n'.join(list(new))}})
+        if wait_for_healthy:
+            healthy = __salt__['boto_elb.wait_for_healthy'](
+                    {name: instances}, timeout=timeout, region=region, key=key,
+                    keyid=keyid, profile=profile)
+            if not healthy['healthy']:
+                ret['comment'] = '{0}, but instance/s {1} are not InService after {2} seconds'.format(
+                    msg, ', '.join(healthy['pending'][name] or instances), timeout)
+                ret['result'] = False
     else:
         msg = 'Load balancer {0} failed to add instances'.format(name)
         log.error(msg)
@@ -64,13 +64,11 @@ config:
 from __future__ import absolute_import, print_function, unicode_literals
 import logging
 import os
-import hashlib
 
 # Import Salt Libs
 from salt.ext import six
 import salt.utils.data
 import salt.utils.dictupdate as dictupdate
-import salt.utils.files
 import salt.utils.json
 from salt.exceptions import SaltInvocationError
 
@@ -406,10 +404,7 @@ def _function_code_present(FunctionName, ZipFile, S3Bucket, S3Key,
     if ZipFile:
         size = os.path.getsize(ZipFile)
         if size == func['CodeSize']:
-            sha = hashlib.sha256()
-            with salt.utils.files.fopen(ZipFile, 'rb') as f:
-                sha.update(f.read())
-            hashed = sha.digest().encode('base64').strip()
+            hashed = __salt__['boto_lambda.code_sha256'](ZipFile)
             if hashed != func['CodeSha256']:
                 update = True
         else:
@@ -136,6 +136,9 @@ def present(name, value, zone, record_type, ttl=None, identifier=None, region=No
 
     wait_for_sync
         Wait for an INSYNC change status from Route53 before returning success.
+        Pass ``defer`` to return right away and confirm the change together
+        with the other deferred changes, in a ``changes_synced`` state or at
+        the end of the run.
 
     split_dns
         Route53 supports parallel public and private DNS zones with the same name.
@@ -301,7 +304,8 @@ def absent(
         that contains a dict with region, key and keyid.
 
     wait_for_sync
-        Wait for an INSYNC change status from Route53.
+        Wait for an INSYNC change status from Route53. Pass ``defer`` to
+        confirm the change later, like in :py:func:`present`.
 
     split_dns
         Route53 supports a public and private DNS zone with the same
@@ -341,6 +345,41 @@ def absent(
     return ret
 
 
+def changes_synced(name, timeout=600):
+    '''
+    Wait for the Route53 changes of the record states run with
+    ``wait_for_sync: defer`` so far to be in sync. The changes are polled
+    together, rather than one record state at a time.
+
+    .. code-block:: yaml
+
+        records synced:
+          boto_route53.changes_synced:
+            - timeout: 300
+            - require:
+              - boto_route53: www.example.com.
+              - boto_route53: mail.example.com.
+
+    name
+        Name of the state.
+
+    timeout
+        Seconds to wait for the changes.
+    '''
+    ret = {'name': name, 'result': True, 'comment': '', 'changes': {}}
+    if __opts__['test']:
+        ret['comment'] = 'Route53 changes will be waited for.'
+        return ret
+    res = __salt__['boto_route53.wait_for_changes'](timeout=timeout)
+    if res['pending']:
+        ret['result'] = False
+        ret['comment'] = 'Route53 changes {0} not synced after {1} seconds.'.format(
+            ', '.join(res['pending']), timeout)
+    else:
+        ret['comment'] = '{0} Route53 changes are in sync.'.format(len(res['synced']))
+    return ret
+
+
 def hosted_zone_present(name, domain_name=None, private_zone=False, caller_ref=None, comment='',
                         vpc_id=None, vpc_name=None, vpc_region=None, region=None, key=None,
                         keyid=None, profile=None):
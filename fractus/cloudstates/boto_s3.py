@@ -46,6 +46,14 @@ config:
             - key: askdjghsdfjkghWupUjasdflkdfklgjsdfjajkghs
             - profile: my-profile
 
+    Ensure s3 prefix matches a local directory:
+        boto_s3.directory_present:
+            - name: s3-bucket/s3-prefix
+            - source: /path/to/local/dir
+            - workers: 16
+            - transfer_config:
+                multipart_chunksize: 16777216
+
 :depends: boto3
 '''
 
@@ -57,7 +65,6 @@ import logging
 
 # Import Salt libs
 import salt.ext.six as six
-import salt.utils.hashutils
 
 log = logging.getLogger(__name__)
 
@@ -105,6 +112,18 @@ GET_METADATA_EXTRA_ARGS = frozenset([
     'SSECustomerKeyMD5',
     'RequestPayer',
 ])
+HASH_METADATA_KEY = 'salt_managed_content_hash'
+
+
+def _without_hash(metadata):
+    '''
+    Copy of the S3 metadata without the salt managed content hash
+    '''
+    metadata = copy.deepcopy(metadata)
+    metadata.get('Metadata', {}).pop(HASH_METADATA_KEY, None)
+    if not metadata.get('Metadata', True):
+        del metadata['Metadata']
+    return metadata
 
 
 def object_present(
@@ -113,6 +132,7 @@ def object_present(
     hash_type=None,
     extra_args=None,
     extra_args_from_pillar='boto_s3_object_extra_args',
+    transfer_config=None,
     region=None,
     key=None,
     keyid=None,
@@ -150,6 +170,12 @@ def object_present(
         Extra arguments defined for this specific state will be
         merged over those from the pillar.
 
+    transfer_config
+        A dictionary of ``boto3.s3.transfer.TransferConfig`` settings used for
+        the upload, like ``multipart_threshold``, ``multipart_chunksize`` and
+        ``max_concurrency``. Defaults to the ``boto_s3.transfer_config``
+        option.
+
     region
         Region to connect to.
 
@@ -187,8 +213,13 @@ def object_present(
     if not hash_type:
         hash_type = __opts__['hash_type']
     try:
-        digest = salt.utils.hashutils.get_hash(source, form=hash_type)
-    except IOError as e:
+        digests = __salt__['boto_s3.file_digests'](
+            source,
+            hash_type=hash_type,
+            transfer_config=transfer_config,
+        )
+        digest = digests['hash']
+    except (IOError, OSError) as e:
         ret['result'] = False
         ret['comment'] = "Could not read local file {0}: {1}".format(
             source,
@@ -204,7 +235,6 @@ def object_present(
         )
         return ret
 
-    HASH_METADATA_KEY = 'salt_managed_content_hash'
     combined_extra_args.setdefault('Metadata', {})
     if HASH_METADATA_KEY in combined_extra_args['Metadata']:
         # Be lenient, silently allow hash metadata key if digest value matches
@@ -253,7 +283,11 @@ def object_present(
             (k, r['result'][k]) for k in STORED_EXTRA_ARGS
             if k in desired_metadata and k in r['result']
         )
-        if s3_metadata == desired_metadata:
+        # An object with the same ETag has the same content, even if it was
+        # not uploaded by salt or hashed with another hash_type
+        if s3_metadata == desired_metadata or (
+                _without_hash(s3_metadata) == _without_hash(desired_metadata) and
+                __utils__['s3.etag_matches'](r['result'].get('ETag'), digests['etag'])):
             ret['result'] = True
             ret['comment'] = 'S3 object {0} is present.'.format(name)
             return ret
@@ -289,6 +323,7 @@ def object_present(
         source,
         name,
         extra_args=combined_extra_args,
+        transfer_config=transfer_config,
         region=region,
         key=key,
         keyid=keyid,
@@ -308,3 +343,102 @@ def object_present(
     ret['comment'] += '\nChanges:\n{0}'.format(changes_diff)
     ret['changes'] = {'diff': changes_diff}
     return ret
+
+
+def directory_present(
+    name,
+    source,
+    extra_args=None,
+    transfer_config=None,
+    workers=8,
+    delete=False,
+    region=None,
+    key=None,
+    keyid=None,
+    profile=None,
+):
+    '''
+    Ensure every file below a local directory exists in S3.
+
+    name
+        The bucket and the optional prefix to upload to, as
+        ``bucket/prefix``.
+
+    source
+        The local directory to upload.
+
+    extra_args
+        A dictionary of extra arguments to use when uploading files.
+        Unlike :py:func:`object_present`, only the content of existing
+        objects is compared, using their ETag.
+
+    transfer_config
+        A dictionary of ``boto3.s3.transfer.TransferConfig`` settings used
+        for the uploads.
+
+    workers
+        Number of files to hash and upload at a time.
+
+    delete
+        Delete the S3 objects under ``name`` which have no local file.
+
+    region
+        Region to connect to.
+
+    key
+        Secret key to be used.
+
+    keyid
+        Access key to be used.
+
+    profile
+        A dict with region, key and keyid, or a pillar key (string) that
+        contains a dict with region, key and keyid.
+    '''
+    ret = {
+        'name': name,
+        'comment': '',
+        'changes': {},
+    }
+
+    r = __salt__['boto_s3.sync_directory'](
+        source,
+        name,
+        extra_args=extra_args,
+        transfer_config=transfer_config,
+        workers=workers,
+        delete=delete,
+        test=__opts__['test'],
+        region=region,
+        key=key,
+        keyid=keyid,
+        profile=profile,
+    )
+    if 'error' in r:
+        ret['result'] = False
+        ret['comment'] = 'Failed to sync {0} to S3: {1}.'.format(source, r['error'])
+        return ret
+
+    changes = dict((action, r['result'][action]) for action in ('uploaded', 'deleted')
+                   if r['result'].get(action))
+    failed = r['result']['failed']
+    if failed:
+        ret['result'] = False
+        ret['comment'] = 'Failed to sync {0} S3 objects under {1}.'.format(len(failed), name)
+        if changes:
+            ret['changes'] = dict(changes, failed=failed)
+        return ret
+    if not changes:
+        ret['result'] = True
+        ret['comment'] = 'S3 objects under {0} are up to date.'.format(name)
+        return ret
+    summary = ', '.join('{0} {1}'.format(len(keys), action) for action, keys in sorted(changes.items()))
+    if __opts__['test']:
+        ret['result'] = None
+        ret['comment'] = 'S3 objects under {0} set to be synced: {1}.'.format(name, summary)
+        ret['pchanges'] = changes
+        return ret
+    ret['result'] = True
+    ret['comment'] = 'S3 objects under {0} synced: {1}.'.format(name, summary)
+    ret['changes'] = changes
+    return ret
@@ -303,39 +303,27 @@ def _split_rules(rules):
     return split
 
 
-def _check_rule(rule, _rule):
+# Protocol numbers AWS reports by name, and the name salt uses for all.
+_PROTOCOL_NAMES = {'6': 'tcp', '17': 'udp', '1': 'icmp', 'all': '-1'}
+_RULE_SOURCES = ('cidr_ip', 'source_group_owner_id', 'source_group_group_id',
+                 'source_group_name')
+
+
+def _rule_keys(rule):
     '''
-    Check to see if two rules are the same. Needed to compare rules fetched
-    from boto, since they may not completely match rules defined in sls files
-    but may be functionally equivalent.
+    Return the canonical forms of a rule, one hashable
+    ``(protocol, from_port, to_port, source, value)`` tuple per source it
+    names. Rules fetched from boto may not completely match rules defined in
+    sls files, but two rules are equivalent if they share any of these keys.
     '''
-
-    # We need to alter what Boto returns if no ports are specified
-    # so that we can compare rules fairly.
-    #
-    # Boto returns None for from_port and to_port where we're required
-    # to pass in "-1" instead.
-    if _rule.get('from_port') is None:
-        _rule['from_port'] = -1
-    if _rule.get('to_port') is None:
-        _rule['to_port'] = -1
-
-    if (rule['ip_protocol'] == _rule['ip_protocol'] and
-            six.text_type(rule['from_port']) == six.text_type(_rule['from_port']) and
-            six.text_type(rule['to_port']) == six.text_type(_rule['to_port'])):
-        _cidr_ip = _rule.get('cidr_ip')
-        if _cidr_ip and _cidr_ip == rule.get('cidr_ip'):
-            return True
-        _owner_id = _rule.get('source_group_owner_id')
-        if _owner_id and _owner_id == rule.get('source_group_owner_id'):
-            return True
-        _group_id = _rule.get('source_group_group_id')
-        if _group_id and _group_id == rule.get('source_group_group_id'):
-            return True
-        _group_name = _rule.get('source_group_name')
-        if _group_name and _group_id == rule.get('source_group_name'):
-            return True
-    return False
+    protocol = six.text_type(rule.get('ip_protocol')).lower()
+    protocol = _PROTOCOL_NAMES.get(protocol, protocol)
+    # Boto returns None for from_port and to_port where we're required to
+    # pass in "-1" instead.
+    ports = tuple(six.text_type(-1 if rule.get(port) is None else rule[port])
+                  for port in ('from_port', 'to_port'))
+    return set((protocol,) + ports + (source, six.text_type(rule[source]))
+               for source in _RULE_SOURCES if rule.get(source))
 
 
 def _get_rule_changes(rules, _rules):
@@ -345,9 +333,7 @@ def _get_rule_changes(rules, _rules):
     '''
     to_delete = []
     to_create = []
-    # for each rule in state file
-    # 1. validate rule
-    # 2. determine if rule exists in existing security group rules
+    # validate the rules in the state file
     for rule in rules:
         try:
             ip_protocol = six.text_type(rule.get('ip_protocol'))
@@ -378,24 +364,21 @@ def _get_rule_changes(rules, _rules):
             raise SaltInvocationError('cidr_ip, source_group_group_id, or'
                                       ' source_group_name must be provided for'
                                       ' security group rules.')
-        rule_found = False
-        # for each rule in existing security group ruleset determine if
-        # new rule exists
-        for _rule in _rules:
-            if _check_rule(rule, _rule):
-                rule_found = True
-                break
-        if not rule_found:
+
+    existing = set()
+    for _rule in _rules:
+        for port in ('from_port', 'to_port'):
+            if _rule.get(port) is None:
+                _rule[port] = -1
+        existing.update(_rule_keys(_rule))
+    desired = set()
+    for rule in rules:
+        keys = _rule_keys(rule)
+        if not keys & existing and not keys & desired:
             to_create.append(rule)
-    # for each rule in existing security group configuration
-    # 1. determine if rules needed to be deleted
+        desired.update(keys)
     for _rule in _rules:
-        rule_found = False
-        for rule in rules:
-            if _check_rule(rule, _rule):
-                rule_found = True
-                break
-        if not rule_found:
+        if not _rule_keys(_rule) & desired:
             # Can only supply name or id, not both. Since we're deleting
             # entries, it doesn't matter which we pick.
             _rule.pop('source_group_name', None)
@@ -460,26 +443,18 @@ def _rules_present(name, rules, delete_ingress_rules=True, vpc_id=None,
             ret['result'] = None
             return ret
         if to_delete:
-            deleted = True
-            for rule in to_delete:
-                _deleted = __salt__['boto_secgroup.revoke'](
-                    name, vpc_id=vpc_id, vpc_name=vpc_name, region=region,
-                    key=key, keyid=keyid, profile=profile, **rule)
-                if not _deleted:
-                    deleted = False
+            deleted = __salt__['boto_secgroup.revoke_rules'](
+                to_delete, name=name, vpc_id=vpc_id, vpc_name=vpc_name,
+                region=region, key=key, keyid=keyid, profile=profile)
             if deleted:
                 ret['comment'] = 'Removed rules on {0} security group.'.format(name)
             else:
                 ret['comment'] = 'Failed to remove rules on {0} security group.'.format(name)
                 ret['result'] = False
         if to_create:
-            created = True
-            for rule in to_create:
-                _created = __salt__['boto_secgroup.authorize'](
-                    name, vpc_id=vpc_id, vpc_name=vpc_name, region=region,
-                    key=key, keyid=keyid, profile=profile, **rule)
-                if not _created:
-                    created = False
+            created = __salt__['boto_secgroup.authorize_rules'](
+                to_create, name=name, vpc_id=vpc_id, vpc_name=vpc_name,
+                region=region, key=key, keyid=keyid, profile=profile)
             if created:
                 ret['comment'] = ' '.join([
                     ret['comment'],
@@ -554,13 +529,9 @@ def _rules_egress_present(name, rules_egress, delete_egress_rules=True, vpc_id=N
             ret['result'] = None
             return ret
         if to_delete:
-            deleted = True
-            for rule in to_delete:
-                _deleted = __salt__['boto_secgroup.revoke'](
-                    name, vpc_id=vpc_id, vpc_name=vpc_name, region=region,
-                    key=key, keyid=keyid, profile=profile, egress=True, **rule)
-                if not _deleted:
-                    deleted = False
+            deleted = __salt__['boto_secgroup.revoke_rules'](
+                to_delete, name=name, vpc_id=vpc_id, vpc_name=vpc_name,
+                region=region, key=key, keyid=keyid, profile=profile, egress=True)
             if deleted:
                 ret['comment'] = ' '.join([
                     ret['comment'],
@@ -573,13 +544,9 @@ def _rules_egress_present(name, rules_egress, delete_egress_rules=True, vpc_id=N
                 ])
                 ret['result'] = False
         if to_create:
-            created = True
-            for rule in to_create:
-                _created = __salt__['boto_secgroup.authorize'](
-                    name, vpc_id=vpc_id, vpc_name=vpc_name, region=region,
-                    key=key, keyid=keyid, profile=profile, egress=True, **rule)
-                if not _created:
-                    created = False
+            created = __salt__['boto_secgroup.authorize_rules'](
+                to_create, name=name, vpc_id=vpc_id, vpc_name=vpc_name,
+                region=region, key=key, keyid=keyid, profile=profile, egress=True)
             if created:
                 ret['comment'] = ' '.join([
                     ret['comment'],
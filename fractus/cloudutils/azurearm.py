@@ -22,15 +22,19 @@ Azure (ARM) Utilities
 '''
 # Import Python libs
 from __future__ import absolute_import, print_function, unicode_literals
+from multiprocessing.pool import ThreadPool
 from operator import itemgetter
+import hashlib
 import importlib
 import logging
+import pkgutil
 import sys
+import threading
+import time
 
 # Import Salt libs
-import salt.config
 import salt.ext.six as six
-import salt.loader
+import salt.utils.data
 import salt.utils.stringutils
 import salt.version
 from salt.exceptions import (
@@ -40,33 +44,99 @@ try:
     from salt.ext.six.moves import range as six_range
 except ImportError:
     six_range = range
-
-# Import third party libs
 try:
-    from azure.common.credentials import (
-        UserPassCredentials,
-        ServicePrincipalCredentials,
-    )
-    from msrestazure.azure_cloud import (
-        MetadataEndpointError,
-        get_cloud_from_metadata_endpoint,
-    )
-    from msrestazure.azure_exceptions import CloudError
-    HAS_AZURE = True
+    from enum import Enum
 except ImportError:
-    HAS_AZURE = False
-
-__opts__ = salt.config.minion_config('/etc/salt/minion')
-__salt__ = salt.loader.minion_mods(__opts__)
+    Enum = ()
 
 log = logging.getLogger(__name__)
 
+# Cached credentials get a new token once theirs expires within this many
+# seconds.
+TOKEN_REFRESH_MARGIN = 300
+
+# Resource groups listed at a time by iter_resources
+LIST_WORKERS = 8
+
+# Credentials, cloud environments and management clients are kept for the
+# life of the process, so the many azurearm calls of a run share their
+# tokens and connections.
+_CREDENTIALS = {}
+_CLOUD_ENVS = {}
+_CLIENTS = {}
+_CACHE_LOCK = threading.RLock()
+
 
 def __virtual__():
-    if not HAS_AZURE:
+    # The Azure SDK is only imported once credentials are needed
+    try:
+        return all(pkgutil.find_loader(name) for name in ('azure.common', 'msrestazure'))
+    except ImportError:
         return False
-    else:
-        return True
+
+
+def _config_get(key):
+    '''
+    Look up a profile in the configuration or the pillar, without loading the
+    Salt execution modules.
+    '''
+    value = salt.utils.data.traverse_dict_and_list(__opts__, key, None, delimiter=':')
+    if value is None:
+        value = salt.utils.data.traverse_dict_and_list(__opts__.get('pillar', {}), key, None,
+                                                       delimiter=':')
+    return value or {}
+
+
+def _cloud_environment(name=None):
+    '''
+    Return the Azure cloud environment by name or metadata endpoint, resolving
+    every environment once.
+    '''
+    name = name or 'AZURE_PUBLIC_CLOUD'
+    with _CACHE_LOCK:
+        if name not in _CLOUD_ENVS:
+            import msrestazure.azure_cloud as azure_cloud
+            try:
+                if name.startswith('http'):
+                    cloud_env = azure_cloud.get_cloud_from_metadata_endpoint(name)
+                else:
+                    cloud_env = getattr(azure_cloud, name)
+            except (AttributeError, azure_cloud.MetadataEndpointError):
+                raise sys.exit('The Azure cloud environment {0} is not available.'.format(name))
+            _CLOUD_ENVS[name] = cloud_env
+        return _CLOUD_ENVS[name]
+
+
+def _hash(value):
+    return hashlib.sha256(salt.utils.stringutils.to_bytes(value or '')).hexdigest()
+
+
+def _token_expiring(credentials):
+    '''
+    Return True if the token of the credentials expires within
+    TOKEN_REFRESH_MARGIN seconds.
+    '''
+    token = getattr(credentials, 'token', None) or {}
+    expires = token.get('expires_on', token.get('expires_at'))
+    try:
+        return float(expires) - time.time() < TOKEN_REFRESH_MARGIN
+    except (TypeError, ValueError):
+        return False
+
+
+def _get_credentials(cred_key, factory):
+    '''
+    Return the cached credentials for cred_key, creating them with factory()
+    on first use and fetching a new token when the cached one expires.
+    '''
+    with _CACHE_LOCK:
+        credentials = _CREDENTIALS.get(cred_key)
+        if credentials is None:
+            credentials = _CREDENTIALS[cred_key] = factory()
+        elif _token_expiring(credentials):
+            log.debug('Refreshing the Azure ARM token of %s', cred_key[1])
+            credentials.set_token()
+        return credentials
 
 
 def _determine_auth(**kwargs):
@@ -74,20 +144,13 @@ def _determine_auth(**kwargs):
     Acquire Azure ARM Credentials
     '''
     if 'profile' in kwargs:
-        azure_credentials = __salt__['config.get'](kwargs['profile'])
+        azure_credentials = _config_get(kwargs['profile'])
         kwargs.update(azure_credentials)
 
     service_principal_creds_kwargs = ['client_id', 'secret', 'tenant']
     user_pass_creds_kwargs = ['username', 'password']
 
-    try:
-        if kwargs.get('cloud_environment') and kwargs.get('cloud_environment').startswith('http'):
-            cloud_env = get_cloud_from_metadata_endpoint(kwargs['cloud_environment'])
-        else:
-            cloud_env_module = importlib.import_module('msrestazure.azure_cloud')
-            cloud_env = getattr(cloud_env_module, kwargs.get('cloud_environment', 'AZURE_PUBLIC_CLOUD'))
-    except (AttributeError, ImportError, MetadataEndpointError):
-        raise sys.exit('The Azure cloud environment {0} is not available.'.format(kwargs['cloud_environment']))
+    cloud_env = _cloud_environment(kwargs.get('cloud_environment'))
 
     if set(service_principal_creds_kwargs).issubset(kwargs):
         if not (kwargs['client_id'] and kwargs['secret'] and kwargs['tenant']):
@@ -96,10 +159,15 @@ def _determine_auth(**kwargs):
                 'populated if using service principals.'
             )
         else:
-            credentials = ServicePrincipalCredentials(kwargs['client_id'],
-                                                      kwargs['secret'],
-                                                      tenant=kwargs['tenant'],
-                                                      cloud_environment=cloud_env)
+            def _service_principal():
+                from azure.common.credentials import ServicePrincipalCredentials
+                return ServicePrincipalCredentials(kwargs['client_id'],
+                                                   kwargs['secret'],
+                                                   tenant=kwargs['tenant'],
+                                                   cloud_environment=cloud_env)
+            cred_key = ('service_principal', kwargs['client_id'], kwargs['tenant'],
+                        _hash(kwargs['secret']), cloud_env.endpoints.resource_manager)
+            credentials = _get_credentials(cred_key, _service_principal)
     elif set(user_pass_creds_kwargs).issubset(kwargs):
         if not (kwargs['username'] and kwargs['password']):
             raise SaltInvocationError(
@@ -107,9 +175,14 @@ def _determine_auth(**kwargs):
                 'populated if using username/password authentication.'
             )
         else:
-            credentials = UserPassCredentials(kwargs['username'],
-                                              kwargs['password'],
-                                              cloud_environment=cloud_env)
+            def _user_pass():
+                from azure.common.credentials import UserPassCredentials
+                return UserPassCredentials(kwargs['username'],
+                                           kwargs['password'],
+                                           cloud_environment=cloud_env)
+            cred_key = ('user_pass', kwargs['username'], None,
+                        _hash(kwargs['password']), cloud_env.endpoints.resource_manager)
+            credentials = _get_credentials(cred_key, _user_pass)
     else:
         raise SaltInvocationError(
             'Unable to determine credentials. '
@@ -130,7 +203,11 @@ def _determine_auth(**kwargs):
 
 def get_client(client_type, **kwargs):
     '''
-    Dynamically load the selected client and return a management client object
+    Dynamically load the selected client and return a management client object.
+
+    Credentials are cached per identity and cloud, and get a new token shortly
+    before theirs expires. Clients are cached per client type, subscription
+    and credentials, so that many calls share one token and connection pool.
     '''
     client_map = {'compute': 'ComputeManagement',
                   'storage': 'StorageManagement',
@@ -164,6 +241,16 @@ def get_client(client_type, **kwargs):
         )
 
     credentials, subscription_id, cloud_env = _determine_auth(**kwargs)
+    client_key = (client_type, subscription_id, id(credentials))
+    with _CACHE_LOCK:
+        client = _CLIENTS.get(client_key)
+        if client is None:
+            client = _CLIENTS[client_key] = _create_client(Client, client_type, credentials,
+                                                           subscription_id, cloud_env)
+    return client
+
+
+def _create_client(Client, client_type, credentials, subscription_id, cloud_env):  # pylint: disable=invalid-name
     if client_type == 'subscription':
         client = Client(
             credentials=credentials,
@@ -199,67 +286,234 @@ def log_cloud_error(client, message, **kwargs):
     return
 
 
-def paged_object_to_list(paged_object):
+def _to_dict(value):
+    if hasattr(value, 'as_dict'):
+        return value.as_dict()
+    if isinstance(value, list):
+        return [_to_dict(item) for item in value]
+    if isinstance(value, dict):
+        return dict((key, _to_dict(item)) for key, item in six.iteritems(value))
+    if isinstance(value, Enum):
+        return value.value
+    return value
+
+
+def _project(item, fields):
+    '''
+    Convert only the given attributes of a model to a dictionary. Like
+    ``as_dict()``, attributes which are not set are left out.
+    '''
+    result = {}
+    for field in fields:
+        value = getattr(item, field, None)
+        if value is not None:
+            result[field] = _to_dict(value)
+    return result
+
+
+def iter_paged_object(paged_object, fields=None):
+    '''
+    Lazily yield the items of a paged object as dictionaries, only fetching
+    the next page once the current one has been consumed. If ``fields`` is
+    given, only those attributes of each item are converted.
+    '''
+    if isinstance(fields, six.string_types):
+        fields = fields.split(',')
+    for item in paged_object:
+        yield _project(item, fields) if fields else item.as_dict()
+
+
+def paged_object_to_list(paged_object, fields=None):
     '''
     Extract all pages within a paged object as a list of dictionaries
     '''
-    paged_return = []
-    while True:
-        try:
-            page = next(paged_object)
-            paged_return.append(page.as_dict())
-        except CloudError:
-            raise
-        except StopIteration:
-            break
+    return list(iter_paged_object(paged_object, fields=fields))
+
 
-    return paged_return
+def paged_object_to_dict(paged_object, fields=None, key='name'):
+    '''
+    Extract all pages within a paged object as a dictionary of dictionaries
+    keyed by ``key``, without building an intermediate list.
+    '''
+    if isinstance(fields, six.string_types):
+        fields = fields.split(',')
+    if fields and key not in fields:
+        fields = [key] + list(fields)
+    return dict((item[key], item) for item in iter_paged_object(paged_object, fields=fields))
 
 
-def create_object_model(module_name, object_name, **kwargs):
+def iter_resources(operations, resource_groups=None, fields=None, workers=LIST_WORKERS):
     '''
-    Assemble an object from incoming parameters.
+    Yield the resources of an operations group of a management client, such
+    as ``netconn.network_interfaces``, as dictionaries.
+
+    Without ``resource_groups`` the whole subscription is listed with
+    ``list_all()``, or ``list()`` for operations groups which have no
+    ``list_all()``. Otherwise up to ``workers`` of the given resource groups
+    are listed at a time, with ``list_by_resource_group()`` or ``list()``,
+    and their resources are yielded as each group completes. Errors raised
+    while listing, such as ``CloudError``, are raised to the caller.
     '''
-    object_kwargs = {}
+    if resource_groups is None:
+        list_func = getattr(operations, 'list_all', None) or operations.list
+        for item in iter_paged_object(list_func(), fields=fields):
+            yield item
+        return
 
+    list_func = getattr(operations, 'list_by_resource_group', None) or operations.list
+
+    def _list_group(resource_group):
+        return list(iter_paged_object(list_func(resource_group_name=resource_group), fields=fields))
+
+    if isinstance(resource_groups, six.string_types):
+        resource_groups = [resource_groups]
+    pool = ThreadPool(max(min(int(workers), len(resource_groups)), 1))
     try:
-        model_module = importlib.import_module('azure.mgmt.{0}.models'.format(module_name))
-        # pylint: disable=invalid-name
-        Model = getattr(model_module, object_name)
-    except ImportError:
-        raise sys.exit(
-            'The {0} model in the {1} Azure module is not available.'.format(object_name, module_name)
-        )
+        for items in pool.imap_unordered(_list_group, resource_groups):
+            for item in items:
+                yield item
+    finally:
+        pool.terminate()
 
-    if '_attribute_map' in dir(Model):
-        for attr, items in Model._attribute_map.items():
+
+# Kinds of model attributes, parsed once per model class from the type strings
+# of its _attribute_map, e.g. "SecurityRule", "{str}", "[SubResource]".
+_PLAIN, _MODEL, _DICT, _LIST_PLAIN, _LIST_MODEL, _LIST_DICT = range(6)
+
+
+class _ModelBuilder(object):
+    '''
+    Builds one Azure model class from keyword arguments.
+    '''
+    def __init__(self, module_name, model):
+        self.module_name = module_name
+        self.model = model
+        self.fields = []
+        for attr, items in six.iteritems(getattr(model, '_attribute_map', None) or {}):
+            self.fields.append((attr,) + self._parse_type(items['type']))
+
+    @staticmethod
+    def _parse_type(type_string):
+        if type_string[0].isupper():
+            return _MODEL, type_string
+        if type_string[0] == '{':
+            return _DICT, None
+        if type_string[0] == '[':
+            item_type = type_string[type_string.index('[')+1:type_string.rindex(']')]
+            if type_string[1].isupper():
+                return _LIST_MODEL, item_type
+            if type_string[1] == '{':
+                return _LIST_DICT, None
+            return _LIST_PLAIN, None
+        return _PLAIN, None
+
+    def build(self, **kwargs):
+        object_kwargs = {}
+        for attr, kind, nested in self.fields:
             param = kwargs.get(attr)
-            if param:
-                if items['type'][0].isupper() and isinstance(param, dict):
-                    object_kwargs[attr] = create_object_model(module_name, items['type'], **param)
-                elif items['type'][0] == '{' and isinstance(param, dict):
-                    object_kwargs[attr] = param
-                elif items['type'][0] == '[' and isinstance(param, list):
-                    obj_list = []
-                    for list_item in param:
-                        if items['type'][1].isupper() and isinstance(list_item, dict):
-                            obj_list.append(
-                                create_object_model(
-                                    module_name,
-                                    items['type'][items['type'].index('[')+1:items['type'].rindex(']')],
-                                    **list_item
-                                )
-                            )
-                        elif items['type'][1] == '{' and isinstance(list_item, dict):
-                            obj_list.append(list_item)
-                        elif not items['type'][1].isupper() and items['type'][1] != '{':
-                            obj_list.append(list_item)
-                    object_kwargs[attr] = obj_list
+            if not param:
+                continue
+            if kind == _MODEL and isinstance(param, dict):
+                param = _model_builder(self.module_name, nested).build(**param)
+            elif kind in (_LIST_MODEL, _LIST_DICT, _LIST_PLAIN) and isinstance(param, list):
+                if kind == _LIST_MODEL:
+                    builder = _model_builder(self.module_name, nested)
+                    param = [builder.build(**item) for item in param if isinstance(item, dict)]
+                elif kind == _LIST_DICT:
+                    param = [item for item in param if isinstance(item, dict)]
                 else:
-                    object_kwargs[attr] = param
+                    param = list(param)
+            object_kwargs[attr] = param
+        return self.model(**object_kwargs)
+
+
+_MODEL_BUILDERS = {}
+
+
+def _model_builder(module_name, object_name):
+    '''
+    Return the cached builder of a model class, importing and compiling it on
+    first use.
+    '''
+    key = (module_name, object_name)
+    builder = _MODEL_BUILDERS.get(key)
+    if builder is None:
+        try:
+            model_module = importlib.import_module('azure.mgmt.{0}.models'.format(module_name))
+            # pylint: disable=invalid-name
+            Model = getattr(model_module, object_name)
+        except ImportError:
+            raise sys.exit(
+                'The {0} model in the {1} Azure module is not available.'.format(object_name, module_name)
+            )
+        builder = _MODEL_BUILDERS.setdefault(key, _ModelBuilder(module_name, Model))
+    return builder
+
+
+def create_object_model(module_name, object_name, **kwargs):
+    '''
+    Assemble an object from incoming parameters.
 
+    The attribute map of each model class is parsed once and the resulting
+    builder is reused for every object and nested list item of that class.
+    '''
     # wrap calls to this function to catch TypeError exceptions
-    return Model(**object_kwargs)
+    return _model_builder(module_name, object_name).build(**kwargs)
+
+
+def normalize_list_of_dicts(configs, convert_id_to_name=None):
+    '''
+    Return the canonical form in which compare_list_of_dicts compares a list of
+    Azure objects: a dictionary of the objects by name, with string values
+    lowercased and the values of the keys in ``convert_id_to_name`` reduced to
+    the name at the end of their ID. Returns None if the list can't be
+    normalized.
+    '''
+    convert_id_to_name = convert_id_to_name or []
+    result = {}
+    for config in configs or []:
+        if not isinstance(config, dict) or 'name' not in config or config['name'] in result:
+            return None
+        normalized = {}
+        for key, value in six.iteritems(config):
+            if key in convert_id_to_name:
+                if not isinstance(value, dict):
+                    return None
+                value = value.get('id', '').split('/')[-1]
+            elif isinstance(value, six.string_types):
+                value = value.lower()
+            normalized[key] = value
+        result[config['name']] = normalized
+    return result
+
+
+def list_of_dicts_unchanged(normalized, new, convert_id_to_name=None):
+    '''
+    Return True if compare_list_of_dicts would find no changes between the
+    objects normalized by normalize_list_of_dicts and the ``new`` list. A
+    False result only means that the full comparison is needed.
+    '''
+    if normalized is None or not isinstance(new, list) or len(new) != len(normalized):
+        return False
+    convert_id_to_name = convert_id_to_name or []
+    names = set()
+    for config in new:
+        if not isinstance(config, dict) or config.get('name') in names:
+            return False
+        names.add(config.get('name'))
+        remote = normalized.get(config.get('name'))
+        if remote is None:
+            return False
+        for key, local_val in six.iteritems(config):
+            if key in convert_id_to_name:
+                remote_val = remote.get(key, '')
+            else:
+                remote_val = remote.get(key)
+                if isinstance(local_val, six.string_types):
+                    local_val = local_val.lower()
+            if local_val != remote_val:
+                return False
+    return True
 
 
 def compare_list_of_dicts(old, new, convert_id_to_name=None):
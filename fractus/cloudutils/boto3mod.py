@@ -37,6 +37,7 @@ from __future__ import absolute_import, print_function, unicode_literals
 import hashlib
 import logging
 import sys
+import threading
 from functools import partial
 
 # Import salt libs
@@ -46,6 +47,9 @@ from salt.ext import six
 import salt.utils.stringutils
 import salt.utils.versions
 
+# Import Fractus libs
+import fractus.pool
+
 # Import third party libs
 # pylint: disable=import-error
 try:
@@ -55,6 +59,7 @@ try:
     import boto.exception
     import boto3.session
     import botocore  # pylint: disable=W0611
+    import botocore.config
 
     # pylint: enable=import-error
     logging.getLogger('boto3').setLevel(logging.CRITICAL)
@@ -68,6 +73,8 @@ log = logging.getLogger(__name__)
 
 __virtualname__ = 'boto3'
 
+_SESSION_LOCK = threading.Lock()
+
 
 def __virtual__():
     '''
@@ -86,11 +93,13 @@ def _option(value):
     '''
     if value in __opts__:
         return __opts__[value]
-    master_opts = __pillar__.get('master', {})
+    # Not every loader packs __pillar__
+    pillar = globals().get('__pillar__') or {}
+    master_opts = pillar.get('master', {})
     if value in master_opts:
         return master_opts[value]
-    if value in __pillar__:
-        return __pillar__[value]
+    if value in pillar:
+        return pillar[value]
 
 
 def _get_profile(service, region, key, keyid, profile):
@@ -178,11 +187,47 @@ def cache_id_func(service):
     return partial(cache_id, service)
 
 
+def _get_session(region, key, keyid):
+    '''
+    Return a pooled boto3 session for the region and credentials.
+
+    Sessions are not thread safe, so they are only used to build clients while
+    holding ``_SESSION_LOCK``, never to make API calls.
+    '''
+    hash_string = '{0}:{1}:{2}'.format(region, keyid or '', key or '')
+    if six.PY3:
+        hash_string = salt.utils.stringutils.to_bytes(hash_string)
+    pool = fractus.pool.get_pool('boto3.session')
+    return pool.get(hashlib.sha256(hash_string).hexdigest(),
+                    partial(boto3.session.Session,
+                            aws_access_key_id=keyid,
+                            aws_secret_access_key=key,
+                            region_name=region))
+
+
+def _new_client(module, region, key, keyid):
+    session = _get_session(region, key, keyid)
+    if session is None:
+        raise SaltInvocationError('Region "{0}" is not '
+                                  'valid.'.format(region))
+    max_pool_connections = _option('boto3.max_pool_connections')
+    with _SESSION_LOCK:
+        if max_pool_connections:
+            config = botocore.config.Config(max_pool_connections=int(max_pool_connections))
+            return session.client(module, config=config)
+        return session.client(module)
+
+
 def get_connection(service, module=None, region=None, key=None, keyid=None,
                    profile=None):
     '''
     Return a boto connection for the service.
 
+    Clients are shared by every loader and thread in the process through a
+    pool keyed by service, region and credentials. The pool can be tuned with
+    the ``boto3.pool_size``, ``boto3.pool_idle_timeout`` and
+    ``boto3.max_pool_connections`` options.
+
     .. code-block:: python
 
         conn = __utils__['boto.get_connection']('ec2', profile='custom_profile')
@@ -197,14 +242,11 @@ def get_connection(service, module=None, region=None, key=None, keyid=None,
     if cxkey in __context__:
         return __context__[cxkey]
 
+    pool = fractus.pool.get_pool('boto3.client',
+                                 maxsize=_option('boto3.pool_size'),
+                                 idle_timeout=_option('boto3.pool_idle_timeout'))
     try:
-        session = boto3.session.Session(aws_access_key_id=keyid,
-                          aws_secret_access_key=key,
-                          region_name=region)
-        if session is None:
-            raise SaltInvocationError('Region "{0}" is not '
-                                      'valid.'.format(region))
-        conn = session.client(module)
+        conn = pool.get((module, cxkey), partial(_new_client, module, region, key, keyid))
         if conn is None:
             raise SaltInvocationError('Region "{0}" is not '
                                       'valid.'.format(region))
@@ -304,16 +346,47 @@ def assign_funcs(modname, service, module=None,
 def paged_call(function, *args, **kwargs):
     """Retrieve full set of values from a boto3 API call that may truncate
     its results, yielding each page as it is obtained.
+
+    Pages are only requested as they are consumed, so callers can stop
+    iterating early. ``marker_flag`` and ``marker_arg`` may be tuples for APIs
+    which continue from several tokens at once (e.g. ``NextKeyMarker`` and
+    ``NextVersionIdMarker``). ``page_size`` is passed to the call as
+    ``page_size_arg`` (``MaxItems`` by default) as a hint.
     """
     marker_flag = kwargs.pop('marker_flag', 'NextMarker')
     marker_arg = kwargs.pop('marker_arg', 'Marker')
+    page_size = kwargs.pop('page_size', None)
+    page_size_arg = kwargs.pop('page_size_arg', 'MaxItems')
+    if page_size:
+        kwargs[page_size_arg] = page_size
+    if not isinstance(marker_flag, (list, tuple)):
+        marker_flag, marker_arg = (marker_flag,), (marker_arg,)
     while True:
         ret = function(*args, **kwargs)
-        marker = ret.get(marker_flag)
+        markers = [ret.get(flag) for flag in marker_flag]
         yield ret
-        if not marker:
+        if not markers[0]:
             break
-        kwargs[marker_arg] = marker
+        for arg, marker in zip(marker_arg, markers):
+            if marker:
+                kwargs[arg] = marker
+            else:
+                kwargs.pop(arg, None)
+
+
+def paged_items(function, result_key, *args, **kwargs):
+    """Lazily yield the items found under ``result_key`` in every page of a
+    boto3 API call, see :py:func:`paged_call` for the paging arguments.
+
+    .. code-block:: python
+
+        for function in __utils__['boto3.paged_items'](conn.list_functions, 'Functions'):
+            if function['FunctionName'] == name:
+                break
+    """
+    for page in paged_call(function, *args, **kwargs):
+        for item in page.get(result_key) or []:
+            yield item
 
 
 def ordered(obj):
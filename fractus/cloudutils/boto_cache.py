@@ -0,0 +1,168 @@
+# -*- coding: utf-8 -*-
+'''
+Boto Describe Cache Utils
+=========================
+
+Run scoped cache for describe calls of the boto execution modules.
+
+Modules describe every resource of a type with a single call and answer
+name, id and tag lookups from an in memory index, instead of sending a
+filtered describe call for every lookup. The cache is kept in the
+``__context__`` of the calling module, so it lives as long as the run, and
+entries expire after ``ttl`` seconds. Functions which change resources must
+invalidate the resource types they touch.
+
+Example Usage:
+
+    .. code-block:: python
+
+        cache = __utils__['boto_cache.get_cache'](__context__, 'boto_vpc', ttl=60)
+        index = cache.get(('subnet', cxkey),
+                          lambda: __utils__['boto_cache.index'](conn.get_all_subnets()))
+        subnets = index.find(name='mysubnet', vpc_id='vpc-123456')
+
+        cache.invalidate('subnet')
+'''
+
+# Import Python libs
+from __future__ import absolute_import, print_function, unicode_literals
+import logging
+import threading
+import time
+
+# Import Salt libs
+from salt.ext import six
+
+log = logging.getLogger(__name__)
+
+__virtualname__ = 'boto_cache'
+
+DEFAULT_TTL = 60
+
+
+def __virtual__():
+    return __virtualname__
+
+
+class DescribeCache(object):
+    '''
+    Thread safe TTL cache keyed by tuples. A ``ttl`` of 0 disables caching.
+    '''
+    def __init__(self, ttl=DEFAULT_TTL):
+        self.ttl = ttl
+        self._entries = {}
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def get(self, key, fetch):
+        '''
+        Return the cached value for ``key``, calling ``fetch()`` if it is
+        missing or expired.
+        '''
+        if not self.ttl:
+            return fetch()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.time() - entry[0] < self.ttl:
+                return entry[1]
+            generation = self._generation
+        value = fetch()
+        with self._lock:
+            # Don't store results which may predate an invalidation
+            if generation == self._generation:
+                self._entries[key] = (time.time(), value)
+        return value
+
+    def peek(self, key):
+        '''
+        Return the cached value for ``key`` without fetching it, or None if
+        it is missing or expired.
+        '''
+        if not self.ttl:
+            return None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.time() - entry[0] < self.ttl:
+                return entry[1]
+        return None
+
+    def invalidate(self, *prefix):
+        '''
+        Drop every entry whose key starts with ``prefix``, or every entry if
+        no prefix is given.
+        '''
+        with self._lock:
+            self._generation += 1
+            for key in [key for key in self._entries if key[:len(prefix)] == prefix]:
+                log.debug('Invalidating cached describe of %s', key)
+                del self._entries[key]
+
+
+class ResourceIndex(object):
+    '''
+    In memory index of described boto resources, by id and by name.
+    '''
+    def __init__(self, items, name_attr=None):
+        self.items = list(items or [])
+        self.name_attr = name_attr
+        self.by_id = {}
+        self.by_name = {}
+        for item in self.items:
+            self.by_id[item.id] = item
+            self.by_name.setdefault(self._name(item), []).append(item)
+
+    def _name(self, item):
+        if self.name_attr:
+            return getattr(item, self.name_attr, None)
+        return (getattr(item, 'tags', None) or {}).get('Name')
+
+    def find(self, resource_id=None, name=None, tags=None, **attrs):
+        '''
+        Return the items matching all of the given criteria. ``resource_id``,
+        ``name`` and attribute values may be lists to match any of them.
+        '''
+        if resource_id:
+            ids = resource_id if isinstance(resource_id, (list, tuple)) else [resource_id]
+            items = [self.by_id[_id] for _id in ids if _id in self.by_id]
+        elif name:
+            names = name if isinstance(name, (list, tuple)) else [name]
+            items = [item for _name in names for item in self.by_name.get(_name, [])]
+        else:
+            items = self.items
+        if resource_id and name:
+            names = name if isinstance(name, (list, tuple)) else [name]
+            items = [item for item in items if self._name(item) in names]
+        for tag, value in six.iteritems(tags or {}):
+            items = [item for item in items
+                     if (getattr(item, 'tags', None) or {}).get(tag) == value]
+        for attr, value in six.iteritems(attrs):
+            if value is None:
+                continue
+            values = value if isinstance(value, (list, tuple)) else [value]
+            items = [item for item in items if getattr(item, attr, None) in values]
+        return items
+
+
+def get_cache(context, name, ttl=None):
+    '''
+    Return the describe cache called ``name`` kept in ``context``, creating it
+    on first use. Passing ``ttl`` updates the TTL of an existing cache.
+    '''
+    key = 'boto_cache.{0}'.format(name)
+    cache = context.get(key)
+    if cache is None:
+        cache = context.setdefault(key, DescribeCache())
+    if ttl is not None:
+        try:
+            cache.ttl = float(ttl)
+        except (TypeError, ValueError):
+            log.warning('Ignoring invalid TTL %r for the %s describe cache', ttl, name)
+    return cache
+
+
+def index(items, name_attr=None):
+    '''
+    Build a :py:class:`ResourceIndex` of boto resources. Items are named by
+    their ``Name`` tag, or by ``name_attr`` if given.
+    '''
+    return ResourceIndex(items, name_attr=name_attr)
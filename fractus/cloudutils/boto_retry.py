@@ -0,0 +1,322 @@
+# -*- coding: utf-8 -*-
+'''
+Boto Retry Utils
+================
+
+Shared retry handling for the boto and boto3 execution modules.
+
+Calls are retried with exponential backoff and full jitter, instead of fixed
+sleeps. Every service gets a client side token bucket, which only starts
+limiting the request rate once the service has throttled us and recovers
+over time, plus a retry budget so that a throttling storm fails
+fast instead of piling on more retries.
+
+Example Usage:
+
+    .. code-block:: python
+
+        result = __utils__['boto_retry.call']('autoscaling', conn.get_all_groups, names=[name])
+
+        backoff = __utils__['boto_retry.backoff']('autoscaling', tries=30)
+        while True:
+            try:
+                return conn.get_all_groups(names=[name])
+            except boto.exception.BotoServerError as e:
+                if backoff.retry(e):
+                    continue
+                raise
+'''
+
+# Import Python libs
+from __future__ import absolute_import, print_function, unicode_literals
+import logging
+import random
+import threading
+import time
+
+log = logging.getLogger(__name__)
+
+__virtualname__ = 'boto_retry'
+
+# Error codes AWS uses to tell the client to slow down.
+THROTTLE_CODES = frozenset([
+    'Throttling',
+    'ThrottlingException',
+    'ThrottledException',
+    'RequestThrottled',
+    'RequestThrottledException',
+    'RequestLimitExceeded',
+    'TooManyRequestsException',
+    'ProvisionedThroughputExceededException',
+    'TransactionInProgressException',
+    'PriorRequestNotComplete',
+    'SlowDown',
+    'EC2ThrottledException',
+    'BandwidthLimitExceeded',
+])
+
+DEFAULT_TRIES = 10
+DEFAULT_BASE = 0.1
+DEFAULT_CAP = 20.0
+
+# Client side rate limiting, in requests per second, once throttled.
+MAX_RATE = 40.0
+MIN_RATE = 0.5
+RATE_INCREASE = 0.5
+
+# Retry budget, modeled on the AWS SDK retry quota.
+BUDGET_CAPACITY = 500
+RETRY_COST = 5
+SUCCESS_REFUND = 1
+
+
+def __virtual__():
+    return __virtualname__
+
+
+def error_code(exc):
+    '''
+    Return the AWS error code of a boto or boto3 exception, or None.
+    '''
+    response = getattr(exc, 'response', None)
+    if isinstance(response, dict):
+        return response.get('Error', {}).get('Code')
+    return getattr(exc, 'error_code', None) or getattr(exc, 'code', None)
+
+
+def is_throttle(exc):
+    '''
+    Check if an exception means the request was throttled.
+    '''
+    return error_code(exc) in THROTTLE_CODES
+
+
+class TokenBucket(object):
+    '''
+    Adaptive client side rate limiter.
+
+    The bucket lets every request through until :py:meth:`throttled` is called.
+    From then on requests are limited to a rate which is halved on every
+    throttle and climbs back by ``increase`` requests per second every second,
+    until it reaches ``max_rate`` and limiting is switched off again.
+    '''
+    def __init__(self, max_rate=MAX_RATE, min_rate=MIN_RATE, increase=RATE_INCREASE):
+        self.max_rate = max_rate
+        self.min_rate = min_rate
+        self.increase = increase
+        self._floor = None
+        self._throttled_at = 0.0
+        self._tokens = 0.0
+        self._last = 0.0
+        self._lock = threading.Lock()
+
+    def _rate(self, now):
+        if self._floor is None:
+            return None
+        rate = self._floor + self.increase * (now - self._throttled_at)
+        if rate >= self.max_rate:
+            self._floor = None
+            return None
+        return rate
+
+    @property
+    def rate(self):
+        with self._lock:
+            return self._rate(time.time())
+
+    def acquire(self):
+        '''
+        Block until a request may be sent.
+        '''
+        while True:
+            with self._lock:
+                now = time.time()
+                rate = self._rate(now)
+                if rate is None:
+                    return
+                self._tokens = min(rate, self._tokens + (now - self._last) * rate)
+                self._last = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                delay = (1 - self._tokens) / rate
+            time.sleep(delay)
+
+    def throttled(self):
+        with self._lock:
+            now = time.time()
+            rate = self._rate(now)
+            if rate is None:
+                rate = self.max_rate
+                self._tokens = 0.0
+                self._last = now
+            self._floor = max(self.min_rate, rate / 2)
+            self._throttled_at = now
+            log.debug('Lowered client side request rate to %s/s', self._floor)
+
+
+class RetryBudget(object):
+    '''
+    Shared quota of retries. Each retry withdraws ``RETRY_COST``, and the quota
+    refills by ``SUCCESS_REFUND`` for every successful call and every second,
+    so retries stop once most calls to a service are failing.
+    '''
+    def __init__(self, capacity=BUDGET_CAPACITY):
+        self.capacity = capacity
+        self._available = float(capacity)
+        self._last = time.time()
+        self._lock = threading.Lock()
+
+    def _refill(self, amount=0):
+        now = time.time()
+        self._available = min(self.capacity, self._available + amount + (now - self._last) * SUCCESS_REFUND)
+        self._last = now
+
+    @property
+    def available(self):
+        with self._lock:
+            self._refill()
+            return self._available
+
+    def withdraw(self, cost=RETRY_COST):
+        with self._lock:
+            self._refill()
+            if self._available < cost:
+                return False
+            self._available -= cost
+            return True
+
+    def refund(self, amount=SUCCESS_REFUND):
+        with self._lock:
+            self._refill(amount)
+
+
+_SERVICES = {}
+_SERVICES_LOCK = threading.Lock()
+
+
+def _service(service):
+    with _SERVICES_LOCK:
+        if service not in _SERVICES:
+            _SERVICES[service] = (TokenBucket(), RetryBudget())
+        return _SERVICES[service]
+
+
+def get_bucket(service):
+    '''
+    Return the rate limiter shared by all calls to ``service``.
+    '''
+    return _service(service)[0]
+
+
+def get_budget(service):
+    '''
+    Return the retry budget shared by all calls to ``service``.
+    '''
+    return _service(service)[1]
+
+
+class Backoff(object):
+    '''
+    Retry state for a single logical call.
+
+    ``codes`` are extra error codes which should be retried on top of the
+    throttling codes, pass ``retry_all=True`` to retry on any error.
+    '''
+    def __init__(self, service, tries=DEFAULT_TRIES, base=DEFAULT_BASE, cap=DEFAULT_CAP,
+                 codes=None, retry_all=False):
+        self.service = service
+        self.tries = tries
+        self.base = base
+        self.cap = cap
+        self.codes = frozenset(codes or ())
+        self.retry_all = retry_all
+        self.attempt = 0
+        self.bucket, self.budget = _service(service)
+
+    def delay(self):
+        '''
+        Full jitter: a random delay between 0 and the exponential backoff.
+        '''
+        return random.uniform(0, min(self.cap, self.base * 2 ** self.attempt))
+
+    def retryable(self, exc):
+        code = error_code(exc)
+        return self.retry_all or code in THROTTLE_CODES or code in self.codes
+
+    def retry(self, exc):
+        '''
+        Decide whether the call that raised ``exc`` should be retried, and
+        wait before returning True if so.
+        '''
+        return self.retry_code(error_code(exc), exc)
+
+    def retry_code(self, code, exc=None):
+        '''
+        Same as :py:meth:`retry`, for errors which are only reported as an
+        error code, like the per item errors of batch calls.
+        '''
+        if not (self.retry_all or code in THROTTLE_CODES or code in self.codes):
+            return False
+        if code in THROTTLE_CODES:
+            self.bucket.throttled()
+        if self.attempt >= self.tries:
+            log.error('Giving up on %s after %s retries: %s', self.service, self.attempt, exc or code)
+            return False
+        if not self.budget.withdraw():
+            log.error('Retry budget for %s is exhausted, not retrying: %s', self.service, exc or code)
+            return False
+        delay = self.delay()
+        self.attempt += 1
+        log.debug('%s error from %s, retrying in %.2f seconds (attempt %s of %s)',
+                  code, self.service, delay, self.attempt, self.tries)
+        time.sleep(delay)
+        self.bucket.acquire()
+        return True
+
+    def success(self):
+        '''
+        Record a successful call.
+        '''
+        self.budget.refund()
+
+
+def backoff(service, **kwargs):
+    '''
+    Return a :py:class:`Backoff` for hand written retry loops.
+
+    .. code-block:: python
+
+        backoff = __utils__['boto_retry.backoff']('elb', tries=30)
+    '''
+    return Backoff(service, **kwargs)
+
+
+def call(service, func, *args, **kwargs):
+    '''
+    Call ``func(*args, **kwargs)``, retrying it while AWS throttles us. The
+    last error is raised once the retries run out. Retry settings can be
+    passed as ``retry_tries``, ``retry_base``, ``retry_cap``, ``retry_codes``
+    and ``retry_all``.
+
+    .. code-block:: python
+
+        groups = __utils__['boto_retry.call']('autoscaling', conn.get_all_groups, names=[name])
+    '''
+    options = {}
+    for opt in ('tries', 'base', 'cap', 'codes'):
+        if 'retry_' + opt in kwargs:
+            options[opt] = kwargs.pop('retry_' + opt)
+    if 'retry_all' in kwargs:
+        options['retry_all'] = kwargs.pop('retry_all')
+    retry = Backoff(service, **options)
+    retry.bucket.acquire()
+    while True:
+        try:
+            ret = func(*args, **kwargs)
+        except Exception as exc:  # pylint: disable=broad-except
+            if retry.retry(exc):
+                continue
+            raise
+        retry.success()
+        return ret
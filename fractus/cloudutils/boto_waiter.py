@@ -0,0 +1,281 @@
+# -*- coding: utf-8 -*-
+'''
+Boto Waiter Utils
+=================
+
+Shared waiting for long running operations of the boto execution modules.
+
+Instead of every function sleeping in a loop of its own, waits for the same
+kind of resource are registered on one waiter, which polls all the pending
+resources from a background thread, with one batched describe call per round.
+The interval between rounds starts short, grows while nothing changes and
+shrinks again as soon as a resource changes status. Registering a wait does
+not block, so resources created one after the other are waited for in
+parallel, and callers only block when they need the outcome.
+
+A waiter is built around a ``describe(keys)`` function, which returns the
+status of the resources named by ``keys`` as a dict. Resources left out of
+the dict don't exist (anymore), which waits see as the ``GONE`` status.
+
+Example Usage:
+
+    .. code-block:: python
+
+        def describe(names):
+            return dict((db['DBInstanceIdentifier'], db['DBInstanceStatus'])
+                        for db in ...)
+
+        waiter = __utils__['boto_waiter.get_waiter'](__context__, ('boto_rds', cxkey), describe)
+        waits = [waiter.add(name, until='available', timeout=900) for name in names]
+        results = __utils__['boto_waiter.wait_all'](waits)
+
+Instead of blocking, a module can defer a wait to the end of the run, where
+the ``wait_for_deferred`` function of the module, called by
+:py:meth:`fractus.state.FractusState.confirm_deferred`, settles all the
+waits it deferred at once.
+
+    .. code-block:: python
+
+        __utils__['boto_waiter.defer'](__context__, 'boto_rds', waiter.add(name, until='available'))
+        ...
+        results = __utils__['boto_waiter.wait_deferred'](__context__, 'boto_rds')
+'''
+
+# Import Python libs
+from __future__ import absolute_import, print_function, unicode_literals
+import logging
+import threading
+import time
+
+# Import Salt libs
+from salt.ext import six
+
+log = logging.getLogger(__name__)
+
+__virtualname__ = 'boto_waiter'
+
+# Status of resources which don't exist (anymore).
+GONE = None
+
+# Bounds of the interval between polls, in seconds, and the factor it grows
+# by after every poll which saw no change.
+DEFAULT_MIN_INTERVAL = 2.0
+DEFAULT_MAX_INTERVAL = 30.0
+DEFAULT_GROWTH = 1.5
+
+DEFAULT_TIMEOUT = 600
+
+# Keys passed to a single describe call.
+DEFAULT_BATCH = 100
+
+_LOCK = threading.Lock()
+
+
+def __virtual__():
+    return __virtualname__
+
+
+def _statuses(value):
+    if value is None or isinstance(value, six.string_types):
+        return frozenset([value])
+    return frozenset(value)
+
+
+class Wait(object):
+    '''
+    Handle of a registered wait.
+
+    ``status`` is the last status seen. ``result`` is None while the wait is
+    pending, True once the resource reached one of the ``until`` statuses and
+    False if it reached one of the ``failed`` statuses or timed out.
+    '''
+    def __init__(self, key, until, failed=(), timeout=DEFAULT_TIMEOUT):
+        self.key = key
+        self.until = _statuses(until)
+        self.failed = _statuses(failed) if failed else frozenset()
+        self.timeout = timeout
+        self.deadline = time.time() + timeout
+        self.status = GONE
+        self.result = None
+        self._done = threading.Event()
+
+    def done(self):
+        return self._done.is_set()
+
+    def wait(self, timeout=None):
+        '''
+        Block until the wait is over, or for ``timeout`` seconds, and return
+        ``result``.
+        '''
+        self._done.wait(timeout)
+        return self.result
+
+    def _update(self, status, now):
+        self.status = status
+        if status in self.until:
+            self._finish(True)
+        elif status in self.failed:
+            log.error('%s reached status %s while waiting for %s',
+                      self.key, status, ', '.join(six.text_type(s) for s in self.until))
+            self._finish(False)
+        else:
+            self._expire(now)
+
+    def _expire(self, now):
+        if now >= self.deadline:
+            log.error('%s is still %s after %s seconds', self.key,
+                      'missing' if self.status is GONE else self.status, self.timeout)
+            self._finish(False)
+
+    def _finish(self, result):
+        self.result = result
+        self._done.set()
+
+
+class Waiter(object):
+    '''
+    Polls the status of the resources with pending waits, batching up to
+    ``batch`` keys per ``describe`` call, or all of them when ``batch`` is
+    None, for describe calls which list every resource anyway. The poller
+    thread is started by the first wait and stops once no wait is pending.
+    '''
+    def __init__(self, describe, min_interval=DEFAULT_MIN_INTERVAL,
+                 max_interval=DEFAULT_MAX_INTERVAL, growth=DEFAULT_GROWTH,
+                 batch=DEFAULT_BATCH, name='boto_waiter'):
+        self.describe = describe
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.growth = growth
+        self.batch = batch
+        self.name = name
+        self._waits = {}
+        self._thread = None
+        self._lock = threading.Lock()
+
+    @property
+    def pending(self):
+        with self._lock:
+            return list(self._waits)
+
+    def add(self, key, until, failed=(), timeout=DEFAULT_TIMEOUT):
+        '''
+        Register a wait for the resource ``key`` to reach one of the ``until``
+        statuses, and return its :py:class:`Wait` without blocking. Pass
+        ``GONE`` in ``until`` to wait for a deletion, or in ``failed`` to fail
+        when the resource doesn't exist.
+        '''
+        wait = Wait(key, until, failed, timeout)
+        with self._lock:
+            self._waits.setdefault(key, []).append(wait)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name=self.name)
+                self._thread.daemon = True
+                self._thread.start()
+        return wait
+
+    def _describe(self, keys):
+        if not self.batch:
+            return self.describe(keys)
+        statuses = {}
+        for idx in range(0, len(keys), self.batch):
+            statuses.update(self.describe(keys[idx:idx + self.batch]))
+        return statuses
+
+    def _run(self):
+        interval = self.min_interval
+        while True:
+            with self._lock:
+                if not self._waits:
+                    self._thread = None
+                    return
+                deadline = min(wait.deadline for waits in six.itervalues(self._waits)
+                               for wait in waits)
+            # Give resources registered meanwhile a chance to join the poll
+            time.sleep(max(0, min(interval, deadline - time.time())))
+            with self._lock:
+                keys = list(self._waits)
+            try:
+                statuses = self._describe(keys)
+            except Exception as exc:  # pylint: disable=broad-except
+                log.warning('Unable to poll the status of %s: %s', ', '.join(
+                    six.text_type(key) for key in keys), exc)
+                statuses = None
+            changed = False
+            now = time.time()
+            with self._lock:
+                for key in keys:
+                    waits = self._waits.get(key, [])
+                    for wait in list(waits):
+                        if statuses is None:
+                            wait._expire(now)
+                        else:
+                            status = statuses.get(key, GONE)
+                            changed = changed or status != wait.status
+                            wait._update(status, now)
+                        if wait.done():
+                            waits.remove(wait)
+                    if not waits:
+                        self._waits.pop(key, None)
+            if changed:
+                interval = self.min_interval
+            else:
+                interval = min(interval * self.growth, self.max_interval)
+            log.debug('Polled %s resources, next poll in %.1f seconds', len(keys), interval)
+
+
+def get_waiter(context, key, describe, **kwargs):
+    '''
+    Return the waiter stored under ``key`` in ``context``, creating it with
+    ``describe`` and ``kwargs`` on first use. ``key`` should name the resource
+    module, the resource type and the connection, so that all the waits of a
+    run for the same kind of resource share one waiter. ``describe`` runs in
+    the poller thread, so it should get its connection itself instead of
+    using the one of the caller.
+    '''
+    context_key = ('boto_waiter', key)
+    with _LOCK:
+        waiter = context.get(context_key)
+        if waiter is None:
+            kwargs.setdefault('name', 'boto_waiter {0}'.format(key[0] if isinstance(key, tuple) else key))
+            waiter = context[context_key] = Waiter(describe, **kwargs)
+    return waiter
+
+
+def wait_all(waits, timeout=None):
+    '''
+    Block until all of ``waits`` are over, or for ``timeout`` seconds, and
+    return their results by key.
+    '''
+    deadline = None if timeout is None else time.time() + timeout
+    ret = {}
+    for wait in waits:
+        remaining = None if deadline is None else max(0, deadline - time.time())
+        ret[wait.key] = wait.wait(remaining)
+    return ret
+
+
+def defer(context, module, wait):
+    '''
+    Keep ``wait`` in ``context`` to be settled at the end of the run by
+    :py:func:`wait_deferred`, instead of blocking until it is over.
+    '''
+    with _LOCK:
+        context.setdefault(('boto_waiter', 'deferred', module), []).append(wait)
+    log.debug('Deferred waiting for %s', wait.key)
+    return wait
+
+
+def wait_deferred(context, module, timeout=None):
+    '''
+    Block until all the waits ``module`` deferred are over, or for
+    ``timeout`` seconds, and return the keys of the resources which are
+    ``ready`` and of those which ``failed`` or are still ``pending``.
+    '''
+    with _LOCK:
+        waits = context.pop(('boto_waiter', 'deferred', module), [])
+    wait_all(waits, timeout)
+    ret = {'ready': [], 'failed': [], 'pending': []}
+    for wait in waits:
+        key = 'ready' if wait.result else 'pending' if wait.result is None else 'failed'
+        ret[key].append(six.text_type(wait.key))
+    return ret
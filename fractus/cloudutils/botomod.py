@@ -47,6 +47,9 @@ from salt.exceptions import SaltInvocationError
 import salt.utils.stringutils
 import salt.utils.versions
 
+# Import Fractus libs
+import fractus.pool
+
 # Import third party libs
 # pylint: disable=import-error
 try:
@@ -112,6 +115,18 @@ def _get_profile(service, region, key, keyid, profile):
     return (cxkey, region, key, keyid)
 
 
+def profile_key(service, region=None, key=None, keyid=None, profile=None):
+    '''
+    Return the key identifying the region and credentials of a connection,
+    for caches which must not be shared between accounts or regions.
+
+    .. code-block:: python
+
+        cxkey = __utils__['boto.profile_key']('vpc', profile='custom_profile')
+    '''
+    return _get_profile(service, region, key, keyid, profile)[0]
+
+
 def cache_id(service, name, sub_resource=None, resource_id=None,
              invalidate=False, region=None, key=None, keyid=None,
              profile=None):
@@ -168,6 +183,10 @@ def get_connection(service, module=None, region=None, key=None, keyid=None,
     '''
     Return a boto connection for the service.
 
+    boto connections are not thread safe, so they are pooled per thread. The
+    pool can be tuned with the ``boto.pool_size`` and ``boto.pool_idle_timeout``
+    options.
+
     .. code-block:: python
 
         conn = __utils__['boto.get_connection']('ec2', profile='custom_profile')
@@ -184,12 +203,16 @@ def get_connection(service, module=None, region=None, key=None, keyid=None,
                                              keyid, profile)
     cxkey = cxkey + ':conn'
 
-    if cxkey in __context__:
-        return __context__[cxkey]
-
+    # __context__ is shared by all threads, so connections are always looked
+    # up in the per thread pool instead.
+    pool = fractus.pool.get_pool('boto.conn',
+                                 maxsize=__salt__['config.get']('boto.pool_size', None),
+                                 idle_timeout=__salt__['config.get']('boto.pool_idle_timeout', None))
     try:
-        conn = svc_mod.connect_to_region(region, aws_access_key_id=keyid,
-                                         aws_secret_access_key=key)
+        conn = pool.get(fractus.pool.thread_key(module, submodule, cxkey),
+                        partial(svc_mod.connect_to_region, region,
+                                aws_access_key_id=keyid,
+                                aws_secret_access_key=key))
         if conn is None:
             raise SaltInvocationError('Region "{0}" is not '
                                       'valid.'.format(region))
@@ -279,7 +302,7 @@ def paged_call(function, *args, **kwargs):
     its results, yielding each page as it is obtained.
     '''
     marker_flag = kwargs.pop('marker_flag', 'marker')
-    marker_arg = kwargs.pop('marker_flag', 'marker')
+    marker_arg = kwargs.pop('marker_arg', 'marker')
     while True:
         ret = function(*args, **kwargs)
         marker = ret.get(marker_flag)
@@ -287,3 +310,32 @@ def paged_call(function, *args, **kwargs):
         if not marker:
             break
         kwargs[marker_arg] = marker
+
+
+def paged_items(function, path, *args, **kwargs):
+    '''
+    Lazily yield the items of a boto list call whose results are nested in
+    the response, like the IAM ``list_*`` calls, where ``path`` is the dotted
+    path of the list in the response. The result object holding the list is
+    checked for a ``marker`` to request the next page. ``page_size`` is sent
+    as ``max_items``.
+
+    .. code-block:: python
+
+        users = __utils__['boto.paged_items'](conn.get_all_users,
+                                              'list_users_response.list_users_result.users')
+    '''
+    page_size = kwargs.pop('page_size', None)
+    if page_size:
+        kwargs['max_items'] = page_size
+    result_path, items = path.rsplit('.', 1)
+    while True:
+        result = function(*args, **kwargs)
+        for attr in result_path.split('.'):
+            result = getattr(result, attr)
+        for item in getattr(result, items, None) or []:
+            yield item
+        marker = getattr(result, 'marker', None)
+        if not marker:
+            break
+        kwargs['marker'] = marker
@@ -0,0 +1,355 @@
+# -*- coding: utf-8 -*-
+'''
+Route53 Utils
+=============
+
+Shared waiter, change batching and zone models for Route53 changes.
+
+Changes are polled with a short interval which grows while they stay
+``PENDING``, instead of sleeping up to a minute between polls. The waiter
+is kept in the ``__context__`` of the calling module, so changes submitted
+by many record states can be registered without waiting and confirmed
+together later, and changes seen ``INSYNC`` by one waiting state are not
+polled again by the others.
+
+Example Usage:
+
+    .. code-block:: python
+
+        waiter = __utils__['route53.get_waiter'](__context__)
+        waiter.add(change_id, lambda change_id: conn.get_change(Id=change_id)['ChangeInfo']['Status'])
+        not_synced = waiter.wait([change_id], timeout=600)
+
+Record changes of many states can be queued per hosted zone and submitted
+later as a few ``ChangeBatch`` requests, split to fit the Route53 limits.
+
+    .. code-block:: python
+
+        queue = __utils__['route53.get_queue'](__context__)
+        queue.add((zone_id, cxkey), change, conn_args)
+        for (zone_id, cxkey), conn_args, changes in queue.pop_all():
+            for batch in __utils__['route53.change_batches'](changes):
+                conn.change_resource_record_sets(HostedZoneId=zone_id, ChangeBatch={'Changes': batch})
+
+The record sets of a zone can be loaded once into a :py:class:`ZoneRecords`
+model, which answers name and type lookups from an index and is kept up to
+date with the changes made to the zone.
+
+    .. code-block:: python
+
+        zone = __utils__['route53.zone_records'](
+            lambda name, rtype: iter_resource_records(HostedZoneId=zone_id, StartRecordName=name,
+                                                      StartRecordType=rtype))
+        rrsets = zone.lookup('www.example.com.', 'A')
+        zone.apply({'Action': 'DELETE', 'ResourceRecordSet': rrsets[0]})
+'''
+
+# Import Python libs
+from __future__ import absolute_import, print_function, unicode_literals
+import logging
+import threading
+import time
+
+# Import Salt libs
+from salt.utils.odict import OrderedDict
+
+log = logging.getLogger(__name__)
+
+__virtualname__ = 'route53'
+
+# Seconds between the polls of a pending change, the interval grows by
+# POLL_BACKOFF after every poll up to MAX_POLL_INTERVAL.
+POLL_INTERVAL = 1.0
+POLL_BACKOFF = 1.5
+MAX_POLL_INTERVAL = 10.0
+DEFAULT_TIMEOUT = 600
+
+# Limits of a single ChangeResourceRecordSets request. Values of UPSERT
+# changes count twice.
+MAX_BATCH_RECORDS = 1000
+MAX_BATCH_VALUE_CHARS = 32000
+
+
+def __virtual__():
+    return __virtualname__
+
+
+class ChangeWaiter(object):
+    '''
+    Thread safe registry of Route53 change ids waiting to be ``INSYNC``.
+
+    Every change is registered with a ``get_status(change_id)`` callable,
+    returning the status reported by ``GetChange``, so changes made with
+    different connections and libraries can be waited on together.
+    '''
+    def __init__(self):
+        self._pending = OrderedDict()
+        self._synced = set()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        with self._lock:
+            return len(self._pending)
+
+    def add(self, change_id, get_status):
+        '''
+        Register a change to wait for.
+        '''
+        with self._lock:
+            if change_id not in self._synced:
+                self._pending[change_id] = get_status
+
+    def pending(self):
+        '''
+        Return the ids of the changes which are not known to be in sync.
+        '''
+        with self._lock:
+            return list(self._pending)
+
+    def _poll(self, change_id):
+        with self._lock:
+            if change_id in self._synced:
+                return True
+            get_status = self._pending.get(change_id)
+        if get_status is None:
+            return False
+        try:
+            status = get_status(change_id)
+        except Exception as exc:  # pylint: disable=broad-except
+            log.warning('Unable to get the status of Route53 change %s: %s', change_id, exc)
+            return False
+        if status != 'INSYNC':
+            log.debug('Route53 change %s is %s', change_id, status)
+            return False
+        with self._lock:
+            self._synced.add(change_id)
+            self._pending.pop(change_id, None)
+        return True
+
+    def wait(self, change_ids=None, timeout=DEFAULT_TIMEOUT):
+        '''
+        Wait up to ``timeout`` seconds for the given changes, or for every
+        registered change, to be in sync. Returns the ids of the changes
+        which are still not in sync.
+        '''
+        outstanding = list(self.pending() if change_ids is None else change_ids)
+        if not outstanding:
+            return []
+        log.info('Waiting up to %s seconds for %s Route53 changes to synchronize',
+                 timeout, len(outstanding))
+        deadline = time.time() + timeout
+        interval = POLL_INTERVAL
+        while True:
+            outstanding = [change_id for change_id in outstanding if not self._poll(change_id)]
+            remaining = deadline - time.time()
+            if not outstanding or remaining <= 0:
+                break
+            time.sleep(min(interval, remaining))
+            interval = min(interval * POLL_BACKOFF, MAX_POLL_INTERVAL)
+        if outstanding:
+            log.error('Route53 changes %s not synced after %s seconds.',
+                      ', '.join(outstanding), timeout)
+        return outstanding
+
+
+def get_waiter(context, name='route53'):
+    '''
+    Return the change waiter called ``name`` kept in ``context``, creating it
+    on first use.
+    '''
+    key = 'route53.waiter.{0}'.format(name)
+    waiter = context.get(key)
+    if waiter is None:
+        waiter = context.setdefault(key, ChangeWaiter())
+    return waiter
+
+
+def change_key(change):
+    '''
+    Return the ``(Name, Type, SetIdentifier)`` of the record set a change is
+    about.
+    '''
+    rrset = change['ResourceRecordSet']
+    return (rrset['Name'], rrset['Type'], rrset.get('SetIdentifier'))
+
+
+class ZoneRecords(object):
+    '''
+    Thread safe model of the record sets of a hosted zone, indexed by
+    ``(Name, Type, SetIdentifier)``.
+
+    ``list_records(name, rtype)`` must return an iterable of the record sets
+    with the given name and type, or of every record set of the zone when
+    both are None. The zone is listed on the first lookup, and changes made
+    afterwards are applied to the model with :py:meth:`apply`, or by listing
+    single names again with :py:meth:`refresh`.
+    '''
+    def __init__(self, list_records):
+        self._list_records = list_records
+        self._records = None
+        self._names = None
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        with self._lock:
+            return sum(len(by_id) for by_id in self._index().values())
+
+    @property
+    def loaded(self):
+        return self._records is not None
+
+    def _index(self):
+        with self._lock:
+            if self._records is None:
+                self._records = OrderedDict()
+                self._names = {}
+                for rrset in self._list_records(None, None):
+                    self._set(rrset)
+                log.debug('Loaded %s Route53 record sets', len(self))
+            return self._records
+
+    def _set(self, rrset):
+        key = (rrset['Name'], rrset['Type'])
+        self._records.setdefault(key, OrderedDict())[rrset.get('SetIdentifier')] = rrset
+        self._names.setdefault(rrset['Name'], OrderedDict())[rrset['Type']] = None
+
+    def _remove(self, name, rtype, set_identifier):
+        by_id = self._records.get((name, rtype), {})
+        by_id.pop(set_identifier, None)
+        if not by_id:
+            self._records.pop((name, rtype), None)
+            self._names.get(name, {}).pop(rtype, None)
+            if not self._names.get(name, True):
+                del self._names[name]
+
+    def lookup(self, name=None, rtype=None, set_identifier=None):
+        '''
+        Return copies of the record sets with the given name, type and set
+        identifier. Lookups by name, or by name and type, don't scan the
+        zone.
+        '''
+        with self._lock:
+            index = self._index()
+            if name is not None:
+                types = [rtype] if rtype is not None else list(self._names.get(name, {}))
+                rrsets = [rrset for _type in types
+                          for rrset in index.get((name, _type), {}).values()]
+            else:
+                rrsets = [rrset for (_, _type), by_id in index.items()
+                          if rtype in (None, _type) for rrset in by_id.values()]
+        if set_identifier is not None:
+            rrsets = [rrset for rrset in rrsets if rrset.get('SetIdentifier') == set_identifier]
+        return [dict(rrset) for rrset in rrsets]
+
+    def apply(self, change):
+        '''
+        Apply a change made to the zone to the model. Changes made before the
+        zone is loaded are ignored, since the listing will include them.
+        '''
+        with self._lock:
+            if self._records is None:
+                return
+            name, rtype, set_identifier = change_key(change)
+            if change['Action'] == 'DELETE':
+                self._remove(name, rtype, set_identifier)
+            else:
+                self._remove(name, rtype, set_identifier)
+                self._set(dict(change['ResourceRecordSet']))
+
+    def refresh(self, name, rtype=None):
+        '''
+        List the record sets with the given name, and type if given, again.
+        '''
+        rrsets = list(self._list_records(name, rtype))
+        with self._lock:
+            if self._records is None:
+                return
+            types = [rtype] if rtype is not None else list(self._names.get(name, {}))
+            for _type in types:
+                for set_identifier in list(self._records.get((name, _type), {})):
+                    self._remove(name, _type, set_identifier)
+            for rrset in rrsets:
+                self._set(rrset)
+
+
+def zone_records(list_records):
+    '''
+    Return a :py:class:`ZoneRecords` model of a zone, which lists its record
+    sets with ``list_records(name, rtype)`` on first use.
+    '''
+    return ZoneRecords(list_records)
+
+
+class ChangeQueue(object):
+    '''
+    Thread safe queue of record changes, per hosted zone. A later change to
+    the same record set replaces the queued one, since Route53 rejects
+    batches changing a record set twice.
+    '''
+    def __init__(self):
+        self._zones = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        with self._lock:
+            return sum(len(changes) for _, changes in self._zones.values())
+
+    def add(self, zone_key, change, conn_args=None):
+        with self._lock:
+            _, changes = self._zones.setdefault(zone_key, (conn_args or {}, OrderedDict()))
+            key = change_key(change)
+            changes.pop(key, None)
+            changes[key] = change
+
+    def changes(self, zone_key):
+        '''
+        Return the queued changes of a zone, by record set.
+        '''
+        with self._lock:
+            return OrderedDict(self._zones.get(zone_key, ({}, {}))[1])
+
+    def pop_all(self):
+        '''
+        Remove and return every queued change, as ``(zone_key, conn_args,
+        changes)`` tuples.
+        '''
+        with self._lock:
+            zones, self._zones = self._zones, OrderedDict()
+        return [(zone_key, conn_args, list(changes.values()))
+                for zone_key, (conn_args, changes) in zones.items()]
+
+
+def get_queue(context, name='route53'):
+    '''
+    Return the change queue called ``name`` kept in ``context``, creating it
+    on first use.
+    '''
+    key = 'route53.queue.{0}'.format(name)
+    queue = context.get(key)
+    if queue is None:
+        queue = context.setdefault(key, ChangeQueue())
+    return queue
+
+
+def _change_size(change):
+    values = [rr.get('Value', '') for rr in change['ResourceRecordSet'].get('ResourceRecords', [])]
+    factor = 2 if change['Action'] == 'UPSERT' else 1
+    return factor * max(len(values), 1), factor * sum(len(value) for value in values)
+
+
+def change_batches(changes, max_records=MAX_BATCH_RECORDS, max_chars=MAX_BATCH_VALUE_CHARS):
+    '''
+    Split a list of changes into batches which each fit in a single
+    ChangeResourceRecordSets request.
+    '''
+    batch, records, chars = [], 0, 0
+    for change in changes:
+        size, length = _change_size(change)
+        if batch and (records + size > max_records or chars + length > max_chars):
+            yield batch
+            batch, records, chars = [], 0, 0
+        batch.append(change)
+        records += size
+        chars += length
+    if batch:
+        yield batch
@@ -0,0 +1,201 @@
+# -*- coding: utf-8 -*-
+'''
+S3 Utils
+========
+
+Content hashing for the boto_s3 modules.
+
+Local files are read once to produce both the digest salt stores in the
+object metadata and the ETag S3 reports for the file when it is uploaded
+with the given multipart settings. Results are cached by path, size and
+mtime, in memory and in ``<cachedir>/boto_s3/hashes``, so unchanged files
+are not hashed again on the next run. The cache file is only appended to, and
+is rewritten without the entries of files which changed since once they pile
+up.
+
+Example Usage:
+
+    .. code-block:: python
+
+        digests = __utils__['s3.file_digests']('/srv/artifact.tgz', 'sha256')
+        if __utils__['s3.etag_matches'](metadata['ETag'], digests['etag']):
+            return
+'''
+
+# Import Python libs
+from __future__ import absolute_import, print_function, unicode_literals
+import hashlib
+import logging
+import os
+import threading
+
+# Import Salt libs
+import salt.utils.files
+import salt.utils.json
+
+log = logging.getLogger(__name__)
+
+__virtualname__ = 's3'
+
+MB = 1024 ** 2
+# Same defaults as boto3.s3.transfer.TransferConfig
+MULTIPART_THRESHOLD = 8 * MB
+MULTIPART_CHUNKSIZE = 8 * MB
+# Limits S3 puts on multipart uploads, boto3 grows the part size to fit them.
+MIN_PART_SIZE = 5 * MB
+MAX_PARTS = 10000
+READ_SIZE = MB
+# Superseded entries in the cache file which trigger a rewrite of it.
+COMPACT_THRESHOLD = 1000
+
+_CACHE = {}
+_CACHE_LOCK = threading.Lock()
+_LOADED = set()
+# Cache key of the latest entry of every path, hash type and part size
+_LATEST = {}
+_SUPERSEDED = {}
+
+
+def __virtual__():
+    return __virtualname__
+
+
+def part_size(size, chunksize=MULTIPART_CHUNKSIZE):
+    '''
+    Return the part size boto3 uses to upload a file of ``size`` bytes.
+    '''
+    chunksize = max(int(chunksize), MIN_PART_SIZE)
+    while size > chunksize * MAX_PARTS:
+        chunksize *= 2
+    return chunksize
+
+
+def _cache_file():
+    cachedir = __opts__.get('cachedir')
+    if not cachedir:
+        return None
+    return os.path.join(cachedir, 'boto_s3', 'hashes')
+
+
+def _add(path, key, value):
+    '''
+    Add an entry to the in memory cache, dropping the entry of the same file
+    it supersedes, and count the superseded entries of the cache file.
+    '''
+    file_path, _, _, hash_type, chunksize = key.rsplit(':', 4)
+    latest = _LATEST.get((file_path, hash_type, chunksize))
+    _LATEST[(file_path, hash_type, chunksize)] = key
+    _CACHE[key] = value
+    if latest is None:
+        return
+    if latest != key:
+        _CACHE.pop(latest, None)
+    _SUPERSEDED[path] = _SUPERSEDED.get(path, 0) + 1
+
+
+def _compact(path):
+    '''
+    Rewrite the cache file with the latest entries only, through a temporary
+    file so concurrent readers never see a partial file.
+    '''
+    tmp = '{0}.{1}'.format(path, os.getpid())
+    try:
+        with salt.utils.files.fopen(tmp, 'w') as fh:
+            for key in sorted(_LATEST.values()):
+                if key in _CACHE:
+                    fh.write(salt.utils.json.dumps([key, _CACHE[key]]) + '\n')
+        os.rename(tmp, path)
+    except (IOError, OSError) as exc:
+        log.debug('Unable to rewrite the S3 hash cache %s: %s', path, exc)
+        return False
+    log.debug('Rewrote the S3 hash cache %s without %s superseded entries',
+              path, _SUPERSEDED.get(path, 0))
+    _SUPERSEDED[path] = 0
+    return True
+
+
+def _load(path):
+    if path is None or path in _LOADED:
+        return
+    _LOADED.add(path)
+    try:
+        with salt.utils.files.fopen(path, 'r') as fh:
+            for line in fh:
+                try:
+                    key, value = salt.utils.json.loads(line)
+                    _add(path, key, value)
+                except ValueError:
+                    continue
+    except (IOError, OSError):
+        pass
+
+
+def _store(path, key, value):
+    _add(path, key, value)
+    if path is None:
+        return
+    if _SUPERSEDED.get(path, 0) >= COMPACT_THRESHOLD and _compact(path):
+        return
+    try:
+        if not os.path.isdir(os.path.dirname(path)):
+            os.makedirs(os.path.dirname(path))
+        with salt.utils.files.fopen(path, 'a') as fh:
+            fh.write(salt.utils.json.dumps([key, value]) + '\n')
+    except (IOError, OSError) as exc:
+        log.debug('Unable to write to the S3 hash cache %s: %s', path, exc)
+
+
+def file_digests(path, hash_type='sha256', multipart_threshold=MULTIPART_THRESHOLD,
+                 multipart_chunksize=MULTIPART_CHUNKSIZE):
+    '''
+    Return ``{'hash': <hash_type hex digest>, 'etag': <S3 ETag>}`` for a local
+    file. Raises ``IOError`` if the file cannot be read and ``ValueError`` for
+    an unknown ``hash_type``.
+    '''
+    stat = os.stat(path)
+    multipart = stat.st_size >= int(multipart_threshold)
+    chunksize = part_size(stat.st_size, multipart_chunksize) if multipart else None
+    key = '{0}:{1}:{2}:{3}:{4}'.format(os.path.realpath(path), stat.st_size,
+                                       stat.st_mtime, hash_type, chunksize)
+    cache_file = _cache_file()
+    with _CACHE_LOCK:
+        _load(cache_file)
+        if key in _CACHE:
+            return dict(_CACHE[key])
+
+    digest = hashlib.new(hash_type)
+    parts = []
+    md5 = hashlib.md5()
+    in_part = 0
+    with salt.utils.files.fopen(path, 'rb') as fh:
+        while True:
+            chunk = fh.read(min(READ_SIZE, chunksize - in_part) if multipart else READ_SIZE)
+            if not chunk:
+                break
+            digest.update(chunk)
+            md5.update(chunk)
+            in_part += len(chunk)
+            if multipart and in_part == chunksize:
+                parts.append(md5.digest())
+                md5 = hashlib.md5()
+                in_part = 0
+    if not multipart:
+        etag = md5.hexdigest()
+    else:
+        if in_part:
+            parts.append(md5.digest())
+        etag = '{0}-{1}'.format(hashlib.md5(b''.join(parts)).hexdigest(), len(parts))
+
+    value = {'hash': digest.hexdigest(), 'etag': etag}
+    with _CACHE_LOCK:
+        _store(cache_file, key, value)
+    return dict(value)
+
+
+def etag_matches(etag, local_etag):
+    '''
+    Compare an ETag returned by S3 with the one computed for a local file.
+    '''
+    if not etag or not local_etag:
+        return False
+    return etag.strip('"') == local_etag
@@ -19,6 +19,7 @@ VALID_OPTS = {
     'file_ignore_glob': (list, six.string_types),
     'renderer': six.string_types,
     'log_level': six.string_types,
+    'parallel': int,
 }
 
 DEFAULTS = {
@@ -28,6 +29,7 @@ DEFAULTS = {
     'file_ignore_glob': [],
     'renderer': 'yaml_jinja',
     'log_level': 'warning',
+    'parallel': 1,
 }
 
 
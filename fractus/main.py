@@ -22,6 +22,8 @@ class Runner(object):
         self._prepare_fractus()
         self.opts = fractus.config.fractus_config(conf_file=self.options.config)
         self.opts['test'] = self.options.test
+        if self.options.parallel:
+            self.opts['parallel'] = self.options.parallel
         self.st_ = fractus.state.FractusState(self.opts, jid=salt.utils.jid.gen_jid(self.opts))
 
     def _prepare_fractus(self):
@@ -33,7 +35,8 @@ class Runner(object):
         if errors:
             return errors, 'nested'
 
-        ret = {'data': {'local': self.st_.state.call_high(high_)}}
+        running = self.st_.confirm_deferred(self.st_.state.call_high(high_))
+        ret = {'data': {'local': running}}
         ret['retcode'] = 0 if salt.utils.state.check_result(ret['data']) else 1
         return ret, 'highstate'
 
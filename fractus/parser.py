@@ -14,6 +14,8 @@ def parse():
                         help='Config file (default {0}/fractus/config.yml'.format(xdg.XDG_CONFIG_HOME))
     parser.add_argument('--test', action='store_true', default=False,
                         help='Test state runs')
+    parser.add_argument('--parallel', '-p', dest='parallel', type=int, default=None,
+                        help='Number of states to run concurrently (default 1)')
     parser.add_argument('--out', '-o', dest='out', type=str, default=None,
                         help='Which outputter to use')
     parser.add_argument('--log-level', '-l', dest='log_level', type=str, default=None,
@@ -0,0 +1,141 @@
+# -*- coding: utf-8 -*-
+'''
+Process wide connection pool shared by the cloud utils modules
+
+The loader gives every module its own ``__context__``, so connections cached
+there are rebuilt for every loader and every ``FractusState``. The pools in
+this module live for the whole process and are safe to use from the worker
+threads of a parallel run.
+'''
+from __future__ import absolute_import, unicode_literals
+
+# Import python libraries
+import logging
+import threading
+import time
+from collections import OrderedDict
+
+log = logging.getLogger(__name__)
+
+DEFAULT_MAXSIZE = 128
+DEFAULT_IDLE_TIMEOUT = 900
+
+
+class ConnectionPool(object):
+    '''
+    Bounded LRU pool of connection objects.
+
+    Connections are built by the ``factory`` passed to :py:meth:`get` the
+    first time a key is requested. Entries which have not been used for
+    ``idle_timeout`` seconds are evicted, as are the least recently used
+    entries once the pool holds more than ``maxsize`` connections.
+    '''
+    def __init__(self, maxsize=DEFAULT_MAXSIZE, idle_timeout=DEFAULT_IDLE_TIMEOUT):
+        self.maxsize = maxsize
+        self.idle_timeout = idle_timeout
+        self._lock = threading.Lock()
+        self._building = {}
+        self._conns = OrderedDict()
+
+    def __len__(self):
+        return len(self._conns)
+
+    def __contains__(self, key):
+        return key in self._conns
+
+    def _lookup(self, key, now):
+        entry = self._conns.pop(key, None)
+        if entry is None:
+            return None
+        if self.idle_timeout and now - entry[1] > self.idle_timeout:
+            log.debug('Evicting idle connection %s', key)
+            return None
+        self._conns[key] = (entry[0], now)
+        return entry[0]
+
+    def _evict(self, now):
+        if self.idle_timeout:
+            for key in [key for key, entry in self._conns.items() if now - entry[1] > self.idle_timeout]:
+                log.debug('Evicting idle connection %s', key)
+                del self._conns[key]
+        while self.maxsize and len(self._conns) > self.maxsize:
+            key, _ = self._conns.popitem(last=False)
+            log.debug('Evicting least recently used connection %s', key)
+
+    def get(self, key, factory):
+        '''
+        Return the pooled connection for ``key``, calling ``factory()`` to
+        build it if needed. Only one thread builds a given key at a time.
+        '''
+        with self._lock:
+            conn = self._lookup(key, time.time())
+            if conn is not None:
+                return conn
+            building = self._building.setdefault(key, threading.Lock())
+
+        with building:
+            try:
+                with self._lock:
+                    conn = self._lookup(key, time.time())
+                    if conn is not None:
+                        return conn
+                conn = factory()
+                with self._lock:
+                    now = time.time()
+                    self._conns[key] = (conn, now)
+                    self._evict(now)
+            finally:
+                with self._lock:
+                    self._building.pop(key, None)
+        return conn
+
+    def discard(self, key):
+        '''
+        Drop a connection from the pool
+        '''
+        with self._lock:
+            return self._conns.pop(key, None) is not None
+
+    def clear(self):
+        '''
+        Drop every connection in the pool
+        '''
+        with self._lock:
+            self._conns.clear()
+
+
+_POOLS = {}
+_POOLS_LOCK = threading.Lock()
+
+
+def _as_int(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def get_pool(name, maxsize=None, idle_timeout=None):
+    '''
+    Return the named process wide pool, creating it on first use. Passing
+    ``maxsize`` or ``idle_timeout`` updates the limits of an existing pool,
+    values which are not integers are ignored.
+    '''
+    maxsize, idle_timeout = _as_int(maxsize), _as_int(idle_timeout)
+    with _POOLS_LOCK:
+        if name not in _POOLS:
+            _POOLS[name] = ConnectionPool()
+        pool = _POOLS[name]
+        if maxsize is not None:
+            pool.maxsize = maxsize
+        if idle_timeout is not None:
+            pool.idle_timeout = idle_timeout
+        return pool
+
+
+def thread_key(*key):
+    '''
+    Build a pool key which is only shared with the current thread, for
+    connection objects that are not thread safe.
+    '''
+    return key + (threading.current_thread().ident,)
@@ -2,19 +2,248 @@
 from __future__ import absolute_import, unicode_literals
 
 # Import Python Libraries
+import copy
 import logging
+import threading
+import traceback
+from collections import defaultdict
+from multiprocessing.pool import ThreadPool
 
 # Import Salt Libraries
 import salt.state
 import salt.loader
+from salt.ext import six
+from salt.ext.six.moves import queue  # pylint: disable=import-error
 
 # Import Fractus Libraries
 import fractus.loader
 
 log = logging.getLogger(__name__)
 
+# Requisites which run states out of order and can only be honoured by the
+# serial executor.
+SERIAL_REQUISITES = (
+    'prereq',
+    'prerequired',
+)
+
+# Functions run at the end of the run to apply and confirm the changes which
+# states deferred, with the tag of the result they add to the run.
+DEFERRED = (
+    ('boto3_route53.flush_changes',
+     'boto3_route53_|-deferred changes_|-deferred changes_|-changes_applied'),
+    ('boto_route53.wait_for_changes',
+     'boto_route53_|-deferred changes_|-deferred changes_|-changes_synced'),
+    ('boto_rds.wait_for_deferred',
+     'boto_rds_|-deferred changes_|-deferred changes_|-resources_ready'),
+    ('boto_elasticache.wait_for_deferred',
+     'boto_elasticache_|-deferred changes_|-deferred changes_|-resources_ready'),
+    ('boto3_elasticache.wait_for_deferred',
+     'boto3_elasticache_|-deferred changes_|-deferred changes_|-resources_ready'),
+    ('boto_dynamodb.wait_for_deferred',
+     'boto_dynamodb_|-deferred changes_|-deferred changes_|-resources_ready'),
+)
+# Lists in the results of the DEFERRED functions which mean they failed.
+DEFERRED_FAILURES = ('failed', 'pending')
+
+
+class _RequisiteRecorder(dict):
+    '''
+    Empty ``running`` dict which records the tags
+    :py:meth:`salt.state.State.check_requisite` looks for
+    '''
+    def __init__(self):
+        super(_RequisiteRecorder, self).__init__()
+        self.tags = set()
+
+    def __contains__(self, tag):
+        self.tags.add(tag)
+        return False
+
+
+def requisite_graph(state, chunks):
+    '''
+    Build the dependency graph of a list of low chunks, resolving requisites
+    with :py:meth:`salt.state.State.check_requisite` so they match exactly the
+    chunks salt itself waits for.
+
+    Returns a dict mapping each chunk tag to the set of tags it has to wait
+    for, or ``None`` if the chunks use requisites which cannot be scheduled
+    concurrently.
+    '''
+    graph = {}
+    for low in chunks:
+        if any(low.get(req) for req in SERIAL_REQUISITES):
+            return None
+        tag = salt.state._gen_tag(low)
+        recorder = _RequisiteRecorder()
+        # check_requisite turns watch into require when there is no mod_watch
+        state.check_requisite(copy.deepcopy(low), recorder, chunks)
+        recorder.tags.discard(tag)
+        graph[tag] = recorder.tags
+    return graph
+
+
+class ParallelChunkRunner(object):
+    '''
+    Drop-in replacement for :py:meth:`salt.state.State.call_chunks` which runs
+    every chunk as soon as all of its requisites have finished, using a pool of
+    worker threads.
+
+    A State is not thread safe, it injects ``__low__`` and ``__running__`` into
+    the state modules and keeps its own bookkeeping, so every worker thread
+    runs chunks on a copy of it with its own modules. The copies share the
+    ``__context__`` of the run. Workers run a chunk against a snapshot of the
+    results and merge the new results back under a lock.
+    '''
+    def __init__(self, state, workers):
+        self.state = state
+        self.workers = workers
+        self._local = threading.local()
+
+    def _worker_state(self):
+        state = getattr(self._local, 'state', None)
+        if state is None:
+            state = copy.copy(self.state)
+            state.pre = {}
+            state.load_modules()
+            self._local.state = state
+        return state
+
+    def __call__(self, chunks):
+        graph = requisite_graph(self.state, chunks)
+        if graph is None:
+            log.warning('prereq requisites can not be run in parallel, falling back to serial execution')
+            return salt.state.State.call_chunks(self.state, chunks)
+
+        lows = dict((salt.state._gen_tag(low), low) for low in chunks)
+        order = [salt.state._gen_tag(low) for low in chunks]
+        dependents = defaultdict(set)
+        for tag, deps in six.iteritems(graph):
+            for dep in deps:
+                dependents[dep].add(tag)
+
+        running = {}
+        claimed = set()
+        lock = threading.Lock()
+        finished = queue.Queue()
+        pool = ThreadPool(self.workers)
+        scheduled = set()
+        inflight = 0
+        failhard = False
+
+        def _call(state, tag):
+            with lock:
+                if tag in claimed:
+                    return
+                claimed.add(tag)
+                snapshot = dict(running)
+            ret = state.call_chunk(lows[tag], snapshot, chunks)
+            with lock:
+                # Number the results in the order they are merged, every
+                # State copy keeps a run counter of its own.
+                new = sorted((key for key in ret if key not in running and key != '__FAILHARD__'),
+                             key=lambda key: ret[key].get('__run_num__', 0))
+                for key in new:
+                    running[key] = ret[key]
+                    running[key]['__run_num__'] = len(running) - 1
+                    claimed.add(key)
+
+        def _run(tag):
+            try:
+                _call(self._worker_state(), tag)
+                finished.put((tag, None))
+            except Exception:  # pylint: disable=broad-except
+                finished.put((tag, traceback.format_exc()))
+
+        try:
+            for tag in order:
+                if not graph[tag]:
+                    scheduled.add(tag)
+                    pool.apply_async(_run, (tag,))
+                    inflight += 1
+
+            while inflight:
+                tag, trb = finished.get()
+                inflight -= 1
+                with lock:
+                    if trb is not None:
+                        log.error('Exception while running %s: %s', tag, trb)
+                        # Fail the chunk like salt fails a state which
+                        # raised, so that its dependents fail their
+                        # requisites and the results of the run are kept
+                        low = lows[tag]
+                        running.setdefault(tag, {
+                            '__id__': low['__id__'],
+                            '__sls__': low.get('__sls__'),
+                            '__run_num__': len(running),
+                            'name': low['name'],
+                            'result': False,
+                            'comment': 'An exception occurred in this state: {0}'.format(trb),
+                            'changes': {},
+                        })
+                    if failhard or self.state.check_failhard(lows[tag], running):
+                        failhard = True
+                        continue
+                for dependent in sorted(dependents[tag], key=order.index):
+                    graph[dependent].discard(tag)
+                    if not graph[dependent] and dependent not in scheduled:
+                        scheduled.add(dependent)
+                        pool.apply_async(_run, (dependent,))
+                        inflight += 1
+        finally:
+            pool.close()
+            pool.join()
+
+        if not failhard:
+            # Anything left over is part of a requisite loop, let salt
+            # detect and report it the same way it does for serial runs.
+            for tag in order:
+                _call(self.state, tag)
+        return running
+
 
 class FractusState(salt.state.HighState):
+    def __init__(self, opts, *args, **kwargs):
+        super(FractusState, self).__init__(opts, *args, **kwargs)
+        parallel = self.opts.get('parallel', 1)
+        if parallel > 1:
+            self.state.call_chunks = ParallelChunkRunner(self.state, parallel)
+
+    def confirm_deferred(self, running):
+        '''
+        Apply and confirm the changes which states deferred to the end of the
+        run, like Route53 changes applied with ``wait_for_sync: defer`` or the
+        waits for RDS instances with ``boto_rds.defer_wait`` set, and add the
+        outcome to the results of the run.
+        '''
+        if not isinstance(running, dict) or not running or self.opts.get('test'):
+            return running
+        for fun, tag in DEFERRED:
+            if fun not in self.state.functions:
+                continue
+            try:
+                res = self.state.functions[fun]()
+            except Exception as exc:  # pylint: disable=broad-except
+                log.error('Unable to confirm the deferred changes with %s: %s', fun, exc, exc_info=True)
+                res = {}
+                failures = ['{0} failed: {1}'.format(fun, exc)]
+            else:
+                if not any(six.itervalues(res)):
+                    continue
+                failures = ['{0}: {1}'.format(key, ', '.join(res[key]))
+                            for key in DEFERRED_FAILURES if res.get(key)]
+            running[tag] = {
+                '__id__': 'deferred changes',
+                '__run_num__': len(running),
+                'name': 'deferred changes',
+                'result': not failures,
+                'comment': '; '.join(failures) or ', '.join(
+                    '{0} {1}'.format(len(value), key) for key, value in sorted(res.items())),
+                'changes': {},
+            }
+        return running
+
     def load_modules(self, data=None, proxy=None):
         '''
         Load the modules into the state
@@ -2,6 +2,8 @@
 from __future__ import absolute_import, unicode_literals
 
 # Import python libraries
+import contextlib
+import operator
 import pytest
 import random
 import string
@@ -49,6 +51,32 @@ def setup_loader(setup):
             setattr(mod, key, {})
 
 
+@pytest.helpers.register
+def poller_conns(poll, responses):
+    '''
+    Mock _get_conn for a module which waits from poller threads. The first
+    connection goes to the caller, the following ones to the pollers, whose
+    ``poll`` method returns ``responses`` and then keeps returning the last
+    one. Returns the _get_conn mock, the caller's and the pollers' connection.
+    '''
+    conn = MagicMock()
+    poll_conn = MagicMock()
+    responses = list(responses)
+    operator.attrgetter(poll)(poll_conn).side_effect = responses + [responses[-1]] * 100
+    return MagicMock(side_effect=[conn] + [poll_conn] * 100), conn, poll_conn
+
+
+@pytest.helpers.register
+@contextlib.contextmanager
+def fast_waiter(module):
+    '''
+    Make the waiters of a module poll every 10ms.
+    '''
+    with patch.object(module, 'WAIT_MIN_INTERVAL', 0.01), \
+            patch.object(module, 'WAIT_MAX_INTERVAL', 0.01):
+        yield
+
+
 @pytest.fixture
 def boto_conn():
     # Set up MagicMock to replace the boto3 session
@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+
+# Import Python Libs
+from __future__ import absolute_import, print_function, unicode_literals
+
+# Import Fractus Libs
+import fractus.cloudmodules.boto3_elasticache as boto3_elasticache
+
+# Import Testing Libs
+import pytest
+from mock import patch
+
+boto3 = pytest.importorskip('boto3')
+
+conn_parameters = {'region': 'us-east-1', 'key': None, 'keyid': None, 'profile': {}}
+cluster_args = {'name_param': 'CacheClusterId', 'desc': 'cache cluster', 'res_type': 'cache_cluster',
+                'status_param': 'CacheClusterStatus', 'wait': 5}
+
+
+def setup_function():
+    pytest.helpers.setup_loader({
+        boto3_elasticache: {
+            '__opts__': pytest.opts,
+            '__utils__': pytest.utils,
+        },
+    })
+
+
+def _conns(*statuses):
+    # The caller's connection creates, modifies and deletes, the poller thread
+    # gets a connection of its own which lists the cluster going through statuses
+    pages = [{'CacheClusters': [{'CacheClusterId': 'mycache', 'CacheClusterStatus': status}]
+              if status else []} for status in statuses]
+    return pytest.helpers.poller_conns('describe_cache_clusters', pages)
+
+
+@pytest.fixture(autouse=True)
+def fast_waiter():
+    with pytest.helpers.fast_waiter(boto3_elasticache):
+        yield
+
+
+def test_create_waits_for_the_cluster_with_a_connection_of_the_poller():
+    get_conn, conn, poll_conn = _conns('creating', 'available')
+    with patch.object(boto3_elasticache, '_get_conn', get_conn, create=True):
+        assert boto3_elasticache._create_resource('mycache', **dict(conn_parameters, **cluster_args))
+    conn.create_cache_cluster.assert_called_once_with(CacheClusterId='mycache')
+    assert not conn.describe_cache_clusters.called
+    poll_conn.describe_cache_clusters.assert_called_with(Marker='')
+
+
+def test_modify_fails_when_the_cluster_is_not_available_in_time():
+    get_conn, conn, _ = _conns('modifying')
+    args = dict(conn_parameters, **cluster_args)
+    args['wait'] = 1
+    with patch.object(boto3_elasticache, '_get_conn', get_conn, create=True):
+        assert not boto3_elasticache._modify_resource('mycache', **args)
+    conn.modify_cache_cluster.assert_called_once_with(CacheClusterId='mycache')
+
+
+def test_delete_defers_the_wait_to_the_end_of_the_run():
+    get_conn, conn, _ = _conns('deleting', None)
+    with patch.object(boto3_elasticache, '_get_conn', get_conn, create=True), \
+            patch.dict(boto3_elasticache.__opts__, {'boto3_elasticache.defer_wait': True}):
+        assert boto3_elasticache._delete_resource('mycache', **dict(conn_parameters, **cluster_args))
+        assert boto3_elasticache.wait_for_deferred(timeout=5) == {
+            'ready': ['mycache'], 'failed': [], 'pending': []}
+    conn.delete_cache_cluster.assert_called_once_with(CacheClusterId='mycache')
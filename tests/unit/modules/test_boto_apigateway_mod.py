@@ -1149,6 +1149,26 @@ def test_that_when_creating_an_api_method_and_error_thrown_on_put_method_the_cre
                                                authorizationType='NONE', **pytest.conn_parameters)
     assert not result.get('created')
 
+def test_that_when_creating_and_deleting_api_methods_the_cached_resource_methods_are_updated(boto_conn):
+    '''
+    Tests the cached resource of '/api/users' follows created and deleted methods,
+    without changing resources returned before
+    '''
+    boto_conn.get_resources.return_value = api_resources_ret
+    boto_conn.put_method.return_value = {u'httpMethod': 'GET'}
+    before = boto_apigateway.describe_api_resource(restApiId='rm06h9oac4', path='/api/users',
+                                                   **pytest.conn_parameters)['resource']
+    boto_apigateway.create_api_method(restApiId='rm06h9oac4', resourcePath='/api/users',
+                                      httpMethod='GET', authorizationType='NONE', **pytest.conn_parameters)
+    boto_apigateway.delete_api_method(restApiId='rm06h9oac4', resourcePath='/api/users',
+                                      httpMethod='POST', **pytest.conn_parameters)
+    after = boto_apigateway.describe_api_resource(restApiId='rm06h9oac4', path='/api/users',
+                                                  **pytest.conn_parameters)['resource']
+    assert sorted(before['resourceMethods']) == ['OPTIONS', 'POST']
+    assert sorted(after['resourceMethods']) == ['GET', 'OPTIONS']
+    assert sorted(api_resources_ret['items'][2]['resourceMethods']) == ['OPTIONS', 'POST']
+    assert boto_conn.get_resources.call_count == 1
+
 def test_that_when_deleting_an_api_method_for_a_method_that_exist_the_delete_api_method_method_returns_true(boto_conn):
     '''
     Tests True for '/api/users' and 'POST'
@@ -1562,3 +1582,19 @@ def test_that_attach_or_detach_usage_plan_updated_successfully(boto_conn):
     result = boto_apigateway.detach_usage_plan_from_apis(plan_id='plan1_id', apis=[api], **pytest.conn_parameters)
     assert result.get('success') == True
     assert result.get('result') == detach_ret
+
+def test_that_the_resources_of_an_api_are_fetched_once_and_updated_in_place(boto_conn):
+    '''
+    Tests that describing, creating and deleting resources share one listing of the api
+    '''
+    boto_conn.get_resources.return_value = api_resources_ret
+    boto_conn.create_resource.return_value = api_create_resource_ret
+    boto_apigateway.create_api_resources(restApiId='rm06h9oac4', path='/api3', **pytest.conn_parameters)
+    assert boto_apigateway.describe_api_resource(restApiId='rm06h9oac4', path='/api3',
+                                                 **pytest.conn_parameters)['resource']['id'] == '123abc'
+    assert boto_apigateway.delete_api_resources(restApiId='rm06h9oac4', path='/api',
+                                                **pytest.conn_parameters)['deleted']
+    paths = [r['path'] for r in boto_apigateway.describe_api_resources(restApiId='rm06h9oac4',
+                                                                      **pytest.conn_parameters)['resources']]
+    assert paths == ['/', '/api3']
+    assert boto_conn.get_resources.call_count == 1
@@ -0,0 +1,137 @@
+# -*- coding: utf-8 -*-
+
+# Import Python Libs
+from __future__ import absolute_import, print_function, unicode_literals
+import datetime
+
+# Import Fractus Libs
+import fractus.cloudmodules.boto_asg as boto_asg
+
+# Import Testing Libs
+import pytest
+from mock import MagicMock, patch
+
+boto = pytest.importorskip('boto')
+
+conn_parameters = {'region': 'us-east-1', 'key': None, 'keyid': None, 'profile': {}}
+
+
+def setup_function():
+    pytest.helpers.setup_loader({
+        boto_asg: {
+            '__opts__': pytest.opts,
+            '__utils__': pytest.utils,
+            '__salt__': pytest.modules,
+        },
+    })
+
+
+class _Page(list):
+    next_token = None
+
+
+def _paged(pages):
+    # boto result sets carry the token of the next page
+    def describe(next_token=None, **kwargs):
+        index = int(next_token or 0)
+        page = _Page(pages[index])
+        if index + 1 < len(pages):
+            page.next_token = str(index + 1)
+        return page
+    return MagicMock(side_effect=describe)
+
+
+def _group(name, min_size=1):
+    group = MagicMock(availability_zones=['us-east-1a'], default_cooldown=300,
+                      desired_capacity=min_size, health_check_period=0,
+                      health_check_type='EC2', launch_config_name='lc',
+                      load_balancers=[], max_size=10, min_size=min_size,
+                      placement_group=None, vpc_zone_identifier='subnet-1,subnet-2',
+                      tags=[], termination_policies=['Default'], suspended_processes=[])
+    group.name = name
+    return group
+
+
+def _policy(as_name):
+    policy = MagicMock(as_name=as_name, adjustment_type='ChangeInCapacity',
+                       scaling_adjustment=1, min_adjustment_step=None, cooldown=60)
+    policy.name = 'up'
+    return policy
+
+
+def _action(as_group):
+    action = MagicMock(as_group=as_group, min_size=1, max_size=2, desired_capacity='1',
+                       start_time=datetime.datetime(2026, 1, 1), end_time=None,
+                       recurrence='0 9 * * *')
+    action.name = 'morning'
+    return action
+
+
+def test_configs_are_described_in_bulk_and_refreshed_after_changes():
+    conn = MagicMock()
+    conn.get_all_groups = _paged([[_group('asg{0}'.format(idx)) for idx in range(100)],
+                                  [_group('asg{0}'.format(idx)) for idx in range(100, 250)]])
+    conn.get_all_policies = _paged([[_policy('asg1'), _policy('gone')]])
+    conn.get_all_scheduled_actions = _paged([[_action('asg2')]])
+    with patch.object(boto_asg, '_get_conn', MagicMock(return_value=conn), create=True):
+        for idx in range(250):
+            config = boto_asg.get_config('asg{0}'.format(idx), **conn_parameters)
+            assert config['vpc_zone_identifier'] == ['subnet-1', 'subnet-2']
+        assert boto_asg.get_config('asg1', **conn_parameters)['scaling_policies'][0]['name'] == 'up'
+        assert boto_asg.get_config('asg2', **conn_parameters)['scheduled_actions']['morning'] == {
+            'min_size': 1, 'max_size': 2, 'desired_capacity': 1,
+            'start_time': '2026-01-01T00:00:00', 'end_time': None, 'recurrence': '0 9 * * *'}
+        assert not boto_asg.exists('missing', **conn_parameters)
+        assert sorted(boto_asg.get_configs(['asg3', 'asg4', 'missing'], **conn_parameters)) == ['asg3', 'asg4']
+        # Two pages of groups, and a page each of policies and scheduled actions
+        assert conn.get_all_groups.call_count == 2
+        assert conn.get_all_policies.call_count == 1
+        assert conn.get_all_scheduled_actions.call_count == 1
+
+        # Returned configs are copies
+        boto_asg.get_config('asg5', **conn_parameters)['min_size'] = 5
+        assert boto_asg.get_config('asg5', **conn_parameters)['min_size'] == 1
+
+        assert boto_asg.delete('asg5', **conn_parameters)
+        conn.get_all_groups = MagicMock(return_value=[])
+        assert boto_asg.get_config('asg5', **conn_parameters) == {}
+        conn.get_all_groups.assert_called_once_with(names=['asg5'])
+        assert 'asg5' not in boto_asg.get_configs(**conn_parameters)
+        assert conn.get_all_groups.call_count == 1
+
+
+def test_get_instances_bulk_returns_columns():
+    groups = []
+    for idx in range(60):
+        group = _group('asg{0:02d}'.format(idx))
+        group.instances = [MagicMock(instance_id='i-{0:02d}{1}'.format(idx, num),
+                                     lifecycle_state='InService', health_status='Healthy')
+                           for num in range(20)]
+        groups.append(group)
+    groups[0].instances[0].lifecycle_state = 'Pending'
+    conn = MagicMock()
+    conn.get_all_groups.side_effect = lambda names=None, next_token=None: _Page(
+        group for group in groups if group.name in names)
+
+    def get_only_instances(instance_ids):
+        # i-001 was terminated since its group was described
+        return [MagicMock(id=instance_id, private_ip_address='10.0.0.1', placement='us-east-1a',
+                          tags={'Name': instance_id})
+                for instance_id in reversed(instance_ids) if instance_id != 'i-001']
+    ec2_conn = MagicMock()
+    ec2_conn.get_only_instances.side_effect = get_only_instances
+
+    with patch.object(boto_asg, '_get_conn', MagicMock(return_value=conn), create=True), \
+            patch.object(boto_asg, '_get_ec2_conn', MagicMock(return_value=ec2_conn), create=True):
+        ret = boto_asg.get_instances_bulk([group.name for group in groups], **conn_parameters)
+
+    assert conn.get_all_groups.call_count == 2
+    assert ec2_conn.get_only_instances.call_count == 2
+    assert len(ret['id']) == 60 * 20 - 2
+    # Instances are in the order their groups list them
+    assert ret['id'] == ['i-{0:02d}{1}'.format(idx, num) for idx in range(60) for num in range(20)
+                         if (idx, num) not in ((0, 0), (0, 1))]
+    assert ret['asg'][:2] == ['asg00', 'asg00']
+    assert ret['private_ip_address'][0] == '10.0.0.1'
+    assert ret['placement'][-1] == 'us-east-1a'
+    assert ret['tags'][-1] == {'Name': 'i-5919'}
@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+
+# Import Python Libs
+from __future__ import absolute_import, print_function, unicode_literals
+
+# Import Fractus Libs
+import fractus.cloudmodules.boto_dynamodb as boto_dynamodb
+
+# Import Testing Libs
+import pytest
+from mock import patch
+
+boto = pytest.importorskip('boto')
+exception = pytest.importorskip('boto.exception')
+
+conn_parameters = {'region': 'us-east-1', 'key': None, 'keyid': None, 'profile': {}}
+
+
+def setup_function():
+    pytest.helpers.setup_loader({
+        boto_dynamodb: {
+            '__opts__': pytest.opts,
+            '__utils__': pytest.utils,
+        },
+    })
+
+
+def _conns(*statuses):
+    # The caller's connection creates and deletes, the poller thread gets a
+    # connection of its own which sees the table go through statuses
+    not_found = exception.JSONResponseError(400, 'Bad Request')
+    not_found.error_code = 'ResourceNotFoundException'
+    tables = [{'Table': {'TableStatus': status}} if status else not_found for status in statuses]
+    return pytest.helpers.poller_conns('describe_table', tables)
+
+
+@pytest.fixture(autouse=True)
+def fast_waiter():
+    with pytest.helpers.fast_waiter(boto_dynamodb):
+        yield
+
+
+def test_create_table_waits_for_the_table_with_a_connection_of_the_poller():
+    get_conn, conn, poll_conn = _conns(None, 'CREATING')
+    with patch.object(boto_dynamodb, '_get_conn', get_conn, create=True), \
+            patch.object(boto_dynamodb, 'Table') as table:
+        assert boto_dynamodb.create_table('mytable', hash_key='id', hash_key_data_type='N',
+                                          **conn_parameters) is True
+    assert table.create.call_args[1]['connection'] is conn
+    poll_conn.describe_table.assert_called_with('mytable')
+
+
+def test_delete_waits_until_the_table_is_gone():
+    get_conn, conn, _ = _conns('DELETING', None)
+    with patch.object(boto_dynamodb, '_get_conn', get_conn, create=True), \
+            patch.object(boto_dynamodb, 'Table') as table:
+        assert boto_dynamodb.delete('mytable', **conn_parameters) is True
+    table.assert_called_once_with('mytable', connection=conn)
+    assert table.return_value.delete.called
+
+
+def test_delete_defers_the_wait_to_the_end_of_the_run():
+    get_conn, _, _ = _conns('DELETING', None)
+    with patch.object(boto_dynamodb, '_get_conn', get_conn, create=True), \
+            patch.object(boto_dynamodb, 'Table'), \
+            patch.dict(boto_dynamodb.__opts__, {'boto_dynamodb.defer_wait': True}):
+        assert boto_dynamodb.delete('mytable', **conn_parameters) is True
+        assert boto_dynamodb.wait_for_deferred(timeout=5) == {
+            'ready': ['mytable'], 'failed': [], 'pending': []}
@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+
+# Import Python Libs
+from __future__ import absolute_import, print_function, unicode_literals
+
+# Import Fractus Libs
+import fractus.cloudmodules.boto_elasticache as boto_elasticache
+
+# Import Testing Libs
+import pytest
+from mock import patch
+
+boto = pytest.importorskip('boto')
+
+conn_parameters = {'region': 'us-east-1', 'key': None, 'keyid': None, 'profile': {}}
+
+
+def setup_function():
+    pytest.helpers.setup_loader({
+        boto_elasticache: {
+            '__opts__': pytest.opts,
+            '__utils__': pytest.utils,
+        },
+    })
+
+
+def _response(name, items):
+    return {name + 'Response': {name + 'Result': dict(items, Marker=None)}}
+
+
+def _conns(kind, *statuses):
+    # The caller's connection creates and deletes, the poller thread gets a
+    # connection of its own which lists the resources going through statuses
+    if kind == 'cache_cluster':
+        pages = [_response('DescribeCacheClusters', {'CacheClusters': [
+            {'CacheClusterId': 'mycache', 'CacheClusterStatus': status}] if status else []})
+            for status in statuses]
+        return pytest.helpers.poller_conns('describe_cache_clusters', pages)
+    pages = [_response('DescribeReplicationGroups', {'ReplicationGroups': [
+        {'ReplicationGroupId': 'mycache', 'Status': status}]}) for status in statuses]
+    return pytest.helpers.poller_conns('describe_replication_groups', pages)
+
+
+@pytest.fixture(autouse=True)
+def fast_waiter():
+    with pytest.helpers.fast_waiter(boto_elasticache):
+        yield
+
+
+def test_create_waits_for_the_cluster_with_a_connection_of_the_poller():
+    get_conn, conn, poll_conn = _conns('cache_cluster', 'creating', 'available')
+    with patch.object(boto_elasticache, '_get_conn', get_conn, create=True):
+        assert boto_elasticache.create('mycache', 1, 'redis', 'cache.t1.micro', wait=True,
+                                       **conn_parameters) is True
+    assert conn.create_cache_cluster.called
+    assert not conn.describe_cache_clusters.called
+    poll_conn.describe_cache_clusters.assert_called_with(marker=None)
+
+
+def test_create_replication_group_defers_the_wait_to_the_end_of_the_run():
+    get_conn, conn, _ = _conns('replication_group', 'creating', 'available')
+    with patch.object(boto_elasticache, '_get_conn', get_conn, create=True):
+        assert boto_elasticache.create_replication_group('mycache', 'primary', 'description',
+                                                         wait='defer', **conn_parameters) is True
+        assert boto_elasticache.wait_for_deferred(timeout=5) == {
+            'ready': ['mycache'], 'failed': [], 'pending': []}
+    conn.create_replication_group.assert_called_once_with('mycache', 'primary', 'description')
+
+
+def test_delete_waits_until_the_cluster_is_deleting():
+    get_conn, conn, _ = _conns('cache_cluster', 'available', 'deleting')
+    with patch.object(boto_elasticache, '_get_conn', get_conn, create=True):
+        assert boto_elasticache.delete('mycache', wait=True, **conn_parameters) is True
+    conn.delete_cache_cluster.assert_called_once_with('mycache')
+
+
+def test_delete_fails_when_the_cluster_is_not_deleted_in_time():
+    get_conn, _, _ = _conns('cache_cluster', 'available')
+    with patch.object(boto_elasticache, '_get_conn', get_conn, create=True), \
+            patch.object(boto_elasticache, 'WAIT_TIMEOUT', 0.05):
+        assert boto_elasticache.delete('mycache', wait=True, **conn_parameters) is False
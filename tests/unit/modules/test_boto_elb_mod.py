@@ -13,6 +13,7 @@ import fractus.cloudmodules.boto_elb as boto_elb
 
 # Import Testing Libs
 import pytest
+from mock import MagicMock, patch
 
 log = logging.getLogger(__name__)
 
@@ -157,3 +158,101 @@ def test_deregister_instances_valid_id_list():
     actual_instances = [instance.id for instance in
                         load_balancer_refreshed.instances]
     assert actual_instances == expected_instances
+
+
+def _fake_lb(name, target='HTTP:80/'):
+    lb = MagicMock(availability_zones=['us-east-1a'], listeners=[], backends=[], subnets=[],
+                   security_groups=[], scheme='internet-facing', dns_name='{0}.elb'.format(name),
+                   policies=MagicMock(app_cookie_stickiness_policies=[],
+                                      lb_cookie_stickiness_policies=[], other_policies=[]))
+    lb.name = name
+    lb.health_check = MagicMock(interval=30, target=target, healthy_threshold=3,
+                                timeout=5, unhealthy_threshold=5)
+    return lb
+
+
+def test_elbs_are_described_in_bulk_and_refreshed_after_changes():
+    conn = MagicMock()
+    conn.get_all_load_balancers.side_effect = lambda load_balancer_names=None, marker=None: (
+        [_fake_lb(name, 'TCP:443') for name in load_balancer_names] if load_balancer_names
+        else [_fake_lb('elb1'), _fake_lb('elb2')]
+    )
+    params = dict(conn_parameters, region='eu-west-3')
+    with patch.dict(boto_elb.__opts__, {'boto_elb.describe_cache_ttl': 60}), \
+            patch.object(boto_elb, '_get_conn', MagicMock(return_value=conn)), \
+            patch.object(boto_elb, '_get_all_tags', MagicMock(return_value={'env': 'prod'})):
+        assert boto_elb.exists('elb1', **params)
+        assert not boto_elb.exists('elb3', **params)
+        assert boto_elb.get_elb_config('elb2', **params)['tags'] == {'env': 'prod'}
+        assert boto_elb.get_health_check('elb2', **params)['target'] == 'HTTP:80/'
+        assert conn.get_all_load_balancers.call_count == 1
+
+        assert boto_elb.set_health_check('elb2', {'target': 'TCP:443'}, **params)
+        assert boto_elb.get_health_check('elb2', **params)['target'] == 'TCP:443'
+        assert boto_elb.get_health_check('elb1', **params)['target'] == 'HTTP:80/'
+        conn.get_all_load_balancers.assert_called_with(load_balancer_names=['elb2'])
+        assert conn.get_all_load_balancers.call_count == 2
+
+
+def _health(instance_id, state='InService'):
+    return MagicMock(instance_id=instance_id, state=state)
+
+
+def test_set_instances_bulk_reconciles_and_waits_for_healthy():
+    members = {'elb1': ['i-1', 'i-old'], 'elb2': ['i-3']}
+    polls = {'elb1': 0}
+
+    def describe_instance_health(name, instances=None):
+        if instances is None:
+            return [_health(instance_id) for instance_id in members[name]]
+        if name == 'elb1':
+            polls['elb1'] += 1
+            return [_health('i-2', 'InService' if polls['elb1'] > 2 else 'OutOfService')]
+        return [_health(instance_id) for instance_id in instances]
+
+    conn = MagicMock()
+    conn.describe_instance_health.side_effect = describe_instance_health
+    conn.register_instances.side_effect = lambda name, instances: [
+        MagicMock(id=instance_id) for instance_id in members[name] + instances]
+    conn.deregister_instances.return_value = []
+    with patch.object(boto_elb, '_get_conn', MagicMock(return_value=conn)), \
+            patch.object(boto_elb, '_sleep') as sleep:
+        ret = boto_elb.set_instances_bulk({'elb1': ['i-1', 'i-2'], 'elb2': ['i-3']},
+                                          wait_for_healthy=True, **conn_parameters)['result']
+    assert ret['changed'] == {'elb1': {'added': ['i-2'], 'removed': ['i-old']}}
+    assert ret['unchanged'] == ['elb2']
+    assert not ret['failed'] and not ret['unhealthy']
+    conn.register_instances.assert_called_once_with('elb1', ['i-2'])
+    conn.deregister_instances.assert_called_once_with('elb1', ['i-old'])
+    # Only the instances still out of service are polled, with a growing interval
+    conn.describe_instance_health.assert_called_with('elb1', ['i-2'])
+    assert [call[0][0] for call in sleep.call_args_list] == [
+        boto_elb.HEALTH_POLL_MIN, boto_elb.HEALTH_POLL_MIN * 2]
+
+
+def test_wait_for_healthy_times_out_with_pending_instances():
+    conn = MagicMock()
+    conn.describe_instance_health.return_value = [_health('i-1'), _health('i-2', 'OutOfService')]
+    with patch.object(boto_elb, '_get_conn', MagicMock(return_value=conn)), \
+            patch.object(boto_elb, '_sleep'):
+        ret = boto_elb.wait_for_healthy(['elb1'], timeout=0, **conn_parameters)
+    assert ret == {'healthy': False, 'pending': {'elb1': ['i-2']}}
+    conn.describe_instance_health.assert_called_once_with('elb1', None)
+
+
+def test_wait_for_healthy_keeps_elbs_pending_while_their_health_is_unknown():
+    error = boto.exception.BotoServerError(400, 'Bad Request')
+    error.error_code = 'InvalidInstance'
+    conn = MagicMock()
+    conn.describe_instance_health.side_effect = [error, [_health('i-1')]]
+    with patch.object(boto_elb, '_get_conn', MagicMock(return_value=conn)), \
+            patch.object(boto_elb, '_sleep') as sleep:
+        ret = boto_elb.wait_for_healthy(['elb1'], **conn_parameters)
+    assert ret == {'healthy': True, 'pending': {}}
+    assert sleep.call_count == 1
+
+    conn.describe_instance_health.side_effect = error
+    with patch.object(boto_elb, '_get_conn', MagicMock(return_value=conn)), \
+            patch.object(boto_elb, '_sleep'):
+        ret = boto_elb.wait_for_healthy(['elb1'], timeout=0, **conn_parameters)
+    assert ret == {'healthy': False, 'pending': {'elb1': []}}
@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+
+# Import Python Libs
+from __future__ import absolute_import, print_function, unicode_literals
+
+# Import Fractus Libs
+import fractus.cloudmodules.boto_kinesis as boto_kinesis
+
+# Import Testing Libs
+import pytest
+from mock import patch
+
+boto3 = pytest.importorskip('boto3')
+
+conn_parameters = {'region': 'us-east-1', 'key': None, 'keyid': None, 'profile': {}}
+
+
+def setup_function():
+    pytest.helpers.setup_loader({
+        boto_kinesis: {
+            '__opts__': pytest.opts,
+            '__utils__': pytest.utils,
+        },
+    })
+
+
+def _stream(status):
+    return {'StreamDescription': {'StreamName': 'mystream', 'StreamStatus': status,
+                                  'HasMoreShards': False, 'Shards': []}}
+
+
+def _conns(status, *statuses):
+    # The caller's connection gets the stream once it's active, the poller
+    # thread gets a connection of its own which sees the stream go through
+    # statuses
+    get_conn, conn, poll_conn = pytest.helpers.poller_conns(
+        'describe_stream', [_stream(s) for s in statuses])
+    conn.describe_stream.return_value = _stream(status)
+    return get_conn, conn, poll_conn
+
+
+@pytest.fixture(autouse=True)
+def fast_waiter():
+    with pytest.helpers.fast_waiter(boto_kinesis):
+        yield
+
+
+def test_get_stream_when_active_waits_with_a_connection_of_the_poller():
+    get_conn, conn, poll_conn = _conns('ACTIVE', 'CREATING', 'ACTIVE')
+    with patch.object(boto_kinesis, '_get_conn', get_conn, create=True):
+        ret = boto_kinesis.get_stream_when_active('mystream', **conn_parameters)
+    assert ret == {'result': _stream('ACTIVE')}
+    conn.describe_stream.assert_called_once_with(StreamName='mystream')
+    poll_conn.describe_stream.assert_called_with(StreamName='mystream', Limit=1)
+
+
+def test_get_stream_when_active_times_out():
+    get_conn, _, _ = _conns('UPDATING', 'UPDATING')
+    with patch.object(boto_kinesis, '_get_conn', get_conn, create=True):
+        ret = boto_kinesis.get_stream_when_active('mystream', timeout=0.05, **conn_parameters)
+    assert ret['error'] == 'Stream mystream is not ACTIVE after 0.05 seconds'
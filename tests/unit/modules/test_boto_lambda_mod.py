@@ -711,3 +711,134 @@ def test_that_when_updating_an_event_source_mapping_fails_the_update_event_sourc
         **pytest.conn_parameters)
     assert result.get('error', {}).get('message') == \
                      error_message.format('update_event_source_mapping')
+
+def test_that_code_sha256_returns_the_base64_digest_of_the_zipfile():
+    '''
+    tests the CodeSha256 computed for a deployment package
+    '''
+    with TempZipFile() as zipfile:
+        result = boto_lambda.code_sha256(zipfile)
+    # base64 of the sha256 of '###\n'
+    assert result == '9CCCPoWTPjCm2pC8t2V1i0IZrk9as5YaXDoWZ/jjrtU='
+
+def test_that_when_updating_function_code_from_a_large_zipfile_the_code_is_staged_in_s3(boto_conn):
+    '''
+    tests large deployment packages are uploaded to the staging bucket
+    '''
+    upload_file = MagicMock(return_value={'result': True})
+    salt_mods = {'boto_s3.get_object_metadata': MagicMock(return_value={'result': None}),
+                 'boto_s3.upload_file': upload_file}
+    opts = {'boto_lambda.s3_staging_bucket': 'staging', 'boto_lambda.s3_staging_threshold': 1}
+    with patch.dict(boto_lambda.__salt__, salt_mods), patch.dict(boto_lambda.__opts__, opts):
+        with TempZipFile() as zipfile:
+            boto_conn.update_function_code.return_value = function_ret
+            result = boto_lambda.update_function_code(
+                FunctionName=function_ret['FunctionName'],
+                ZipFile=zipfile, **pytest.conn_parameters)
+
+    assert result['updated']
+    name = upload_file.call_args[0][1]
+    assert name.startswith('staging/fractus-lambda/testfunction/') and name.endswith('.zip')
+    kwargs = boto_conn.update_function_code.call_args[1]
+    assert 'ZipFile' not in kwargs
+    assert (kwargs['S3Bucket'], kwargs['S3Key']) == ('staging', name.partition('/')[2])
+
+def test_that_when_a_large_zipfile_is_already_staged_it_is_not_uploaded_again(boto_conn):
+    '''
+    tests staged deployment packages are reused
+    '''
+    upload_file = MagicMock()
+    salt_mods = {'boto_s3.get_object_metadata': MagicMock(return_value={'result': {'ETag': 'x'}}),
+                 'boto_s3.upload_file': upload_file}
+    opts = {'boto_lambda.s3_staging_bucket': 'staging', 'boto_lambda.s3_staging_threshold': 1}
+    with patch.dict(boto_lambda.__salt__, salt_mods), patch.dict(boto_lambda.__opts__, opts):
+        with TempZipFile() as zipfile:
+            boto_conn.update_function_code.return_value = function_ret
+            result = boto_lambda.update_function_code(
+                FunctionName=function_ret['FunctionName'],
+                ZipFile=zipfile, **pytest.conn_parameters)
+
+    assert result['updated']
+    assert not upload_file.called
+
+def test_that_deploy_functions_creates_updates_and_isolates_failures(boto_conn):
+    '''
+    tests deploying many functions against one listing
+    '''
+    unchanged = dict(function_ret, FunctionName='unchanged',
+                     Role='arn:aws:iam::1234:role/myrole')
+    outdated = dict(unchanged, FunctionName='outdated', Timeout=3)
+    boto_conn.list_functions.return_value = {'Functions': [unchanged, outdated]}
+    boto_conn.create_function.return_value = function_ret
+    boto_conn.update_function_configuration.return_value = function_ret
+    spec = {'Runtime': 'python2.7', 'Role': 'myrole', 'Handler': 'handler',
+            'Timeout': 5, 'S3Bucket': 'bucket', 'S3Key': 'key'}
+    functions = [dict(spec, FunctionName=name) for name in ('unchanged', 'outdated', 'new')]
+    functions[0].pop('S3Bucket')
+    functions[0].pop('S3Key')
+    functions.append({'FunctionName': 'broken', 'Handler': 'handler'})
+    # No checksum to compare the code in S3 with
+    boto_conn.head_object.return_value = {}
+    get_account_id = MagicMock(return_value='1234')
+    with patch.dict(boto_lambda.__salt__, {'boto_iam.get_account_id': get_account_id}):
+        result = boto_lambda.deploy_functions(functions, workers=2, **pytest.conn_parameters)
+
+    assert result['result']['created'] == ['new']
+    assert result['result']['updated'] == {'outdated': ['config', 'code']}
+    assert result['result']['unchanged'] == ['unchanged']
+    assert list(result['result']['failed']) == ['broken']
+    assert boto_conn.list_functions.call_count == 1
+    assert get_account_id.call_count == 1
+
+
+def test_that_code_without_a_package_is_not_changed():
+    '''
+    tests specs without ZipFile or S3Key leave the code alone
+    '''
+    assert not boto_lambda._code_changed(function_ret, {'FunctionName': 'testfunction'},
+                                         pytest.conn_parameters)
+
+
+def test_that_zipfile_code_is_compared_by_size_and_sha256():
+    '''
+    tests ZipFiles are compared with the CodeSize and CodeSha256 of the function
+    '''
+    func = dict(function_ret, CodeSize=4, CodeSha256='9CCCPoWTPjCm2pC8t2V1i0IZrk9as5YaXDoWZ/jjrtU=')
+    with TempZipFile() as zipfile:
+        spec = {'ZipFile': zipfile}
+        assert not boto_lambda._code_changed(func, spec, pytest.conn_parameters)
+        assert boto_lambda._code_changed(dict(func, CodeSha256='other'), spec, pytest.conn_parameters)
+        assert boto_lambda._code_changed(dict(func, CodeSize=5), spec, pytest.conn_parameters)
+
+
+def test_that_s3_code_is_compared_by_the_sha256_of_the_spec(boto_conn):
+    '''
+    tests a CodeSha256 given with S3 code is compared without calling S3
+    '''
+    func = dict(function_ret, CodeSha256='abc=')
+    spec = {'S3Bucket': 'bucket', 'S3Key': 'key', 'CodeSha256': 'abc='}
+    assert not boto_lambda._code_changed(func, spec, pytest.conn_parameters)
+    assert boto_lambda._code_changed(func, dict(spec, CodeSha256='def='), pytest.conn_parameters)
+    assert not boto_conn.head_object.called
+
+
+def test_that_s3_code_is_compared_by_the_checksum_of_the_object(boto_conn):
+    '''
+    tests S3 code is compared with the SHA256 checksum of the object version,
+    and updated when S3 has no usable checksum
+    '''
+    func = dict(function_ret, CodeSha256='abc=')
+    spec = {'S3Bucket': 'bucket', 'S3Key': 'key', 'S3ObjectVersion': '3'}
+    boto_conn.head_object.return_value = {'ChecksumSHA256': 'abc='}
+    assert not boto_lambda._code_changed(func, spec, pytest.conn_parameters)
+    boto_conn.head_object.assert_called_with(Bucket='bucket', Key='key', VersionId='3',
+                                             ChecksumMode='ENABLED')
+    boto_conn.head_object.return_value = {'ChecksumSHA256': 'def='}
+    assert boto_lambda._code_changed(func, spec, pytest.conn_parameters)
+    boto_conn.head_object.return_value = {'ChecksumSHA256': 'abc=-2'}
+    assert boto_lambda._code_changed(func, spec, pytest.conn_parameters)
+    boto_conn.head_object.return_value = {}
+    assert boto_lambda._code_changed(func, spec, pytest.conn_parameters)
+    boto_conn.head_object.side_effect = exceptions.ParamValidationError(
+        report='Unknown parameter in input: "ChecksumMode"')
+    assert boto_lambda._code_changed(func, spec, pytest.conn_parameters)
@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+
+# Import Python Libs
+from __future__ import absolute_import, print_function, unicode_literals
+
+# Import Fractus Libs
+import fractus.cloudmodules.boto_rds as boto_rds
+
+# Import Testing Libs
+import pytest
+from mock import patch
+
+boto3 = pytest.importorskip('boto3')
+
+conn_parameters = {'region': 'us-east-1', 'key': None, 'keyid': None, 'profile': {}}
+
+
+def setup_function():
+    pytest.helpers.setup_loader({
+        boto_rds: {
+            '__opts__': pytest.opts,
+            '__utils__': pytest.utils,
+        },
+    })
+
+
+def _conns(*statuses):
+    # The caller's connection creates and deletes, the poller thread gets a
+    # connection of its own which sees the instance go through statuses
+    pages = [[{'DBInstances': [{'DBInstanceIdentifier': 'myrds', 'DBInstanceStatus': status}]
+               if status else []}] for status in statuses]
+    return pytest.helpers.poller_conns('get_paginator.return_value.paginate', pages)
+
+
+@pytest.fixture(autouse=True)
+def fast_waiter():
+    with pytest.helpers.fast_waiter(boto_rds):
+        yield
+
+
+def _create(**kwargs):
+    return boto_rds.create('myrds', 10, 'db.t2.micro', 'MySQL', 'sqlusr', 'sqlpassw',
+                           wait_status='available', **dict(conn_parameters, **kwargs))
+
+
+def test_create_waits_for_the_status_with_a_connection_of_the_poller():
+    get_conn, conn, poll_conn = _conns('creating', 'backing-up', 'available')
+    with patch.object(boto_rds, '_get_conn', get_conn, create=True):
+        ret = _create()
+    assert ret == {'created': True, 'message': 'RDS instance myrds created (current status available)'}
+    assert conn.create_db_instance.called
+    assert not conn.get_paginator.called
+    poll_conn.get_paginator.return_value.paginate.assert_called_with(
+        Filters=[{'Name': 'db-instance-id', 'Values': ['myrds']}])
+
+
+def test_create_fails_when_the_instance_fails():
+    get_conn, _, _ = _conns('creating', 'failed')
+    with patch.object(boto_rds, '_get_conn', get_conn, create=True):
+        ret = _create()
+    assert ret['created'] is False
+    assert 'is failed instead of available' in ret['error']
+
+
+def test_create_defers_the_wait_to_the_end_of_the_run():
+    get_conn, _, _ = _conns('creating', 'available')
+    with patch.object(boto_rds, '_get_conn', get_conn, create=True), \
+            patch.dict(boto_rds.__opts__, {'boto_rds.defer_wait': True}):
+        ret = _create()
+        assert ret['created'] is True
+        assert 'at the end of the run' in ret['message']
+        assert boto_rds.wait_for_deferred(timeout=5) == {'ready': ['myrds'], 'failed': [], 'pending': []}
+
+
+def test_delete_waits_until_the_instance_is_gone():
+    get_conn, conn, _ = _conns('deleting', None)
+    with patch.object(boto_rds, '_get_conn', get_conn, create=True):
+        ret = boto_rds.delete('myrds', skip_final_snapshot=True, **conn_parameters)
+    assert ret == {'deleted': True, 'message': 'Deleted RDS instance myrds completely.'}
+    conn.delete_db_instance.assert_called_once_with(DBInstanceIdentifier='myrds', SkipFinalSnapshot=True)
+
+
+def test_delete_defers_the_wait_to_the_end_of_the_run():
+    get_conn, _, _ = _conns('deleting', None)
+    with patch.object(boto_rds, '_get_conn', get_conn, create=True):
+        ret = boto_rds.delete('myrds', skip_final_snapshot=True, wait_for_deletion='defer',
+                              **conn_parameters)
+        assert ret['deleted'] is True
+        assert boto_rds.wait_for_deferred(timeout=5) == {'ready': ['myrds'], 'failed': [], 'pending': []}
@@ -9,10 +9,11 @@ from copy import deepcopy
 from salt.ext import six
 
 # Import Fractus Libs
-import salt.modules.boto_s3_bucket as boto_s3_bucket
+import fractus.cloudmodules.boto_s3_bucket as boto_s3_bucket
 
 # Import Testing Libs
 import pytest
+from mock import patch
 
 boto = pytest.importorskip('boto')
 boto3 = pytest.importorskip('boto3')
@@ -620,3 +621,50 @@ def test_that_when_deleting_website_fails_the_delete_website_method_returns_erro
     result = boto_s3_bucket.delete_website(Bucket='mybucket',
                                     **pytest.conn_parameters)
     assert result.get('error', {}).get('message') == error_message.format('delete_bucket_website')
+
+
+def test_that_when_emptying_a_bucket_all_versions_are_deleted_in_batches(boto_conn):
+    '''
+    tests the versions of every listed page are deleted.
+    '''
+    boto_conn.list_object_versions.side_effect = [
+        {'Versions': [{'Key': 'k{0}'.format(i), 'VersionId': 'v'} for i in range(1500)],
+         'NextKeyMarker': 'k1499', 'NextVersionIdMarker': 'v'},
+        {'DeleteMarkers': [{'Key': 'm', 'VersionId': 'd'}]},
+    ]
+    boto_conn.delete_objects.return_value = {}
+    result = boto_s3_bucket.empty(Bucket='mybucket', Workers=2, **pytest.conn_parameters)
+
+    assert result['deleted'] is True
+    deleted = [obj['Key'] for call in boto_conn.delete_objects.call_args_list
+               for obj in call[1]['Delete']['Objects']]
+    assert sorted(deleted) == sorted(['k{0}'.format(i) for i in range(1500)] + ['m'])
+    assert max(len(call[1]['Delete']['Objects']) for call in boto_conn.delete_objects.call_args_list) == 1000
+
+
+def test_that_when_deleting_objects_only_failed_keys_are_retried(boto_conn):
+    '''
+    tests transient key errors are retried and permanent ones reported.
+    '''
+    boto_conn.delete_objects.side_effect = [
+        {'Errors': [{'Key': 'a', 'Code': 'InternalError'}, {'Key': 'b', 'Code': 'AccessDenied'}]},
+        {},
+    ]
+    with patch('time.sleep'):
+        result = boto_s3_bucket.delete_objects(Bucket='mybucket',
+                                               Delete={'Objects': [{'Key': 'a'}, {'Key': 'b'}, {'Key': 'c'}]},
+                                               **pytest.conn_parameters)
+
+    assert result['deleted'] is False
+    assert [err['Key'] for err in result['failed']] == ['b']
+    assert boto_conn.delete_objects.call_args[1]['Delete']['Objects'] == [{'Key': 'a'}]
+
+
+def test_that_when_deleting_objects_fails_the_delete_objects_method_returns_error(boto_conn):
+    '''
+    tests False objects not deleted.
+    '''
+    boto_conn.delete_objects.side_effect = exceptions.ClientError(error_content, 'delete_objects')
+    result = boto_s3_bucket.delete_objects(Bucket='mybucket', Delete={'Objects': [{'Key': 'a'}]},
+                                           **pytest.conn_parameters)
+    assert result.get('error', {}).get('message') == error_message.format('delete_objects')
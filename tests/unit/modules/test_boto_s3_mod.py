@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+
+# Import Python libs
+from __future__ import absolute_import, print_function, unicode_literals
+import hashlib
+
+# Import Fractus Libs
+import fractus.cloudmodules.boto_s3 as boto_s3
+
+# Import Testing Libs
+import pytest
+from mock import MagicMock
+
+boto3 = pytest.importorskip('boto3')
+
+
+def setup_module():
+    pytest.helpers.setup_loader({
+        boto_s3: {
+            '__opts__': pytest.opts,
+            '__utils__': pytest.utils,
+            '__salt__': {'config.get': MagicMock(return_value={})},
+        },
+    })
+    boto_s3.__init__(pytest.opts)
+
+
+def _object(key, content):
+    return {'Key': key, 'Size': len(content), 'ETag': '"{0}"'.format(hashlib.md5(content).hexdigest())}
+
+
+@pytest.fixture
+def source(tmpdir):
+    source = tmpdir.mkdir('site')
+    source.join('same').write_binary(b'same')
+    source.join('changed').write_binary(b'new content')
+    source.mkdir('sub').join('added').write_binary(b'added')
+    return source
+
+
+@pytest.fixture
+def remote(boto_conn):
+    boto_conn.list_objects_v2.return_value = {'Contents': [
+        _object('www/same', b'same'),
+        _object('www/changed', b'old content'),
+        _object('www/stale', b'stale'),
+    ]}
+    boto_conn.delete_objects.return_value = {}
+    return boto_conn
+
+
+def test_that_when_syncing_a_directory_changed_files_are_uploaded_and_stale_objects_deleted(source, remote):
+    result = boto_s3.sync_directory(str(source), 'mybucket/www', delete=True, **pytest.conn_parameters)
+
+    assert result == {'result': {
+        'uploaded': ['www/changed', 'www/sub/added'],
+        'unchanged': ['www/same'],
+        'deleted': ['www/stale'],
+        'failed': {},
+    }}
+    remote.list_objects_v2.assert_called_once_with(Bucket='mybucket', Prefix='www/')
+    assert sorted(call[0][2] for call in remote.upload_file.call_args_list) == ['www/changed', 'www/sub/added']
+    remote.delete_objects.assert_called_once_with(
+        Bucket='mybucket', Delete={'Objects': [{'Key': 'www/stale'}], 'Quiet': True})
+
+
+def test_that_when_syncing_a_directory_stale_objects_are_kept_unless_delete_is_set(source, remote):
+    result = boto_s3.sync_directory(str(source), 'mybucket/www', **pytest.conn_parameters)
+
+    assert result['result']['deleted'] == []
+    assert not remote.delete_objects.called
+
+
+def test_that_when_syncing_a_directory_in_test_mode_nothing_is_changed(source, remote):
+    result = boto_s3.sync_directory(str(source), 'mybucket/www', delete=True, test=True,
+                                    **pytest.conn_parameters)
+
+    assert result['result']['uploaded'] == ['www/changed', 'www/sub/added']
+    assert result['result']['deleted'] == ['www/stale']
+    assert not remote.upload_file.called
+    assert not remote.delete_objects.called
+
+
+def test_that_when_syncing_a_directory_failed_deletes_are_reported(source, remote):
+    remote.delete_objects.return_value = {
+        'Errors': [{'Key': 'www/stale', 'Code': 'AccessDenied', 'Message': 'Access Denied'}],
+    }
+    result = boto_s3.sync_directory(str(source), 'mybucket/www', delete=True, **pytest.conn_parameters)
+
+    assert result['result']['deleted'] == []
+    assert result['result']['failed'] == {'www/stale': {'message': 'Access Denied', 'code': 'AccessDenied'}}
+
+
+def test_that_when_syncing_a_missing_directory_an_error_is_returned(tmpdir):
+    result = boto_s3.sync_directory(str(tmpdir.join('missing')), 'mybucket', **pytest.conn_parameters)
+
+    assert 'is not a directory' in result['error']
@@ -16,6 +16,7 @@ import fractus.cloudmodules.boto_secgroup as boto_secgroup
 
 # Import Testing Libs
 import pytest
+from mock import patch
 
 boto = pytest.importorskip('boto', minversion='2.4.0')
 ec2 = pytest.importorskip('boto.ec2')
@@ -61,6 +62,28 @@ def test__split_rules():
     assert boto_secgroup._split_rules(rules) == split_rules
 
 
+def test__permission_params():
+    '''
+    tests that rules sharing a protocol and port range are sent as one IP
+    permission
+    '''
+    rules = [{'ip_protocol': 'tcp', 'from_port': 80, 'to_port': 80, 'cidr_ip': '10.0.0.0/8'},
+             {'ip_protocol': 'tcp', 'from_port': 80, 'to_port': 80, 'cidr_ip': ['192.168.0.0/24']},
+             {'ip_protocol': '-1', 'from_port': -1, 'to_port': -1, 'source_group_group_id': 'sg-1'}]
+    assert boto_secgroup._permission_params('sg-2', rules) == {
+        'GroupId': 'sg-2',
+        'IpPermissions.1.IpProtocol': 'tcp',
+        'IpPermissions.1.FromPort': '80',
+        'IpPermissions.1.ToPort': '80',
+        'IpPermissions.1.IpRanges.1.CidrIp': '10.0.0.0/8',
+        'IpPermissions.1.IpRanges.2.CidrIp': '192.168.0.0/24',
+        'IpPermissions.2.IpProtocol': '-1',
+        'IpPermissions.2.FromPort': '-1',
+        'IpPermissions.2.ToPort': '-1',
+        'IpPermissions.2.Groups.1.GroupId': 'sg-1',
+    }
+
+
 @moto.mock_ec2_deprecated
 def test_create_ec2_classic():
     '''
@@ -254,6 +277,50 @@ def test_delete_group_ec2_classic():
 def test_delete_group_name_ec2_vpc():
     pass
 
+@moto.mock_ec2_deprecated
+def test_describe_cache_lookups():
+    '''
+    tests that with the describe cache enabled, lookups are answered from a
+    single describe of the region and the cache is dropped on changes
+    '''
+    group_name = _random_group_name()
+    conn = ec2.connect_to_region(region, **boto_conn_parameters)
+    group_classic = conn.create_security_group(name=group_name, description='classic')
+    group_vpc = conn.create_security_group(name=group_name, description='vpc', vpc_id=vpc_id)
+    boto_secgroup.__context__.pop('boto_cache.boto_secgroup', None)
+    with patch.dict(boto_secgroup.__opts__, {'boto_secgroup.describe_cache_ttl': 60}):
+        assert boto_secgroup.get_group_id(group_name, **conn_parameters) == group_classic.id
+        assert boto_secgroup.get_group_id(group_name, vpc_id=vpc_id, **conn_parameters) == group_vpc.id
+        assert boto_secgroup.convert_to_group_ids([group_name, group_vpc.id], **conn_parameters) == \
+            [group_classic.id, group_vpc.id]
+        assert boto_secgroup.exists(group_id=group_vpc.id, **conn_parameters)
+        boto_secgroup.delete(group_id=group_vpc.id, **conn_parameters)
+        assert not boto_secgroup.exists(group_id=group_vpc.id, **conn_parameters)
+    boto_secgroup.__context__.pop('boto_cache.boto_secgroup', None)
+
+@moto.mock_ec2_deprecated
+def test_authorize_rules_sends_source_group_ids_in_a_vpc():
+    '''
+    tests that source groups given by name are sent by id, as EC2 requires
+    for groups of non-default VPCs
+    '''
+    conn = ec2.connect_to_region(region, **boto_conn_parameters)
+    web = conn.create_security_group(name=_random_group_name(), description='web', vpc_id=vpc_id)
+    db = conn.create_security_group(name=_random_group_name(), description='db', vpc_id=vpc_id)
+    rules = [{'ip_protocol': 'tcp', 'from_port': 5432, 'to_port': 5432, 'source_group_name': web.name}]
+    boto_secgroup.__context__.pop('boto_cache.boto_secgroup', None)
+    with patch.dict(boto_secgroup.__opts__, {'boto_secgroup.describe_cache_ttl': 60}), \
+            patch.object(ec2.connection.EC2Connection, 'get_status', return_value=True) as get_status:
+        assert boto_secgroup.authorize_rules(rules, group_id=db.id, **conn_parameters)
+    boto_secgroup.__context__.pop('boto_cache.boto_secgroup', None)
+
+    action, params = get_status.call_args[0]
+    assert action == 'AuthorizeSecurityGroupIngress'
+    assert params['GroupId'] == db.id
+    assert params['IpPermissions.1.Groups.1.GroupId'] == web.id
+    assert 'IpPermissions.1.Groups.1.GroupName' not in params
+
+
 @moto.mock_ec2_deprecated
 def test__get_conn_true():
     '''
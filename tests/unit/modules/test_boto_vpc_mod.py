@@ -22,6 +22,7 @@ from fractus.cloudmodules.boto_vpc import _maybe_set_name_tag, _maybe_set_tags
 
 # Import Testing Libs
 import pytest
+from mock import patch
 
 boto = pytest.importorskip('boto', minversion='2.8.0')
 boto3 = pytest.importorskip('boto3')
@@ -1614,3 +1615,58 @@ def test_raises_error_if_both_vpc_name_and_vpc_id_are_specified(boto_conn):
                                             requester_vpc_name='my_peering',
                                             peer_vpc_id=other_vpc.id,
                                             **pytest.conn_parameters)
+
+
+def _describe_vpcs():
+    return patch.object(boto.vpc.VPCConnection, 'get_all_vpcs', autospec=True,
+                        side_effect=boto.vpc.VPCConnection.get_all_vpcs)
+
+
+@pytest.fixture
+def describe_cache():
+    with patch.dict(boto_vpc.__context__, clear=True):
+        with patch.dict(boto_vpc.__opts__, {'boto_vpc.describe_cache_ttl': 60}):
+            yield
+
+
+@moto.mock_ec2_deprecated
+def test_that_the_describe_cache_is_disabled_by_default(boto_conn):
+    _create_vpc(name='test')
+    with patch.dict(boto_vpc.__context__, clear=True), _describe_vpcs() as describe:
+        assert boto_vpc.exists(name='test', **pytest.conn_parameters)['exists']
+        assert boto_vpc.exists(name='test', **pytest.conn_parameters)['exists']
+
+    assert describe.call_count == 2
+    assert describe.call_args[1]['filters'] == {'tag:Name': 'test'}
+
+
+@moto.mock_ec2_deprecated
+def test_that_when_the_describe_cache_is_enabled_vpcs_are_described_once(boto_conn, describe_cache):
+    vpc = _create_vpc(name='test', tags={'env': 'dev'})
+    with _describe_vpcs() as describe:
+        assert boto_vpc.exists(name='test', **pytest.conn_parameters)['exists']
+        assert boto_vpc.exists(tags={'env': 'dev'}, **pytest.conn_parameters)['exists']
+        assert boto_vpc.exists(vpc_id=vpc.id, **pytest.conn_parameters)['exists']
+        assert not boto_vpc.exists(name='other', **pytest.conn_parameters)['exists']
+
+    assert describe.call_count == 1
+    assert describe.call_args[1] == {}
+
+
+@moto.mock_ec2_deprecated
+def test_that_creating_a_vpc_invalidates_the_describe_cache(boto_conn, describe_cache):
+    assert not boto_vpc.exists(name='test', **pytest.conn_parameters)['exists']
+    assert boto_vpc.create(cidr_block, vpc_name='test', **pytest.conn_parameters)['created']
+
+    assert boto_vpc.exists(name='test', **pytest.conn_parameters)['exists']
+
+
+@moto.mock_ec2_deprecated
+def test_that_wildcard_lookups_use_filtered_describes(boto_conn, describe_cache):
+    _create_vpc(name='test-1')
+    with _describe_vpcs() as describe:
+        assert boto_vpc.exists(name='test-*', **pytest.conn_parameters)['exists']
+        assert boto_vpc.exists(tags={'Name': 'test-?'}, **pytest.conn_parameters)['exists']
+
+    assert describe.call_count == 2
+    assert describe.call_args_list[0][1]['filters'] == {'tag:Name': 'test-*'}
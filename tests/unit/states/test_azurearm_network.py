@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+# Import Python libs
+from __future__ import absolute_import, print_function, unicode_literals
+
+# Import Fractus Libs
+import fractus.cloudstates.azurearm_network as azurearm_network
+import fractus.cloudutils.azurearm as azurearm
+
+# Import Testing Libs
+import pytest
+from mock import MagicMock, patch
+
+AUTH = {'subscription_id': 'sub', 'tenant': 'tenant', 'client_id': 'client', 'secret': 'secret'}
+
+RULE = {
+    'name': 'rule1',
+    'access': 'Allow',
+    'direction': 'Inbound',
+    'priority': 100,
+    'protocol': 'Tcp',
+    'source_address_prefix': 'Internet',
+    'destination_address_prefix': 'VirtualNetwork',
+    'source_port_range': '*',
+    'destination_port_range': '443',
+}
+
+
+def setup_function():
+    pytest.helpers.setup_loader({azurearm_network: {
+        '__opts__': {'test': False},
+        '__utils__': {
+            'dictdiffer.deep_diff': MagicMock(return_value={}),
+            'azurearm.normalize_list_of_dicts': azurearm.normalize_list_of_dicts,
+            'azurearm.list_of_dicts_unchanged': azurearm.list_of_dicts_unchanged,
+            'azurearm.compare_list_of_dicts': MagicMock(side_effect=azurearm.compare_list_of_dicts),
+        },
+    }})
+
+
+def test_unchanged_security_group_and_rules_are_fetched_once():
+    nsg_get = MagicMock(return_value={'name': 'nsg1', 'tags': {}, 'security_rules': [RULE]})
+    rule_get = MagicMock()
+    salt_mods = {'azurearm_network.network_security_group_get': nsg_get,
+                 'azurearm_network.security_rule_get': rule_get}
+    desired = dict(RULE, access='allow', direction='inbound', protocol='tcp')
+    with patch.dict(azurearm_network.__salt__, salt_mods):
+        ret = azurearm_network.network_security_group_present(
+            'nsg1', 'group1', security_rules=[desired], connection_auth=AUTH
+        )
+        assert ret['result'] and not ret['changes']
+
+        rule_args = dict((key, value) for key, value in desired.items() if key != 'name')
+        ret = azurearm_network.security_rule_present(
+            'rule1', security_group='nsg1', resource_group='GROUP1', connection_auth=AUTH, **rule_args
+        )
+        assert ret['result'] and not ret['changes']
+
+    assert nsg_get.call_count == 1
+    assert not rule_get.called
+    # The fast path answered without the full comparison
+    assert not azurearm_network.__utils__['azurearm.compare_list_of_dicts'].called
+
+
+def test_changed_rules_are_compared_and_snapshot_refreshed():
+    nsg_get = MagicMock(return_value={'name': 'nsg1', 'tags': {}, 'security_rules': [RULE]})
+    updated = {'name': 'nsg1', 'tags': {}, 'security_rules': [dict(RULE, priority=200)]}
+    salt_mods = {'azurearm_network.network_security_group_get': nsg_get,
+                 'azurearm_network.network_security_group_create_or_update': MagicMock(return_value=updated)}
+    with patch.dict(azurearm_network.__salt__, salt_mods):
+        ret = azurearm_network.network_security_group_present(
+            'nsg1', 'group1', security_rules=[dict(RULE, priority=200)], connection_auth=AUTH
+        )
+        assert ret['result']
+        assert azurearm_network.__utils__['azurearm.compare_list_of_dicts'].called
+
+        rule = azurearm_network._get_resource(
+            'azurearm_network.security_rule_get', AUTH, 'group1',
+            'networkSecurityGroups', 'nsg1', 'securityRules', 'rule1'
+        )
+    assert rule['priority'] == 200
+    assert nsg_get.call_count == 1
+
+
+def test_normalized_lists_match_compare_list_of_dicts():
+    old = [{'name': 'fe', 'subnet': {'id': '/subnets/Sub1'}, 'private_ip_allocation_method': 'Dynamic'}]
+    normalized = azurearm.normalize_list_of_dicts(old, ['subnet'])
+    for new, unchanged in (
+            ([{'name': 'fe', 'subnet': 'Sub1', 'private_ip_allocation_method': 'dynamic'}], True),
+            # Names converted from IDs are compared case sensitively
+            ([{'name': 'fe', 'subnet': 'sub1'}], False),
+            ([{'name': 'fe'}, {'name': 'fe'}], False),
+            ([{'name': 'other'}], False)):
+        assert azurearm.list_of_dicts_unchanged(normalized, new, ['subnet']) == unchanged
+        assert (not azurearm.compare_list_of_dicts(old, new, ['subnet'])) == unchanged
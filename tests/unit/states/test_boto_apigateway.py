@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+# Import Python libs
+from __future__ import absolute_import, print_function, unicode_literals
+
+# Import Fractus Libs
+import fractus.cloudstates.boto_apigateway as boto_apigateway
+
+# Import Testing Libs
+import pytest
+from mock import MagicMock, patch
+
+
+def setup_module():
+    pytest.helpers.setup_loader({boto_apigateway: {}})
+
+
+def _swagger(definitions):
+    swagger = object.__new__(boto_apigateway._Swagger)
+    swagger._cfg = {'definitions': definitions}
+    swagger._model_deps = {}
+    swagger._restApiId = 'api_id'
+    swagger._common_aws_args = {}
+    return swagger
+
+
+def _ref(model):
+    return {'$ref': '#/definitions/{0}'.format(model)}
+
+
+def test_models_are_sorted_in_dependency_levels():
+    swagger = _swagger({
+        'Order': {'properties': {'items': {'type': 'array', 'items': _ref('Item')},
+                                 'customer': _ref('Customer')}},
+        'Item': {'properties': {'price': _ref('Money')}},
+        'Customer': {'properties': {'name': {'type': 'string'}}},
+        'Money': {'properties': {'amount': {'type': 'number'}}},
+    })
+    assert swagger._model_levels() == [['Customer', 'Money'], ['Item'], ['Order']]
+    assert [model for model, _ in swagger.models()] == ['Customer', 'Money', 'Item', 'Order']
+
+
+def test_undefined_and_circular_models_are_reported():
+    swagger = _swagger({'A': _ref('B'), 'B': _ref('A'), 'C': _ref('Missing')})
+    with pytest.raises(ValueError) as excinfo:
+        swagger._model_levels()
+    assert 'Missing' in str(excinfo.value)
+    assert "'A'" in str(excinfo.value) and "'B'" in str(excinfo.value)
+
+
+def test_models_of_a_level_are_deployed_and_changes_merged_in_order():
+    swagger = _swagger({'A': {'type': 'object'}, 'B': {'type': 'object'}, 'C': _ref('A')})
+    create = MagicMock(side_effect=lambda **kwargs: {'created': True, 'model': {'name': kwargs['modelName']}})
+    salt_mods = {'boto_apigateway.api_model_exists': MagicMock(return_value={'exists': False}),
+                 'boto_apigateway.create_api_model': create}
+    with patch.dict(boto_apigateway.__salt__, salt_mods):
+        ret = swagger.deploy_models({'result': True, 'comment': '', 'changes': {}})
+    assert ret['result']
+    assert [change['deploy_models']['model']['name'] for change in ret['changes']['new']] == ['A', 'B', 'C']
+
+
+def test_changes_of_models_deployed_after_an_aborted_model_are_kept():
+    swagger = _swagger({'A': {'type': 'object'}, 'B': {'type': 'object'}, 'C': {'type': 'object'}})
+
+    def _create(**kwargs):
+        if kwargs['modelName'] == 'B':
+            return {'created': False, 'error': {'message': 'denied'}}
+        return {'created': True, 'model': {'name': kwargs['modelName']}}
+    salt_mods = {'boto_apigateway.api_model_exists': MagicMock(return_value={'exists': False}),
+                 'boto_apigateway.create_api_model': MagicMock(side_effect=_create)}
+    with patch.dict(boto_apigateway.__salt__, salt_mods):
+        with patch.dict(boto_apigateway.__opts__, {'boto_apigateway.deploy_workers': 3}):
+            ret = swagger.deploy_models({'result': True, 'comment': '', 'changes': {}})
+    assert ret['result'] is False
+    assert ret['abort']
+    assert 'B' in ret['comment']
+    assert [change['deploy_models']['model']['name'] for change in ret['changes']['new']] == ['A', 'C']
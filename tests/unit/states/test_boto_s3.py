@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+
+# Import Python libs
+from __future__ import absolute_import, print_function, unicode_literals
+
+# Import Fractus Libs
+import fractus.cloudstates.boto_s3 as boto_s3
+
+# Import Testing Libs
+import pytest
+from mock import MagicMock, patch
+
+
+def setup_module():
+    pytest.helpers.setup_loader({
+        boto_s3: {
+            '__utils__': pytest.utils,
+        }
+    })
+
+
+def _synced(uploaded=(), unchanged=(), deleted=(), failed=None):
+    return MagicMock(return_value={'result': {
+        'uploaded': list(uploaded),
+        'unchanged': list(unchanged),
+        'deleted': list(deleted),
+        'failed': failed or {},
+    }})
+
+
+def test_directory_present_uploads_and_deletes():
+    sync = _synced(uploaded=['www/a'], unchanged=['www/b'], deleted=['www/c'])
+    with patch.dict(boto_s3.__salt__, {'boto_s3.sync_directory': sync}):
+        with patch.dict(boto_s3.__opts__, {'test': False}):
+            ret = boto_s3.directory_present('mybucket/www', '/srv/www', delete=True)
+
+    assert ret == {
+        'name': 'mybucket/www',
+        'result': True,
+        'comment': 'S3 objects under mybucket/www synced: 1 deleted, 1 uploaded.',
+        'changes': {'uploaded': ['www/a'], 'deleted': ['www/c']},
+    }
+    assert sync.call_args[1]['delete'] is True
+    assert sync.call_args[1]['test'] is False
+
+
+def test_directory_present_skips_unchanged_files():
+    sync = _synced(unchanged=['www/a', 'www/b'])
+    with patch.dict(boto_s3.__salt__, {'boto_s3.sync_directory': sync}):
+        with patch.dict(boto_s3.__opts__, {'test': False}):
+            ret = boto_s3.directory_present('mybucket/www', '/srv/www')
+
+    assert ret['result'] is True
+    assert ret['changes'] == {}
+    assert ret['comment'] == 'S3 objects under mybucket/www are up to date.'
+    assert sync.call_args[1]['delete'] is False
+
+
+def test_directory_present_in_test_mode():
+    sync = _synced(uploaded=['www/a'], deleted=['www/c'])
+    with patch.dict(boto_s3.__salt__, {'boto_s3.sync_directory': sync}):
+        with patch.dict(boto_s3.__opts__, {'test': True}):
+            ret = boto_s3.directory_present('mybucket/www', '/srv/www', delete=True)
+
+    assert ret['result'] is None
+    assert ret['changes'] == {}
+    assert ret['pchanges'] == {'uploaded': ['www/a'], 'deleted': ['www/c']}
+    assert sync.call_args[1]['test'] is True
+
+
+def test_directory_present_reports_failures():
+    failed = {'www/c': {'message': 'Access Denied'}}
+    sync = _synced(uploaded=['www/a'], failed=failed)
+    with patch.dict(boto_s3.__salt__, {'boto_s3.sync_directory': sync}):
+        with patch.dict(boto_s3.__opts__, {'test': False}):
+            ret = boto_s3.directory_present('mybucket/www', '/srv/www', delete=True)
+
+    assert ret['result'] is False
+    assert ret['comment'] == 'Failed to sync 1 S3 objects under mybucket/www.'
+    assert ret['changes'] == {'uploaded': ['www/a'], 'failed': failed}
@@ -45,3 +45,20 @@ def test__get_rule_changes_delete_rules():
     # can also use: rules_to_delete = [rule for rule in present_rules if rule not in desired_rules]
     rules_to_delete = [OrderedDict([('ip_protocol', 'tcp'), ('from_port', 80), ('to_port', 80), ('cidr_ip', '0.0.0.0/0')])]
     assert boto_secgroup._get_rule_changes(desired_rules, present_rules) == (rules_to_delete, [])
+
+def test__get_rule_changes_equivalent_rules():
+    '''
+    tests that rules are matched regardless of protocol numbers, port types
+    and duplicates, and that source groups are matched by id or name
+    '''
+    present_rules = [OrderedDict([('ip_protocol', 'tcp'), ('from_port', 22), ('to_port', 22), ('cidr_ip', '10.0.0.0/8')]),
+                     OrderedDict([('ip_protocol', '-1'), ('from_port', None), ('to_port', None),
+                                  ('source_group_name', 'web'), ('source_group_group_id', 'sg-1')]),
+                     OrderedDict([('ip_protocol', 'udp'), ('from_port', 53), ('to_port', 53), ('cidr_ip', '10.0.0.0/8')])]
+    desired_rules = [OrderedDict([('ip_protocol', '6'), ('from_port', '22'), ('to_port', '22'), ('cidr_ip', '10.0.0.0/8')]),
+                     OrderedDict([('ip_protocol', 'all'), ('from_port', -1), ('to_port', -1), ('source_group_name', 'web')]),
+                     OrderedDict([('ip_protocol', 'tcp'), ('from_port', 443), ('to_port', 443), ('cidr_ip', '0.0.0.0/0')]),
+                     OrderedDict([('ip_protocol', 'tcp'), ('from_port', 443), ('to_port', 443), ('cidr_ip', '0.0.0.0/0')])]
+    rules_to_create = [OrderedDict([('ip_protocol', 'tcp'), ('from_port', 443), ('to_port', 443), ('cidr_ip', '0.0.0.0/0')])]
+    rules_to_delete = [OrderedDict([('ip_protocol', 'udp'), ('from_port', 53), ('to_port', 53), ('cidr_ip', '10.0.0.0/8')])]
+    assert boto_secgroup._get_rule_changes(desired_rules, present_rules) == (rules_to_delete, rules_to_create)
@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+
+# Import Python libs
+from __future__ import absolute_import, print_function, unicode_literals
+import threading
+
+# Import Fractus Libs
+import fractus.pool
+
+# Import Testing Libs
+import pytest
+from mock import MagicMock, patch
+
+
+def test_get_builds_once_and_reuses():
+    pool = fractus.pool.ConnectionPool()
+    factory = MagicMock(side_effect=lambda: object())
+    conn = pool.get('ec2', factory)
+    assert pool.get('ec2', factory) is conn
+    assert factory.call_count == 1
+
+
+def test_least_recently_used_is_evicted():
+    pool = fractus.pool.ConnectionPool(maxsize=2)
+    pool.get('a', object)
+    pool.get('b', object)
+    pool.get('a', object)
+    pool.get('c', object)
+    assert 'a' in pool
+    assert 'b' not in pool
+    assert len(pool) == 2
+
+
+def test_idle_connections_are_evicted():
+    pool = fractus.pool.ConnectionPool(idle_timeout=10)
+    with patch('time.time', return_value=100):
+        conn = pool.get('a', object)
+    with patch('time.time', return_value=105):
+        assert pool.get('a', object) is conn
+    with patch('time.time', return_value=200):
+        assert pool.get('a', object) is not conn
+
+
+def test_concurrent_get_builds_once():
+    pool = fractus.pool.ConnectionPool()
+    factory = MagicMock(side_effect=lambda: object())
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(pool.get('a', factory))) for _ in range(10)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert factory.call_count == 1
+    assert len(set(id(conn) for conn in results)) == 1
+
+
+def test_failed_build_is_not_left_pending():
+    pool = fractus.pool.ConnectionPool()
+    factory = MagicMock(side_effect=[ValueError('no credentials'), 'conn'])
+    with pytest.raises(ValueError):
+        pool.get('a', factory)
+    assert pool._building == {}
+    assert 'a' not in pool
+    assert pool.get('a', factory) == 'conn'
+    assert pool._building == {}
+
+
+def test_thread_key_differs_between_threads():
+    keys = []
+    thread = threading.Thread(target=lambda: keys.append(fractus.pool.thread_key('ec2')))
+    thread.start()
+    thread.join()
+    assert keys[0] != fractus.pool.thread_key('ec2')
+
+
+def test_get_pool_is_shared_and_ignores_bad_limits():
+    pool = fractus.pool.get_pool('test', maxsize=5)
+    assert fractus.pool.get_pool('test', maxsize='dummy_opt') is pool
+    assert pool.maxsize == 5
@@ -0,0 +1,159 @@
+# -*- coding: utf-8 -*-
+
+# Import Python libs
+from __future__ import absolute_import, print_function, unicode_literals
+import threading
+import time
+
+# Import Salt Libs
+import salt.state
+
+# Import Fractus Libs
+import fractus.state
+
+# Import Testing Libs
+from mock import MagicMock
+
+
+def _chunk(id_, state='boto_vpc', fun='present', sls='vpc', **requisites):
+    low = {'__id__': id_, 'name': id_, 'state': state, 'fun': fun, '__sls__': sls}
+    low.update(requisites)
+    return low
+
+
+def _tag(low):
+    return '{0[state]}_|-{0[__id__]}_|-{0[name]}_|-{0[fun]}'.format(low)
+
+
+class FakeState(salt.state.State):
+    '''
+    Minimal stand in for salt.state.State that records the order chunks run in.
+    Requisites are resolved by the real check_requisite.
+    '''
+    def __init__(self, delay=0):
+        self.states = {}
+        self.pre = {}
+        self.delay = delay
+        self.lock = threading.Lock()
+        self.calls = []
+        self.clobbered = []
+        self.check_failhard = MagicMock(return_value=False)
+
+    def load_modules(self, data=None, proxy=None):
+        pass
+
+    def call_chunk(self, low, running, chunks):
+        # Like the __low__ global salt injects into the state modules
+        self.low = low
+        time.sleep(self.delay)
+        tag = _tag(low)
+        with self.lock:
+            if self.low is not low:
+                self.clobbered.append(tag)
+            self.calls.append(tag)
+        running[tag] = {'result': True, 'changes': {}, 'comment': '', '__run_num__': 0}
+        return running
+
+
+def test_requisite_graph_require_by_state_and_id():
+    vpc = _chunk('myvpc')
+    subnet = _chunk('mysubnet', state='boto_vpc', fun='subnet_present',
+                    require=[{'boto_vpc': 'myvpc'}])
+    sg = _chunk('mysg', state='boto_secgroup', require=['myvpc'])
+    graph = fractus.state.requisite_graph(FakeState(), [vpc, subnet, sg])
+    assert graph == {
+        _tag(vpc): set(),
+        _tag(subnet): {_tag(vpc)},
+        _tag(sg): {_tag(vpc)},
+    }
+
+
+def test_requisite_graph_watch_onchanges_and_sls():
+    vpc = _chunk('myvpc', sls='network')
+    elb = _chunk('myelb', state='boto_elb', sls='elb', watch=[{'sls': 'network'}])
+    asg = _chunk('myasg', state='boto_asg', sls='asg', onchanges=[{'boto_elb': 'my*'}])
+    graph = fractus.state.requisite_graph(FakeState(), [vpc, elb, asg])
+    assert graph[_tag(elb)] == {_tag(vpc)}
+    assert graph[_tag(asg)] == {_tag(elb)}
+
+
+def test_requisite_graph_prereq_is_not_parallel():
+    chunks = [_chunk('a'), _chunk('b', prereq=[{'id': 'a'}])]
+    assert fractus.state.requisite_graph(FakeState(), chunks) is None
+
+
+def test_parallel_runner_respects_requisites():
+    vpc = _chunk('myvpc')
+    subnets = [_chunk('subnet{0}'.format(idx), require=[{'id': 'myvpc'}]) for idx in range(5)]
+    elb = _chunk('myelb', state='boto_elb', require=[{'id': 'subnet*'}])
+    state = FakeState()
+    runner = fractus.state.ParallelChunkRunner(state, 4)
+    ret = runner([elb, vpc] + subnets)
+
+    assert state.calls[0] == _tag(vpc)
+    assert state.calls[-1] == _tag(elb)
+    assert len(state.calls) == 7
+    assert sorted(low['__run_num__'] for low in ret.values()) == list(range(7))
+
+
+def test_parallel_runner_stops_scheduling_on_failhard():
+    vpc = _chunk('myvpc')
+    subnet = _chunk('mysubnet', require=[{'id': 'myvpc'}])
+    state = FakeState()
+    state.check_failhard.return_value = True
+    ret = fractus.state.ParallelChunkRunner(state, 2)([vpc, subnet])
+
+    assert state.calls == [_tag(vpc)]
+    assert list(ret) == [_tag(vpc)]
+
+
+def test_parallel_runner_runs_shared_requisite_once():
+    vpc = _chunk('myvpc')
+    subnets = [_chunk('subnet{0}'.format(idx), require=[{'id': 'myvpc'}]) for idx in range(2)]
+    state = FakeState(delay=0.05)
+    ret = fractus.state.ParallelChunkRunner(state, 4)(subnets + [vpc])
+
+    assert state.calls.count(_tag(vpc)) == 1
+    assert state.calls[0] == _tag(vpc)
+    assert sorted(state.calls[1:]) == sorted(_tag(low) for low in subnets)
+    assert state.clobbered == []
+    assert ret[_tag(vpc)]['__run_num__'] == 0
+    assert sorted(low['__run_num__'] for low in ret.values()) == [0, 1, 2]
+
+
+def test_parallel_runner_reports_exceptions_as_failures():
+    vpc = _chunk('myvpc')
+    other = _chunk('othervpc')
+    state = FakeState()
+    call_chunk = state.call_chunk
+
+    def _call_chunk(low, running, chunks):
+        if low is vpc:
+            raise ValueError('Throttling')
+        return call_chunk(low, running, chunks)
+
+    state.call_chunk = _call_chunk
+    ret = fractus.state.ParallelChunkRunner(state, 2)([vpc, other])
+
+    assert ret[_tag(other)]['result'] is True
+    assert ret[_tag(vpc)]['result'] is False
+    assert 'ValueError: Throttling' in ret[_tag(vpc)]['comment']
+    assert sorted(low['__run_num__'] for low in ret.values()) == [0, 1]
+
+
+def test_confirm_deferred_reports_exceptions_as_failures():
+    st_ = fractus.state.FractusState.__new__(fractus.state.FractusState)
+    st_.opts = {'test': False}
+    st_.state = MagicMock(functions={
+        'boto3_route53.flush_changes': MagicMock(side_effect=ValueError('Throttling')),
+        'boto_route53.wait_for_changes': MagicMock(return_value={'synced': ['C1']}),
+    })
+    running = {_tag(_chunk('myvpc')): {'result': True, 'changes': {}, '__run_num__': 0}}
+    ret = st_.confirm_deferred(running)
+
+    flushed = ret['boto3_route53_|-deferred changes_|-deferred changes_|-changes_applied']
+    assert flushed['result'] is False
+    assert flushed['comment'] == 'boto3_route53.flush_changes failed: Throttling'
+    synced = ret['boto_route53_|-deferred changes_|-deferred changes_|-changes_synced']
+    assert synced['result'] is True
+    assert synced['comment'] == '1 synced'
@@ -0,0 +1,188 @@
+# -*- coding: utf-8 -*-
+
+# Import python libs
+from __future__ import absolute_import, print_function, unicode_literals
+import importlib
+import logging
+import sys
+import time
+import types
+
+# Import Fractus Libs
+import fractus.cloudutils.azurearm as azurearm
+
+# Import Testing Libs
+import pytest
+from mock import MagicMock, patch
+
+log = logging.getLogger(__name__)
+
+
+def setup_function():
+    azurearm._CREDENTIALS.clear()
+    azurearm._CLIENTS.clear()
+
+
+def test_config_get_falls_back_to_pillar():
+    azurearm.__opts__ = {'azure': {'opts': {'tenant': 'a'}},
+                         'pillar': {'azure': {'pillar': {'tenant': 'b'}}}}
+    assert azurearm._config_get('azure:opts') == {'tenant': 'a'}
+    assert azurearm._config_get('azure:pillar') == {'tenant': 'b'}
+    assert azurearm._config_get('azure:missing') == {}
+
+
+def test_credentials_are_reused_until_their_token_expires():
+    credentials = MagicMock(token={'expires_on': time.time() + 3600})
+    factory = MagicMock(return_value=credentials)
+    key = ('service_principal', 'client', 'tenant', 'secret', 'endpoint')
+
+    assert azurearm._get_credentials(key, factory) is credentials
+    assert azurearm._get_credentials(key, factory) is credentials
+    assert factory.call_count == 1
+    assert not credentials.set_token.called
+
+    credentials.token = {'expires_on': time.time() + azurearm.TOKEN_REFRESH_MARGIN - 1}
+    assert azurearm._get_credentials(key, factory) is credentials
+    assert factory.call_count == 1
+    assert credentials.set_token.call_count == 1
+
+
+class _Model(object):
+    _attribute_map = {}
+
+    def __init__(self, **kwargs):
+        for attr in self._attribute_map:
+            setattr(self, attr, kwargs.get(attr))
+
+
+def _models_module():
+    def model(model_name, **type_strings):
+        return type(str(model_name), (_Model,), {'_attribute_map': dict(
+            (attr, {'key': attr, 'type': type_string}) for attr, type_string in type_strings.items()
+        )})
+
+    models = types.ModuleType(str('azure.mgmt.network.models'))
+    for cls in (
+        model('SubResource', id='str'),
+        model('SecurityRule', name='str', priority='int', protocol='str', access='str',
+              direction='str', source_address_prefixes='[str]',
+              destination_port_ranges='[str]', source_application_security_groups='[SubResource]'),
+        model('NetworkSecurityGroup', location='str', tags='{str}',
+              security_rules='[SecurityRule]'),
+        model('LoadBalancingRule', name='str', protocol='str', frontend_port='int',
+              backend_port='int', frontend_ip_configuration='SubResource',
+              backend_address_pool='SubResource', probe='SubResource'),
+        model('LoadBalancer', location='str', load_balancing_rules='[LoadBalancingRule]'),
+        model('NetworkInterfaceIPConfiguration', name='str', private_ip_address='str',
+              subnet='SubResource', load_balancer_backend_address_pools='[SubResource]'),
+        model('NetworkInterface', location='str',
+              ip_configurations='[NetworkInterfaceIPConfiguration]'),
+    ):
+        setattr(models, cls.__name__, cls)
+    return models
+
+
+def _benchmark(object_name, count=20, **kwargs):
+    azurearm._MODEL_BUILDERS.clear()
+    with patch.dict(sys.modules, {'azure.mgmt.network.models': _models_module()}), \
+            patch('importlib.import_module', wraps=importlib.import_module) as import_module:
+        start = time.time()
+        for _ in range(count):
+            obj = azurearm.create_object_model('network', object_name, **kwargs)
+        elapsed = time.time() - start
+    log.info('Built %s %d times in %.3fs', object_name, count, elapsed)
+    # Model classes are resolved and parsed once, not per object or list item
+    assert import_module.call_count == len(azurearm._MODEL_BUILDERS)
+    return obj
+
+
+def test_create_object_model_security_rules():
+    rules = [{'name': 'rule{0}'.format(idx), 'priority': 100 + idx, 'protocol': 'Tcp',
+              'access': 'Allow', 'direction': 'Inbound',
+              'source_address_prefixes': ['10.0.0.0/8', '192.168.0.0/16'],
+              'destination_port_ranges': ['443'],
+              'source_application_security_groups': [{'id': '/asg/{0}'.format(idx)}, 'junk']}
+             for idx in range(500)]
+    nsg = _benchmark('NetworkSecurityGroup', location='eastus',
+                     tags={'env': 'prod'}, security_rules=rules)
+    assert nsg.tags == {'env': 'prod'}
+    assert len(nsg.security_rules) == 500
+    rule = nsg.security_rules[7]
+    assert (rule.name, rule.priority) == ('rule7', 107)
+    assert rule.source_address_prefixes == ['10.0.0.0/8', '192.168.0.0/16']
+    # Items of model lists which are not dictionaries are dropped
+    assert [asg.id for asg in rule.source_application_security_groups] == ['/asg/7']
+
+
+def test_create_object_model_load_balancing_rules():
+    rules = [{'name': 'lbrule{0}'.format(idx), 'protocol': 'Tcp', 'frontend_port': idx,
+              'backend_port': idx, 'frontend_ip_configuration': {'id': '/fe'},
+              'backend_address_pool': {'id': '/pool'}, 'probe': '/probe'}
+             for idx in range(500)]
+    lb = _benchmark('LoadBalancer', location='eastus', load_balancing_rules=rules)
+    assert len(lb.load_balancing_rules) == 500
+    rule = lb.load_balancing_rules[-1]
+    assert rule.frontend_ip_configuration.id == '/fe'
+    # Values which don't match the model type are passed through
+    assert rule.probe == '/probe'
+
+
+def test_create_object_model_ip_configurations():
+    configs = [{'name': 'ipconfig{0}'.format(idx), 'private_ip_address': '10.0.0.{0}'.format(idx),
+                'subnet': {'id': '/subnet'},
+                'load_balancer_backend_address_pools': [{'id': '/pool1'}, {'id': '/pool2'}]}
+               for idx in range(250)]
+    nic = _benchmark('NetworkInterface', location='eastus', ip_configurations=configs)
+    assert len(nic.ip_configurations) == 250
+    config = nic.ip_configurations[0]
+    assert config.subnet.id == '/subnet'
+    assert [pool.id for pool in config.load_balancer_backend_address_pools] == ['/pool1', '/pool2']
+    assert config.private_ip_address == '10.0.0.0'
+
+
+class _Item(object):
+    def __init__(self, **attrs):
+        self.__dict__.update(attrs)
+
+    def as_dict(self):
+        return dict((key, value.as_dict() if isinstance(value, _Item) else value)
+                    for key, value in self.__dict__.items() if value is not None)
+
+
+def test_iter_paged_object_projects_fields():
+    items = [_Item(name='nic{0}'.format(idx), id='/nics/{0}'.format(idx),
+                   ip_configurations=[_Item(name='ipconfig', subnet=_Item(id='/subnet'))],
+                   mac_address=None)
+             for idx in range(3)]
+    projected = list(azurearm.iter_paged_object(iter(items), fields=['name', 'ip_configurations',
+                                                                     'mac_address']))
+    assert projected[0] == {'name': 'nic0',
+                            'ip_configurations': [{'name': 'ipconfig', 'subnet': {'id': '/subnet'}}]}
+    assert azurearm.paged_object_to_dict(iter(items), fields='id') == dict(
+        ('nic{0}'.format(idx), {'name': 'nic{0}'.format(idx), 'id': '/nics/{0}'.format(idx)})
+        for idx in range(3)
+    )
+
+
+def test_iter_resources_lists_resource_groups_concurrently():
+    operations = MagicMock(spec=['list_all', 'list'])
+    operations.list_all.return_value = iter([_Item(name='all')])
+    operations.list.side_effect = lambda resource_group_name: iter(
+        [_Item(name='{0}-{1}'.format(resource_group_name, idx)) for idx in range(2)]
+    )
+
+    assert list(azurearm.iter_resources(operations)) == [{'name': 'all'}]
+
+    groups = ['group{0}'.format(idx) for idx in range(10)]
+    items = list(azurearm.iter_resources(operations, resource_groups=groups, fields=['name'], workers=4))
+    assert sorted(item['name'] for item in items) == sorted(
+        '{0}-{1}'.format(group, idx) for group in groups for idx in range(2)
+    )
+    assert operations.list.call_count == 10
+
+
+def test_iter_resources_raises_listing_errors():
+    operations = MagicMock(spec=['list_by_resource_group'])
+    operations.list_by_resource_group.side_effect = ValueError('denied')
+    with pytest.raises(ValueError):
+        list(azurearm.iter_resources(operations, resource_groups=['a', 'b']))
@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+
+# Import python libs
+from __future__ import absolute_import, print_function, unicode_literals
+
+# Import Fractus Libs
+import fractus.cloudutils.boto_cache as boto_cache
+
+# Import Testing Libs
+from mock import MagicMock, patch
+
+
+def _resource(_id, name=None, **attrs):
+    return MagicMock(id=_id, tags={'Name': name} if name else {}, **attrs)
+
+
+def test_cache_calls_fetch_once_until_expired():
+    cache = boto_cache.DescribeCache(ttl=60)
+    fetch = MagicMock(return_value='described')
+    with patch('time.time', return_value=1000):
+        assert cache.get(('subnet', 'cx'), fetch) == 'described'
+        assert cache.get(('subnet', 'cx'), fetch) == 'described'
+    assert fetch.call_count == 1
+    with patch('time.time', return_value=1061):
+        cache.get(('subnet', 'cx'), fetch)
+    assert fetch.call_count == 2
+
+
+def test_cache_disabled_with_zero_ttl():
+    cache = boto_cache.get_cache({}, 'test', ttl=0)
+    fetch = MagicMock(return_value='described')
+    cache.get(('vpc', 'cx'), fetch)
+    cache.get(('vpc', 'cx'), fetch)
+    assert fetch.call_count == 2
+
+
+def test_invalidate_by_prefix():
+    cache = boto_cache.DescribeCache()
+    cache.get(('vpc', 'cx'), lambda: 'vpcs')
+    cache.get(('subnet', 'cx'), lambda: 'subnets')
+    cache.invalidate('vpc')
+    assert cache.get(('vpc', 'cx'), lambda: 'fresh') == 'fresh'
+    assert cache.get(('subnet', 'cx'), lambda: 'fresh') == 'subnets'
+
+
+def test_results_fetched_before_an_invalidation_are_not_stored():
+    cache = boto_cache.DescribeCache()
+
+    def _fetch():
+        cache.invalidate('vpc')
+        return 'stale'
+    assert cache.get(('vpc', 'cx'), _fetch) == 'stale'
+    assert cache.get(('vpc', 'cx'), lambda: 'fresh') == 'fresh'
+
+
+def test_get_cache_is_kept_in_context():
+    context = {}
+    assert boto_cache.get_cache(context, 'boto_vpc') is boto_cache.get_cache(context, 'boto_vpc', ttl=5)
+    assert boto_cache.get_cache(context, 'boto_vpc').ttl == 5
+
+
+def test_index_find():
+    subnets = [
+        _resource('subnet-1', 'web', vpc_id='vpc-1', cidr_block='10.0.0.0/24'),
+        _resource('subnet-2', 'web', vpc_id='vpc-2', cidr_block='10.0.1.0/24'),
+        _resource('subnet-3', 'db', vpc_id='vpc-1', cidr_block='10.0.2.0/24'),
+    ]
+    index = boto_cache.index(subnets)
+    assert [s.id for s in index.find(name='web')] == ['subnet-1', 'subnet-2']
+    assert [s.id for s in index.find(name='web', vpc_id='vpc-2')] == ['subnet-2']
+    assert [s.id for s in index.find(resource_id=['subnet-3', 'subnet-9'])] == ['subnet-3']
+    assert [s.id for s in index.find(cidr_block='10.0.2.0/24')] == ['subnet-3']
+    assert index.find(resource_id='subnet-1', name='db') == []
+    assert [s.id for s in index.find(tags={'Name': 'db'})] == ['subnet-3']
+
+
+def test_peek_does_not_fetch():
+    cache = boto_cache.DescribeCache()
+    assert cache.peek(('vpc', 'cx')) is None
+    cache.get(('vpc', 'cx'), lambda: 'vpcs')
+    assert cache.peek(('vpc', 'cx')) == 'vpcs'
@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+
+# Import python libs
+from __future__ import absolute_import, print_function, unicode_literals
+
+# Import Fractus Libs
+import fractus.cloudutils.boto_retry as boto_retry
+
+# Import Testing Libs
+import pytest
+from mock import MagicMock, patch
+
+exceptions = pytest.importorskip('botocore.exceptions')
+exception = pytest.importorskip('boto.exception')
+
+
+def _client_error(code):
+    return exceptions.ClientError({'Error': {'Code': code, 'Message': 'Test-defined error'}}, 'msg')
+
+
+def _boto_error(code):
+    e = exception.BotoServerError(400, 'Mocked error')
+    e.error_code = code
+    return e
+
+
+def setup_function():
+    boto_retry._SERVICES.clear()
+
+
+def test_error_code_boto3_and_boto():
+    assert boto_retry.error_code(_client_error('Throttling')) == 'Throttling'
+    assert boto_retry.error_code(_boto_error('RequestLimitExceeded')) == 'RequestLimitExceeded'
+    assert boto_retry.error_code(ValueError('oops')) is None
+
+
+def test_is_throttle():
+    assert boto_retry.is_throttle(_client_error('ThrottlingException'))
+    assert boto_retry.is_throttle(_boto_error('Throttling'))
+    assert not boto_retry.is_throttle(_client_error('AccessDenied'))
+
+
+def test_backoff_retries_throttles_with_jitter():
+    backoff = boto_retry.backoff('test', tries=3, base=1, cap=5)
+    with patch('time.sleep') as sleep:
+        assert backoff.retry(_client_error('Throttling'))
+        assert backoff.retry(_client_error('Throttling'))
+        assert backoff.retry(_client_error('Throttling'))
+        assert not backoff.retry(_client_error('Throttling'))
+    delays = [call[0][0] for call in sleep.call_args_list]
+    assert len(delays) >= 3
+    assert all(0 <= delay <= 5 for delay in delays)
+
+
+def test_backoff_does_not_retry_other_errors():
+    backoff = boto_retry.backoff('test')
+    assert not backoff.retry(_client_error('AccessDenied'))
+    assert boto_retry.backoff('test', codes=['AccessDenied']).retryable(_client_error('AccessDenied'))
+    assert boto_retry.backoff('test', retry_all=True).retryable(_client_error('AccessDenied'))
+
+
+def test_budget_stops_retries():
+    budget = boto_retry.get_budget('test')
+    budget.capacity = 5
+    budget._available = 5
+    backoff = boto_retry.backoff('test', tries=10, base=0, codes=['Busy'])
+    with patch('time.sleep'), patch('time.time', return_value=budget._last):
+        assert backoff.retry(_client_error('Busy'))
+        assert not backoff.retry(_client_error('Busy'))
+
+
+def test_token_bucket_only_limits_after_throttle():
+    bucket = boto_retry.TokenBucket(max_rate=10, min_rate=1, increase=1)
+    assert bucket.rate is None
+    with patch('time.time', return_value=100):
+        bucket.throttled()
+        assert bucket.rate == 5
+        bucket.throttled()
+        assert bucket.rate == 2.5
+    with patch('time.time', return_value=110):
+        assert bucket.rate is None
+
+
+def test_call_retries_then_returns():
+    func = MagicMock(side_effect=[_client_error('Throttling'), 'ok'])
+    with patch('time.sleep'):
+        assert boto_retry.call('test', func, 'arg', kwarg=1) == 'ok'
+    func.assert_called_with('arg', kwarg=1)
+    assert func.call_count == 2
+
+
+def test_call_raises_when_not_retryable():
+    func = MagicMock(side_effect=_client_error('AccessDenied'))
+    with pytest.raises(exceptions.ClientError):
+        boto_retry.call('test', func, retry_tries=5)
+    assert func.call_count == 1
@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+
+# Import python libs
+from __future__ import absolute_import, print_function, unicode_literals
+
+# Import Fractus Libs
+import fractus.cloudutils.boto_waiter as boto_waiter
+
+# Import Testing Libs
+from mock import MagicMock
+
+
+def _describe(timeline, polls):
+    # Every poll of a resource moves it to its next status
+    seen = {}
+
+    def describe(keys):
+        polls.append(sorted(keys))
+        statuses = {}
+        for key in keys:
+            history = timeline[key]
+            status = history[min(seen.get(key, 0), len(history) - 1)]
+            seen[key] = seen.get(key, 0) + 1
+            if status is not None:
+                statuses[key] = status
+        return statuses
+    return describe
+
+
+def test_waits_share_batched_polls():
+    timeline = dict(('db{0}'.format(idx), ['creating', 'backing-up', 'available']) for idx in range(30))
+    timeline['failing'] = ['creating', 'failed']
+    timeline['deleted'] = ['deleting', None]
+    polls = []
+    waiter = boto_waiter.Waiter(_describe(timeline, polls), min_interval=0.05, max_interval=0.1, batch=20)
+    waits = [waiter.add('db{0}'.format(idx), until='available') for idx in range(30)]
+    waits.append(waiter.add('failing', until='available', failed=['failed']))
+    waits.append(waiter.add('deleted', until=None))
+    results = boto_waiter.wait_all(waits, timeout=5)
+
+    assert results.pop('failing') is False
+    assert all(results.values()) and len(results) == 31
+    # 32 resources polled 3 times, with two describe calls of up to 20 keys per round
+    assert len(polls) == 6
+    assert max(len(keys) for keys in polls) == 20
+    assert not waiter.pending
+
+
+def test_wait_times_out_and_survives_describe_errors():
+    describe = MagicMock(side_effect=[Exception('throttled')] + [{'db': 'creating'}] * 100)
+    waiter = boto_waiter.Waiter(describe, min_interval=0.01, max_interval=0.01)
+    wait = waiter.add('db', until=None, timeout=0.05)
+    # A failed describe doesn't make the resource look deleted
+    assert wait.wait(5) is False
+    assert wait.status == 'creating'
+
+
+def test_get_waiter_is_shared_per_key():
+    context = {}
+    describe = MagicMock(return_value={})
+    waiter = boto_waiter.get_waiter(context, ('rds', 'cx'), describe, min_interval=0.01)
+    assert boto_waiter.get_waiter(context, ('rds', 'cx'), MagicMock()) is waiter
+    assert boto_waiter.get_waiter(context, ('rds', 'other'), describe) is not waiter
+    assert waiter.add('gone', until=None).wait(5) is True
+
+
+def test_deferred_waits_are_settled_per_module():
+    context = {}
+    describe = MagicMock(return_value={'db1': 'available', 'db2': 'failed'})
+    waiter = boto_waiter.get_waiter(context, ('boto_rds', 'cx'), describe, min_interval=0.01)
+    boto_waiter.defer(context, 'boto_rds', waiter.add('db1', until='available'))
+    boto_waiter.defer(context, 'boto_rds', waiter.add('db2', until='available', failed='failed'))
+    boto_waiter.defer(context, 'boto_dynamodb', waiter.add('db3', until='available', timeout=0.5))
+
+    assert boto_waiter.wait_deferred(context, 'boto_rds', timeout=5) == {
+        'ready': ['db1'], 'failed': ['db2'], 'pending': []}
+    assert boto_waiter.wait_deferred(context, 'boto_rds') == {'ready': [], 'failed': [], 'pending': []}
+    assert boto_waiter.wait_deferred(context, 'boto_dynamodb', timeout=0) == {
+        'ready': [], 'failed': [], 'pending': ['db3']}
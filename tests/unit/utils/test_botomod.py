@@ -147,3 +147,52 @@ def test_context_conflict_between_boto_and_boto3_utils():
 
     # These should *not* be the same object!
     assert id(boto_ec2_conn) != id(boto3_ec2_conn)
+
+
+def test_boto3_conn_is_shared_between_contexts(boto_conn):
+    boto3mod.__context__ = {}
+    conn = boto3mod.get_connection(service, **pytest.conn_parameters)
+    boto3mod.__context__ = {}
+    assert boto3mod.get_connection(service, **pytest.conn_parameters) is conn
+
+
+def test_boto3_paged_items_is_lazy():
+    pages = [
+        {'Contents': [1, 2], 'NextContinuationToken': 'a'},
+        {'Contents': [3], 'NextContinuationToken': 'b'},
+        {'Contents': [4]},
+    ]
+    func = MagicMock(side_effect=pages)
+    items = boto3mod.paged_items(func, 'Contents', Bucket='b',
+                                 marker_flag='NextContinuationToken',
+                                 marker_arg='ContinuationToken',
+                                 page_size=2, page_size_arg='MaxKeys')
+    assert next(items) == 1
+    assert func.call_count == 1
+    assert list(items) == [2, 3, 4]
+    assert func.call_count == 3
+    func.assert_called_with(Bucket='b', MaxKeys=2, ContinuationToken='b')
+
+
+def test_boto3_paged_call_with_several_markers():
+    pages = [
+        {'Versions': [1], 'NextKeyMarker': 'k', 'NextVersionIdMarker': 'v'},
+        {'Versions': [2], 'NextKeyMarker': 'l'},
+        {'Versions': [3]},
+    ]
+    calls = []
+    func = MagicMock(side_effect=lambda **kw: calls.append(dict(kw)) or pages[len(calls) - 1])
+    ret = list(boto3mod.paged_call(func, marker_flag=('NextKeyMarker', 'NextVersionIdMarker'),
+                                   marker_arg=('KeyMarker', 'VersionIdMarker')))
+    assert len(ret) == 3
+    assert calls == [{}, {'KeyMarker': 'k', 'VersionIdMarker': 'v'}, {'KeyMarker': 'l'}]
+
+
+def test_boto_paged_items_follows_marker():
+    def _page(users, marker=None):
+        result = MagicMock(users=users, marker=marker)
+        return MagicMock(list_users_response=MagicMock(list_users_result=result))
+    func = MagicMock(side_effect=[_page(['a', 'b'], marker='m'), _page(['c'])])
+    items = list(botomod.paged_items(func, 'list_users_response.list_users_result.users', page_size=2))
+    assert items == ['a', 'b', 'c']
+    func.assert_called_with(max_items=2, marker='m')
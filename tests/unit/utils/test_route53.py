@@ -0,0 +1,130 @@
+# -*- coding: utf-8 -*-
+
+# Import python libs
+from __future__ import absolute_import, print_function, unicode_literals
+
+# Import Fractus Libs
+import fractus.cloudutils.route53 as route53
+
+# Import Testing Libs
+from mock import MagicMock, patch
+
+
+def test_wait_polls_all_changes_with_growing_interval():
+    statuses = {'C1': ['PENDING', 'INSYNC'], 'C2': ['PENDING', 'PENDING', 'INSYNC']}
+    get_status = MagicMock(side_effect=lambda change_id: statuses[change_id].pop(0))
+    waiter = route53.get_waiter({})
+    waiter.add('C1', get_status)
+    waiter.add('C2', get_status)
+    with patch('time.sleep') as sleep:
+        assert waiter.wait() == []
+    assert get_status.call_count == 5
+    assert [call[0][0] for call in sleep.call_args_list] == [1.0, 1.5]
+    assert waiter.pending() == []
+
+
+def test_wait_returns_changes_not_synced():
+    get_status = MagicMock(return_value='PENDING')
+    waiter = route53.ChangeWaiter()
+    waiter.add('C1', get_status)
+    with patch('fractus.cloudutils.route53.time') as time:
+        time.time.side_effect = [0, 5, 11]
+        assert waiter.wait(['C1'], timeout=10) == ['C1']
+    assert time.sleep.call_count == 1
+    assert waiter.pending() == ['C1']
+
+
+def test_synced_changes_are_not_polled_again():
+    get_status = MagicMock(return_value='INSYNC')
+    waiter = route53.ChangeWaiter()
+    waiter.add('C1', get_status)
+    assert waiter.wait(['C1']) == []
+    waiter.add('C1', get_status)
+    assert waiter.wait(['C1']) == []
+    assert get_status.call_count == 1
+
+
+def test_wait_keeps_changes_pending_when_get_status_raises():
+    get_status = MagicMock(side_effect=[ValueError('Throttling'), 'INSYNC'])
+    waiter = route53.ChangeWaiter()
+    waiter.add('C1', get_status)
+    with patch('time.sleep'):
+        assert waiter.wait(['C1']) == []
+    assert get_status.call_count == 2
+
+    get_status = MagicMock(side_effect=ValueError('AccessDenied'))
+    waiter.add('C2', get_status)
+    with patch('fractus.cloudutils.route53.time') as time:
+        time.time.side_effect = [0, 5, 11]
+        assert waiter.wait(['C2'], timeout=10) == ['C2']
+    assert waiter.pending() == ['C2']
+
+def _change(action, name, values=('1.1.1.1',), set_id=None):
+    rrset = {'Name': name, 'Type': 'A', 'ResourceRecords': [{'Value': v} for v in values]}
+    if set_id:
+        rrset['SetIdentifier'] = set_id
+    return {'Action': action, 'ResourceRecordSet': rrset}
+
+
+def test_queue_keeps_last_change_per_record_set():
+    queue = route53.get_queue({})
+    queue.add(('Z1', 'cx'), _change('UPSERT', 'a.example.com.'), {'region': 'us-east-1'})
+    queue.add(('Z1', 'cx'), _change('UPSERT', 'b.example.com.'))
+    queue.add(('Z1', 'cx'), _change('DELETE', 'a.example.com.'))
+    queue.add(('Z2', 'cx'), _change('UPSERT', 'a.example.com.', set_id='one'))
+    assert len(queue) == 3
+    assert list(queue.changes(('Z2', 'cx'))) == [('a.example.com.', 'A', 'one')]
+    zones = queue.pop_all()
+    assert [(zone_key, [change['Action'] for change in changes]) for zone_key, _, changes in zones] == \
+        [(('Z1', 'cx'), ['UPSERT', 'DELETE']), (('Z2', 'cx'), ['UPSERT'])]
+    assert zones[0][1] == {'region': 'us-east-1'}
+    assert len(queue) == 0
+
+
+def test_change_batches_respect_limits():
+    changes = [_change('UPSERT', '{0}.example.com.'.format(num)) for num in range(5)]
+    # Every UPSERT counts as two records
+    assert [len(batch) for batch in route53.change_batches(changes, max_records=4)] == [2, 2, 1]
+    changes = [_change('DELETE', '{0}.example.com.'.format(num), values=['x' * 10]) for num in range(5)]
+    assert [len(batch) for batch in route53.change_batches(changes, max_chars=30)] == [3, 2]
+
+
+def _rrset(name, rtype='A', set_id=None, value='1.1.1.1'):
+    rrset = {'Name': name, 'Type': rtype, 'ResourceRecords': [{'Value': value}]}
+    if set_id:
+        rrset['SetIdentifier'] = set_id
+    return rrset
+
+
+def test_zone_records_lists_zone_once_and_indexes_lookups():
+    rrsets = [_rrset('a.example.com.'), _rrset('a.example.com.', 'TXT'),
+              _rrset('b.example.com.', set_id='one'), _rrset('b.example.com.', set_id='two')]
+    list_records = MagicMock(return_value=iter(rrsets))
+    zone = route53.zone_records(list_records)
+    assert not zone.loaded
+    assert [r['Type'] for r in zone.lookup('a.example.com.')] == ['A', 'TXT']
+    assert zone.lookup('b.example.com.', 'A', 'two') == [rrsets[3]]
+    assert len(zone.lookup(rtype='A')) == 3
+    assert zone.lookup('c.example.com.', 'A') == []
+    list_records.assert_called_once_with(None, None)
+
+
+def test_zone_records_apply_changes():
+    zone = route53.zone_records(lambda name, rtype: [_rrset('a.example.com.')])
+    zone.lookup('a.example.com.', 'A')
+    zone.apply(_change('UPSERT', 'a.example.com.', values=['2.2.2.2']))
+    zone.apply(_change('UPSERT', 'b.example.com.'))
+    assert zone.lookup('a.example.com.', 'A')[0]['ResourceRecords'] == [{'Value': '2.2.2.2'}]
+    zone.apply(_change('DELETE', 'a.example.com.'))
+    assert zone.lookup('a.example.com.') == []
+    assert len(zone) == 1
+
+
+def test_zone_records_refresh_one_name():
+    listings = {(None, None): [_rrset('a.example.com.'), _rrset('b.example.com.')],
+                ('a.example.com.', None): [_rrset('a.example.com.', 'TXT')]}
+    zone = route53.zone_records(lambda name, rtype: listings[(name, rtype)])
+    zone.lookup()
+    zone.refresh('a.example.com.')
+    assert [r['Type'] for r in zone.lookup('a.example.com.')] == ['TXT']
+    assert len(zone.lookup('b.example.com.')) == 1
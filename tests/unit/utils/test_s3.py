@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+
+# Import python libs
+from __future__ import absolute_import, print_function, unicode_literals
+import hashlib
+
+# Import Fractus Libs
+import fractus.cloudutils.s3 as s3
+
+# Import Testing Libs
+import pytest
+from mock import patch
+
+
+def setup_function():
+    s3._CACHE.clear()
+    s3._LOADED.clear()
+    s3._LATEST.clear()
+    s3._SUPERSEDED.clear()
+
+
+@pytest.fixture
+def cachedir(tmpdir):
+    s3.__opts__ = {'cachedir': str(tmpdir.mkdir('cache'))}
+    return tmpdir
+
+
+def test_part_size_grows_to_fit_max_parts():
+    assert s3.part_size(10 * s3.MB, 1) == s3.MIN_PART_SIZE
+    assert s3.part_size(100000 * s3.MB, 8 * s3.MB) == 16 * s3.MB
+
+
+def test_single_part_etag_is_md5(cachedir):
+    path = cachedir.join('small')
+    path.write_binary(b'data')
+    digests = s3.file_digests(str(path), 'sha256')
+    assert digests == {'hash': hashlib.sha256(b'data').hexdigest(),
+                       'etag': hashlib.md5(b'data').hexdigest()}
+    assert s3.etag_matches('"{0}"'.format(digests['etag']), digests['etag'])
+
+
+def test_multipart_etag(cachedir):
+    data = b'a' * (5 * s3.MB) + b'b'
+    path = cachedir.join('large')
+    path.write_binary(data)
+    parts = [hashlib.md5(data[:5 * s3.MB]).digest(), hashlib.md5(b'b').digest()]
+    digests = s3.file_digests(str(path), 'md5', multipart_threshold=s3.MB,
+                              multipart_chunksize=5 * s3.MB)
+    assert digests['etag'] == '{0}-2'.format(hashlib.md5(b''.join(parts)).hexdigest())
+    assert digests['hash'] == hashlib.md5(data).hexdigest()
+
+
+def test_digests_are_cached_on_disk(cachedir):
+    path = cachedir.join('cached')
+    path.write_binary(b'data')
+    first = s3.file_digests(str(path))
+    s3._CACHE.clear()
+    s3._LOADED.clear()
+    with patch('hashlib.new') as new:
+        assert s3.file_digests(str(path)) == first
+    assert not new.called
+
+
+def test_cache_file_is_rewritten_without_superseded_entries(cachedir):
+    path = cachedir.join('changing')
+    with patch.object(s3, 'COMPACT_THRESHOLD', 3):
+        for size in range(1, 6):
+            path.write_binary(b'x' * size)
+            latest = s3.file_digests(str(path))
+    cache_file = cachedir.join('cache', 'boto_s3', 'hashes')
+    # Rewritten with the 4th entry, then the 5th was appended
+    assert len(cache_file.readlines()) == 2
+    setup_function()
+    with patch('hashlib.new') as new:
+        assert s3.file_digests(str(path)) == latest
+    assert not new.called
+    assert list(s3._CACHE.values()) == [latest]